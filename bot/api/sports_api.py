@@ -19,6 +19,7 @@ from services.api_response_cache_service import (
     cache_api_response,
     cache_api_response_with_invalidation,
 )
+from utils.http_client import get_http_client
 
 # Load environment variables
 load_dotenv()
@@ -140,12 +141,12 @@ class APISportsFetcher:
         self.session = None
 
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        # Borrow the process-wide session; it is closed once at shutdown
+        self.session = await get_http_client().get_session()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            await self.session.close()
+        self.session = None
 
     @cache_api_response(ttl=300, provider="api-sports")
     async def fetch_data(
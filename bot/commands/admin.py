@@ -1089,6 +1089,7 @@ class AdminCog(commands.Cog):
                     """,
                     guild_id,
                 )
+                await self.bot.admin_service.guild_settings.invalidate(guild_id)
                 subscription_level = "free"
             else:
                 # Determine subscription level based on the new table structure
@@ -1122,6 +1123,7 @@ class AdminCog(commands.Cog):
                         subscription_level,
                         guild_id,
                     )
+                    await self.bot.admin_service.guild_settings.invalidate(guild_id)
                     logger.info(
                         f"Updated subscription_level to '{subscription_level}' for guild {guild_id}"
                     )
@@ -24,9 +24,8 @@ async def is_allowed_command_channel(interaction: Interaction) -> bool:
     """Checks if the command is used in a configured command channel."""
     try:
         # Get guild settings
-        settings = await interaction.client.db_manager.fetch_one(
-            "SELECT command_channel_1, command_channel_2 FROM guild_settings WHERE guild_id = $1",
-            (interaction.guild_id,),
+        settings = await interaction.client.admin_service.guild_settings.get(
+            interaction.guild_id
         )
 
         if not settings:
@@ -270,21 +270,19 @@ class CommunityLeaderboardCog(commands.Cog):
     async def get_leaderboard_data(self, guild_id: int, category: str):
         """Get leaderboard data for a specific category from real data."""
         try:
-            if category == "reactions":
-                # Get top users by reaction count (join with bets to get guild_id)
-                query = """
-                    SELECT br.user_id, COUNT(*) as reaction_count
-                    FROM bet_reactions br
-                    JOIN bets b ON br.bet_serial = b.bet_serial
-                    WHERE b.guild_id = $1
-                    GROUP BY br.user_id
-                    ORDER BY reaction_count DESC
-                    LIMIT 10
-                """
-                results = await self.bot.db_manager.fetch_all(query, (guild_id,))
+            if category in ("reactions", "predictions"):
+                # Served from the per-guild stat rollups
+                metric = "reactions" if category == "reactions" else "win_rate"
+                leaderboard = await self.bot.analytics_service.get_leaderboard(
+                    guild_id, metric=metric, limit=10
+                )
                 return [
-                    {"user_id": row["user_id"], "reaction_count": row["reaction_count"]}
-                    for row in results
+                    {
+                        "user_id": row["user_id"],
+                        "reaction_count": row["reactions"],
+                        "win_rate": row["win_rate"],
+                    }
+                    for row in leaderboard.get("rows", [])
                 ]
 
             elif category == "achievements":
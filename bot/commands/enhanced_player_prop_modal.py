@@ -15,6 +15,7 @@ from config.prop_templates import (
     validate_prop_value,
 )
 from services.player_search_service import PlayerSearchService
+from utils.render_service import get_render_service
 
 logger = logging.getLogger(__name__)
 
@@ -494,7 +495,9 @@ class EnhancedPlayerPropModal(discord.ui.Modal, title="Player Prop Bet"):
             prop_type = prop_type.replace("_", " ").title()
 
             # Generate the image
-            image_bytes = generator.generate_player_prop_bet_image(
+            image_bytes = await get_render_service().render(
+                generator.generate_player_prop_bet_image,
+                name="player_prop",
                 player_name=bet_data["player_name"],
                 team_name=bet_data["team_name"],
                 league=bet_data["league"],
@@ -627,30 +630,26 @@ class EnhancedPlayerPropModal(discord.ui.Modal, title="Player Prop Bet"):
         try:
             # Get available channels from guild settings
             allowed_channels = []
-            guild_settings = await self.db_manager.fetch_one(
-                "SELECT embed_channel_1, embed_channel_2, embed_channel_3, embed_channel_4, embed_channel_5 FROM guild_settings WHERE guild_id = $1",
-                (str(interaction.guild_id),),
+            guild_settings = await self.bot.admin_service.guild_settings.get(
+                interaction.guild_id
             )
 
             if guild_settings:
-                for key in ["embed_channel_1", "embed_channel_2", "embed_channel_3", "embed_channel_4", "embed_channel_5"]:
-                    channel_id = guild_settings.get(key)
-                    if channel_id:
-                        try:
-                            cid = int(channel_id)
-                            channel = interaction.client.get_channel(
-                                cid
-                            ) or await interaction.client.fetch_channel(cid)
-                            if (
-                                isinstance(channel, discord.TextChannel)
-                                and channel.permissions_for(
-                                    interaction.guild.me
-                                ).send_messages
-                            ):
-                                if channel not in allowed_channels:
-                                    allowed_channels.append(channel)
-                        except Exception as e:
-                            logger.error(f"Error processing channel {channel_id}: {e}")
+                for cid in guild_settings.embed_channel_ids:
+                    try:
+                        channel = interaction.client.get_channel(
+                            cid
+                        ) or await interaction.client.fetch_channel(cid)
+                        if (
+                            isinstance(channel, discord.TextChannel)
+                            and channel.permissions_for(
+                                interaction.guild.me
+                            ).send_messages
+                        ):
+                            if channel not in allowed_channels:
+                                allowed_channels.append(channel)
+                    except Exception as e:
+                        logger.error(f"Error processing channel {cid}: {e}")
 
             if not allowed_channels:
                 await interaction.response.edit_message(
@@ -748,7 +747,9 @@ class EnhancedPlayerPropModal(discord.ui.Modal, title="Player Prop Bet"):
             timestamp = datetime.now(timezone.utc)
 
             # Generate the bet slip image
-            bet_slip_image_bytes = generator.generate_player_prop_bet_image(
+            bet_slip_image_bytes = await get_render_service().render(
+                generator.generate_player_prop_bet_image,
+                name="player_prop",
                 player_name=bet_data["player_name"],
                 team_name=bet_data.get("team_name", "Team"),
                 league=bet_data.get("league", "N/A"),
@@ -798,12 +799,11 @@ class EnhancedPlayerPropModal(discord.ui.Modal, title="Player Prop Bet"):
 
                 # Get member role for mention
                 member_role_id = None
-                guild_settings = await self.db_manager.fetch_one(
-                    "SELECT member_role FROM guild_settings WHERE guild_id = $1",
-                    (str(interaction.guild_id),),
+                guild_settings = await self.bot.admin_service.guild_settings.get(
+                    interaction.guild_id
                 )
-                if guild_settings and guild_settings.get("member_role"):
-                    member_role_id = guild_settings["member_role"]
+                if guild_settings and guild_settings.member_role:
+                    member_role_id = guild_settings.member_role
 
                 # Prepare content with member role mention
                 content = f"<@&{member_role_id}>" if member_role_id else None
@@ -20,6 +20,7 @@ from discord.ui import Button, Select, View
 from config.leagues import LEAGUE_CONFIG
 from utils.league_loader import get_all_sport_categories, get_leagues_by_sport
 from utils.player_prop_image_generator import PlayerPropImageGenerator
+from utils.render_service import get_render_service
 
 logger = logging.getLogger(__name__)
 
@@ -364,9 +365,8 @@ class PlayerPropsWorkflowView(View):
         self.bet_details["units_str"] = str(units)
 
         # Get guild settings for units display mode
-        guild_settings = await self.bot.db_manager.fetch_one(
-            "SELECT units_display_mode FROM guild_settings WHERE guild_id = $1",
-            (str(self.original_interaction.guild_id),),
+        guild_settings = await self.bot.admin_service.guild_settings.get(
+            self.original_interaction.guild_id
         )
         units_display_mode = (
             guild_settings.get("units_display_mode", "auto")
@@ -393,7 +393,9 @@ class PlayerPropsWorkflowView(View):
             # Always use 1 unit for preview images
             preview_units = 1.0
 
-            bet_slip_image_bytes = generator.generate_player_prop_bet_image(
+            bet_slip_image_bytes = await get_render_service().render(
+                generator.generate_player_prop_bet_image,
+                name="player_prop",
                 player_name=player_name,
                 team_name=team_name,
                 league=league,
@@ -524,7 +526,9 @@ class PlayerPropsWorkflowView(View):
                 generator = PlayerPropImageGenerator(
                     guild_id=self.original_interaction.guild_id
                 )
-                bet_slip_image_bytes = generator.generate_player_prop_bet_image(
+                bet_slip_image_bytes = await get_render_service().render(
+                    generator.generate_player_prop_bet_image,
+                    name="player_prop",
                     player_name=player_name,
                     team_name=team_name,
                     league=league,
@@ -577,12 +581,11 @@ class PlayerPropsWorkflowView(View):
 
                 # Fetch member_role for mention
                 member_role_id = None
-                guild_settings = await self.bot.db_manager.fetch_one(
-                    "SELECT member_role FROM guild_settings WHERE guild_id = $1",
-                    (str(interaction.guild_id),),
+                guild_settings = await self.bot.admin_service.guild_settings.get(
+                    interaction.guild_id
                 )
-                if guild_settings and guild_settings.get("member_role"):
-                    member_role_id = guild_settings["member_role"]
+                if guild_settings and guild_settings.member_role:
+                    member_role_id = guild_settings.member_role
 
                 # Post the bet slip image to the channel using a webhook
                 if member_role_id:
@@ -1,4 +1,5 @@
 import logging
+from datetime import datetime
 from io import BytesIO
 
 from discord import File, Interaction, app_commands
@@ -46,9 +47,10 @@ class LeaderboardCog(commands.Cog):
                 return
 
             # Get leaderboard data
-            cappers = await self.analytics_service.get_leaderboard(
+            leaderboard = await self.analytics_service.get_leaderboard(
                 interaction.guild_id, metric=metric, limit=limit
             )
+            cappers = leaderboard.get("rows")
 
             if not cappers:
                 await interaction.followup.send(
@@ -78,6 +80,8 @@ class LeaderboardCog(commands.Cog):
             title = (
                 f"🏆 Top {limit} Cappers by {metric_names.get(metric, metric.title())}"
             )
+            as_of = datetime.fromisoformat(leaderboard["as_of"])
+            title += f"\nUpdated <t:{int(as_of.timestamp())}:R>"
 
             await interaction.followup.send(content=title, file=file, ephemeral=True)
 
@@ -111,9 +115,10 @@ class LeaderboardCog(commands.Cog):
             # Create comparison view (you can expand this with a selection interface)
             # For now, just show top 5 cappers comparison
 
-            top_cappers = await self.analytics_service.get_leaderboard(
+            leaderboard = await self.analytics_service.get_leaderboard(
                 interaction.guild_id, metric="net_units", limit=5
             )
+            top_cappers = leaderboard.get("rows")
 
             if not top_cappers:
                 await interaction.followup.send(
@@ -14,6 +14,8 @@ from PIL import Image
 
 # Import directly from utils
 from config.asset_paths import get_sport_category_for_path
+from utils.asset_loader import asset_loader
+from utils.slip_cache import get_slip_cache
 
 logger = logging.getLogger(__name__)
 
@@ -241,6 +243,10 @@ class LoadLogosCog(commands.Cog):
             )
 
             if saved_path:
+                # New or replaced logos must not be masked by cached lookups
+                # or by slips rendered with the old logo
+                asset_loader.clear_cache()
+                get_slip_cache().clear()
                 msg = (
                     f"✅ Logo for **{name}** (Context: {'League' if is_league else f'Team in {league_code_for_path_arg}'}) processed.\n"
                     f"Attempted save path relative to assets/static: `{saved_path}`\n"
@@ -14,6 +14,7 @@ from commands.admin import require_registered_guild
 from data.db_manager import get_db_manager
 from utils.errors import ValidationError
 from utils.parlay_bet_image_generator import ParlayBetImageGenerator
+from utils.render_service import get_render_service
 
 from .constants import DEFAULT_UNITS
 from .modals import BetDetailsModal, OddsModal, TotalOddsModal
@@ -412,10 +413,7 @@ class ParlayBetWorkflowView(View):
         # Get allowed embed channels from guild settings
         allowed_channels = []
         try:
-            guild_settings = await self.bot.db_manager.fetch_one(
-                "SELECT embed_channel_1, embed_channel_2 FROM guild_settings WHERE guild_id = $1",
-                (str(guild.id),),
-            )
+            guild_settings = await self.bot.admin_service.guild_settings.get(guild.id)
             if guild_settings:
                 for channel_id in (
                     guild_settings.get("embed_channel_1"),
@@ -501,7 +499,9 @@ class ParlayBetWorkflowView(View):
             }
 
             # Generate image
-            image_bytes = generator.generate_image(
+            image_bytes = await get_render_service().render(
+                generator.generate_image,
+                name="parlay",
                 legs=bet_data["legs"],
                 output_path=None,
                 total_odds=bet_data["total_odds"],
@@ -574,7 +574,12 @@ class ParlayBetWorkflowView(View):
             }
 
             # Generate image
-            image_bytes = generator.generate_parlay_preview(
+            image_bytes = await get_render_service().render(
+                generator.generate_parlay_preview,
+                name="parlay_preview",
+                cache_key=generator.parlay_preview_cache_key(
+                    bet_data["legs"], bet_data["total_odds"], bet_data["units"]
+                ),
                 legs=bet_data["legs"],
                 total_odds=bet_data["total_odds"],
                 units=bet_data["units"],
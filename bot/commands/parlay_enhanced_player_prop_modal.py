@@ -17,6 +17,7 @@ from config.prop_templates import (
     validate_prop_value,
 )
 from services.player_search_service import PlayerSearchResult, PlayerSearchService
+from utils.render_service import get_render_service
 
 logger = logging.getLogger(__name__)
 
@@ -412,7 +413,9 @@ class ParlayEnhancedPlayerPropModal(Modal):
 
             # Generate preview with just this leg
             preview_legs = [leg_data]
-            image_bytes = generator.generate_image(
+            image_bytes = await get_render_service().render(
+                generator.generate_image,
+                name="parlay_preview",
                 legs=preview_legs,
                 output_path=None,
                 total_odds=bet_data["odds"],  # Use leg odds for preview
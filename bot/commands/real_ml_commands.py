@@ -917,6 +917,9 @@ class RealMLCommands(commands.Cog):
                     interaction.guild.name if interaction.guild else "Unknown Guild",
                     "free",  # Default to free tier
                 )
+                await self.bot.admin_service.guild_settings.invalidate(
+                    interaction.guild_id
+                )
                 result = {"subscription_level": "free"}
 
             is_platinum = result.get("subscription_level") == "platinum"
@@ -27,6 +27,7 @@ from utils.league_loader import (
 
 # Using local StraightBetDetailsModal class instead of importing from utils.modals
 from utils.player_prop_image_generator import PlayerPropImageGenerator
+from utils.render_service import get_render_service
 
 logger = logging.getLogger(__name__)
 
@@ -904,16 +905,8 @@ class StraightBetWorkflowView(View):
 
         # Restrict to embed_channel_1 and embed_channel_2 from guild_settings, fallback to all available channels if none found
         guild = interaction.guild
-        db_manager = self.bot.db_manager
-        settings = await db_manager.fetch_one(
-            "SELECT embed_channel_1, embed_channel_2, embed_channel_3, embed_channel_4, embed_channel_5 FROM guild_settings WHERE guild_id = $1",
-            (guild.id,)
-        )
-        channel_ids = []
-        if settings:
-            for key in ["embed_channel_1", "embed_channel_2", "embed_channel_3", "embed_channel_4", "embed_channel_5"]:
-                if settings.get(key):
-                    channel_ids.append(int(settings[key]))
+        settings = await self.bot.admin_service.guild_settings.get(guild.id)
+        channel_ids = settings.embed_channel_ids if settings else []
         # Get channel objects and filter by send permissions
         channels = []
         for cid in channel_ids:
@@ -1013,7 +1006,7 @@ class StraightBetWorkflowView(View):
                 formatted_serial = bet_id_str
             else:
                 formatted_serial = f"{today_str}{bet_id_str}"
-            bet_slip_image_bytes = gen.generate_bet_slip_image(
+            render_kwargs = dict(
                 league=details.get("league", ""),
                 home_team=details.get("home_team_name", ""),
                 away_team=details.get("away_team_name", ""),
@@ -1027,6 +1020,12 @@ class StraightBetWorkflowView(View):
                 units_display_mode="auto",
                 display_as_risk=False,
             )
+            bet_slip_image_bytes = await get_render_service().render(
+                gen.generate_bet_slip_image,
+                name="game_line",
+                cache_key=gen.bet_slip_cache_key(**render_kwargs),
+                **render_kwargs,
+            )
 
             if bet_slip_image_bytes:
                 self.preview_image_bytes = io.BytesIO(bet_slip_image_bytes)
@@ -1072,13 +1071,12 @@ class StraightBetWorkflowView(View):
         self, interaction: discord.Interaction
     ) -> Optional[str]:
         """Get member role mention if configured."""
-        guild_settings = await self.bot.db_manager.fetch_one(
-            "SELECT member_role FROM guild_settings WHERE guild_id = $1",
-            (str(interaction.guild_id),),
+        guild_settings = await self.bot.admin_service.guild_settings.get(
+            interaction.guild_id
         )
 
-        if guild_settings and guild_settings.get("member_role"):
-            return f"<@&{guild_settings['member_role']}>"
+        if guild_settings and guild_settings.member_role:
+            return f"<@&{guild_settings.member_role}>"
         return None
 
     async def _get_or_create_webhook(self, post_channel) -> Optional[discord.Webhook]:
@@ -1182,6 +1180,8 @@ class StraightBetWorkflowView(View):
 
             # Include preview bytes (if generated in the UI) so the service can persist the
             # preview image to disk and attach it to the webhook message.
+            if self.bet_details.get("preview_cache_key"):
+                bet_details["preview_cache_key"] = self.bet_details["preview_cache_key"]
             try:
                 if getattr(self, 'preview_image_bytes', None):
                     # Persist the preview to a stable path under StaticFiles so the
@@ -1308,7 +1308,7 @@ class StraightBetWorkflowView(View):
                 formatted_serial = f"{today_str}{bet_id_str}"
             timestamp = datetime.now(timezone.utc)
 
-            bet_slip_image_bytes = gen.generate_bet_slip_image(
+            render_kwargs = dict(
                 league=self.bet_details.get("league", ""),
                 home_team=home_team,
                 away_team=away_team,
@@ -1322,10 +1322,19 @@ class StraightBetWorkflowView(View):
                 units_display_mode=units_display_mode,
                 display_as_risk=display_as_risk,
             )
+            cache_key = gen.bet_slip_cache_key(**render_kwargs)
+            bet_slip_image_bytes = await get_render_service().render(
+                gen.generate_bet_slip_image,
+                name="game_line",
+                cache_key=cache_key,
+                **render_kwargs,
+            )
 
             if bet_slip_image_bytes:
                 self.preview_image_bytes = io.BytesIO(bet_slip_image_bytes)
                 self.preview_image_bytes.seek(0)
+                # Lets submit reuse the rendered preview instead of redrawing it
+                self.bet_details["preview_cache_key"] = cache_key
                 return True
             else:
                 self.preview_image_bytes = None
@@ -1357,7 +1366,9 @@ class StraightBetWorkflowView(View):
             bet_id = str(self.bet_details.get("bet_serial", ""))
             timestamp = datetime.now(timezone.utc)
 
-            bet_slip_image_bytes = generator.generate_player_prop_bet_image(
+            bet_slip_image_bytes = await get_render_service().render(
+                generator.generate_player_prop_bet_image,
+                name="player_prop",
                 player_name=player_name or team_name,
                 team_name=team_name,
                 league=league,
@@ -1427,32 +1438,30 @@ class StraightBetWorkflowView(View):
 
             # Prefer a reserved serial if available (set in _handle_step_6 when reserving)
             reserved_serial = self.bet_details.get("reserved_bet_serial")
+            bet_service = getattr(self.bot, "bet_service", None)
+            if not reserved_serial and bet_service:
+                # Reserve one now so the preview and the submitted bet share it
+                reserved_serial = await bet_service.reserve_bet(
+                    guild_id=self.original_interaction.guild_id,
+                    user_id=self.original_interaction.user.id,
+                    league=self.bet_details.get("league"),
+                    bet_type="straight",
+                    bet_details=self.bet_details,
+                )
+                if reserved_serial:
+                    self.bet_details["reserved_bet_serial"] = int(reserved_serial)
+            today_str = datetime.now().strftime("%m%d%Y")
             if reserved_serial:
                 # Use the reserved DB serial for preview naming
                 bet_id_raw = str(int(reserved_serial))
-                today_str = datetime.now().strftime("%m%d%Y")
                 # If the UI generator expects MMDDYYYY prefix, ensure it's present
                 formatted_serial = bet_id_raw if bet_id_raw.startswith(today_str) else f"{today_str}{bet_id_raw}"
                 self.bet_details["bet_serial"] = formatted_serial
                 logger.debug(f"Using reserved bet_serial for preview: {formatted_serial}")
             else:
-                # Fetch next bet serial from database as a fallback
-                db_manager = self.bot.db_manager
-                next_serial = None
-                try:
-                    result = await db_manager.fetch_one(
-                        "SELECT COALESCE(MAX(bet_serial), 0) + 1 AS next_serial FROM bets WHERE guild_id = $1",
-                        (self.bet_details["guild_id"],),
-                    )
-                    next_serial = result["next_serial"] if result and "next_serial" in result else 1
-                except Exception as e:
-                    logger.error(f"Error fetching next bet serial: {e}")
-                    next_serial = 1
-                # Format bet_serial as MMDDYYYY + serial
-                today_str = datetime.now().strftime("%m%d%Y")
-                formatted_serial = f"{today_str}{next_serial}"
-                self.bet_details["bet_serial"] = formatted_serial
-                logger.debug(f"Using computed bet_serial for preview: {formatted_serial}")
+                # The serial is assigned on submit; the preview shows the date only
+                self.bet_details["bet_serial"] = today_str
+                logger.warning("Could not reserve a bet_serial for the preview")
 
             # Generate preview image
             preview_success = await self._generate_preview_image(units)
@@ -1901,7 +1910,9 @@ class StraightBetDetailsModal(Modal):
                     generator = PlayerPropImageGenerator(
                         guild_id=self.view_ref.original_interaction.guild_id
                     )
-                    image_bytes = generator.generate_player_prop_bet_image(
+                    image_bytes = await get_render_service().render(
+                        generator.generate_player_prop_bet_image,
+                        name="player_prop",
                         league=self.bet_details.get("league", ""),
                         player_name=self.bet_details.get("player_name", ""),
                         prop_line=self.bet_details.get("line", ""),
@@ -1911,7 +1922,7 @@ class StraightBetDetailsModal(Modal):
                         guild_id=self.view_ref.original_interaction.guild_id,
                     )
                 else:
-                    image_bytes = generator.generate_bet_slip_image(
+                    render_kwargs = dict(
                         league=self.bet_details.get("league", ""),
                         home_team=self.bet_details.get("home_team_name", ""),
                         away_team=self.bet_details.get("away_team_name", ""),
@@ -1921,6 +1932,12 @@ class StraightBetDetailsModal(Modal):
                         selected_team=self.bet_details.get("team", ""),
                         output_path=None,
                     )
+                    image_bytes = await get_render_service().render(
+                        generator.generate_bet_slip_image,
+                        name="game_line",
+                        cache_key=generator.bet_slip_cache_key(**render_kwargs),
+                        **render_kwargs,
+                    )
                 preview_bytes = image_bytes
                 preview_file = File(
                     io.BytesIO(image_bytes), filename="bet_preview.webp"
@@ -0,0 +1,265 @@
+"""
+Bulk upsert pipeline for the api_games table.
+Buffers mapped games and writes each batch with a single pipelined
+INSERT ... ON CONFLICT (api_game_id) DO UPDATE inside one transaction.
+A batch that PostgreSQL rejects because of bad rows is split until only those
+rows are dropped.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import asyncpg
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 500
+
+# Column set written by ComprehensiveFetcher
+FETCHER_COLUMNS = (
+    "api_game_id",
+    "sport",
+    "league_id",
+    "league_name",
+    "home_team_name",
+    "away_team_name",
+    "start_time",
+    "status",
+    "score",
+    "venue",
+)
+
+
+# Column holding the content fingerprint used by incremental writes
+FINGERPRINT_COLUMN = "payload_hash"
+
+# Errors caused by the values of a row rather than by the connection; a batch
+# failing with one of these is split to find the offending rows
+ROW_ERRORS = (
+    asyncpg.exceptions.DataError,
+    asyncpg.exceptions.IntegrityConstraintViolationError,
+)
+
+
+def compute_game_fingerprint(
+    game: Dict[str, Any], columns: Sequence[str]
+) -> str:
+    """Stable hash of a game's content over the given columns."""
+    payload = {col: game.get(col) for col in columns}
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha1(encoded).hexdigest()
+
+
+def build_upsert_query(
+    columns: Sequence[str],
+    insert_timestamp_columns: Sequence[str] = ("created_at", "updated_at"),
+    update_timestamp_columns: Sequence[str] = ("updated_at",),
+    update_columns: Optional[Sequence[str]] = None,
+    only_if_changed: bool = False,
+) -> str:
+    """Build an api_games upsert for the given column set.
+
+    ``api_game_id`` must be the first column; it is the conflict target.
+    Columns listed in ``update_columns`` (default: every other column) are
+    overwritten on conflict, timestamp columns are set to NOW(). With
+    ``only_if_changed`` the update is skipped when the stored fingerprint
+    already matches, so unchanged rows are never rewritten.
+    """
+    if not columns or columns[0] != "api_game_id":
+        raise ValueError("api_game_id must be the first upsert column")
+
+    if update_columns is None:
+        update_columns = columns[1:]
+
+    insert_columns = list(columns) + list(insert_timestamp_columns)
+    values = [f"${i}" for i in range(1, len(columns) + 1)]
+    values += ["NOW()"] * len(insert_timestamp_columns)
+
+    assignments = [f"{col} = EXCLUDED.{col}" for col in update_columns]
+    assignments += [f"{col} = NOW()" for col in update_timestamp_columns]
+
+    query = (
+        f"INSERT INTO api_games ({', '.join(insert_columns)}) "
+        f"VALUES ({', '.join(values)}) "
+        f"ON CONFLICT (api_game_id) DO UPDATE SET {', '.join(assignments)}"
+    )
+    if only_if_changed:
+        query += (
+            f" WHERE api_games.{FINGERPRINT_COLUMN} "
+            f"IS DISTINCT FROM EXCLUDED.{FINGERPRINT_COLUMN}"
+        )
+    return query
+
+
+class ApiGamesBulkWriter:
+    """Buffer api_games rows and upsert them in batches.
+
+    Rows are plain dicts keyed by column name. Rows are de-duplicated by
+    ``api_game_id`` inside a batch (last write wins), since PostgreSQL rejects
+    an ON CONFLICT DO UPDATE that touches the same row twice in one command.
+    Every flush acquires one connection, opens one transaction and pipelines
+    the whole batch through ``executemany``.
+
+    With ``fingerprint=True`` each row also carries a content hash in
+    ``payload_hash``. Rows whose hash matches the last one written (see
+    ``load_fingerprints``) are not sent at all, and the upsert only rewrites
+    rows whose stored hash differs.
+    """
+
+    def __init__(
+        self,
+        db_pool,
+        columns: Sequence[str] = FETCHER_COLUMNS,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        insert_timestamp_columns: Sequence[str] = ("created_at", "updated_at"),
+        update_timestamp_columns: Sequence[str] = ("updated_at",),
+        update_columns: Optional[Sequence[str]] = None,
+        fingerprint: bool = False,
+    ):
+        self.db_pool = db_pool
+        self.fingerprint = fingerprint
+        self.content_columns = tuple(columns)
+        self.columns = self.content_columns
+        if fingerprint:
+            self.columns += (FINGERPRINT_COLUMN,)
+            if update_columns is not None:
+                update_columns = tuple(update_columns) + (FINGERPRINT_COLUMN,)
+        self.batch_size = max(1, batch_size)
+        self.query = build_upsert_query(
+            self.columns,
+            insert_timestamp_columns,
+            update_timestamp_columns,
+            update_columns,
+            only_if_changed=fingerprint,
+        )
+        self._buffer: Dict[str, Tuple[Any, ...]] = {}
+        self._pending_fingerprints: Dict[str, str] = {}
+        self.known_fingerprints: Dict[str, str] = {}
+        self._flush_lock = asyncio.Lock()
+        self.stats = {
+            "rows_written": 0,
+            "rows_unchanged": 0,
+            "rows_failed": 0,
+            "batches": 0,
+            "failed_batches": 0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.flush()
+
+    async def load_fingerprints(self) -> int:
+        """Load the stored fingerprints so unchanged games are skipped."""
+        if not self.fingerprint:
+            return 0
+        try:
+            async with self.db_pool.acquire() as conn:
+                rows = await conn.fetch(
+                    f"SELECT api_game_id, {FINGERPRINT_COLUMN} FROM api_games "
+                    f"WHERE {FINGERPRINT_COLUMN} IS NOT NULL"
+                )
+        except Exception as e:
+            logger.warning(f"Could not load api_games fingerprints: {e}")
+            return 0
+        self.known_fingerprints = {
+            str(row["api_game_id"]): row[FINGERPRINT_COLUMN] for row in rows
+        }
+        return len(self.known_fingerprints)
+
+    def _to_row(self, game: Dict[str, Any], fingerprint: Optional[str]) -> Tuple[Any, ...]:
+        row = tuple(game.get(col) for col in self.content_columns)
+        return row + (fingerprint,) if self.fingerprint else row
+
+    async def add(self, game: Dict[str, Any]) -> None:
+        """Queue one game, flushing when the batch is full."""
+        await self.add_many([game])
+
+    async def add_many(self, games: Iterable[Dict[str, Any]]) -> None:
+        """Queue many games, flushing every time a batch fills up."""
+        for game in games:
+            api_game_id = game.get("api_game_id")
+            if not api_game_id:
+                logger.warning("Skipping game without api_game_id")
+                continue
+            api_game_id = str(api_game_id)
+            fingerprint = None
+            if self.fingerprint:
+                fingerprint = compute_game_fingerprint(game, self.content_columns)
+                if self.known_fingerprints.get(api_game_id) == fingerprint:
+                    self.stats["rows_unchanged"] += 1
+                    continue
+                self._pending_fingerprints[api_game_id] = fingerprint
+            self._buffer[api_game_id] = self._to_row(game, fingerprint)
+            if len(self._buffer) >= self.batch_size:
+                await self.flush()
+
+    async def flush(self) -> int:
+        """Write all buffered rows. Returns the number of rows written."""
+        async with self._flush_lock:
+            if not self._buffer:
+                return 0
+            entries: List[Tuple[str, Tuple[Any, ...]]] = list(self._buffer.items())
+            fingerprints = {
+                api_game_id: self._pending_fingerprints.pop(api_game_id)
+                for api_game_id in self._buffer
+                if api_game_id in self._pending_fingerprints
+            }
+            self._buffer.clear()
+
+            written = await self._write_rows(entries)
+            if len(written) < len(entries):
+                self.stats["failed_batches"] += 1
+                self.stats["rows_failed"] += len(entries) - len(written)
+            if not written:
+                return 0
+
+            self.known_fingerprints.update(
+                (api_game_id, fingerprints[api_game_id])
+                for api_game_id in written
+                if api_game_id in fingerprints
+            )
+            self.stats["batches"] += 1
+            self.stats["rows_written"] += len(written)
+            logger.debug(f"Upserted {len(written)} api_games rows in one batch")
+            return len(written)
+
+    async def _write_rows(
+        self, entries: List[Tuple[str, Tuple[Any, ...]]]
+    ) -> List[str]:
+        """Upsert ``(api_game_id, row)`` entries in one transaction.
+
+        If PostgreSQL rejects the batch because of a row's values, each half
+        is retried on its own so only the offending rows are dropped. Returns
+        the api_game_ids that were written.
+        """
+        try:
+            async with self.db_pool.acquire() as conn:
+                async with conn.transaction():
+                    await conn.executemany(self.query, [row for _, row in entries])
+            return [api_game_id for api_game_id, _ in entries]
+        except ROW_ERRORS as e:
+            if len(entries) == 1:
+                logger.error(f"Dropped api_games row {entries[0][0]}: {e}")
+                return []
+            middle = len(entries) // 2
+            return await self._write_rows(entries[:middle]) + await self._write_rows(
+                entries[middle:]
+            )
+        except Exception as e:
+            logger.error(f"Bulk upsert of {len(entries)} api_games rows failed: {e}")
+            return []
+
+    async def write(self, games: Iterable[Dict[str, Any]]) -> int:
+        """Queue games and flush immediately. Returns rows written."""
+        written_before = self.stats["rows_written"]
+        await self.add_many(games)
+        await self.flush()
+        return self.stats["rows_written"] - written_before
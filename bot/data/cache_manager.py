@@ -223,12 +223,19 @@ class CacheManager:
 
         try:
             pattern = f"{CACHE_PREFIXES[prefix]}*"
-            keys = await self._redis_client.keys(pattern)
-            if keys:
-                deleted = await self._redis_client.delete(*keys)
+            # SCAN walks the keyspace incrementally; KEYS would block Redis
+            deleted = 0
+            batch = []
+            async for key in self._redis_client.scan_iter(match=pattern, count=1000):
+                batch.append(key)
+                if len(batch) >= 500:
+                    deleted += await self._redis_client.unlink(*batch)
+                    batch = []
+            if batch:
+                deleted += await self._redis_client.unlink(*batch)
+            if deleted:
                 logger.info(f"Cleared {deleted} cache keys with prefix: {prefix}")
-                return deleted
-            return 0
+            return deleted
         except Exception as e:
             logger.error(f"Error clearing cache prefix: {e}")
             return 0
@@ -115,9 +115,17 @@ class DatabaseManager:
         logger.info("[INFO] Database schema initialization completed")
         return True
 
-    async def fetch_all(self, query: str, *args) -> List[Dict[str, Any]]:
-        """Execute a query and return all results."""
+    async def fetch_all(
+        self, query: str, *args, raise_errors: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Execute a query and return all results.
+
+        Failures are logged and return an empty list, unless ``raise_errors``
+        is set for callers that must tell a failed query from no rows.
+        """
         if not self._pool:
+            if raise_errors:
+                raise ConnectionError("Database pool not available")
             logger.warning("Database pool not available, returning empty list")
             return []
         try:
@@ -130,11 +138,21 @@ class DatabaseManager:
                 return [dict(row) for row in rows]
         except Exception as e:
             logger.error(f"Database query failed: {e}")
+            if raise_errors:
+                raise
             return []
 
-    async def fetch_one(self, query: str, *args) -> Optional[Dict[str, Any]]:
-        """Execute a query and return one result."""
+    async def fetch_one(
+        self, query: str, *args, raise_errors: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """Execute a query and return one result.
+
+        Failures are logged and return None, unless ``raise_errors`` is set
+        for callers that must tell a failed query from a missing row.
+        """
         if not self._pool:
+            if raise_errors:
+                raise ConnectionError("Database pool not available")
             logger.warning("Database pool not available, returning None")
             return None
         try:
@@ -147,6 +165,8 @@ class DatabaseManager:
                 return dict(row) if row else None
         except Exception as e:
             logger.error(f"Database query failed: {e}")
+            if raise_errors:
+                raise
             return None
 
     async def execute(self, query: str, *args):
@@ -4,6 +4,7 @@ from datetime import datetime, timezone
 from typing import Any, Dict, List
 
 from bot.config.leagues import LEAGUE_CONFIG, LEAGUE_IDS
+from bot.data.api_games_writer import ApiGamesBulkWriter
 
 # Import all league dictionaries
 
@@ -362,38 +363,45 @@ async def insert_games(
 ) -> None:
     """Insert or update games into the api_games table."""
     logger.info(f"Inserting/updating {len(games)} games for league_id={league_id}")
-    for game in games:
-        try:
-            query = """
-                INSERT INTO api_games (
-                    api_game_id, sport, league_id, league_name,
-                    home_team_name, away_team_name, start_time,
-                    status, created_at, updated_at
-                ) VALUES (
-                    $1, $2, $3, $4, $5, $6, $7, $8, NOW(), NOW()
-                ) ON DUPLICATE KEY UPDATE
-                    home_team_name = VALUES(home_team_name),
-                    away_team_name = VALUES(away_team_name),
-                    start_time = VALUES(start_time),
-                    status = VALUES(status),
-                    updated_at = NOW()
-            """
-            args = (
-                game.get("api_game_id"),
-                sport,
-                league_id,
-                league_name,
-                sanitize_team_name(game.get("home_team_name", "Unknown Team")),
-                sanitize_team_name(game.get("away_team_name", "Unknown Team")),
-                game.get("start_time"),
-                game.get("status", "scheduled"),
-            )
-            await db_manager.execute(query, args)
-        except Exception as e:
-            logger.error(
-                f"Error inserting game with api_game_id={game.get('api_game_id')}: {e}",
-                exc_info=True,
-            )
+    if not db_manager.pool:
+        logger.warning("Database pool not available, skipping game insert")
+        return
+    writer = ApiGamesBulkWriter(
+        db_manager.pool,
+        columns=(
+            "api_game_id",
+            "sport",
+            "league_id",
+            "league_name",
+            "home_team_name",
+            "away_team_name",
+            "start_time",
+            "status",
+        ),
+        update_columns=("home_team_name", "away_team_name", "start_time", "status"),
+    )
+    written = await writer.write(
+        {
+            "api_game_id": game.get("api_game_id"),
+            "sport": sport,
+            "league_id": league_id,
+            "league_name": league_name,
+            "home_team_name": sanitize_team_name(
+                game.get("home_team_name", "Unknown Team")
+            ),
+            "away_team_name": sanitize_team_name(
+                game.get("away_team_name", "Unknown Team")
+            ),
+            "start_time": game.get("start_time"),
+            "status": game.get("status", "scheduled"),
+        }
+        for game in games
+    )
+    if writer.stats["rows_failed"]:
+        logger.error(
+            f"Failed to upsert {writer.stats['rows_failed']} games for league_id={league_id}"
+        )
+    logger.debug(f"Upserted {written} games for league_id={league_id}")
     logger.info(f"Completed inserting/updating games for league_id={league_id}")
 
 
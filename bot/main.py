@@ -64,11 +64,13 @@ except ImportError:
 try:
     from api.sports_api import SportsAPI
     from services.live_game_channel_service import LiveGameChannelService
+    from utils.asset_loader import asset_loader
     from utils.error_handler import (
         get_error_handler,
         initialize_default_recovery_strategies,
     )
     from utils.game_line_image_generator import GameLineImageGenerator
+    from utils.http_client import close_http_client
     from utils.parlay_image_generator import ParlayImageGenerator
     from utils.performance_monitor import (
         background_monitoring,
@@ -76,18 +78,22 @@ try:
     )
     from utils.player_prop_image_generator import PlayerPropImageGenerator
     from utils.rate_limiter import cleanup_rate_limits, get_rate_limiter
+    from utils.render_service import shutdown_render_service
 except ImportError:
     from api.sports_api import SportsAPI
     from services.live_game_channel_service import LiveGameChannelService
+    from utils.asset_loader import asset_loader
     from utils.error_handler import (
         get_error_handler,
         initialize_default_recovery_strategies,
     )
     from utils.game_line_image_generator import GameLineImageGenerator
+    from utils.http_client import close_http_client
     from utils.parlay_image_generator import ParlayImageGenerator
     from utils.performance_monitor import background_monitoring, get_performance_monitor
     from utils.player_prop_image_generator import PlayerPropImageGenerator
     from utils.rate_limiter import cleanup_rate_limits, get_rate_limiter
+    from utils.render_service import shutdown_render_service
 
 # --- Logging Setup ---
 # Use new centralized logging configuration
@@ -575,6 +581,7 @@ class BettingBot(commands.Bot):
                             """,
                             (guild_id,),
                         )
+                        await self.admin_service.guild_settings.invalidate(guild_id)
 
                     guild_obj = discord.Object(id=guild_id)
 
@@ -913,6 +920,14 @@ class BettingBot(commands.Bot):
             await run_one_time_player_data_download()
             logger.info("Step 2: One-time downloads completed")
 
+            # Index the logo tree (or load its manifest) before the first render
+            try:
+                await asyncio.get_running_loop().run_in_executor(
+                    None, asset_loader.index.ensure_loaded
+                )
+            except Exception as e:
+                logger.warning(f"Failed to build the asset path index: {e}")
+
             logger.info("Step 3: Starting services...")
 
             # Initialize community engagement services (DISABLED)
@@ -1219,6 +1234,18 @@ class BettingBot(commands.Bot):
                         "Error closing database connection pool: %s", e, exc_info=True
                     )
 
+            # Close the shared HTTP session used by the API clients
+            try:
+                await close_http_client()
+            except Exception as e:
+                logger.error("Error closing shared HTTP session: %s", e, exc_info=True)
+
+            # Stop the image render worker pool
+            try:
+                shutdown_render_service()
+            except Exception as e:
+                logger.error("Error stopping render workers: %s", e, exc_info=True)
+
             # Stop fetcher monitoring task
             if (
                 hasattr(self, "_fetcher_monitor_task")
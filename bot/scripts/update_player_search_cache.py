@@ -149,6 +149,8 @@ class PlayerCacheUpdater:
             "CREATE INDEX IF NOT EXISTS idx_player_team ON player_search_cache(player_name, team_name)",
             "CREATE INDEX IF NOT EXISTS idx_league_sport ON player_search_cache(league, sport)",
             "CREATE INDEX IF NOT EXISTS idx_name_fuzzy ON player_search_cache(player_name)",
+            # Incremental syncs of the bot's in-memory search index
+            "CREATE INDEX IF NOT EXISTS idx_league_last_used ON player_search_cache(league, last_used)",
         ]
 
         for index_sql in indexes:
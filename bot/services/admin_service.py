@@ -9,6 +9,8 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 
+from bot.utils.guild_settings_cache import get_guild_settings_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -27,6 +29,7 @@ class AdminService:
         """
         self.bot = bot
         self.db_manager = db_manager
+        self.guild_settings = get_guild_settings_cache(db_manager)
         logger.info("AdminService initialized")
 
     async def start(self):
@@ -35,6 +38,7 @@ class AdminService:
         try:
             # Note: Database schema initialization is handled by DatabaseManager.initialize_db()
             # No need to create tables here as they're already created during bot startup
+            await self.guild_settings.start()
             logger.info("AdminService started successfully")
         except Exception as e:
             logger.error(f"Failed to start AdminService: {e}", exc_info=True)
@@ -59,14 +63,7 @@ class AdminService:
             str: The subscription level ('initial' or 'premium').
         """
         try:
-            result = await self.db_manager.fetch_one(
-                """
-                SELECT is_paid, subscription_level
-                FROM guild_settings
-                WHERE guild_id = $1
-                """,
-                guild_id,
-            )
+            result = await self.guild_settings.get(guild_id)
 
             if not result:
                 # If guild not found, create initial entry
@@ -77,11 +74,12 @@ class AdminService:
                     """,
                     guild_id,
                 )
+                await self.guild_settings.invalidate(guild_id)
                 return "initial"
 
             # If is_paid is 1, ensure subscription_level is 'premium'
             if result.get("is_paid", 0) == 1:
-                if result.get("subscription_level") != "premium":
+                if result.subscription_level != "premium":
                     await self.db_manager.execute(
                         """
                         UPDATE guild_settings
@@ -90,6 +88,7 @@ class AdminService:
                         """,
                         guild_id,
                     )
+                    await self.guild_settings.invalidate(guild_id)
                 return "premium"
 
             return result.get("subscription_level", "initial")
@@ -101,10 +100,8 @@ class AdminService:
     async def check_guild_subscription(self, guild_id: int) -> bool:
         """Check if a guild has an active paid subscription."""
         try:
-            result = await self.db_manager.fetch_one(
-                "SELECT is_paid FROM guild_settings WHERE guild_id = $1", guild_id
-            )
-            return bool(result and result.get("is_paid", False))
+            result = await self.guild_settings.get(guild_id)
+            return bool(result and result.is_paid)
         except Exception as e:
             logger.error(f"Error checking guild subscription for {guild_id}: {e}")
             return False
@@ -113,9 +110,7 @@ class AdminService:
         """Set up or update guild settings."""
         try:
             # Check if guild already exists
-            existing = await self.db_manager.fetch_one(
-                "SELECT * FROM guild_settings WHERE guild_id = $1", guild_id
-            )
+            existing = await self.guild_settings.get(guild_id)
 
             if existing:
                 # Update existing settings
@@ -209,6 +204,7 @@ class AdminService:
                     settings.get("units_display_mode"),
                 )
 
+            await self.guild_settings.invalidate(guild_id)
             return True
         except Exception as e:
             logger.error(f"Error setting up guild {guild_id}: {e}")
@@ -217,9 +213,7 @@ class AdminService:
     async def get_guild_settings(self, guild_id: int) -> Optional[Dict[str, any]]:
         """Get guild settings."""
         try:
-            result = await self.db_manager.fetch_one(
-                "SELECT * FROM guild_settings WHERE guild_id = $1", guild_id
-            )
+            result = await self.guild_settings.get(guild_id)
 
             if not result:
                 # Create initial entry for new guild
@@ -230,12 +224,12 @@ class AdminService:
                     """,
                     guild_id,
                 )
+                await self.guild_settings.invalidate(guild_id)
                 # Fetch the newly created entry
-                result = await self.db_manager.fetch_one(
-                    "SELECT * FROM guild_settings WHERE guild_id = $1", guild_id
-                )
+                result = await self.guild_settings.get(guild_id)
 
-            return result
+            # Callers may modify the dict; the cached row must stay intact
+            return dict(result.row) if result else None
         except Exception as e:
             logger.error(f"Error getting guild settings for {guild_id}: {e}")
             return None
@@ -250,8 +244,8 @@ class AdminService:
             values = []
             for key, value in settings.items():
                 if key != "guild_id":  # Skip guild_id in SET clause
-                    set_clauses.append(f"{key} = $1")
                     values.append(value)
+                    set_clauses.append(f"{key} = ${len(values)}")
 
             if not set_clauses:
                 return False
@@ -260,10 +254,12 @@ class AdminService:
             query = f"""
                 UPDATE guild_settings
                 SET {', '.join(set_clauses)}, updated_at = CURRENT_TIMESTAMP
-                WHERE guild_id = $1
+                WHERE guild_id = ${len(values)}
             """
 
             await self.db_manager.execute(query, *values)
+            # Every process drops its cached copy of this guild's settings
+            await self.guild_settings.invalidate(guild_id)
             return True
         except Exception as e:
             logger.error(f"Error updating guild settings for {guild_id}: {e}")
@@ -300,6 +296,7 @@ class AdminCog(commands.Cog):
             """
             params = (interaction.guild_id, True, 0, True, 0)
             await self.bot.db_manager.execute(query, params)
+            await self.admin_service.guild_settings.invalidate(interaction.guild_id)
             await interaction.response.send_message(
                 "Guild settings initialized successfully!", ephemeral=True
             )
@@ -332,6 +329,7 @@ class AdminCog(commands.Cog):
             """
             params = (channel.id, interaction.guild_id)
             await self.bot.db_manager.execute(query, params)
+            await self.admin_service.guild_settings.invalidate(interaction.guild_id)
             await interaction.response.send_message(
                 f"Embed channel set to {channel.mention}!", ephemeral=True
             )
@@ -15,6 +15,7 @@ from bot.utils.enhanced_cache_manager import (
     get_enhanced_cache_manager,
 )
 from bot.utils.performance_monitor import time_operation
+from bot.utils.stats_rollups import get_stats_rollups
 
 logger = logging.getLogger(__name__)
 
@@ -39,6 +40,7 @@ class AnalyticsService:
         self.metrics_cache = {}  # Cache for computed metrics
         self._processing_task = None
         self._is_running = False
+        self.stats_rollups = get_stats_rollups(db_manager)
 
         # Analytics configuration
         self.config = {
@@ -331,6 +333,46 @@ class AnalyticsService:
             logger.error(f"Error getting guild metrics: {e}")
             return {}
 
+    @time_operation("analytics_get_leaderboard")
+    async def get_leaderboard(
+        self,
+        guild_id: int,
+        metric: str = "net_units",
+        limit: int = 10,
+        period: str = "all",
+    ) -> Dict[str, Any]:
+        """Top cappers of a guild from the stat rollups.
+
+        Returns ``{"rows": [...], "as_of": iso timestamp}``; empty on error.
+        """
+        try:
+            return await self.stats_rollups.get_leaderboard(
+                guild_id, metric, period, limit
+            )
+        except Exception as e:
+            logger.error(f"Error getting leaderboard: {e}")
+            return {}
+
+    @time_operation("analytics_get_guild_stats")
+    async def get_guild_stats(
+        self, guild_id: int, period: str = "all"
+    ) -> Dict[str, Any]:
+        """Win/loss/push and unit totals of a guild from the stat rollups."""
+        try:
+            return await self.stats_rollups.get_guild_stats(guild_id, period)
+        except Exception as e:
+            logger.error(f"Error getting guild stats: {e}")
+            return {}
+
+    @time_operation("analytics_get_user_stats")
+    async def get_user_stats(self, guild_id: int, user_id: int) -> Dict[str, Any]:
+        """Win/loss/push and unit totals of a capper from the stat rollups."""
+        try:
+            return await self.stats_rollups.get_user_stats(guild_id, user_id)
+        except Exception as e:
+            logger.error(f"Error getting user stats: {e}")
+            return {}
+
     async def _get_user_betting_data(
         self, user_id: int, guild_id: int, start_date: datetime, end_date: datetime
     ) -> List[Dict]:
@@ -6,16 +6,20 @@ This service provides comprehensive API response caching with:
 - Cache headers for HTTP responses
 - Intelligent cache invalidation
 - Rate limiting with caching
+- TTLs chosen from game state, stale-while-revalidate and stale-if-error
 - Performance monitoring
 """
 
 import asyncio
+import functools
 import hashlib
+import inspect
 import json
 import logging
+import os
 import time
-from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple, Union
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple, Union
 from dataclasses import dataclass
 from functools import wraps
 
@@ -24,6 +28,137 @@ from bot.utils.enhanced_cache_manager import EnhancedCacheManager
 logger = logging.getLogger(__name__)
 
 
+def _normalize_request_value(value: Any) -> Any:
+    """Canonical JSON-serializable form of a request argument.
+
+    Dict keys are sorted and ``None`` values dropped, so equivalent requests
+    map to the same key regardless of argument order or omitted defaults.
+    """
+    if isinstance(value, dict):
+        return {
+            str(k): _normalize_request_value(v)
+            for k, v in sorted(value.items(), key=lambda item: str(item[0]))
+            if v is not None
+        }
+    if isinstance(value, (list, tuple)):
+        return [_normalize_request_value(v) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted((_normalize_request_value(v) for v in value), key=str)
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+# Game statuses (lower-cased) after which a payload no longer changes
+FINAL_STATUSES = {
+    "ft", "aet", "pen", "aot", "ap", "final", "finished", "match finished",
+    "game finished", "fight finished", "ended", "completed", "closed",
+    "canc", "cancelled", "canceled", "pst", "postponed", "abd", "abandoned",
+    "awd", "wo", "match cancelled", "match postponed",
+}
+# Game statuses (lower-cased) that mean the game is in progress
+LIVE_STATUSES = {
+    "live", "in progress", "in_progress", "inprogress", "1h", "2h", "ht", "et",
+    "bt", "p", "q1", "q2", "q3", "q4", "ot", "in1", "in2", "in3", "in4",
+    "in5", "in6", "in7", "in8", "in9", "halftime", "first half", "second half",
+    "break time", "extra time", "penalty in progress",
+}
+
+
+def _iter_games(data: Any):
+    """Yield game-like dicts from a provider payload."""
+    if isinstance(data, dict):
+        if isinstance(data.get("response"), list):
+            data = data["response"]
+        elif isinstance(data.get("data"), list):
+            data = data["data"]
+        else:
+            data = [data]
+    if isinstance(data, list):
+        for item in data:
+            if isinstance(item, dict):
+                yield item
+
+
+def _game_status(game: Dict) -> Optional[str]:
+    """Lower-cased status of a game payload, if it has one."""
+    status = game.get("status")
+    if status is None and isinstance(game.get("fixture"), dict):
+        status = game["fixture"].get("status")
+    if isinstance(status, dict):
+        status = status.get("short") or status.get("long")
+    return str(status).strip().lower() if status else None
+
+
+def _game_start(game: Dict) -> Optional[datetime]:
+    """Kickoff time of a game payload, if it has one."""
+    fixture = game.get("fixture") if isinstance(game.get("fixture"), dict) else {}
+    for value in (
+        game.get("timestamp"),
+        fixture.get("timestamp"),
+        game.get("start_time"),
+        game.get("date"),
+        fixture.get("date"),
+    ):
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return datetime.fromtimestamp(value, tz=timezone.utc)
+        if isinstance(value, str) and value:
+            try:
+                start = datetime.fromisoformat(value.replace("Z", "+00:00"))
+            except ValueError:
+                continue
+            return start if start.tzinfo else start.replace(tzinfo=timezone.utc)
+    return None
+
+
+@dataclass
+class ResponseCachePolicy:
+    """Chooses how long a provider response stays fresh from its content."""
+
+    # Any game in progress
+    live_ttl: int = int(os.getenv("API_CACHE_LIVE_TTL", "15"))
+    # Next kickoff within ``imminent_window`` seconds
+    imminent_ttl: int = int(os.getenv("API_CACHE_IMMINENT_TTL", "60"))
+    imminent_window: int = int(os.getenv("API_CACHE_IMMINENT_WINDOW", "3600"))
+    # Next kickoff within a day
+    upcoming_ttl: int = int(os.getenv("API_CACHE_UPCOMING_TTL", "300"))
+    # Next kickoff more than a day away
+    scheduled_ttl: int = int(os.getenv("API_CACHE_SCHEDULED_TTL", "1800"))
+    # Every game finished, cancelled or postponed
+    final_ttl: int = int(os.getenv("API_CACHE_FINAL_TTL", "86400"))
+    # How long past freshness an entry is served while one refresh runs
+    stale_while_revalidate: int = int(os.getenv("API_CACHE_SWR", "300"))
+    # How long past freshness an entry may stand in for a failing provider
+    stale_if_error: int = int(os.getenv("API_CACHE_STALE_IF_ERROR", "3600"))
+
+    def ttl_for(self, data: Any, default_ttl: int) -> int:
+        """Fresh TTL for a payload; ``default_ttl`` when it holds no games."""
+        now = datetime.now(timezone.utc)
+        ttls = []
+        for game in _iter_games(data):
+            status = _game_status(game)
+            start = _game_start(game)
+            if status is None and start is None:
+                continue
+            if status in FINAL_STATUSES:
+                ttls.append(self.final_ttl)
+            elif status in LIVE_STATUSES:
+                ttls.append(self.live_ttl)
+            elif start is None:
+                ttls.append(self.upcoming_ttl)
+            else:
+                until_start = (start - now).total_seconds()
+                if until_start <= self.imminent_window:
+                    # Includes kickoffs that passed without a live status yet
+                    ttls.append(self.imminent_ttl)
+                elif until_start <= 86400:
+                    ttls.append(self.upcoming_ttl)
+                else:
+                    ttls.append(self.scheduled_ttl)
+        # The most volatile game decides how long the whole payload is fresh
+        return min(ttls) if ttls else default_ttl
+
+
 @dataclass
 class CacheHeaders:
     """Cache headers for API responses."""
@@ -44,13 +179,28 @@ class APIResponse:
     status_code: int = 200
     cached: bool = False
     cache_hit: bool = False
+    # Seconds the cached entry is past its fresh TTL (0 while fresh)
+    stale_for: float = 0.0
 
-    def __init__(self, data=None, headers=None, status_code=200, cached=False, cache_hit=False):
+    def __init__(
+        self,
+        data=None,
+        headers=None,
+        status_code=200,
+        cached=False,
+        cache_hit=False,
+        stale_for=0.0,
+    ):
         self.data = data if data is not None else []
         self.headers = headers
         self.status_code = status_code
         self.cached = cached
         self.cache_hit = cache_hit
+        self.stale_for = stale_for
+
+    @property
+    def stale(self) -> bool:
+        return self.stale_for > 0
 
     def __iter__(self):
         if isinstance(self.data, (list, tuple)):
@@ -91,11 +241,21 @@ class APIRateLimiter:
 class APIResponseCacheService:
     """Service for caching API responses with advanced features."""
 
-    def __init__(self, cache_manager: Optional[EnhancedCacheManager] = None):
+    def __init__(
+        self,
+        cache_manager: Optional[EnhancedCacheManager] = None,
+        policy: Optional[ResponseCachePolicy] = None,
+    ):
         self.cache_manager = cache_manager or EnhancedCacheManager()
+        self.policy = policy or ResponseCachePolicy()
         self.rate_limiters: Dict[str, APIRateLimiter] = {}
         self.default_ttl = 300  # 5 minutes
         self.etag_ttl = 3600  # 1 hour for ETags
+        # Requests currently being fetched, keyed by cache key (single-flight)
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self.provider_stats: Dict[str, Dict[str, int]] = {}
+        # Background revalidation tasks, kept referenced until they finish
+        self._refresh_tasks: Set[asyncio.Task] = set()
 
         # Cache configuration
         self.cache_config = {
@@ -133,6 +293,73 @@ class APIResponseCacheService:
         request_str = json.dumps(request_data, sort_keys=True)
         return hashlib.sha256(request_str.encode()).hexdigest()
 
+    def request_cache_key(
+        self,
+        provider: str,
+        sport: Optional[str] = None,
+        endpoint: Optional[str] = None,
+        params: Optional[Dict] = None,
+    ) -> str:
+        """Generate a canonical cache key for a provider request.
+
+        The key depends only on what is requested, never on the client
+        instance that makes the request.
+        """
+        request_data = {
+            "provider": provider,
+            "sport": sport,
+            "endpoint": endpoint,
+            "params": _normalize_request_value(params or {}),
+        }
+        request_str = json.dumps(request_data, sort_keys=True)
+        return hashlib.sha256(request_str.encode()).hexdigest()
+
+    def _describe_call(
+        self, func, args: Tuple, kwargs: Dict, provider: Optional[str]
+    ) -> Tuple[str, str]:
+        """Resolve ``(provider, cache_key)`` for a call to a cached function."""
+        try:
+            bound = inspect.signature(func).bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = dict(bound.arguments)
+        except TypeError:
+            arguments = {"args": list(args), "kwargs": kwargs}
+
+        # Drop the bound client; its repr changes with every instance
+        instance = None
+        for name in ("self", "cls"):
+            if name in arguments:
+                instance = arguments.pop(name)
+
+        sport = arguments.pop("sport", None)
+        endpoint = arguments.pop("endpoint", None)
+        resolved_provider = arguments.pop("provider_override", None)
+        if not resolved_provider and sport and hasattr(
+            instance, "get_provider_for_sport"
+        ):
+            resolved_provider = instance.get_provider_for_sport(sport)
+        resolved_provider = resolved_provider or provider or "default"
+
+        endpoint = f"{func.__name__}:{endpoint}" if endpoint else func.__name__
+        return resolved_provider, self.request_cache_key(
+            resolved_provider, sport, endpoint, arguments
+        )
+
+    def _record(self, provider: str, event: str) -> None:
+        stats = self.provider_stats.setdefault(
+            provider,
+            {
+                "hits": 0,
+                "misses": 0,
+                "coalesced": 0,
+                "errors": 0,
+                "stale_served": 0,
+                "refreshes": 0,
+                "stale_fallbacks": 0,
+            },
+        )
+        stats[event] += 1
+
     def _generate_etag(self, data: Any) -> str:
         """Generate ETag for response data."""
         if isinstance(data, (dict, list)):
@@ -160,6 +387,8 @@ class APIResponseCacheService:
         try:
             cached_data = await self.cache_manager.get("api_response", cache_key)
             if cached_data:
+                fresh_until = cached_data.get("fresh_until")
+                stale_for = max(0.0, time.time() - fresh_until) if fresh_until else 0.0
                 # If running in test/mock mode, ETag may not be present; skip ETag validation if missing
                 etag = cached_data.get("etag")
                 if etag is None:
@@ -170,6 +399,7 @@ class APIResponseCacheService:
                         status_code=cached_data["status_code"],
                         cached=True,
                         cache_hit=True,
+                        stale_for=stale_for,
                     )
                 # Otherwise, check ETag as before
                 etag_key = f"etag:{cache_key}"
@@ -182,6 +412,7 @@ class APIResponseCacheService:
                         status_code=cached_data["status_code"],
                         cached=True,
                         cache_hit=True,
+                        stale_for=stale_for,
                     )
                 else:
                     # ETag mismatch, invalidate cache
@@ -194,24 +425,34 @@ class APIResponseCacheService:
     async def cache_response(
         self, cache_key: str, response: APIResponse, ttl: int = None
     ) -> None:
-        """Cache an API response."""
+        """Cache an API response.
+
+        The response is fresh for ``ttl`` seconds and then kept for the stale
+        windows of the cache policy, so it can still be served while a refresh
+        runs or while the provider is failing.
+        """
         try:
+            ttl = ttl or self.default_ttl
             cache_data = {
                 "data": response.data,
                 "headers": response.headers,
                 "status_code": response.status_code,
                 "cached_at": datetime.utcnow().isoformat(),
+                "fresh_until": time.time() + ttl,
             }
+            stored_ttl = ttl + max(
+                self.policy.stale_while_revalidate, self.policy.stale_if_error
+            )
 
             # Cache the response
             await self.cache_manager.set(
-                "api_response", cache_key, cache_data, ttl or self.default_ttl
+                "api_response", cache_key, cache_data, stored_ttl
             )
 
             # Cache the ETag separately
             etag_key = f"etag:{cache_key}"
             await self.cache_manager.set(
-                "etag", etag_key, response.headers.etag, self.etag_ttl
+                "etag", etag_key, response.headers.etag, max(self.etag_ttl, stored_ttl)
             )
 
             logger.debug(f"Cached response for key: {cache_key}")
@@ -261,67 +502,178 @@ class APIResponseCacheService:
         def decorator(func):
             @wraps(func)
             async def wrapper(*args, **kwargs):
-                # Generate cache key from function and arguments
-                func_name = func.__name__
-                args_str = str(args) + str(sorted(kwargs.items()))
-                cache_key = hashlib.sha256(
-                    f"{func_name}:{args_str}".encode()
-                ).hexdigest()
+                request_provider, cache_key = self._describe_call(
+                    func, args, kwargs, provider
+                )
+
+                fetch = functools.partial(
+                    self._fetch_and_cache,
+                    func,
+                    args,
+                    kwargs,
+                    cache_key,
+                    provider,
+                    ttl,
+                    invalidate_patterns,
+                )
 
                 # Check cache first
                 cached_response = await self.get_cached_response(cache_key)
-                if cached_response:
-                    # Always return an APIResponse instance
-                    if isinstance(cached_response, APIResponse):
-                        return cached_response
+                if cached_response is not None and not isinstance(
+                    cached_response, APIResponse
+                ):
                     # If cached_response is dict/list, wrap in APIResponse
-                    return APIResponse(data=cached_response, cached=True, cache_hit=True)
-
-                # Check rate limit if provider specified
-                if provider:
-                    rate_allowed = await self.check_rate_limit(provider)
-                    if not rate_allowed:
-                        raise Exception("Rate limit exceeded")
+                    cached_response = APIResponse(
+                        data=cached_response, cached=True, cache_hit=True
+                    )
+                if cached_response is not None:
+                    if not cached_response.stale:
+                        self._record(request_provider, "hits")
+                        return cached_response
+                    if cached_response.stale_for <= self.policy.stale_while_revalidate:
+                        # Serve the stale copy now and refresh it in the background
+                        self._record(request_provider, "stale_served")
+                        self._revalidate(cache_key, request_provider, fetch)
+                        return cached_response
 
-                # Execute the function
-                start_time = time.time()
                 try:
-                    result = await func(*args, **kwargs)
-                    execution_time = time.time() - start_time
-
-                    # If result is an APIResponse, use as-is, else wrap in APIResponse
-                    if isinstance(result, APIResponse):
-                        api_response = result
-                    else:
-                        headers = self._create_cache_headers(result, ttl)
-                        api_response = APIResponse(
-                            data=result,
-                            headers=headers,
-                            status_code=200,
-                            cached=False,
-                            cache_hit=False,
+                    return await self._single_flight(cache_key, request_provider, fetch)
+                except Exception as e:
+                    if (
+                        cached_response is not None
+                        and cached_response.stale_for <= self.policy.stale_if_error
+                    ):
+                        self._record(request_provider, "stale_fallbacks")
+                        logger.warning(
+                            f"{func.__name__} failed ({e}); serving response "
+                            f"{cached_response.stale_for:.0f}s past its TTL"
                         )
+                        return cached_response
+                    raise
 
-                    # Cache the response
-                    await self.cache_response(cache_key, api_response, ttl)
+            return wrapper
 
-                    # Invalidate related cache patterns if specified
-                    if invalidate_patterns:
-                        for pattern in invalidate_patterns:
-                            await self.invalidate_cache(pattern)
+        return decorator
 
-                    logger.info(
-                        f"API response cached for {func_name} (execution time: {execution_time:.2f}s)"
-                    )
-                    return api_response
+    async def _single_flight(
+        self, cache_key: str, provider: str, fetch: Callable[[], Awaitable]
+    ) -> APIResponse:
+        """Run ``fetch`` unless an identical request is already in flight.
+
+        If the caller running the shared request is cancelled, a waiting
+        caller takes the fetch over instead of failing with it.
+        """
+        # Share an identical request that is already being fetched
+        loop = asyncio.get_running_loop()
+        in_flight = self._in_flight.get(cache_key)
+        while in_flight is not None and in_flight.get_loop() is loop:
+            self._record(provider, "coalesced")
+            # wait() neither cancels the shared future nor raises its outcome
+            await asyncio.wait((in_flight,))
+            if not in_flight.cancelled():
+                return in_flight.result()
+            in_flight = self._in_flight.get(cache_key)
+
+        self._record(provider, "misses")
+        future = loop.create_future()
+        self._in_flight[cache_key] = future
+        try:
+            api_response = await fetch()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            self._record(provider, "errors")
+            future.set_exception(e)
+            # Mark the exception retrieved in case nobody was waiting
+            future.exception()
+            raise
+        else:
+            future.set_result(api_response)
+            return api_response
+        finally:
+            if self._in_flight.get(cache_key) is future:
+                del self._in_flight[cache_key]
+
+    def _revalidate(
+        self, cache_key: str, provider: str, fetch: Callable[[], Awaitable]
+    ) -> None:
+        """Start one background refresh of a stale entry."""
+        if cache_key in self._in_flight:
+            return
 
-                except Exception as e:
-                    logger.error(f"API request failed for {func_name}: {e}")
-                    raise
+        async def _refresh():
+            try:
+                await self._single_flight(cache_key, provider, fetch)
+                self._record(provider, "refreshes")
+            except Exception as e:
+                logger.warning(f"Background refresh for {provider} failed: {e}")
 
-            return wrapper
+        task = asyncio.create_task(_refresh())
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
 
-        return decorator
+    async def _fetch_and_cache(
+        self,
+        func,
+        args: Tuple,
+        kwargs: Dict,
+        cache_key: str,
+        provider: Optional[str],
+        ttl: Optional[int],
+        invalidate_patterns: Optional[List[str]],
+    ) -> APIResponse:
+        """Call the wrapped function and cache its response."""
+        func_name = func.__name__
+
+        # Check rate limit if provider specified
+        if provider:
+            rate_allowed = await self.check_rate_limit(provider)
+            if not rate_allowed:
+                raise Exception("Rate limit exceeded")
+
+        # Execute the function
+        start_time = time.time()
+        try:
+            result = await func(*args, **kwargs)
+            execution_time = time.time() - start_time
+
+            # Finished games can be kept far longer than live ones
+            fresh_ttl = self.policy.ttl_for(
+                result.data if isinstance(result, APIResponse) else result,
+                ttl or self.default_ttl,
+            )
+
+            # If result is an APIResponse, use as-is, else wrap in APIResponse
+            if isinstance(result, APIResponse):
+                api_response = result
+            else:
+                headers = self._create_cache_headers(result, fresh_ttl)
+                api_response = APIResponse(
+                    data=result,
+                    headers=headers,
+                    status_code=200,
+                    cached=False,
+                    cache_hit=False,
+                )
+
+            # Cache the response
+            await self.cache_response(cache_key, api_response, fresh_ttl)
+
+            # Invalidate related cache patterns if specified
+            if invalidate_patterns:
+                for pattern in invalidate_patterns:
+                    await self.invalidate_cache(pattern)
+
+            logger.info(
+                f"API response cached for {func_name} for {fresh_ttl}s "
+                f"(execution time: {execution_time:.2f}s)"
+            )
+            return api_response
+
+        except Exception as e:
+            logger.error(f"API request failed for {func_name}: {e}")
+            raise
 
     async def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
@@ -335,6 +687,11 @@ class APIResponseCacheService:
                     stats.get(prefix, {}).get("size", 0)
                     for prefix in ["api_response", "etag", "rate_limit"]
                 ),
+                "providers": {
+                    name: dict(counters)
+                    for name, counters in self.provider_stats.items()
+                },
+                "in_flight": len(self._in_flight),
             }
         except Exception as e:
             logger.error(f"Error getting cache stats: {e}")
@@ -4,20 +4,320 @@
 import asyncio
 import json
 import logging
+import os
+import time
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Optional, Union
+from typing import Awaitable, Dict, List, Optional, Set, Union
 from zoneinfo import ZoneInfo
 
 import discord
 from aiomysql import IntegrityError
 
 from bot.data.db_manager import DatabaseManager
+from bot.utils.bet_serial_allocator import BetSerialAllocator
+from bot.utils.enhanced_cache_manager import get_enhanced_cache_manager
 from bot.utils.errors import BetServiceError
+from bot.utils.guild_settings_cache import get_guild_settings_cache
+from bot.utils.stats_rollups import get_stats_rollups
 
 logger = logging.getLogger(__name__)
 
 EDT = ZoneInfo("America/New_York")
 
+RESOLVE_EMOJI_MAP = {"✅": "won", "❌": "lost", "➖": "push"}
+# How often capper counters and guild stat rollups are checked against the
+# bets table (seconds)
+CAPPER_RECONCILE_INTERVAL = int(os.getenv("CAPPER_RECONCILE_INTERVAL", "3600"))
+# How long reaction handlers remember which bet a slip message belongs to,
+# and how long they remember that a message is not a bet slip (seconds)
+BET_MESSAGE_CACHE_TTL = int(os.getenv("BET_MESSAGE_CACHE_TTL", str(3 * 86400)))
+BET_MESSAGE_NEGATIVE_TTL = int(os.getenv("BET_MESSAGE_NEGATIVE_TTL", "300"))
+# How often unconfirmed and expired bets are swept (seconds, 0 disables)
+BET_CLEANUP_INTERVAL = int(os.getenv("BET_CLEANUP_INTERVAL", "60"))
+# Rows deleted per statement, which bounds how long each sweep holds locks
+BET_CLEANUP_BATCH_SIZE = int(os.getenv("BET_CLEANUP_BATCH_SIZE", "500"))
+# Age at which an unconfirmed bet is abandoned
+UNCONFIRMED_BET_TTL = timedelta(minutes=5)
+# How long a pending bet is kept after it expires
+EXPIRED_BET_GRACE = timedelta(hours=24)
+
+# Resolves a pending or live bet in one statement: the status update, its
+# unit record, the capper counter and the guild stat rollups (migration 026)
+# either all apply or none do. Returns no row if the bet is missing or
+# already resolved.
+RESOLVE_BET_QUERY = """
+    WITH resolved AS (
+        UPDATE bets
+        SET status = $2,
+            result_value = CASE $2::text
+                WHEN 'won' THEN CASE
+                    WHEN odds > 0 THEN COALESCE(units, 0) * odds / 100.0
+                    WHEN odds < 0 THEN COALESCE(units, 0) * 100.0 / ABS(odds)
+                    ELSE 0
+                END
+                WHEN 'lost' THEN -COALESCE(units, 0)
+                ELSE 0
+            END,
+            bet_won = CASE WHEN $2::text = 'won' THEN 1 ELSE 0 END,
+            bet_loss = CASE WHEN $2::text = 'lost' THEN 1 ELSE 0 END,
+            updated_at = $3
+        WHERE bet_serial = $1
+        AND status IN ('pending', 'live')
+        RETURNING bet_serial, guild_id, user_id, status, units, odds, result_value,
+                  COALESCE(game_start, created_at, updated_at) AS period
+    ),
+    unit_record AS (
+        INSERT INTO unit_records (
+            bet_serial, guild_id, user_id, year, month, units, odds,
+            monthly_result_value, total_result_value, created_at
+        )
+        SELECT bet_serial, guild_id, user_id,
+               EXTRACT(YEAR FROM period)::int, EXTRACT(MONTH FROM period)::int,
+               COALESCE(units, 0), COALESCE(odds, 0), result_value, result_value, $3
+        FROM resolved
+        ON CONFLICT (bet_serial) DO UPDATE SET
+            monthly_result_value = EXCLUDED.monthly_result_value,
+            total_result_value = EXCLUDED.total_result_value,
+            created_at = EXCLUDED.created_at
+    ),
+    capper AS (
+        UPDATE cappers c
+        SET bet_won = c.bet_won + CASE WHEN r.status = 'won' THEN 1 ELSE 0 END,
+            bet_loss = c.bet_loss + CASE WHEN r.status = 'lost' THEN 1 ELSE 0 END,
+            bet_push = c.bet_push + CASE WHEN r.status = 'push' THEN 1 ELSE 0 END,
+            updated_at = NOW()
+        FROM resolved r
+        WHERE c.user_id = r.user_id AND c.guild_id = r.guild_id
+        RETURNING c.bet_won, c.bet_loss, c.bet_push
+    ),
+    rollup AS (
+        INSERT INTO guild_stat_rollups AS g (
+            guild_id, user_id, period_type, period_start,
+            bets, units_wagered, net_units, wins, losses, pushes, updated_at
+        )
+        SELECT r.guild_id, r.user_id, p.period_type, p.period_start,
+               1, COALESCE(r.units, 0), r.result_value,
+               (r.status = 'won')::int, (r.status = 'lost')::int,
+               (r.status = 'push')::int, $3
+        FROM resolved r
+        CROSS JOIN LATERAL rollup_periods(r.period) p
+        ON CONFLICT (guild_id, period_type, period_start, user_id) DO UPDATE SET
+            bets = g.bets + 1,
+            units_wagered = g.units_wagered + EXCLUDED.units_wagered,
+            net_units = g.net_units + EXCLUDED.net_units,
+            wins = g.wins + EXCLUDED.wins,
+            losses = g.losses + EXCLUDED.losses,
+            pushes = g.pushes + EXCLUDED.pushes,
+            updated_at = EXCLUDED.updated_at
+    )
+    SELECT r.bet_serial, r.guild_id, r.user_id, r.status, r.result_value,
+           cap.bet_won, cap.bet_loss, cap.bet_push
+    FROM resolved r
+    LEFT JOIN capper cap ON TRUE
+"""
+# Reverts a resolved bet to pending in one statement, undoing its unit
+# record, capper counter and rollups. Returns no row if the status changed
+# meanwhile.
+UNRESOLVE_BET_QUERY = """
+    WITH previous AS (
+        SELECT bet_serial, units, result_value,
+               COALESCE(game_start, created_at, updated_at) AS period
+        FROM bets
+        WHERE bet_serial = $1 AND status = $2
+        FOR UPDATE
+    ),
+    reverted AS (
+        UPDATE bets b
+        SET status = 'pending',
+            result_value = NULL,
+            bet_won = 0,
+            bet_loss = 0,
+            updated_at = $3
+        FROM previous p
+        WHERE b.bet_serial = p.bet_serial AND b.status = $2
+        RETURNING b.bet_serial, b.guild_id, b.user_id, p.units, p.result_value, p.period
+    ),
+    unit_record AS (
+        DELETE FROM unit_records u
+        USING reverted r
+        WHERE u.bet_serial = r.bet_serial
+    ),
+    capper AS (
+        UPDATE cappers c
+        SET bet_won = GREATEST(c.bet_won - CASE WHEN $2::text = 'won' THEN 1 ELSE 0 END, 0),
+            bet_loss = GREATEST(c.bet_loss - CASE WHEN $2::text = 'lost' THEN 1 ELSE 0 END, 0),
+            bet_push = GREATEST(c.bet_push - CASE WHEN $2::text = 'push' THEN 1 ELSE 0 END, 0),
+            updated_at = NOW()
+        FROM reverted r
+        WHERE c.user_id = r.user_id AND c.guild_id = r.guild_id
+        RETURNING c.bet_won, c.bet_loss, c.bet_push
+    ),
+    rollup AS (
+        UPDATE guild_stat_rollups g
+        SET bets = GREATEST(g.bets - 1, 0),
+            units_wagered = g.units_wagered - COALESCE(r.units, 0),
+            net_units = g.net_units - COALESCE(r.result_value, 0),
+            wins = GREATEST(g.wins - CASE WHEN $2::text = 'won' THEN 1 ELSE 0 END, 0),
+            losses = GREATEST(g.losses - CASE WHEN $2::text = 'lost' THEN 1 ELSE 0 END, 0),
+            pushes = GREATEST(g.pushes - CASE WHEN $2::text = 'push' THEN 1 ELSE 0 END, 0),
+            updated_at = $3
+        FROM reverted r
+        CROSS JOIN LATERAL rollup_periods(r.period) p
+        WHERE g.guild_id = r.guild_id AND g.user_id = r.user_id
+        AND g.period_type = p.period_type AND g.period_start = p.period_start
+    )
+    SELECT r.bet_serial, r.guild_id, r.user_id,
+           cap.bet_won, cap.bet_loss, cap.bet_push
+    FROM reverted r
+    LEFT JOIN capper cap ON TRUE
+"""
+# Records a reaction and counts it in the reacting user's rollups, unless the
+# same reaction was already recorded
+ADD_REACTION_QUERY = """
+    WITH reaction AS (
+        INSERT INTO bet_reactions (
+            bet_serial, user_id, emoji, channel_id, message_id, created_at
+        ) VALUES ($1, $2, $3, $4, $5, $6)
+        ON CONFLICT DO NOTHING
+        RETURNING user_id, created_at
+    )
+    INSERT INTO guild_stat_rollups AS g (
+        guild_id, user_id, period_type, period_start, reactions, updated_at
+    )
+    SELECT $7::bigint, r.user_id, p.period_type, p.period_start, 1, r.created_at
+    FROM reaction r
+    CROSS JOIN LATERAL rollup_periods(r.created_at) p
+    ON CONFLICT (guild_id, period_type, period_start, user_id) DO UPDATE SET
+        reactions = g.reactions + 1,
+        updated_at = EXCLUDED.updated_at
+"""
+# Deletes a reaction and takes it back out of the periods it was counted in
+REMOVE_REACTION_QUERY = """
+    WITH removed AS (
+        DELETE FROM bet_reactions
+        WHERE bet_serial = $1 AND user_id = $2 AND emoji = $3 AND message_id = $4
+        RETURNING user_id, created_at
+    )
+    UPDATE guild_stat_rollups g
+    SET reactions = GREATEST(g.reactions - r.removed, 0),
+        updated_at = NOW()
+    FROM (
+        SELECT removed.user_id, p.period_type, p.period_start, COUNT(*) AS removed
+        FROM removed
+        CROSS JOIN LATERAL rollup_periods(removed.created_at) p
+        GROUP BY removed.user_id, p.period_type, p.period_start
+    ) r
+    WHERE g.guild_id = $5 AND g.user_id = r.user_id
+    AND g.period_type = r.period_type AND g.period_start = r.period_start
+"""
+# Deletes a bet and takes it back out of the capper counter and rollups it
+# was counted in: its result if it was resolved, and the reactions on it
+DELETE_BET_QUERY = """
+    WITH deleted AS (
+        DELETE FROM bets
+        WHERE bet_serial = $1
+        RETURNING message_id, guild_id, user_id, status, units, result_value,
+                  COALESCE(game_start, created_at, updated_at) AS period
+    ),
+    capper AS (
+        UPDATE cappers c
+        SET bet_won = GREATEST(c.bet_won - (d.status = 'won')::int, 0),
+            bet_loss = GREATEST(c.bet_loss - (d.status = 'lost')::int, 0),
+            bet_push = GREATEST(c.bet_push - (d.status = 'push')::int, 0),
+            updated_at = NOW()
+        FROM deleted d
+        WHERE c.user_id = d.user_id AND c.guild_id = d.guild_id
+        AND d.status IN ('won', 'lost', 'push')
+    ),
+    delta AS (
+        SELECT guild_id, user_id, period_type, period_start,
+               SUM(bets) AS bets, SUM(units_wagered) AS units_wagered,
+               SUM(net_units) AS net_units, SUM(wins) AS wins,
+               SUM(losses) AS losses, SUM(pushes) AS pushes,
+               SUM(reactions) AS reactions
+        FROM (
+            SELECT d.guild_id, d.user_id, p.period_type, p.period_start,
+                   1 AS bets, COALESCE(d.units, 0) AS units_wagered,
+                   COALESCE(d.result_value, 0) AS net_units,
+                   (d.status = 'won')::int AS wins, (d.status = 'lost')::int AS losses,
+                   (d.status = 'push')::int AS pushes, 0 AS reactions
+            FROM deleted d
+            CROSS JOIN LATERAL rollup_periods(d.period) p
+            WHERE d.status IN ('won', 'lost', 'push')
+            UNION ALL
+            SELECT d.guild_id, br.user_id, p.period_type, p.period_start,
+                   0, 0, 0, 0, 0, 0, 1
+            FROM deleted d
+            JOIN bet_reactions br ON br.bet_serial = $1
+            CROSS JOIN LATERAL rollup_periods(br.created_at) p
+        ) counted
+        GROUP BY guild_id, user_id, period_type, period_start
+    ),
+    rollup AS (
+        UPDATE guild_stat_rollups g
+        SET bets = GREATEST(g.bets - d.bets, 0),
+            units_wagered = g.units_wagered - d.units_wagered,
+            net_units = g.net_units - d.net_units,
+            wins = GREATEST(g.wins - d.wins, 0),
+            losses = GREATEST(g.losses - d.losses, 0),
+            pushes = GREATEST(g.pushes - d.pushes, 0),
+            reactions = GREATEST(g.reactions - d.reactions, 0),
+            updated_at = NOW()
+        FROM delta d
+        WHERE g.guild_id = d.guild_id AND g.user_id = d.user_id
+        AND g.period_type = d.period_type AND g.period_start = d.period_start
+    )
+    SELECT message_id, guild_id FROM deleted
+"""
+# Moves a bet's result between capper counters when update_bet changes its
+# status or owner: the previous result is taken back and the new one counted,
+# netted per capper so an unchanged result is left alone. {update} is the
+# bet UPDATE returning the new and previous guild_id, user_id and status.
+UPDATE_BET_QUERY = """
+    WITH updated AS (
+        {update}
+    ),
+    counted AS (
+        SELECT previous_guild_id AS guild_id, previous_user_id AS user_id,
+               previous_status AS status, -1 AS delta
+        FROM updated
+        UNION ALL
+        SELECT guild_id, user_id, status, 1 FROM updated
+    ),
+    capper AS (
+        UPDATE cappers c
+        SET bet_won = GREATEST(c.bet_won + d.won, 0),
+            bet_loss = GREATEST(c.bet_loss + d.lost, 0),
+            bet_push = GREATEST(c.bet_push + d.pushed, 0),
+            updated_at = NOW()
+        FROM (
+            SELECT guild_id, user_id,
+                   SUM(CASE WHEN status = 'won' THEN delta ELSE 0 END) AS won,
+                   SUM(CASE WHEN status = 'lost' THEN delta ELSE 0 END) AS lost,
+                   SUM(CASE WHEN status = 'push' THEN delta ELSE 0 END) AS pushed
+            FROM counted
+            GROUP BY guild_id, user_id
+        ) d
+        WHERE c.guild_id = d.guild_id AND c.user_id = d.user_id
+        AND (d.won, d.lost, d.pushed) <> (0, 0, 0)
+    )
+    SELECT * FROM updated
+"""
+# Bet columns the rollups are derived from; updating any of them on a resolved
+# bet rebuilds its guild's rollups
+ROLLUP_BET_COLUMNS = frozenset(
+    {"status", "units", "result_value", "game_start", "created_at", "user_id", "guild_id"}
+)
+
+# Cleanup rules: each predicate matches one partial index (migration 024)
+BET_CLEANUP_RULES = {
+    "unconfirmed": "confirmed = 0 AND created_at < $1",
+    "expired": "status = 'pending' AND expiration_time < $1",
+    "expired_without_expiration": (
+        "status = 'pending' AND expiration_time IS NULL AND created_at < $1"
+    ),
+}
+
 
 class BetService:
     def __init__(self, bot, db_manager: DatabaseManager):
@@ -30,13 +330,38 @@ class BetService:
         self.bot = bot
         self.db_manager = db_manager
         self.pending_reactions: Dict[int, Dict[str, Union[str, int, List]]] = {}
+        self.reconcile_task: Optional[asyncio.Task] = None
+        self.cleanup_task: Optional[asyncio.Task] = None
+        # Side effects of resolutions still running; held so they are not
+        # garbage collected mid-flight
+        self._side_effect_tasks: Set[asyncio.Task] = set()
+        self.cleanup_stats: Dict = {
+            "runs": 0,
+            "last_run": None,
+            "last_duration": 0.0,
+            "last_swept": {},
+            "total_swept": {rule: 0 for rule in BET_CLEANUP_RULES},
+        }
+        self.cache_manager = get_enhanced_cache_manager()
+        self.guild_settings = get_guild_settings_cache(db_manager)
+        self.stats_rollups = get_stats_rollups(db_manager)
+        # Shared by the preview and submit paths
+        self.serials = BetSerialAllocator(db_manager)
         logger.info("BetService initialized")
 
     async def start(self):
         """Start the BetService and perform any necessary setup."""
         logger.info("Starting BetService")
         try:
-            await self.cleanup_expired_bets()
+            await self.cache_manager.connect()
+            if BET_CLEANUP_INTERVAL > 0:
+                self.cleanup_task = asyncio.create_task(self._cleanup_loop())
+            else:
+                await self.cleanup_expired_bets()
+            if CAPPER_RECONCILE_INTERVAL > 0:
+                self.reconcile_task = asyncio.create_task(
+                    self._reconcile_capper_counters_loop()
+                )
             logger.info("BetService started successfully")
         except Exception as e:
             logger.error(f"Failed to start BetService: {e}", exc_info=True)
@@ -46,81 +371,177 @@ class BetService:
         """Stop the BetService and perform any necessary cleanup."""
         logger.info("Stopping BetService")
         try:
+            for task in (self.reconcile_task, self.cleanup_task):
+                if task:
+                    task.cancel()
+            for task in self._side_effect_tasks:
+                task.cancel()
+            self.reconcile_task = None
+            self.cleanup_task = None
             self.pending_reactions.clear()
             logger.info("BetService stopped successfully")
         except Exception as e:
             logger.error(f"Failed to stop BetService: {e}", exc_info=True)
             raise BetServiceError(f"Could not stop BetService: {str(e)}")
 
-    async def cleanup_expired_bets(self):
-        """Remove expired pending bets from the database."""
+    async def reconcile_capper_counters(self) -> int:
+        """Recount capper win/loss/push totals from bets and repair any drift.
+
+        Returns the number of capper rows that had to be corrected.
+        """
+        query = """
+            UPDATE cappers c
+            SET bet_won = t.won,
+                bet_loss = t.lost,
+                bet_push = t.push,
+                updated_at = NOW()
+            FROM (
+                SELECT
+                    c2.user_id,
+                    c2.guild_id,
+                    COUNT(b.bet_serial) FILTER (WHERE b.status = 'won') AS won,
+                    COUNT(b.bet_serial) FILTER (WHERE b.status = 'lost') AS lost,
+                    COUNT(b.bet_serial) FILTER (WHERE b.status = 'push') AS push
+                FROM cappers c2
+                LEFT JOIN bets b
+                    ON b.user_id = c2.user_id AND b.guild_id = c2.guild_id
+                GROUP BY c2.user_id, c2.guild_id
+            ) t
+            WHERE c.user_id = t.user_id
+            AND c.guild_id = t.guild_id
+            AND (
+                c.bet_won IS DISTINCT FROM t.won
+                OR c.bet_loss IS DISTINCT FROM t.lost
+                OR c.bet_push IS DISTINCT FROM t.push
+            )
+        """
+        repaired = await self.db_manager.execute(query)
+        repaired = repaired if isinstance(repaired, int) else 0
+        if repaired:
+            logger.warning(f"Repaired drifted win/loss/push counters for {repaired} cappers")
+        else:
+            logger.debug("Capper counters match the bets table")
+        return repaired
+
+    async def _reconcile_capper_counters_loop(self):
+        """Periodically reconcile capper counters and guild stat rollups until
+        the service stops."""
+        while True:
+            try:
+                await asyncio.sleep(CAPPER_RECONCILE_INTERVAL)
+                await self.reconcile_capper_counters()
+                repaired = await self.stats_rollups.rebuild()
+                if repaired:
+                    logger.warning(f"Repaired {repaired} drifted guild stat rollup rows")
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Capper counter reconciliation failed: {e}", exc_info=True)
+
+    async def _sweep_bets(self, rule: str, cutoff: datetime) -> int:
+        """Delete the bets matched by a cleanup rule, one bounded batch at a time.
+
+        Each batch is a single DELETE ... RETURNING statement, so locks are
+        held for at most ``BET_CLEANUP_BATCH_SIZE`` rows and rows locked by a
+        concurrent confirm are skipped until the next sweep.
+        """
+        predicate = BET_CLEANUP_RULES[rule]
+        query = f"""
+            DELETE FROM bets
+            WHERE bet_serial IN (
+                SELECT bet_serial FROM bets
+                WHERE {predicate}
+                LIMIT $2
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING bet_serial, message_id
+        """
+        swept = 0
+        while True:
+            deleted = await self.db_manager.fetch_all(
+                query, (cutoff, BET_CLEANUP_BATCH_SIZE)
+            )
+            if not deleted:
+                break
+            swept += len(deleted)
+            await self._forget_bet_messages(row["message_id"] for row in deleted)
+            if len(deleted) < BET_CLEANUP_BATCH_SIZE:
+                break
+        return swept
+
+    async def cleanup_expired_bets(self) -> int:
+        """Remove pending bets that expired over a day ago."""
         logger.debug("Checking for expired pending bets")
         try:
-            expiration_datetime = datetime.now(EDT) - timedelta(hours=24)
-            query = """
-                DELETE FROM bets
-                WHERE status = 'pending'
-                AND COALESCE(expiration_time, created_at) < $1
-            """
-            rowcount = await self.db_manager.execute(query, (expiration_datetime,))
-            if isinstance(rowcount, int) and rowcount > 0:
-                logger.info(f"Cleaned up {rowcount} expired pending bets.")
+            cutoff = datetime.now(EDT) - EXPIRED_BET_GRACE
+            deleted = await self._sweep_bets("expired", cutoff)
+            deleted += await self._sweep_bets("expired_without_expiration", cutoff)
+            if deleted:
+                logger.info(f"Cleaned up {deleted} expired pending bets.")
             else:
                 logger.debug("No expired pending bets found to clean up.")
+            return deleted
         except Exception as e:
             logger.error(f"Failed to clean up expired bets: {e}", exc_info=True)
+            return 0
 
-    async def cleanup_unconfirmed_bets(self):
+    async def cleanup_unconfirmed_bets(self) -> int:
         """Delete unconfirmed bets that are older than 5 minutes."""
-        logger.info("Starting cleanup of unconfirmed bets")
+        logger.debug("Starting cleanup of unconfirmed bets")
         try:
-            cutoff_time = datetime.now(timezone.utc) - timedelta(minutes=5)
-            query_select = """
-                SELECT bet_serial, guild_id, user_id
-                FROM bets
-                WHERE confirmed = 0
-                AND created_at < $1
-            """
-            expired_bets = await self.db_manager.fetch_all(query_select, (cutoff_time,))
-
-            if not expired_bets:
+            cutoff = datetime.now(timezone.utc) - UNCONFIRMED_BET_TTL
+            deleted = await self._sweep_bets("unconfirmed", cutoff)
+            if deleted:
+                logger.info(f"Finished cleanup. Deleted {deleted} unconfirmed bets.")
+            else:
                 logger.debug("No unconfirmed bets to clean up")
-                return
-
-                logger.info(f"Found {len(expired_bets)} unconfirmed bets to clean up")
-
-            deleted_count = 0
-            for bet in expired_bets:
-                bet_serial_int = int(bet["bet_serial"])
-                logger.debug(
-                    f"Attempting to clean up unconfirmed bet: {bet_serial_int}"
-                )
-                try:
-                    delete_query = (
-                        "DELETE FROM bets WHERE bet_serial = $1 AND confirmed = 0"
-                    )
-                    rowcount = await self.db_manager.execute(
-                        delete_query, (bet_serial_int,)
-                    )
-                    if rowcount is not None and rowcount > 0:
-                        logger.info(
-                            f"Successfully cleaned up unconfirmed bet {bet_serial_int} for user {bet['user_id']} "
-                            f"in guild {bet['guild_id']}"
-                        )
-                        deleted_count += 1
-                    else:
-                        logger.warning(
-                            f"Did not delete bet {bet_serial_int}. It might have been confirmed or deleted already."
-                        )
-                except Exception as e:
-                    logger.error(
-                        f"Failed to clean up bet {bet_serial_int}: {e}", exc_info=True
-                    )
-                    continue
-
-            logger.info(f"Finished cleanup. Deleted {deleted_count} unconfirmed bets.")
+            return deleted
         except Exception as e:
             logger.error(f"Error in cleanup_unconfirmed_bets: {e}", exc_info=True)
+            return 0
+
+    async def run_cleanup(self) -> Dict[str, int]:
+        """Run every cleanup rule once and record rows swept per rule."""
+        started = time.monotonic()
+        now_utc = datetime.now(timezone.utc)
+        expired_cutoff = datetime.now(EDT) - EXPIRED_BET_GRACE
+        cutoffs = {
+            "unconfirmed": now_utc - UNCONFIRMED_BET_TTL,
+            "expired": expired_cutoff,
+            "expired_without_expiration": expired_cutoff,
+        }
+        swept = {}
+        for rule, cutoff in cutoffs.items():
+            try:
+                swept[rule] = await self._sweep_bets(rule, cutoff)
+            except Exception as e:
+                logger.error(f"Bet cleanup rule '{rule}' failed: {e}", exc_info=True)
+                swept[rule] = 0
+
+        stats = self.cleanup_stats
+        stats["runs"] += 1
+        stats["last_run"] = now_utc
+        stats["last_duration"] = time.monotonic() - started
+        stats["last_swept"] = swept
+        for rule, count in swept.items():
+            stats["total_swept"][rule] += count
+        if any(swept.values()):
+            logger.info(
+                f"Bet cleanup swept {swept} in {stats['last_duration']:.2f}s"
+            )
+        return swept
+
+    async def _cleanup_loop(self):
+        """Sweep unconfirmed and expired bets until the service stops."""
+        while True:
+            try:
+                await self.run_cleanup()
+                await asyncio.sleep(BET_CLEANUP_INTERVAL)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Bet cleanup failed: {e}", exc_info=True)
+                await asyncio.sleep(BET_CLEANUP_INTERVAL)
 
     async def confirm_bet(
         self, bet_serial: int, message_id: int, channel_id: int
@@ -134,10 +555,12 @@ class BetService:
                     channel_id = $2
                 WHERE bet_serial = $3 AND confirmed = 0
             """
-            rowcount, _ = await self.db_manager.execute(
+            rowcount = await self.db_manager.execute(
                 query, (message_id, channel_id, bet_serial)
             )
-            if rowcount is not None and rowcount > 0:
+            if isinstance(rowcount, int) and rowcount > 0:
+                # The message may have been cached as "not a bet" already
+                await self._forget_bet_messages([message_id])
                 logger.info(
                     f"Bet {bet_serial} confirmed with message {message_id} in channel {channel_id}."
                 )
@@ -192,8 +615,13 @@ class BetService:
         api_game_id: str,
         channel_id: int,
         confirmed: int = 0,
+        bet_serial: Optional[int] = None,
     ) -> int:
-        """Create a straight bet record."""
+        """Create a straight bet record.
+
+        ``bet_serial`` is a serial reserved with ``reserve_bet``; without one
+        the sequence default is used.
+        """
         logger.info(
             f"[BET INSERT] Starting bet creation with args: guild_id={guild_id}, user_id={user_id}, league={league}, bet_type={bet_type}, units={units}, odds={odds}, team={team}, opponent={opponent}, line={line}, api_game_id={api_game_id}, channel_id={channel_id}, confirmed={confirmed}"
         )
@@ -242,18 +670,20 @@ class BetService:
             bet_details_json = json.dumps(internal_bet_details_dict)
             logger.info(f"[BET INSERT] Prepared bet_details JSON: {bet_details_json}")
 
-            # Use auto-generated bet_serial (identity column)
+            # Use the reserved bet_serial, else the sequence (COALESCE only
+            # calls nextval when no serial was reserved)
             query = """
                 INSERT INTO bets (
                     guild_id, user_id, league, bet_type, units, odds,
                     team, opponent, line, player_prop, player_id,
                     game_id, game_start, expiration_time,
-                    legs, channel_id, confirmed, status, bet_details
+                    legs, channel_id, confirmed, status, bet_details, bet_serial
                 ) VALUES (
                     $1, $2, $3, $4, $5, $6,
                     $7, $8, $9, $10, $11,
                     $12, $13, $14,
-                    $15, $16, $17, $18, $19
+                    $15, $16, $17, $18, $19,
+                    COALESCE($20::bigint, nextval(pg_get_serial_sequence('bets', 'bet_serial')))
                 ) RETURNING bet_serial
             """
             args = (
@@ -276,6 +706,7 @@ class BetService:
                 confirmed,
                 "pending",
                 bet_details_json,
+                bet_serial,
             )
             logger.info(f"[BET INSERT] Executing query: {query} with args: {args}")
             logger.debug(f"[BET INSERT] Query string: {query}")
@@ -540,45 +971,30 @@ class BetService:
             return None
 
     async def reserve_bet(self, guild_id: int, user_id: int, league: Optional[str] = None, bet_type: str = "straight", bet_details: Optional[Dict] = None) -> Optional[int]:
-        """Reserve a DB bet row for a preview flow and return the reserved bet_serial.
+        """Reserve a bet_serial for a preview flow and return it.
 
-        This inserts a minimal row with status='preview' so the frontend can name the preview
-        file using the returned DB serial. The frontend should pass this serial back on final
-        submit so the backend can update the reserved row instead of inserting a new one.
+        The serial comes from the shared allocator, so no row is written: the
+        frontend names the preview file with it and passes it back on final
+        submit, where the bet is inserted under this serial.
         """
         try:
-            bd_json = json.dumps(bet_details or {})
-            query = (
-                "INSERT INTO bets (guild_id, user_id, league, bet_type, status, confirmed, bet_details) "
-                "VALUES ($1,$2,$3,$4,$5,$6,$7) RETURNING bet_serial"
-            )
-            args = (guild_id, user_id, league, bet_type, "preview", 0, bd_json)
-            result = await self.db_manager.fetch_one(query, args)
-            if result and "bet_serial" in result:
-                logger.info(f"[RESERVE] Reserved bet_serial {result['bet_serial']} for user {user_id} guild {guild_id}")
-                return result["bet_serial"]
-            logger.error("[RESERVE] Failed to reserve bet row (no bet_serial returned)")
+            bet_serial = await self.serials.allocate()
+            if bet_serial:
+                logger.info(f"[RESERVE] Reserved bet_serial {bet_serial} for user {user_id} guild {guild_id}")
+                return bet_serial
+            logger.error("[RESERVE] Failed to reserve bet_serial (sequence unavailable)")
             return None
         except Exception as e:
-            logger.error(f"[RESERVE] Exception while reserving bet row: {e}", exc_info=True)
+            logger.error(f"[RESERVE] Exception while reserving bet_serial: {e}", exc_info=True)
             return None
 
     async def cancel_reserved_bet(self, bet_serial: int, guild_id: int, user_id: int) -> bool:
-        """Delete a reserved (unconfirmed) bet row created for preview when user cancels.
+        """Release a serial reserved for a preview when the user cancels.
 
-        Only deletes rows that are unconfirmed to avoid removing legitimate bets.
+        Reservations write no row, so the serial is simply never used.
         """
-        try:
-            query = "DELETE FROM bets WHERE bet_serial = $1 AND guild_id = $2 AND user_id = $3 AND confirmed = 0"
-            rowcount, _ = await self.db_manager.execute(query, (bet_serial, guild_id, user_id))
-            if rowcount and rowcount > 0:
-                logger.info(f"[RESERVE] Deleted reserved bet_serial {bet_serial} for user {user_id} guild {guild_id}")
-                return True
-            logger.warning(f"[RESERVE] No reserved bet deleted for bet_serial {bet_serial} (rowcount={rowcount})")
-            return False
-        except Exception as e:
-            logger.error(f"[RESERVE] Exception while deleting reserved bet {bet_serial}: {e}", exc_info=True)
-            return False
+        logger.info(f"[RESERVE] Released reserved bet_serial {bet_serial} for user {user_id} guild {guild_id}")
+        return True
 
     async def submit_bet(self, bet_details: Dict) -> Dict:
         """
@@ -631,79 +1047,25 @@ class BetService:
                             reserved_serial = None
                         break
 
-                bet_serial = None
-                # Prepare internal bet_details json for storage
-                internal_bet_details_dict = {
-                    "api_game_id": api_game_id,
-                    "provided_bet_type": bet_sub_type,
-                    "provided_line": line,
-                    "team_selected": team,
-                    "opponent_involved": opponent,
-                    "game_start_iso": bet_details.get("game_start"),
-                    "expiration_time_iso": bet_details.get("expiration_time"),
-                }
-                bet_details_json = json.dumps(internal_bet_details_dict)
-
-                if reserved_serial:
-                    try:
-                        # Normalize api_game_id to internal game_id (int) or None for manual
-                        internal_game_id = None
-                        try:
-                            if api_game_id and api_game_id != "manual":
-                                # If api_game_id is numeric string, use as int; otherwise try to resolve
-                                try:
-                                    internal_game_id = int(api_game_id)
-                                except Exception:
-                                    internal_game_id = await self.get_game_id_by_api_id(api_game_id)
-                        except Exception:
-                            internal_game_id = None
-
-                        update_query = """
-                            UPDATE bets
-                            SET league = $1, bet_type = $2, units = $3, odds = $4,
-                                team = $5, opponent = $6, line = $7, game_id = $8,
-                                channel_id = $9, confirmed = $10, status = $11, bet_details = $12, updated_at = NOW()
-                            WHERE bet_serial = $13 AND user_id = $14 AND guild_id = $15
-                        """
-                        update_args = (
-                            league, bet_sub_type, units, odds,
-                            team, opponent, line, internal_game_id,
-                            channel_id, 0, "pending", bet_details_json,
-                            reserved_serial, user_id, guild_id,
-                        )
-                        exec_result = await self.db_manager.execute(update_query, update_args)
-                        # db_manager.execute may return an int or a (rowcount, ...) tuple depending on implementation
-                        if isinstance(exec_result, (list, tuple)):
-                            rowcount = exec_result[0]
-                        else:
-                            rowcount = exec_result
-                        if rowcount and rowcount > 0:
-                            bet_serial = reserved_serial
-                            logger.info(f"[SUBMIT BET] Updated reserved bet_serial {bet_serial} with final data")
-                        else:
-                            logger.warning(f"[SUBMIT BET] Failed to update reserved bet {reserved_serial}; will insert new row")
-                    except Exception as e:
-                        logger.error(f"[SUBMIT BET] Exception while updating reserved bet {reserved_serial}: {e}", exc_info=True)
-
-                # If no reserved row updated, create a new bet normally
-                if not bet_serial:
-                    try:
-                        bet_serial = await self.create_straight_bet(
-                            guild_id,
-                            user_id,
-                            league,
-                            bet_sub_type,
-                            units,
-                            odds,
-                            team,
-                            opponent,
-                            line,
-                            api_game_id,
-                            channel_id,
-                        )
-                    except Exception as e:
-                        logger.error(f"[SUBMIT BET] Exception in create_straight_bet: {e}", exc_info=True)
-                        return {"success": False, "error": f"Exception in create_straight_bet: {e}"}
+                # Insert under the reserved serial, if any, so the preview matches
+                try:
+                    bet_serial = await self.create_straight_bet(
+                        guild_id,
+                        user_id,
+                        league,
+                        bet_sub_type,
+                        units,
+                        odds,
+                        team,
+                        opponent,
+                        line,
+                        api_game_id,
+                        channel_id,
+                        bet_serial=reserved_serial,
+                    )
+                except Exception as e:
+                    logger.error(f"[SUBMIT BET] Exception in create_straight_bet: {e}", exc_info=True)
+                    return {"success": False, "error": f"Exception in create_straight_bet: {e}"}
 
                 if bet_serial:
                     # Always return integer bet_serial for DB, format for display elsewhere
@@ -716,8 +1078,8 @@ class BetService:
                         # 1. Fetch member_role from guild_settings
                         member_role_id = None
                         try:
-                            gs_row = await self.db_manager.fetch_one("SELECT member_role FROM guild_settings WHERE guild_id = $1", (guild_id,))
-                            member_role_id = gs_row["member_role"] if gs_row and "member_role" in gs_row else None
+                            guild_settings = await self.guild_settings.get(guild_id)
+                            member_role_id = guild_settings.member_role if guild_settings else None
                             logger.info(f"[METRIC] Fetched member_role_id: {member_role_id}")
                         except Exception as e:
                             logger.error(f"[METRIC] Failed to fetch member_role from guild_settings: {e}", exc_info=True)
@@ -889,8 +1251,8 @@ class BetService:
                         # 1. Fetch member_role from guild_settings
                         member_role_id = None
                         try:
-                            gs_row = await self.db_manager.fetch_one("SELECT member_role FROM guild_settings WHERE guild_id = $1", (guild_id,))
-                            member_role_id = gs_row["member_role"] if gs_row and "member_role" in gs_row else None
+                            guild_settings = await self.guild_settings.get(guild_id)
+                            member_role_id = guild_settings.member_role if guild_settings else None
                             logger.info(f"[METRIC] Fetched member_role_id: {member_role_id}")
                         except Exception as e:
                             logger.error(f"[METRIC] Failed to fetch member_role from guild_settings: {e}", exc_info=True)
@@ -1008,10 +1370,11 @@ class BetService:
                 SET channel_id = $1, message_id = $2, confirmed = 1
                 WHERE bet_serial = $3
             """
-            rowcount, _ = await self.db_manager.execute(
+            rowcount = await self.db_manager.execute(
                 query, (channel_id, message_id, bet_serial)
             )
-            if rowcount is not None and rowcount > 0:
+            if isinstance(rowcount, int) and rowcount > 0:
+                await self._forget_bet_messages([message_id])
                 logger.debug(
                     f"Bet {bet_serial} channel and message ID updated and confirmed."
                 )
@@ -1039,24 +1402,45 @@ class BetService:
                 return False
 
             # Build the SET clause dynamically
-            set_clause = ", ".join(f"{field} = $1" for field in kwargs.keys())
-            query = f"""
-                UPDATE bets
+            set_clause = ", ".join(
+                f"{field} = ${index}" for index, field in enumerate(kwargs, start=1)
+            )
+            serial_param = len(kwargs) + 1
+            # The previous row is locked and read first so the capper
+            # counters can be moved in the same statement
+            query = UPDATE_BET_QUERY.format(
+                update=f"""
+                UPDATE bets b
                 SET {set_clause}
-                WHERE bet_serial = $1
-            """
+                FROM (
+                    SELECT bet_serial, guild_id, user_id, status
+                    FROM bets
+                    WHERE bet_serial = ${serial_param}
+                    FOR UPDATE
+                ) p
+                WHERE b.bet_serial = p.bet_serial
+                RETURNING b.guild_id, b.user_id, b.status,
+                          p.guild_id AS previous_guild_id,
+                          p.user_id AS previous_user_id,
+                          p.status AS previous_status
+                """
+            )
 
             # Add bet_serial to the end of the values tuple
             values = tuple(kwargs.values()) + (bet_serial,)
 
-            rowcount, _ = await self.db_manager.execute(query, values)
-            if rowcount is not None and rowcount > 0:
+            updated = await self.db_manager.fetch_one(query, values)
+            if updated:
                 logger.info(f"Successfully updated bet {bet_serial}")
+                resolved = {"won", "lost", "push"}
+                if ROLLUP_BET_COLUMNS.intersection(kwargs) and (
+                    updated["previous_status"] in resolved or updated["status"] in resolved
+                ):
+                    for guild_id in {updated["previous_guild_id"], updated["guild_id"]}:
+                        await self.stats_rollups.rebuild(guild_id)
                 return True
             else:
-                logger.warning(
-                    f"No rows updated for bet {bet_serial}. Rowcount: {rowcount}"
-                )
+                logger.warning(f"No rows updated for bet {bet_serial}.")
                 return False
         except Exception as e:
             logger.error(f"Failed to update bet {bet_serial}: {e}", exc_info=True)
@@ -1075,10 +1459,11 @@ class BetService:
                 SET channel_id = $1, message_id = $2, confirmed = 1
                 WHERE bet_serial = $3 AND bet_type = 'parlay'
             """
-            rowcount, _ = await self.db_manager.execute(
+            rowcount = await self.db_manager.execute(
                 query, (channel_id, message_id, bet_serial)
             )
-            if rowcount is not None and rowcount > 0:
+            if isinstance(rowcount, int) and rowcount > 0:
+                await self._forget_bet_messages([message_id])
                 logger.debug(
                     f"Parlay bet {bet_serial} channel and message ID updated and confirmed."
                 )
@@ -1096,10 +1481,14 @@ class BetService:
         """Delete a bet and its associated data from the database."""
         logger.info(f"Attempting to delete bet {bet_serial} and associated data.")
         try:
-            bet_query = "DELETE FROM bets WHERE bet_serial = $1"
-            rowcount, _ = await self.db_manager.execute(bet_query, (bet_serial,))
+            deleted = await self.db_manager.fetch_one(DELETE_BET_QUERY, (bet_serial,))
 
-            if rowcount is not None and rowcount > 0:
+            if deleted:
+                await self._forget_bet_messages([deleted["message_id"]])
+                self._start_side_effect(
+                    self.stats_rollups.invalidate(deleted["guild_id"]),
+                    "deletion stats cache invalidation",
+                )
                 self.pending_reactions = {
                     msg_id: data
                     for msg_id, data in self.pending_reactions.items()
@@ -1108,7 +1497,7 @@ class BetService:
                 logger.info(f"Bet {bet_serial} deleted successfully.")
             else:
                 logger.warning(
-                    f"Bet {bet_serial} not found for deletion or delete failed. Rowcount: {rowcount}"
+                    f"Bet {bet_serial} not found for deletion or delete failed."
                 )
                 self.pending_reactions = {
                     msg_id: data
@@ -1136,18 +1525,13 @@ class BetService:
         )
 
         try:
-            bet_lookup_query = "SELECT bet_serial, user_id, guild_id, status FROM bets WHERE message_id = $1 AND guild_id = $2"
-            bet_context = await self.db_manager.fetch_one(
-                bet_lookup_query, (message_id, payload.guild_id)
-            )
-
+            bet_context = await self._get_bet_context(message_id, payload.guild_id)
             if not bet_context:
                 return
 
             bet_serial = bet_context["bet_serial"]
             original_user_id = bet_context["user_id"]
             guild_id = bet_context["guild_id"]
-            current_bet_status = bet_context["status"]
             emoji_str = str(payload.emoji)
 
             logger.info(
@@ -1155,11 +1539,6 @@ class BetService:
                 f"in channel {payload.channel_id} (guild {guild_id})"
             )
 
-            reaction_query = """
-                INSERT IGNORE INTO bet_reactions (
-                    bet_serial, user_id, emoji, channel_id, message_id, created_at
-                ) VALUES ($1, $2, $3, $4, $5, $6)
-            """
             reaction_params = (
                 bet_serial,
                 payload.user_id,
@@ -1167,8 +1546,9 @@ class BetService:
                 payload.channel_id,
                 message_id,
                 datetime.now(timezone.utc),
+                guild_id,
             )
-            await self.db_manager.execute(reaction_query, reaction_params)
+            await self.db_manager.execute(ADD_REACTION_QUERY, reaction_params)
 
             # Track reaction for community analytics (DISABLED)
             # try:
@@ -1182,9 +1562,7 @@ class BetService:
             # except Exception as e:
             #     logger.error(f"Failed to track reaction for analytics: {e}")
 
-            resolve_emoji_map = {"✅": "won", "❌": "lost", "➖": "push"}
-
-            if emoji_str in resolve_emoji_map:
+            if emoji_str in RESOLVE_EMOJI_MAP:
                 member = payload.member
                 if not (
                     payload.user_id == original_user_id
@@ -1195,176 +1573,72 @@ class BetService:
                     )
                     return
 
-                new_status = resolve_emoji_map[emoji_str]
-
-                if current_bet_status not in ["pending", "live"]:
-                    logger.warning(
-                        f"Bet {bet_serial} (message {message_id}) cannot be resolved. Current status: {current_bet_status}"
-                    )
-                    return
-
+                new_status = RESOLVE_EMOJI_MAP[emoji_str]
                 logger.info(
                     f"Attempting to resolve bet {bet_serial} as '{new_status}' by user {payload.user_id}"
                 )
 
-                bet_data_query = """
-                    SELECT guild_id, user_id, units, odds, league, bet_type, bet_details, game_start, created_at
-                    FROM bets
-                    WHERE bet_serial = $1
-                """
-                bet_data = await self.db_manager.fetch_one(
-                    bet_data_query, (bet_serial,)
-                )
-
-                if not bet_data:
-                    logger.error(
-                        f"Cannot resolve bet: Bet {bet_serial} data not found after initial context."
-                    )
-                    return
-
-                update_time = datetime.now(timezone.utc)
-                status_query = """
-                    UPDATE bets
-                    SET status = $1,
-                        result_value = $2,
-                        bet_won = CASE WHEN $3 = 'won' THEN 1 ELSE 0 END,
-                        bet_loss = CASE WHEN $4 = 'lost' THEN 1 ELSE 0 END,
-                        updated_at = $5
-                    WHERE bet_serial = $6
-                """
-
-                units_staked = float(bet_data.get("units", 0.0))
-                odds_val = float(bet_data.get("odds", 0.0))
-                calculated_result_value = 0.0
-
-                if new_status == "won":
-                    if odds_val > 0:
-                        # Positive odds: win $odds for every $100 bet
-                        # For units: if 1 unit = $100, then profit in units = (odds/100) * units_staked
-                        calculated_result_value = units_staked * (odds_val / 100.0)
-                    elif odds_val < 0:
-                        # Negative odds: need to bet $abs(odds) to win $100
-                        # For units: if 1 unit = $100, then profit in units = (100/abs(odds)) * units_staked
-                        calculated_result_value = units_staked * (100.0 / abs(odds_val))
-                elif new_status == "lost":
-                    # Lose the units staked
-                    calculated_result_value = -units_staked
-
-                rowcount, _ = await self.db_manager.execute(
-                    status_query,
-                    (
-                        new_status,
-                        calculated_result_value,
-                        new_status,
-                        new_status,
-                        update_time,
-                        bet_serial,
-                    ),
-                )
-
-                if rowcount is None or rowcount == 0:
-                    logger.error(
-                        f"Failed to update status/result for bet {bet_serial} to {new_status}."
+                resolved = await self.resolve_bet(bet_serial, new_status)
+                if not resolved:
+                    # Missing, not pending/live, or a concurrent reaction already
+                    # resolved the bet; only the transition that won is applied
+                    logger.warning(
+                        f"Bet {bet_serial} (message {message_id}) was not resolved as {new_status}; "
+                        f"it may already be resolved."
                     )
                     return
                 logger.info(
-                    f"Bet {bet_serial} status updated to '{new_status}', result_value to {calculated_result_value:.2f}"
-                )
-
-                record_period_date = (
-                    bet_data.get("game_start")
-                    or bet_data.get("created_at")
-                    or update_time
-                )
-                year = record_period_date.year
-                month = record_period_date.month
-
-                unit_query = """
-                    INSERT INTO unit_records (
-                        bet_serial, guild_id, user_id, year, month, units, odds, monthly_result_value, total_result_value, created_at
-                    ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10)
-                    ON DUPLICATE KEY UPDATE
-                        monthly_result_value = VALUES(monthly_result_value),
-                        total_result_value = VALUES(total_result_value),
-                        created_at = VALUES(created_at)
-                """
-                unit_params = (
-                    bet_serial,
-                    bet_data["guild_id"],
-                    bet_data["user_id"],
-                    year,
-                    month,
-                    units_staked,
-                    odds_val,
-                    calculated_result_value,
-                    calculated_result_value,
-                    update_time,
-                )
-                await self.db_manager.execute(unit_query, unit_params)
-                logger.info(
-                    f"Unit record updated for bet {bet_serial}. Result Value: {calculated_result_value:.2f}"
-                )
-
-                # Update cappers table with win/loss/push counts
-                capper_update_query = """
-                    UPDATE cappers
-                    SET
-                        bet_won = (
-                            SELECT COUNT(*)
-                            FROM bets b2
-                            WHERE b2.user_id = $1
-                            AND b2.guild_id = $2
-                            AND b2.status = 'won'
-                        ),
-                        bet_loss = (
-                            SELECT COUNT(*)
-                            FROM bets b2
-                            WHERE b2.user_id = $3
-                            AND b2.guild_id = $4
-                            AND b2.status = 'lost'
-                        ),
-                        bet_push = (
-                            SELECT COUNT(*)
-                            FROM bets b2
-                            WHERE b2.user_id = $5
-                            AND b2.guild_id = $6
-                            AND b2.status = 'push'
-                        ),
-                        updated_at = NOW()
-                    WHERE user_id = $7 AND guild_id = $8
-                """
-                capper_params = (
-                    bet_data["user_id"],
-                    bet_data["guild_id"],  # For won count
-                    bet_data["user_id"],
-                    bet_data["guild_id"],  # For lost count
-                    bet_data["user_id"],
-                    bet_data["guild_id"],  # For push count
-                    bet_data["user_id"],
-                    bet_data["guild_id"],  # WHERE clause
+                    f"Bet {bet_serial} status updated to '{new_status}', result_value to "
+                    f"{float(resolved['result_value']):.2f}; capper {resolved['user_id']} is now "
+                    f"{resolved['bet_won']}-{resolved['bet_loss']}-{resolved['bet_push']}"
                 )
-                await self.db_manager.execute(capper_update_query, capper_params)
-                logger.info(
-                    f"Cappers table updated for user {bet_data['user_id']} in guild {bet_data['guild_id']}"
-                )
-
-                if hasattr(self.bot, "voice_service") and hasattr(
-                    self.bot.voice_service, "update_on_bet_resolve"
-                ):
-                    asyncio.create_task(
-                        self.bot.voice_service.update_on_bet_resolve(
-                            bet_data["guild_id"]
-                        )
-                    )
-                    logger.debug(
-                        f"Triggered voice channel update for guild {bet_data['guild_id']}"
-                    )
+                self._queue_resolution_side_effects(resolved["guild_id"])
         except Exception as e:
             logger.error(
                 f"Failed to handle reaction add for message {message_id}: {e}",
                 exc_info=True,
             )
 
+    async def resolve_bet(self, bet_serial: int, status: str) -> Optional[Dict]:
+        """Resolve a pending or live bet as won, lost or push.
+
+        The bet, its unit record and the capper's counters are written by one
+        statement, so a resolution is never half-applied. Returns the bet's
+        guild, user and result_value with the capper's new won/lost/push
+        totals (None when the capper has no row), or None if nothing was
+        resolved.
+        """
+        return await self.db_manager.fetch_one(
+            RESOLVE_BET_QUERY, (bet_serial, status, datetime.now(timezone.utc))
+        )
+
+    def _queue_resolution_side_effects(self, guild_id: int) -> None:
+        """Start work that follows a (un)resolution without delaying the reaction."""
+        self._start_side_effect(
+            self.stats_rollups.invalidate(guild_id),
+            "resolution stats cache invalidation",
+        )
+        voice_service = getattr(self.bot, "voice_service", None)
+        if hasattr(voice_service, "update_on_bet_resolve"):
+            self._start_side_effect(
+                voice_service.update_on_bet_resolve(guild_id),
+                "resolution voice channel update",
+            )
+            logger.debug(f"Queued voice channel update for guild {guild_id}")
+
+    def _start_side_effect(self, work: Awaitable, description: str) -> None:
+        """Run ``work`` in the background, logging instead of raising on failure."""
+
+        async def _run():
+            try:
+                await work
+            except Exception as e:
+                logger.error(f"Bet {description} failed: {e}", exc_info=True)
+
+        task = asyncio.create_task(_run())
+        self._side_effect_tasks.add(task)
+        task.add_done_callback(self._side_effect_tasks.discard)
+
     async def on_raw_reaction_remove(self, payload: discord.RawReactionActionEvent):
         """Handle a reaction removed from a bet slip message."""
         if payload.user_id == self.bot.user.id:
@@ -1378,13 +1652,7 @@ class BetService:
         )
 
         try:
-            bet_lookup_query = (
-                "SELECT bet_serial FROM bets WHERE message_id = $1 AND guild_id = $2"
-            )
-            bet_context = await self.db_manager.fetch_one(
-                bet_lookup_query, (message_id, payload.guild_id)
-            )
-
+            bet_context = await self._get_bet_context(message_id, payload.guild_id)
             if not bet_context:
                 return
 
@@ -1396,18 +1664,102 @@ class BetService:
                 f"in channel {payload.channel_id} (guild {payload.guild_id})"
             )
 
-            query = """
-                DELETE FROM bet_reactions
-                WHERE bet_serial = $1 AND user_id = $2 AND emoji = $3 AND message_id = $4
-            """
-            params = (bet_serial, payload.user_id, emoji_str, message_id)
-            await self.db_manager.execute(query, params)
+            params = (
+                bet_serial,
+                payload.user_id,
+                emoji_str,
+                message_id,
+                bet_context["guild_id"],
+            )
+            await self.db_manager.execute(REMOVE_REACTION_QUERY, params)
+
+            if emoji_str in RESOLVE_EMOJI_MAP:
+                # Status changes after posting, so it is never cached
+                status = await self.db_manager.fetchval(
+                    "SELECT status FROM bets WHERE bet_serial = $1", (bet_serial,)
+                )
+                if RESOLVE_EMOJI_MAP[emoji_str] == status:
+                    await self._unresolve_bet(
+                        payload, {**bet_context, "status": status}
+                    )
         except Exception as e:
             logger.error(
                 f"Failed to handle reaction remove for message {message_id}: {e}",
                 exc_info=True,
             )
 
+    async def _get_bet_context(
+        self, message_id: int, guild_id: int
+    ) -> Optional[Dict]:
+        """Bet posted as ``message_id``, from the message cache or the database.
+
+        Only fields that never change after posting are cached. Messages that
+        are not bet slips are cached as empty for ``BET_MESSAGE_NEGATIVE_TTL``
+        so reactions on them do not reach the database either. A failed
+        lookup is not cached, so the next reaction tries again.
+        """
+        key = str(message_id)
+        context = await self.cache_manager.get("bet_message", key)
+        if context is None:
+            try:
+                row = await self.db_manager.fetch_one(
+                    "SELECT bet_serial, user_id, guild_id FROM bets WHERE message_id = $1",
+                    (message_id,),
+                    raise_errors=True,
+                )
+            except Exception as e:
+                logger.warning(f"Could not look up bet for message {message_id}: {e}")
+                return None
+            context = dict(row) if row else {}
+            await self.cache_manager.set(
+                "bet_message",
+                key,
+                context,
+                ttl=BET_MESSAGE_CACHE_TTL if context else BET_MESSAGE_NEGATIVE_TTL,
+            )
+        if not context or context["guild_id"] != guild_id:
+            return None
+        return context
+
+    async def _forget_bet_messages(self, message_ids) -> None:
+        """Drop cached bet contexts after slips are posted, moved or deleted."""
+        batch = self.cache_manager.batch()
+        for message_id in message_ids:
+            if message_id:
+                batch.delete("bet_message", str(message_id))
+        if len(batch):
+            await batch.execute()
+
+    async def _unresolve_bet(
+        self, payload: discord.RawReactionActionEvent, bet_context: Dict
+    ) -> None:
+        """Revert a bet resolved by the removed reaction back to pending."""
+        bet_serial = bet_context["bet_serial"]
+        original_user_id = bet_context["user_id"]
+        guild_id = bet_context["guild_id"]
+        old_status = bet_context["status"]
+
+        # Remove events carry no member, so look up permissions from the cache
+        guild = self.bot.get_guild(payload.guild_id)
+        member = guild.get_member(payload.user_id) if guild else None
+        if not (
+            payload.user_id == original_user_id
+            or (member and member.guild_permissions.manage_messages)
+        ):
+            return
+
+        reverted = await self.db_manager.fetch_one(
+            UNRESOLVE_BET_QUERY,
+            (bet_serial, old_status, datetime.now(timezone.utc)),
+        )
+        if not reverted:
+            return
+
+        logger.info(
+            f"Bet {bet_serial} reverted from '{old_status}' to 'pending' by user {payload.user_id}"
+        )
+        self._queue_resolution_side_effects(guild_id)
+
     async def _get_or_create_game(self, api_game_id: str) -> int:
         # 1) look up in games
         row = await self.db_manager.fetch_one(
@@ -1502,6 +1854,7 @@ class BetService:
         """Resolve an image path to use for the webhook. Behavior:
         - Prefer preview image path fields from bet_details (normalize relative -> absolute).
         - Accept data-uri/base64 or raw bytes keys and write them into StaticFiles/Confirmed_Bets/<guild>.
+        - Reuse the rendered preview under bet_details["preview_cache_key"] from the slip cache.
         - If none, call self.bot.generate_bet_image(...) when available.
         - As a last resort, search StaticFiles for any file with the bet_serial in its filename (useful when preview step saved the file).
         Returns absolute filesystem path or None.
@@ -1566,7 +1919,21 @@ class BetService:
             if saved:
                 return saved
 
-        # 3) Fall back to regenerate via bot if available
+        # 3) Reuse the preview the render service already drew
+        preview_cache_key = bet_details.get("preview_cache_key")
+        if preview_cache_key:
+            try:
+                from utils.render_service import get_render_service
+            except ImportError:
+                from bot.utils.render_service import get_render_service
+            cached = await get_render_service().get_cached(preview_cache_key)
+            if cached:
+                fname = f"bet_{bet_serial}_preview.webp"
+                saved = await self._save_raw_preview(cached, static_root, fname)
+                if saved:
+                    return saved
+
+        # 4) Fall back to regenerate via bot if available
         if hasattr(self.bot, "generate_bet_image"):
             try:
                 # call generate_bet_image with best-effort args; function should return a path
@@ -1585,7 +1952,7 @@ class BetService:
         else:
             logger.debug("[METRIC] No generate_bet_image available on bot for fallback")
 
-        # 4) Last-resort: search StaticFiles for files matching bet_serial.
+        # 5) Last-resort: search StaticFiles for files matching bet_serial.
         # Accept filenames where a date prefix may be prepended to the serial (e.g. 08202025 + 129 => 08202025129)
         try:
             import re
@@ -172,6 +172,16 @@ class CacheWarmingService:
             )
             await self.register_warming_task(team_warming_task)
 
+            # Guild data warming
+            guild_warming_task = WarmingTask(
+                name="guild_data_warming",
+                strategy=WarmingStrategy.ON_STARTUP,
+                warming_function=self._warm_guild_data,
+                priority=2,
+                ttl=3600,
+            )
+            await self.register_warming_task(guild_warming_task)
+
             # League data warming
             league_warming_task = WarmingTask(
                 name="league_data_warming",
@@ -205,9 +215,7 @@ class CacheWarmingService:
                 "SELECT * FROM users WHERE is_active = 1 LIMIT 1000"
             )
 
-            for user in users:
-                cache_key = f"user:{user['user_id']}"
-                await self.cache_manager.set("user_data", cache_key, user, ttl=1800)
+            await self._cache_rows("user_data", "user", "user_id", users, ttl=1800)
 
             logger.info(f"Warmed user data for {len(users)} users")
 
@@ -227,9 +235,7 @@ class CacheWarmingService:
                 """
             )
 
-            for game in games:
-                cache_key = f"game:{game['api_game_id']}"
-                await self.cache_manager.set("game_data", cache_key, game, ttl=900)
+            await self._cache_rows("game_data", "game", "api_game_id", games, ttl=900)
 
             logger.info(f"Warmed game data for {len(games)} games")
 
@@ -244,15 +250,28 @@ class CacheWarmingService:
                 "SELECT * FROM teams WHERE is_active = 1"
             )
 
-            for team in teams:
-                cache_key = f"team:{team['team_id']}"
-                await self.cache_manager.set("team_data", cache_key, team, ttl=7200)
+            await self._cache_rows("team_data", "team", "team_id", teams, ttl=7200)
 
             logger.info(f"Warmed team data for {len(teams)} teams")
 
         except Exception as e:
             logger.error(f"Failed to warm team data: {e}")
 
+    async def _warm_guild_data(self):
+        """Warm guild settings cache."""
+        try:
+            # Get active guilds
+            guilds = await self.db_manager.fetch_all(
+                "SELECT * FROM guild_settings WHERE is_active = 1"
+            )
+
+            await self._cache_rows("guild_data", "guild", "guild_id", guilds, ttl=3600)
+
+            logger.info(f"Warmed guild data for {len(guilds)} guilds")
+
+        except Exception as e:
+            logger.error(f"Failed to warm guild data: {e}")
+
     async def _warm_league_data(self):
         """Warm league data cache."""
         try:
@@ -261,11 +280,9 @@ class CacheWarmingService:
                 "SELECT * FROM leagues WHERE is_active = 1"
             )
 
-            for league in leagues:
-                cache_key = f"league:{league['league_id']}"
-                await self.cache_manager.set(
-                    "league_data", cache_key, league, ttl=14400
-                )
+            await self._cache_rows(
+                "league_data", "league", "league_id", leagues, ttl=14400
+            )
 
             logger.info(f"Warmed league data for {len(leagues)} leagues")
 
@@ -285,15 +302,30 @@ class CacheWarmingService:
                 """
             )
 
-            for user in active_users:
-                cache_key = f"active_user:{user['user_id']}"
-                await self.cache_manager.set("user_data", cache_key, user, ttl=1800)
+            await self._cache_rows(
+                "user_data", "active_user", "user_id", active_users, ttl=1800
+            )
 
             logger.info(f"Warmed active user data for {len(active_users)} users")
 
         except Exception as e:
             logger.error(f"Failed to warm active user data: {e}")
 
+    async def _cache_rows(
+        self,
+        prefix: str,
+        key_prefix: str,
+        id_field: str,
+        rows: List[Dict[str, Any]],
+        ttl: int,
+    ) -> int:
+        """Cache rows as ``{key_prefix}:{row[id_field]}`` in pipelined batches."""
+        batch = self.cache_manager.batch()
+        for row in rows:
+            batch.set(prefix, f"{key_prefix}:{row[id_field]}", row, ttl=ttl)
+        results = await batch.execute()
+        return sum(1 for stored in results if stored)
+
     async def _scheduled_warming_worker(self):
         """Background worker for scheduled warming tasks."""
         while True:
@@ -354,16 +386,16 @@ class CacheWarmingService:
                 """
             )
 
-            for item in frequent_data:
-                if item["data_type"] == "user":
-                    user_data = await self.db_manager.fetch_one(
-                        "SELECT * FROM users WHERE user_id = $1", (item["id"],)
-                    )
-                    if user_data:
-                        cache_key = f"frequent_user:{item['id']}"
-                        await self.cache_manager.set(
-                            "user_data", cache_key, user_data, ttl=900
-                        )
+            user_ids = [
+                item["id"] for item in frequent_data if item["data_type"] == "user"
+            ]
+            if user_ids:
+                users = await self.db_manager.fetch_all(
+                    "SELECT * FROM users WHERE user_id = ANY($1)", (user_ids,)
+                )
+                await self._cache_rows(
+                    "user_data", "frequent_user", "user_id", users, ttl=900
+                )
 
             logger.info(
                 f"Warmed frequently accessed data for {len(frequent_data)} items"
@@ -392,6 +424,7 @@ class CacheWarmingService:
             await self.cache_manager.clear_prefix("user_data")
             await self.cache_manager.clear_prefix("game_data")
             await self.cache_manager.clear_prefix("team_data")
+            await self.cache_manager.clear_prefix("guild_data")
             await self.cache_manager.clear_prefix("league_data")
             logger.info("Warming cache cleared successfully")
         except Exception as e:
@@ -4,6 +4,8 @@ from typing import Dict
 
 import discord
 
+from bot.utils.stats_rollups import get_stats_rollups
+
 logger = logging.getLogger(__name__)
 
 
@@ -11,6 +13,7 @@ class CommunityAnalyticsService:
     def __init__(self, bot, db_manager):
         self.bot = bot
         self.db_manager = db_manager
+        self.stats_rollups = get_stats_rollups(db_manager)
 
         # Achievement definitions
         self.achievements = {
@@ -310,22 +313,12 @@ class CommunityAnalyticsService:
         """Get community leaderboard."""
         try:
             if category == "reactions":
-                query = """
-                    SELECT
-                        br.user_id,
-                        COUNT(*) as reaction_count,
-                        COUNT(DISTINCT br.bet_serial) as bets_reacted_to
-                    FROM bet_reactions br
-                    JOIN bets b ON br.bet_serial = b.bet_serial
-                    WHERE b.guild_id = $1
-                    GROUP BY br.user_id
-                    ORDER BY reaction_count DESC
-                    LIMIT $2
-                """
-                results = await self.db_manager.fetch_all(query, (guild_id, limit))
+                leaderboard = await self.stats_rollups.get_leaderboard(
+                    guild_id, "reactions", limit=limit
+                )
                 return [
-                    {"user_id": row["user_id"], "value": row["reaction_count"]}
-                    for row in results
+                    {"user_id": row["user_id"], "value": row["reactions"]}
+                    for row in leaderboard.get("rows", [])
                 ]
 
             elif category == "achievements":
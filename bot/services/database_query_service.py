@@ -1,6 +1,7 @@
 """Database query service with caching decorators and optimization utilities."""
 
 import asyncio
+import fnmatch
 import functools
 import hashlib
 import logging
@@ -14,6 +15,9 @@ from services.performance_monitor import record_query
 
 logger = logging.getLogger(__name__)
 
+# EnhancedCacheManager prefix that query results are stored under
+QUERY_CACHE_PREFIX = "db_query"
+
 
 @dataclass
 class QueryCacheConfig:
@@ -49,6 +53,9 @@ class DatabaseQueryService:
         self.config = QueryCacheConfig()
         self.query_history: List[QueryPerformance] = []
         self.max_history_size = 1000
+        # Results waiting for the next pipelined cache write
+        self._pending_writes: Dict[str, Tuple[Any, int]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
 
     def cache_query(self, ttl: Optional[int] = None, key_prefix: Optional[str] = None):
         """Decorator for caching database query results."""
@@ -230,8 +237,11 @@ class DatabaseQueryService:
 
     async def _get_cached_result(self, cache_key: str) -> Optional[Any]:
         """Get cached result from the enhanced cache manager."""
+        pending = self._pending_writes.get(cache_key)
+        if pending is not None:
+            return pending[0]
         try:
-            return await self.cache_manager.get("database_query", cache_key)
+            return await self.cache_manager.get(QUERY_CACHE_PREFIX, cache_key)
         except Exception as e:
             logger.warning(f"Error getting cached result: {e}")
             return None
@@ -239,18 +249,40 @@ class DatabaseQueryService:
     async def _set_cached_result(
         self, cache_key: str, result: Any, ttl: Optional[int] = None
     ) -> None:
-        """Set cached result in the enhanced cache manager."""
-        try:
-            ttl = ttl or self.config.ttl
-            await self.cache_manager.set("database_query", cache_key, result, ttl=ttl)
-        except Exception as e:
-            logger.warning(f"Error setting cached result: {e}")
+        """Queue a result for the next batched write to the cache manager.
+
+        Results of queries that finish in the same event loop iteration are
+        written in one pipelined round trip instead of one SET each.
+        """
+        self._pending_writes[cache_key] = (result, ttl or self.config.ttl)
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_pending_writes())
+
+    async def _flush_pending_writes(self) -> None:
+        """Write queued results until the queue stays empty."""
+        # Let the other queries finishing in this iteration join the batch
+        await asyncio.sleep(0)
+        while self._pending_writes:
+            pending, self._pending_writes = self._pending_writes, {}
+            batch = self.cache_manager.batch()
+            for cache_key, (result, ttl) in pending.items():
+                batch.set(QUERY_CACHE_PREFIX, cache_key, result, ttl=ttl)
+            try:
+                await batch.execute()
+            except Exception as e:
+                logger.warning(f"Error setting cached results: {e}")
 
     async def _invalidate_cache_patterns(self, patterns: List[str]) -> None:
         """Invalidate cache entries matching patterns."""
         for pattern in patterns:
+            # Queued results would otherwise be served and written afterwards
+            glob = f"*{pattern}*"
+            for cache_key in [
+                key for key in self._pending_writes if fnmatch.fnmatchcase(key, glob)
+            ]:
+                del self._pending_writes[cache_key]
             try:
-                await self.cache_manager.clear_prefix("database_query", pattern)
+                await self.cache_manager.clear_prefix(QUERY_CACHE_PREFIX, pattern)
                 logger.debug(f"Invalidated cache pattern: {pattern}")
             except Exception as e:
                 logger.warning(f"Error invalidating cache pattern {pattern}: {e}")
@@ -368,7 +400,8 @@ class DatabaseQueryService:
     async def clear_query_cache(self) -> None:
         """Clear all query cache."""
         try:
-            await self.cache_manager.clear_prefix("database_query", "")
+            self._pending_writes.clear()
+            await self.cache_manager.clear_prefix(QUERY_CACHE_PREFIX, "")
             logger.info("Query cache cleared successfully")
         except Exception as e:
             logger.error(f"Error clearing query cache: {e}")
@@ -412,6 +445,8 @@ class DatabaseQueryService:
     async def stop(self) -> None:
         """Stop the database query service."""
         try:
+            if self._flush_task is not None and not self._flush_task.done():
+                await self._flush_task
             await self.cache_manager.disconnect()
             logger.info("Database query service stopped successfully")
         except Exception as e:
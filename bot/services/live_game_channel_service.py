@@ -1,15 +1,42 @@
 import asyncio
 import logging
+import os
+import time
 from datetime import datetime, timedelta
-from typing import Dict, Optional, Set
+from typing import Dict, Optional, Set, Tuple
 
 import discord
 import pytz
 
 logger = logging.getLogger(__name__)
 
+# Seconds between checks of the live games' scores and statuses
+LIVE_GAME_POLL_INTERVAL = float(os.getenv("LIVE_GAME_POLL_INTERVAL", "15"))
+# Seconds between reloads of which guilds have open bets on which games
+LIVE_GAME_ACTIVE_REFRESH = float(os.getenv("LIVE_GAME_ACTIVE_REFRESH", "60"))
+# Minimum seconds between channel renames within one guild
+LIVE_CHANNEL_GUILD_RENAME_INTERVAL = float(
+    os.getenv("LIVE_CHANNEL_GUILD_RENAME_INTERVAL", "5")
+)
+# Minimum seconds between renames of one channel; Discord allows two renames
+# per channel every 10 minutes and makes the client wait out anything more
+LIVE_CHANNEL_RENAME_INTERVAL = float(os.getenv("LIVE_CHANNEL_RENAME_INTERVAL", "300"))
+# How long to wait before retrying a channel that could not be created
+LIVE_CHANNEL_CREATE_RETRY = float(os.getenv("LIVE_CHANNEL_CREATE_RETRY", "600"))
+
+FINISHED_STATUSES = {"finished", "match finished", "final", "ended"}
+
 
 class LiveGameChannelService:
+    """Keeps one channel per live game that a guild has open game line bets on.
+
+    Each cycle reads the state of every tracked game in one indexed query and
+    only acts on games whose status, score or start time changed. Renames are
+    queued per guild (newest state wins) and rate limited per guild and per
+    channel, so a burst of score changes never turns into a burst of API
+    calls.
+    """
+
     def __init__(self, bot: discord.Client, db_manager):
         self.bot = bot
         self.db = db_manager
@@ -19,6 +46,17 @@ class LiveGameChannelService:
             {}
         )  # guild_id -> {api_game_id: channel_id}
         self.cleanup_tasks: Set[asyncio.Task] = set()
+        # guild_id -> api_game_ids the guild has open game line bets on
+        self._active_games: Dict[int, Set[str]] = {}
+        self._active_games_loaded_at = float("-inf")
+        # api_game_id -> (status, score, start_time) last acted on
+        self._game_states: Dict[str, Tuple] = {}
+        # guild_id -> {api_game_id: game} waiting for a rename slot
+        self._pending_renames: Dict[int, Dict[str, dict]] = {}
+        self._last_guild_rename: Dict[int, float] = {}
+        self._last_channel_rename: Dict[int, float] = {}
+        self._failed_creates: Dict[Tuple[int, str], float] = {}
+        self._deleting_channels: Set[int] = set()
 
     async def start(self):
         """Start the live game channel service."""
@@ -42,78 +80,150 @@ class LiveGameChannelService:
         while self.running:
             try:
                 await self.update_all_live_game_channels()
-                await asyncio.sleep(15)
+                await asyncio.sleep(LIVE_GAME_POLL_INTERVAL)
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.error(
-                    "Error in live game channel update loop: $1", e, exc_info=True
+                    "Error in live game channel update loop: %s", e, exc_info=True
                 )
-                await asyncio.sleep(15)
+                await asyncio.sleep(LIVE_GAME_POLL_INTERVAL)
 
     async def update_all_live_game_channels(self):
-        """Update live game channels for all guilds with live_game_updates enabled."""
-        guilds = await self.db.fetch_all(
-            "SELECT guild_id FROM guild_settings WHERE live_game_updates = 1"
-        )
-        for guild_row in guilds:
-            guild_id = guild_row["guild_id"]
-            await self.update_guild_live_game_channels(guild_id)
+        """Push changed live games to every guild tracking them."""
+        now = time.monotonic()
+        if now - self._active_games_loaded_at >= LIVE_GAME_ACTIVE_REFRESH:
+            await self._load_active_games()
+            self._active_games_loaded_at = now
+
+        # Games with open bets, plus tracked games that have to be closed
+        guilds_by_game: Dict[str, Set[int]] = {}
+        for guild_id, game_ids in self._active_games.items():
+            for api_game_id in game_ids:
+                guilds_by_game.setdefault(api_game_id, set()).add(guild_id)
+        for guild_id, tracked in self.guild_game_channels.items():
+            for api_game_id in tracked:
+                guilds_by_game.setdefault(api_game_id, set()).add(guild_id)
+
+        if guilds_by_game:
+            games = await self.db.fetch_all(
+                """
+                SELECT api_game_id, home_team_name, away_team_name, start_time,
+                       status, score, end_time, id as game_id
+                FROM api_games
+                WHERE api_game_id = ANY($1)
+                """,
+                (list(guilds_by_game),),
+            )
+            for game in games:
+                await self._push_game(game, guilds_by_game[game["api_game_id"]])
+
+        # Forget games nobody tracks or bets on any more
+        for api_game_id in set(self._game_states) - set(guilds_by_game):
+            del self._game_states[api_game_id]
 
-    async def update_guild_live_game_channels(self, guild_id: int):
-        """Update or create live game channels for a guild."""
-        # Fetch active gameline bets, including parlay legs, excluding player props
-        bets = await self.db.fetch_all(
+        await self._apply_pending_renames()
+
+    async def _load_active_games(self):
+        """Reload which games each live-updates guild has open bets on."""
+        rows = await self.db.fetch_all(
             """
-            SELECT DISTINCT COALESCE(b.api_game_id::text, l.api_game_id::text) as api_game_id,
-                   g.home_team_name, g.away_team_name, g.start_time, g.status,
-                   g.score, g.id as game_id
+            SELECT DISTINCT b.guild_id,
+                   COALESCE(b.api_game_id::text, l.api_game_id::text) as api_game_id
             FROM bets b
+            JOIN guild_settings gs
+                ON gs.guild_id = b.guild_id AND gs.live_game_updates = 1
             LEFT JOIN bet_legs l ON b.bet_type = 'parlay' AND l.bet_id = b.bet_serial
-            JOIN api_games g ON COALESCE(b.api_game_id::text, l.api_game_id::text) = g.api_game_id::text
-            WHERE b.guild_id = $1 AND b.confirmed = 1
+            WHERE b.confirmed = 1
+            AND b.status IN ('pending', 'live')
             AND (b.bet_type = 'game_line' OR l.bet_type = 'game_line')
-            AND g.status NOT IN ('finished', 'Match Finished', 'Final', 'Ended')
-            """,
-            (guild_id,),
+            """
         )
-        guild = self.bot.get_guild(guild_id)
-        if not guild:
-            logger.warning("Guild %s not found", guild_id)
+        active: Dict[int, Set[str]] = {}
+        for row in rows:
+            if row["api_game_id"]:
+                active.setdefault(row["guild_id"], set()).add(row["api_game_id"])
+        for guild_id, game_ids in active.items():
+            for api_game_id in game_ids - self._active_games.get(guild_id, set()):
+                # Newly bet-on games need a channel even if the game itself
+                # did not change
+                self._game_states.pop(api_game_id, None)
+        self._active_games = active
+
+    @staticmethod
+    def _game_state(game: dict) -> Tuple:
+        return (game.get("status"), game.get("score"), str(game.get("start_time")))
+
+    async def _push_game(self, game: dict, guild_ids: Set[int]):
+        """Create, rename or retire the channels of one game if it changed."""
+        api_game_id = game["api_game_id"]
+        state = self._game_state(game)
+        changed = self._game_states.get(api_game_id) != state
+        if not changed and not self._needs_channel(api_game_id, guild_ids):
             return
-        if guild_id not in self.guild_game_channels:
-            self.guild_game_channels[guild_id] = {}
-        tracked = self.guild_game_channels[guild_id]
-        finished_statuses = {
-            s.lower() for s in ["finished", "match finished", "final", "ended"]
-        }
-        # Remove finished games from tracked
-        to_remove = []
-        for api_game_id, channel_id in tracked.items():
-            # Find the bet in bets
-            bet = next((b for b in bets if b["api_game_id"] == api_game_id), None)
-            if bet and bet.get("status", "").strip().lower() in finished_statuses:
-                to_remove.append(api_game_id)
-        for api_game_id in to_remove:
-            logger.info(
-                f"Removing finished game {api_game_id} from tracking for guild {guild_id}"
-            )
-            tracked.pop(api_game_id, None)
-        for bet in bets:
-            api_game_id = bet["api_game_id"]
-            if not api_game_id:
+        self._game_states[api_game_id] = state
+        finished = (game.get("status") or "").strip().lower() in FINISHED_STATUSES
+
+        for guild_id in guild_ids:
+            guild = self.bot.get_guild(guild_id)
+            if not guild:
                 continue
-            if api_game_id in tracked:
-                # Update existing channel
-                channel_id = tracked[api_game_id]
-                await self._update_channel_name(guild, channel_id, bet)
-            else:
-                # Create new channel
-                channel = await self._create_live_game_channel(guild, bet)
+            tracked = self.guild_game_channels.setdefault(guild_id, {})
+            channel_id = tracked.get(api_game_id)
+            if finished:
+                if channel_id is not None:
+                    self._schedule_channel_deletion(guild, game, tracked)
+            elif channel_id is not None:
+                if changed:
+                    self._pending_renames.setdefault(guild_id, {})[
+                        api_game_id
+                    ] = game
+            elif api_game_id in self._active_games.get(guild_id, ()):
+                if self._failed_creates.get((guild_id, api_game_id), 0) > time.monotonic():
+                    continue
+                channel = await self._create_live_game_channel(guild, game)
                 if channel:
                     tracked[api_game_id] = channel.id
-        # Cleanup finished games
-        await self._cleanup_finished_channels(guild, tracked)
+                    self._failed_creates.pop((guild_id, api_game_id), None)
+                else:
+                    self._failed_creates[(guild_id, api_game_id)] = (
+                        time.monotonic() + LIVE_CHANNEL_CREATE_RETRY
+                    )
+
+    def _needs_channel(self, api_game_id: str, guild_ids: Set[int]) -> bool:
+        """Whether a guild bet on the game but has no channel for it yet."""
+        now = time.monotonic()
+        return any(
+            api_game_id in self._active_games.get(guild_id, ())
+            and api_game_id not in self.guild_game_channels.get(guild_id, {})
+            and self._failed_creates.get((guild_id, api_game_id), 0) <= now
+            for guild_id in guild_ids
+        )
+
+    async def _apply_pending_renames(self):
+        """Rename at most one channel per guild, within the rate limits."""
+        now = time.monotonic()
+        for guild_id, pending in list(self._pending_renames.items()):
+            last = self._last_guild_rename.get(guild_id, float("-inf"))
+            if now - last < LIVE_CHANNEL_GUILD_RENAME_INTERVAL:
+                continue
+            guild = self.bot.get_guild(guild_id)
+            tracked = self.guild_game_channels.get(guild_id, {})
+            for api_game_id, game in list(pending.items()):
+                channel_id = tracked.get(api_game_id)
+                if guild is None or channel_id is None:
+                    del pending[api_game_id]
+                    continue
+                last = self._last_channel_rename.get(channel_id, float("-inf"))
+                if now - last < LIVE_CHANNEL_RENAME_INTERVAL:
+                    continue
+                del pending[api_game_id]
+                if await self._update_channel_name(guild, channel_id, game):
+                    self._last_guild_rename[guild_id] = now
+                    self._last_channel_rename[channel_id] = now
+                    break
+            if not pending:
+                del self._pending_renames[guild_id]
 
     async def _create_live_game_channel(
         self, guild: discord.Guild, bet: dict
@@ -171,15 +281,15 @@ class LiveGameChannelService:
 
     async def _update_channel_name(
         self, guild: discord.Guild, channel_id: int, bet: dict
-    ):
-        """Update the name of a live game channel."""
+    ) -> bool:
+        """Update the name of a live game channel. Returns True if it was renamed."""
         channel = guild.get_channel(channel_id)
         if not channel:
             try:
                 channel = await guild.fetch_channel(channel_id)
             except discord.errors.NotFound:
                 logger.warning("Channel %s not found in guild %s", channel_id, guild.id)
-                return
+                return False
             except Exception as e:
                 logger.error(
                     "Failed to fetch channel %s in guild %s: %s",
@@ -187,36 +297,38 @@ class LiveGameChannelService:
                     guild.id,
                     e,
                 )
-                return
+                return False
         home = bet.get("home_team_name", "Home")
         away = bet.get("away_team_name", "Away")
         status = bet.get("status", "scheduled")
         score = bet.get("score", "0:0")
         start_time = bet.get("start_time")
-        bet.get("api_game_id")
         new_name = self._format_channel_name(home, away, status, score, start_time)
-        if channel.name != new_name[:100]:
-            try:
-                await channel.edit(name=new_name[:100], reason="Update live game score")
-                logger.debug(
-                    "Updated channel $1 name to $2 in guild $3",
-                    channel_id,
-                    new_name[:100],
-                    guild.id,
-                )
-            except discord.errors.Forbidden:
-                logger.error(
-                    "Missing permissions to edit channel %s in guild %s",
-                    channel_id,
-                    guild.id,
-                )
-            except Exception as e:
-                logger.error(
-                    "Failed to update channel $1 name in guild $2: $3",
-                    channel_id,
-                    guild.id,
-                    e,
-                )
+        if channel.name == new_name[:100]:
+            return False
+        try:
+            await channel.edit(name=new_name[:100], reason="Update live game score")
+            logger.debug(
+                "Updated channel %s name to %s in guild %s",
+                channel_id,
+                new_name[:100],
+                guild.id,
+            )
+            return True
+        except discord.errors.Forbidden:
+            logger.error(
+                "Missing permissions to edit channel %s in guild %s",
+                channel_id,
+                guild.id,
+            )
+        except Exception as e:
+            logger.error(
+                "Failed to update channel %s name in guild %s: %s",
+                channel_id,
+                guild.id,
+                e,
+            )
+        return False
 
     def _format_channel_name(
         self, home: str, away: str, status: str, score: str, start_time: Optional[str]
@@ -237,38 +349,33 @@ class LiveGameChannelService:
                 return f"{home_abbr}-Vs-{away_abbr}-{score}"
             return f"{home_abbr}-Vs-{away_abbr}-Live"
 
-    async def _cleanup_finished_channels(
-        self, guild: discord.Guild, tracked: Dict[str, int]
+    def _schedule_channel_deletion(
+        self, guild: discord.Guild, game: dict, tracked: Dict[str, int]
     ):
-        """Cleanup channels for finished games."""
-        finished_games = await self.db.fetch_all(
-            """
-            SELECT api_game_id, id as game_id, status, end_time
-            FROM api_games
-            WHERE status IN ('finished', 'Match Finished', 'Final', 'Ended')
-            """
-        )
+        """Delete a finished game's channel an hour after the game ended."""
+        api_game_id = game["api_game_id"]
+        channel_id = tracked[api_game_id]
+        if channel_id in self._deleting_channels:
+            return
         now = datetime.now(pytz.UTC)
-        for game in finished_games:
-            api_game_id = game["api_game_id"]
-            if api_game_id in tracked:
-                channel_id = tracked[api_game_id]
-                end_time = game.get("end_time")
-                if end_time:
-                    try:
-                        dt = datetime.fromisoformat(end_time.replace("Z", "+00:00"))
-                    except (ValueError, TypeError):
-                        dt = now
-                else:
-                    dt = now
-                delay = max(0, (dt + timedelta(hours=1) - now).total_seconds())
-                task = asyncio.create_task(
-                    self._delete_channel_later(
-                        guild, channel_id, delay, api_game_id, tracked
-                    )
-                )
-                self.cleanup_tasks.add(task)
-                task.add_done_callback(lambda t: self.cleanup_tasks.discard(t))
+        end_time = game.get("end_time")
+        if isinstance(end_time, datetime):
+            dt = end_time if end_time.tzinfo else pytz.UTC.localize(end_time)
+        elif end_time:
+            try:
+                dt = datetime.fromisoformat(end_time.replace("Z", "+00:00"))
+            except (ValueError, TypeError, AttributeError):
+                dt = now
+        else:
+            dt = now
+        delay = max(0, (dt + timedelta(hours=1) - now).total_seconds())
+        self._deleting_channels.add(channel_id)
+        self._pending_renames.get(guild.id, {}).pop(api_game_id, None)
+        task = asyncio.create_task(
+            self._delete_channel_later(guild, channel_id, delay, api_game_id, tracked)
+        )
+        self.cleanup_tasks.add(task)
+        task.add_done_callback(lambda t: self.cleanup_tasks.discard(t))
 
     async def _delete_channel_later(
         self,
@@ -290,7 +397,7 @@ class LiveGameChannelService:
                     channel_id,
                     guild.id,
                 )
-                tracked.pop(api_game_id, None)
+                self._forget_channel(channel_id, api_game_id, tracked)
                 return
             except Exception as e:
                 logger.error(
@@ -299,25 +406,33 @@ class LiveGameChannelService:
                     guild.id,
                     e,
                 )
+                self._deleting_channels.discard(channel_id)
                 return
         try:
             await channel.delete(
                 reason="Game finished, deleting live update channel after 1 hour"
             )
             logger.info(
-                "Deleted live game channel $1 for game $2 in guild $3",
+                "Deleted live game channel %s for game %s in guild %s",
                 channel_id,
                 api_game_id,
                 guild.id,
             )
         except discord.errors.Forbidden:
             logger.error(
-                "Missing permissions to delete channel $1 in guild $2",
+                "Missing permissions to delete channel %s in guild %s",
                 channel_id,
                 guild.id,
             )
         except Exception as e:
             logger.error(
-                "Failed to delete channel $1 in guild $2: $3", channel_id, guild.id, e
+                "Failed to delete channel %s in guild %s: %s", channel_id, guild.id, e
             )
+        self._forget_channel(channel_id, api_game_id, tracked)
+
+    def _forget_channel(
+        self, channel_id: int, api_game_id: str, tracked: Dict[str, int]
+    ):
         tracked.pop(api_game_id, None)
+        self._deleting_channels.discard(channel_id)
+        self._last_channel_rename.pop(channel_id, None)
@@ -8,6 +8,8 @@ from typing import Any, Dict, List, Optional
 import discord
 from discord import Embed, Webhook
 
+from bot.utils.guild_settings_cache import get_guild_settings_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -17,6 +19,7 @@ class PlatinumService:
     def __init__(self, db_manager, bot):
         self.db_manager = db_manager
         self.bot = bot
+        self.guild_settings = get_guild_settings_cache(db_manager)
         self.active_webhooks = {}
         self.active_alerts = {}
 
@@ -1059,11 +1062,8 @@ class PlatinumService:
     async def is_platinum_guild(self, guild_id: int) -> bool:
         """Check if a guild has Platinum subscription."""
         try:
-            result = await self.db_manager.fetch_one(
-                "SELECT subscription_level FROM guild_settings WHERE guild_id = $1",
-                guild_id,
-            )
-            return bool(result and result.get("subscription_level") == "platinum")
+            result = await self.guild_settings.get(guild_id)
+            return bool(result and result.is_platinum)
         except Exception as e:
             logger.error(f"Error checking Platinum status: {e}")
             return False
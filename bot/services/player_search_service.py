@@ -3,13 +3,21 @@ Enhanced Player Search Service
 Provides fuzzy search, autocomplete, and caching for player names across leagues.
 """
 
+import asyncio
 import logging
 import re
+import time
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 
-from rapidfuzz import fuzz
+from bot.utils.player_search_index import (
+    INDEX_REBUILD_INTERVAL,
+    INDEX_SYNC_INTERVAL,
+    LeaguePlayerIndex,
+    get_player_search_index,
+    score_players,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -69,53 +77,53 @@ class PlayerSearchService:
                 return cached_result
 
         try:
-            # Get players from team library first if team is specified
-            team_players = []
+            scored = []
+
+            # Score team library players first if team is specified
             if team_name:
                 team_players = await self._get_players_from_team_library(
                     league, team_name
                 )
-
-            # Get players from database - IMPORTANT: Always filter by league and team if specified
-            db_players = await self._get_players_from_db(league, team_name)
-
-            # Combine and prioritize team library players
-            all_players = team_players + db_players
-
-            if not all_players:
-                return []
-
-            # Perform fuzzy search
-            search_results = []
-            for player in all_players:
-                # Create searchable text
-                search_text = f"{player['player_name']} {player['team_name']}".lower()
-
-                # Calculate confidence scores
-                name_score = fuzz.partial_ratio(query, player["player_name"].lower())
-                team_score = fuzz.partial_ratio(query, player["team_name"].lower())
-                full_score = fuzz.partial_ratio(query, search_text)
-
-                # Use the best score
-                confidence = max(name_score, team_score, full_score)
-
-                # Boost confidence for team library players
-                if player.get("from_team_library", False):
-                    confidence += 20  # Boost team library players
-
-                if confidence >= min_confidence:
-                    search_results.append(
-                        PlayerSearchResult(
-                            player_name=player["player_name"],
-                            team_name=player["team_name"],
-                            league=player["league"],
-                            sport=player["sport"],
-                            confidence=confidence,
-                            last_used=player.get("last_used"),
-                            usage_count=player.get("usage_count", 0),
+                if team_players:
+                    # Boost team library players
+                    scored.extend(
+                        score_players(
+                            query,
+                            team_players,
+                            [p["player_name"].lower() for p in team_players],
+                            [p["team_name"].lower() for p in team_players],
+                            [
+                                f"{p['player_name']} {p['team_name']}".lower()
+                                for p in team_players
+                            ],
+                            min_confidence,
+                            boost=20,
                         )
                     )
 
+            # Only players sharing trigrams with the query are scored.
+            # IMPORTANT: the index is per league and the shortlist is limited
+            # to the team if specified
+            index = await self._get_index(league)
+            scored.extend(
+                index.score(
+                    query, index.shortlist(query, team_name), min_confidence
+                )
+            )
+
+            search_results = [
+                PlayerSearchResult(
+                    player_name=player["player_name"],
+                    team_name=player["team_name"],
+                    league=player["league"],
+                    sport=player["sport"],
+                    confidence=confidence,
+                    last_used=player.get("last_used"),
+                    usage_count=player.get("usage_count") or 0,
+                )
+                for player, confidence in scored
+            ]
+
             # Sort by confidence and usage count
             search_results.sort(
                 key=lambda x: (x.confidence, x.usage_count), reverse=True
@@ -152,7 +160,7 @@ class PlayerSearchService:
             List of player name suggestions
         """
         results = await self.search_players(
-            partial_query, league, limit, min_confidence=50.0
+            partial_query, league, limit=limit, min_confidence=50.0
         )
         return [result.player_name for result in results]
 
@@ -190,12 +198,12 @@ class PlayerSearchService:
             conditions = []
 
             if league:
-                conditions.append("league = %s")
                 params.append(league)
+                conditions.append(f"league = ${len(params)}")
 
             if team_name:
-                conditions.append("team_name = %s")
                 params.append(team_name)
+                conditions.append(f"team_name = ${len(params)}")
 
             if conditions:
                 query += " WHERE " + " AND ".join(conditions)
@@ -251,16 +259,100 @@ class PlayerSearchService:
                     usage_count = usage_count + 1
             """
 
+            now = datetime.now()
             await self.db_manager.execute(
-                query, (player_name, team_name, league, sport, keywords, datetime.now())
+                query, (player_name, team_name, league, sport, keywords, now)
             )
 
+            # Searchable right away, without waiting for the next index sync
+            get_player_search_index().add_player(
+                {
+                    "player_name": player_name,
+                    "team_name": team_name,
+                    "league": league,
+                    "sport": sport,
+                    "last_used": now,
+                    "usage_count": 1,
+                }
+            )
+            self._search_cache.clear()
+
             return True
 
         except Exception as e:
             logger.error(f"Error adding player to cache: {e}")
             return False
 
+    async def _get_index(self, league: Optional[str]) -> LeaguePlayerIndex:
+        """Get the search index of a league, building or refreshing it as needed."""
+        registry = get_player_search_index()
+        index = registry.get(league)
+        if index is None:
+            async with registry.lock(league):
+                index = registry.get(league)
+                if index is None:
+                    index = await self._build_index(league)
+                    registry.put(index)
+            return index
+
+        now = time.monotonic()
+        if now - index.built_at > INDEX_REBUILD_INTERVAL:
+            # Keep serving the current index while the new one is built
+            if index.rebuild_task is None or index.rebuild_task.done():
+                index.rebuild_task = asyncio.create_task(self._rebuild_index(league))
+        elif now - index.synced_at > INDEX_SYNC_INTERVAL:
+            index.synced_at = now
+            await self._sync_index(index)
+        return index
+
+    async def _build_index(self, league: Optional[str]) -> LeaguePlayerIndex:
+        index = LeaguePlayerIndex(league)
+        index.add_many(await self._get_players_from_db(league))
+        index.built_at = index.synced_at = time.monotonic()
+        logger.info(f"Built player search index for {league}: {len(index)} players")
+        return index
+
+    async def _rebuild_index(self, league: Optional[str]) -> None:
+        try:
+            get_player_search_index().put(await self._build_index(league))
+        except Exception as e:
+            logger.error(f"Error rebuilding player search index: {e}")
+
+    async def _sync_index(self, index: LeaguePlayerIndex) -> None:
+        """Pull players added or used since the index last saw a change.
+
+        This picks up rows written by other processes, such as
+        scripts/update_player_search_cache.py.
+        """
+        try:
+            query = """
+                SELECT
+                    player_name, team_name, league, sport,
+                    last_used, usage_count
+                FROM player_search_cache
+            """
+            params = []
+            conditions = []
+
+            if index.league:
+                params.append(index.league)
+                conditions.append(f"league = ${len(params)}")
+
+            if index.high_water is not None:
+                params.append(index.high_water)
+                conditions.append(f"last_used > ${len(params)}")
+
+            if conditions:
+                query += " WHERE " + " AND ".join(conditions)
+
+            players = await self.db_manager.fetch_all(query, tuple(params))
+            if players:
+                index.add_many(players)
+                self._search_cache.clear()
+
+        except Exception as e:
+            logger.error(f"Error syncing player search index: {e}")
+
     async def _get_players_from_db(
         self, league: Optional[str] = None, team_name: Optional[str] = None
     ) -> List[Dict]:
@@ -277,12 +369,12 @@ class PlayerSearchService:
             conditions = []
 
             if league:
-                conditions.append("league = %s")
                 params.append(league)
+                conditions.append(f"league = ${len(params)}")
 
             if team_name:
-                conditions.append("team_name = %s")
                 params.append(team_name)
+                conditions.append(f"team_name = ${len(params)}")
 
             if conditions:
                 query += " WHERE " + " AND ".join(conditions)
@@ -316,7 +408,7 @@ class PlayerSearchService:
             params = []
 
             if league:
-                query += " AND league = %s"
+                query += " AND league = $1"
                 params.append(league)
 
             query += " ORDER BY created_at DESC"
@@ -333,21 +425,28 @@ class PlayerSearchService:
             query = """
                 UPDATE player_search_cache
                 SET usage_count = usage_count + 1,
-                    last_used = %s
-                WHERE player_name = $1
-                AND team_name = %s
-                AND league = %s
+                    last_used = $1
+                WHERE player_name = $2
+                AND team_name = $3
+                AND league = $4
             """
 
+            now = datetime.now()
             await self.db_manager.execute(
                 query,
                 (
-                    datetime.now(),
+                    now,
                     player_result.player_name,
                     player_result.team_name,
                     player_result.league,
                 ),
             )
+            get_player_search_index().record_usage(
+                player_result.player_name,
+                player_result.team_name,
+                player_result.league,
+                now,
+            )
 
         except Exception as e:
             logger.error(f"Error updating player usage: {e}")
@@ -2,12 +2,15 @@ import logging
 from datetime import datetime, timedelta
 from typing import Any, Dict, Optional
 
+from bot.utils.guild_settings_cache import get_guild_settings_cache
+
 logger = logging.getLogger(__name__)
 
 
 class SubscriptionService:
     def __init__(self, db_manager):
         self.db_manager = db_manager
+        self.guild_settings = get_guild_settings_cache(db_manager)
 
     async def create_subscription(
         self, guild_id: int, user_id: int, plan_type: str = "premium"
@@ -38,6 +41,7 @@ class SubscriptionService:
                 subscription_level,
                 guild_id,
             )
+            await self.guild_settings.invalidate(guild_id)
 
             # Enable Platinum features if applicable
             if plan_type == "platinum":
@@ -81,6 +85,7 @@ class SubscriptionService:
                 "UPDATE guild_settings SET subscription_level = 'free' WHERE guild_id = $1",
                 guild_id,
             )
+            await self.guild_settings.invalidate(guild_id)
 
             return True
         except Exception as e:
@@ -94,6 +99,7 @@ class SubscriptionService:
                 "UPDATE guild_settings SET subscription_level = 'premium' WHERE guild_id = $1",
                 guild_id,
             )
+            await self.guild_settings.invalidate(guild_id)
             return True
         except Exception as e:
             logger.error(f"Error activating subscription for guild {guild_id}: {e}")
@@ -106,6 +112,7 @@ class SubscriptionService:
                 "UPDATE guild_settings SET subscription_level = 'free' WHERE guild_id = $1",
                 guild_id,
             )
+            await self.guild_settings.invalidate(guild_id)
             return True
         except Exception as e:
             logger.error(f"Error deactivating subscription for guild {guild_id}: {e}")
@@ -114,10 +121,7 @@ class SubscriptionService:
     async def check_subscription_status(self, guild_id: int) -> str:
         """Check if a guild has an active subscription and return the level."""
         try:
-            result = await self.db_manager.fetch_one(
-                "SELECT subscription_level FROM guild_settings WHERE guild_id = $1",
-                guild_id,
-            )
+            result = await self.guild_settings.get(guild_id)
             return result.get("subscription_level", "free") if result else "free"
         except Exception as e:
             logger.error(
@@ -196,6 +200,7 @@ class SubscriptionService:
                 """,
                 guild_id,
             )
+            await self.guild_settings.invalidate(guild_id)
 
             # Create Platinum features record
             await self.db_manager.execute(
@@ -250,6 +255,7 @@ class SubscriptionService:
                 """,
                 guild_id,
             )
+            await self.guild_settings.invalidate(guild_id)
 
             # Disable Platinum features record
             await self.db_manager.execute(
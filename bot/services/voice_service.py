@@ -16,6 +16,7 @@ from utils.enhanced_cache_manager import (
     get_enhanced_cache_manager,
 )
 from utils.errors import VoiceServiceError
+from utils.voice_channel_updater import VoiceChannelUpdater
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +37,8 @@ class VoiceService:
         self.cache = get_enhanced_cache_manager()
         self._check_task = None
         self._is_running = False
+        # Monthly/yearly unit total channels of paid guilds
+        self.unit_channels = VoiceChannelUpdater(bot, db_manager)
 
         # Voice service configuration
         self.config = {
@@ -55,6 +58,7 @@ class VoiceService:
 
         self._is_running = True
         self._check_task = asyncio.create_task(self._periodic_check())
+        await self.unit_channels.start()
         logger.info("VoiceService started")
 
     async def stop(self):
@@ -63,6 +67,7 @@ class VoiceService:
             return
 
         self._is_running = False
+        await self.unit_channels.stop()
         if self._check_task:
             self._check_task.cancel()
             try:
@@ -71,6 +76,10 @@ class VoiceService:
                 pass
         logger.info("VoiceService stopped")
 
+    async def update_on_bet_resolve(self, guild_id: int):
+        """Refresh a guild's unit total channels after a bet was resolved."""
+        await self.unit_channels.update_on_bet_resolve(guild_id)
+
     async def _periodic_check(self):
         """Periodic voice channel activity check."""
         while self._is_running:
@@ -34,6 +34,8 @@ except ImportError:
             return None
 
 
+from utils.http_client import get_http_client
+
 logger = logging.getLogger(__name__)
 
 
@@ -81,17 +83,19 @@ class WeatherService:
                 "aqi": "no",  # Disable air quality to save API calls
             }
 
-            async with aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=self.timeout)
-            ) as session:
-                async with session.get(url, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return self._format_weather_data(data)
-                    else:
-                        error_data = await response.json()
-                        logger.error(f"Weather API error: {error_data}")
-                        return None
+            session = await get_http_client().get_session()
+            async with session.get(
+                url,
+                params=params,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            ) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    return self._format_weather_data(data)
+                else:
+                    error_data = await response.json()
+                    logger.error(f"Weather API error: {error_data}")
+                    return None
 
         except Exception as e:
             logger.error(f"Error fetching weather for {location}: {e}")
@@ -123,17 +127,19 @@ class WeatherService:
                 "aqi": "no",
             }
 
-            async with aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=self.timeout)
-            ) as session:
-                async with session.get(url, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return self._format_forecast_data(data)
-                    else:
-                        error_data = await response.json()
-                        logger.error(f"Weather API error: {error_data}")
-                        return None
+            session = await get_http_client().get_session()
+            async with session.get(
+                url,
+                params=params,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            ) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    return self._format_forecast_data(data)
+                else:
+                    error_data = await response.json()
+                    logger.error(f"Weather API error: {error_data}")
+                    return None
 
         except Exception as e:
             logger.error(f"Error fetching forecast for {location}: {e}")
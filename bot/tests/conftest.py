@@ -78,12 +78,18 @@ def mock_discord_interaction():
 
 @pytest.fixture
 def mock_database_manager():
-    """Mock database manager for testing."""
+    """Mock database manager for testing.
+
+    Queries answer like DatabaseManager does when nothing matches (no rows,
+    None, 0). Serve data through ``return_value`` or ``side_effect`` and read
+    the queries sent from ``await_args_list``.
+    """
     db_manager = Mock()
     db_manager.connect = AsyncMock()
-    db_manager.execute = AsyncMock()
-    db_manager.fetch_one = AsyncMock()
-    db_manager.fetch_all = AsyncMock()
+    db_manager.execute = AsyncMock(return_value=0)
+    db_manager.fetch_one = AsyncMock(return_value=None)
+    db_manager.fetch_all = AsyncMock(return_value=[])
+    db_manager.fetchval = AsyncMock(return_value=None)
     db_manager.close = AsyncMock()
     return db_manager
 
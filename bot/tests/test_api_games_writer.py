@@ -0,0 +1,139 @@
+"""
+Tests for the api_games bulk upsert writer.
+"""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import asyncpg
+import pytest
+
+from data.api_games_writer import ApiGamesBulkWriter, build_upsert_query
+
+
+def make_pool():
+    """Create a mock asyncpg pool that records executemany calls."""
+    conn = MagicMock()
+    conn.executemany = AsyncMock()
+    conn.transaction.return_value.__aenter__ = AsyncMock()
+    conn.transaction.return_value.__aexit__ = AsyncMock(return_value=False)
+
+    pool = MagicMock()
+    pool.acquire.return_value.__aenter__ = AsyncMock(return_value=conn)
+    pool.acquire.return_value.__aexit__ = AsyncMock(return_value=False)
+    return pool, conn
+
+
+class TestBuildUpsertQuery:
+    """Test cases for build_upsert_query."""
+
+    def test_conflict_target_and_assignments(self):
+        """Test that the query upserts on api_game_id."""
+        query = build_upsert_query(("api_game_id", "status"))
+        assert "ON CONFLICT (api_game_id) DO UPDATE SET" in query
+        assert "status = EXCLUDED.status" in query
+        assert "updated_at = NOW()" in query
+        assert "api_game_id = EXCLUDED" not in query
+
+    def test_requires_api_game_id_first(self):
+        """Test that the conflict column must lead the column list."""
+        with pytest.raises(ValueError):
+            build_upsert_query(("status", "api_game_id"))
+
+
+class TestApiGamesBulkWriter:
+    """Test cases for ApiGamesBulkWriter."""
+
+    @pytest.mark.asyncio
+    async def test_flushes_one_batch_per_round_trip(self):
+        """Test that a batch is written with a single executemany."""
+        pool, conn = make_pool()
+        writer = ApiGamesBulkWriter(pool, columns=("api_game_id", "status"))
+
+        written = await writer.write(
+            [{"api_game_id": "1", "status": "NS"}, {"api_game_id": "2", "status": "FT"}]
+        )
+
+        assert written == 2
+        conn.executemany.assert_awaited_once()
+        _, rows = conn.executemany.await_args.args
+        assert rows == [("1", "NS"), ("2", "FT")]
+
+    @pytest.mark.asyncio
+    async def test_deduplicates_by_api_game_id(self):
+        """Test that the last version of a game in a batch wins."""
+        pool, conn = make_pool()
+        writer = ApiGamesBulkWriter(pool, columns=("api_game_id", "status"))
+
+        await writer.add({"api_game_id": "1", "status": "NS"})
+        await writer.add({"api_game_id": "1", "status": "LIVE"})
+        assert len(writer) == 1
+
+        await writer.flush()
+        _, rows = conn.executemany.await_args.args
+        assert rows == [("1", "LIVE")]
+
+    @pytest.mark.asyncio
+    async def test_auto_flush_at_batch_size(self):
+        """Test that a full buffer is flushed without an explicit flush."""
+        pool, conn = make_pool()
+        writer = ApiGamesBulkWriter(pool, columns=("api_game_id",), batch_size=2)
+
+        await writer.add_many([{"api_game_id": str(i)} for i in range(5)])
+
+        assert conn.executemany.await_count == 2
+        assert len(writer) == 1
+        assert writer.stats["rows_written"] == 4
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_is_counted(self):
+        """Test that a failing batch is reported instead of raised."""
+        pool, conn = make_pool()
+        conn.executemany.side_effect = RuntimeError("db down")
+        writer = ApiGamesBulkWriter(pool, columns=("api_game_id",))
+
+        assert await writer.write([{"api_game_id": "1"}]) == 0
+        assert writer.stats["failed_batches"] == 1
+        assert writer.stats["rows_failed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_bad_rows_are_dropped_alone(self):
+        """Test that a rejected batch is split until only bad rows are left out."""
+        pool, conn = make_pool()
+
+        async def executemany(query, rows):
+            if ("3",) in rows:
+                raise asyncpg.exceptions.DataError("invalid input syntax")
+
+        conn.executemany.side_effect = executemany
+        writer = ApiGamesBulkWriter(pool, columns=("api_game_id",))
+
+        assert await writer.write([{"api_game_id": str(i)} for i in range(8)]) == 7
+        assert writer.stats["rows_written"] == 7
+        assert writer.stats["rows_failed"] == 1
+        assert writer.stats["failed_batches"] == 1
+        written = {
+            row
+            for call in conn.executemany.await_args_list[1:]
+            for row in call.args[1]
+            if ("3",) not in call.args[1]
+        }
+        assert written == {(str(i),) for i in range(8) if i != 3}
+
+    @pytest.mark.asyncio
+    async def test_fingerprint_skips_unchanged_games(self):
+        """Test that incremental writes only send games whose content changed."""
+        pool, conn = make_pool()
+        writer = ApiGamesBulkWriter(
+            pool, columns=("api_game_id", "status"), fingerprint=True
+        )
+        assert "IS DISTINCT FROM EXCLUDED.payload_hash" in writer.query
+
+        await writer.write([{"api_game_id": "1", "status": "NS"}])
+        await writer.write([{"api_game_id": "1", "status": "NS"}])
+        await writer.write([{"api_game_id": "1", "status": "LIVE"}])
+
+        assert conn.executemany.await_count == 2
+        assert writer.stats["rows_unchanged"] == 1
+        _, rows = conn.executemany.await_args.args
+        assert rows[0][:2] == ("1", "LIVE")
+        assert len(rows[0]) == 3
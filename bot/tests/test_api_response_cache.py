@@ -0,0 +1,209 @@
+"""
+Tests for API response cache keys and request coalescing.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from aiohttp import web
+
+import utils.http_client as http_client_module
+import utils.multi_provider_api as multi_provider_module
+from services.api_response_cache_service import (
+    APIResponseCacheService,
+    ResponseCachePolicy,
+    api_cache_service,
+)
+from utils.enhanced_cache_manager import EnhancedCacheManager
+from utils.http_client import SharedHTTPClient
+from utils.multi_provider_api import MultiProviderAPI, MultiProviderRateLimiter
+
+
+@pytest.fixture
+def cache_service(monkeypatch):
+    monkeypatch.delenv("REDIS_HOST", raising=False)
+    return APIResponseCacheService(EnhancedCacheManager())
+
+
+def age_entries(cache_service, seconds):
+    """Move every cached response ``seconds`` closer to going stale."""
+    local_cache = cache_service.cache_manager._local_cache
+    for key in local_cache.keys():
+        entry = local_cache.get(key)
+        if isinstance(entry, dict) and "fresh_until" in entry:
+            entry["fresh_until"] -= seconds
+
+
+@asynccontextmanager
+async def provider_server():
+    """Serve a provider games endpoint on a free local port, counting hits."""
+    hits = []
+
+    async def games(request):
+        hits.append(request.query.get("date"))
+        return web.json_response({"response": [], "hits": len(hits)})
+
+    app = web.Application()
+    app.router.add_get("/games", games)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    try:
+        yield f"http://127.0.0.1:{runner.addresses[0][1]}", hits
+    finally:
+        await runner.cleanup()
+
+
+@pytest.fixture
+def client_cls(cache_service):
+    class FakeClient:
+        """Stand-in for a provider client created per league."""
+
+        calls = 0
+        fail = False
+
+        def get_provider_for_sport(self, sport):
+            return "api-sports"
+
+        @cache_service.cache_api_response(ttl=60)
+        async def make_request(
+            self, sport, endpoint, params=None, provider_override=None
+        ):
+            FakeClient.calls += 1
+            await asyncio.sleep(0.01)
+            if FakeClient.fail:
+                raise RuntimeError("provider down")
+            return {"sport": sport, "endpoint": endpoint, "calls": FakeClient.calls}
+
+    return FakeClient
+
+
+class TestAPIResponseCacheService:
+    """Test cases for APIResponseCacheService."""
+
+    @pytest.mark.asyncio
+    async def test_key_ignores_client_instance_and_param_order(self, cache_service, client_cls):
+        """Test that separate clients share cached responses."""
+        await client_cls().make_request("football", "games", {"league": 1, "season": 2024})
+        response = await client_cls().make_request(
+            "football", "games", params={"season": 2024, "league": 1}
+        )
+
+        assert response.cache_hit
+        assert client_cls.calls == 1
+        assert cache_service.provider_stats["api-sports"]["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_request(self, cache_service, client_cls):
+        """Test that identical concurrent misses are coalesced."""
+        responses = await asyncio.gather(
+            *(client_cls().make_request("hockey", "games") for _ in range(5))
+        )
+
+        assert client_cls.calls == 1
+        assert all(r.data["endpoint"] == "games" for r in responses)
+        stats = cache_service.provider_stats["api-sports"]
+        assert stats["misses"] == 1
+        assert stats["coalesced"] == 4
+        assert not cache_service._in_flight
+
+    @pytest.mark.asyncio
+    async def test_cancelled_leader_hands_the_fetch_over(self, cache_service, client_cls):
+        """Test that waiting callers survive the cancellation of the fetching one."""
+        leader = asyncio.create_task(client_cls().make_request("tennis", "games"))
+        await asyncio.sleep(0)
+        followers = [
+            asyncio.create_task(client_cls().make_request("tennis", "games"))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        responses = await asyncio.gather(*followers)
+        assert leader.cancelled()
+        assert all(r.data["endpoint"] == "games" for r in responses)
+        assert client_cls.calls == 2
+        assert cache_service.provider_stats["api-sports"]["misses"] == 2
+        assert not cache_service._in_flight
+
+    @pytest.mark.asyncio
+    async def test_stale_entries_are_served_while_refreshing(
+        self, cache_service, client_cls
+    ):
+        """Test stale-while-revalidate and the stale-if-error fallback."""
+        await client_cls().make_request("golf", "games")
+        age_entries(cache_service, 70)
+        stale = await client_cls().make_request("golf", "games")
+        await asyncio.gather(*cache_service._refresh_tasks)
+
+        assert stale.stale and stale.data["calls"] == 1
+        assert client_cls.calls == 2
+        assert not (await client_cls().make_request("golf", "games")).stale
+
+        client_cls.fail = True
+        age_entries(cache_service, cache_service.policy.stale_while_revalidate + 70)
+        fallback = await client_cls().make_request("golf", "games")
+        assert fallback.data["calls"] == 2
+        stats = cache_service.provider_stats["api-sports"]
+        assert stats["stale_served"] == 1
+        assert stats["refreshes"] == 1
+        assert stats["stale_fallbacks"] == 1
+
+    @pytest.mark.asyncio
+    async def test_refresh_outlives_the_calling_client(self, monkeypatch):
+        """Test that a stale refresh still runs after the client was closed."""
+        monkeypatch.delenv("REDIS_HOST", raising=False)
+        monkeypatch.setattr(api_cache_service, "cache_manager", EnhancedCacheManager())
+        monkeypatch.setattr(api_cache_service, "provider_stats", {})
+        http_client = SharedHTTPClient()
+        monkeypatch.setattr(http_client_module, "_global_http_client", http_client)
+        provider = multi_provider_module.API_PROVIDERS["api-sports"]
+        monkeypatch.setitem(provider, "api_key", "test-key")
+
+        async with provider_server() as (server, hits):
+            monkeypatch.setitem(provider["base_urls"], "hockey", server)
+
+            async def request():
+                async with MultiProviderAPI() as api:
+                    api.rate_limiter = MultiProviderRateLimiter()
+                    return await api.make_request(
+                        "hockey", "/games", {"date": "2026-10-16"}
+                    )
+
+            await request()
+            age_entries(api_cache_service, 310)
+            stale = await request()
+            # The client has left its ``async with`` block before the refresh
+            await asyncio.gather(*api_cache_service._refresh_tasks)
+            fresh = await request()
+            await http_client.close()
+
+        assert stale.stale and stale.data["hits"] == 1
+        assert not fresh.stale and fresh.data["hits"] == 2
+        assert hits == ["2026-10-16", "2026-10-16"]
+        stats = api_cache_service.provider_stats["api-sports"]
+        assert stats["refreshes"] == 1
+        assert stats.get("errors", 0) == 0
+
+
+class TestResponseCachePolicy:
+    """Test cases for ResponseCachePolicy."""
+
+    def test_ttl_follows_game_state(self):
+        """Test that live games expire fastest and finished games slowest."""
+        policy = ResponseCachePolicy(
+            live_ttl=15, imminent_ttl=60, scheduled_ttl=1800, final_ttl=86400
+        )
+        soon = (datetime.now(timezone.utc) + timedelta(minutes=30)).isoformat()
+        later = (datetime.now(timezone.utc) + timedelta(days=3)).isoformat()
+
+        final = {"fixture": {"status": {"short": "FT"}}}
+        live = {"fixture": {"status": {"short": "2H"}}}
+        assert policy.ttl_for({"response": [final]}, 300) == 86400
+        assert policy.ttl_for({"response": [final, live]}, 300) == 15
+        assert policy.ttl_for([{"status": "NS", "start_time": soon}], 300) == 60
+        assert policy.ttl_for([{"status": "NS", "date": later}], 300) == 1800
+        assert policy.ttl_for([{"id": 1, "name": "NFL"}], 3600) == 3600
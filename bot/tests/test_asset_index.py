@@ -0,0 +1,57 @@
+"""
+Tests for the in-memory asset path index.
+"""
+
+import os
+
+from utils.asset_index import AssetPathIndex
+
+
+def _touch(path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(b"")
+
+
+class TestAssetPathIndex:
+    """Test cases for AssetPathIndex."""
+
+    def test_lookups_are_case_insensitive(self, tmp_path):
+        """Test that directory and file lookups ignore case."""
+        root = tmp_path / "logos"
+        _touch(str(root / "teams" / "BASEBALL" / "MLB" / "boston_red_sox.webp"))
+        index = AssetPathIndex(str(root))
+
+        assert index.find_dir("teams", "baseball", "mlb") == str(
+            root / "teams" / "BASEBALL" / "MLB"
+        )
+        assert index.find_file(
+            ("teams", "BASEBALL", "Mlb"), "Boston_Red_Sox.webp"
+        ) == str(root / "teams" / "BASEBALL" / "MLB" / "boston_red_sox.webp")
+        assert index.list_files(("teams", "BASEBALL", "MLB")) == ["boston_red_sox.webp"]
+        assert index.find_file(("teams", "BASEBALL", "NBA"), "x.webp") is None
+
+    def test_refresh_picks_up_new_files(self, tmp_path):
+        """Test that an mtime change re-lists only the changed directory."""
+        root = tmp_path / "logos"
+        league_dir = root / "teams" / "HOCKEY" / "NHL"
+        _touch(str(league_dir / "bruins.webp"))
+        index = AssetPathIndex(str(root))
+        index.ensure_loaded()
+
+        _touch(str(league_dir / "rangers.webp"))
+        os.utime(league_dir, (1, 1))
+        assert index.refresh(force=True) == 1
+        assert index.find_file(("teams", "HOCKEY", "NHL"), "rangers.webp")
+
+    def test_manifest_skips_the_cold_start_scan(self, tmp_path):
+        """Test that a second index loads the persisted manifest."""
+        root = tmp_path / "logos"
+        _touch(str(root / "leagues" / "FOOTBALL" / "nfl.webp"))
+        AssetPathIndex(str(root)).ensure_loaded()
+
+        index = AssetPathIndex(str(root))
+        index.ensure_loaded()
+        assert index.stats["builds"] == 0
+        assert index.stats["rescanned_dirs"] == 0
+        assert index.find_file(("leagues", "football"), "NFL.webp")
@@ -0,0 +1,77 @@
+"""
+Tests for the batched bet cleanup janitor.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+import bot.services.bet_service as bet_service_module
+from bot.services.bet_service import BetService
+from bot.utils.enhanced_cache_manager import EnhancedCacheManager
+
+
+@pytest.fixture
+def service(monkeypatch, mock_database_manager):
+    monkeypatch.delenv("REDIS_HOST", raising=False)
+    monkeypatch.setattr(bet_service_module, "BET_CLEANUP_BATCH_SIZE", 2)
+    rules = bet_service_module.BET_CLEANUP_RULES
+    rows_by_predicate = {
+        rules["unconfirmed"]: [
+            {"bet_serial": i, "message_id": None} for i in range(5)
+        ],
+        rules["expired"]: [{"bet_serial": 10, "message_id": 900}],
+        rules["expired_without_expiration"]: [],
+    }
+
+    async def delete_batch(query, params):
+        """Delete up to LIMIT rows of the rule the statement sweeps."""
+        cutoff, limit = params
+        for predicate, rows in rows_by_predicate.items():
+            if predicate in query:
+                deleted, rows[:] = rows[:limit], rows[limit:]
+                return deleted
+        return []
+
+    mock_database_manager.fetch_all.side_effect = delete_batch
+    service = BetService(
+        SimpleNamespace(user=SimpleNamespace(id=0)), mock_database_manager
+    )
+    service.cache_manager = EnhancedCacheManager()
+    return service
+
+
+class TestBetCleanup:
+    """Test cases for BetService cleanup sweeps."""
+
+    @pytest.mark.asyncio
+    async def test_sweeps_are_set_based_and_batched(self, service):
+        """Test that each batch is one DELETE and sweeps stop on a short batch."""
+        swept = await service.run_cleanup()
+
+        assert swept == {
+            "unconfirmed": 5,
+            "expired": 1,
+            "expired_without_expiration": 0,
+        }
+        statements = [
+            call.args[0] for call in service.db_manager.fetch_all.await_args_list
+        ]
+        # 2 + 2 + 1 unconfirmed rows, then one statement per expired rule
+        assert len(statements) == 5
+        assert all("RETURNING bet_serial, message_id" in q for q in statements)
+        assert all("FOR UPDATE SKIP LOCKED" in q for q in statements)
+        assert "COALESCE" not in "".join(statements)
+
+    @pytest.mark.asyncio
+    async def test_metrics_accumulate_per_rule(self, service):
+        """Test that rows swept are recorded per run and in total."""
+        await service.run_cleanup()
+        await service.run_cleanup()
+
+        stats = service.cleanup_stats
+        assert stats["runs"] == 2
+        assert stats["last_swept"]["unconfirmed"] == 0
+        assert stats["total_swept"]["unconfirmed"] == 5
+        assert stats["total_swept"]["expired"] == 1
+        assert stats["last_run"] is not None
@@ -0,0 +1,77 @@
+"""
+Tests for the reaction -> bet slip lookup cache.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from bot.services.bet_service import BetService
+from bot.utils.enhanced_cache_manager import EnhancedCacheManager
+
+
+@pytest.fixture
+def bets():
+    """Bet rows by the message_id their slip was posted as."""
+    return {100: {"bet_serial": 7, "user_id": 1, "guild_id": 50}}
+
+
+@pytest.fixture
+def bet_service(monkeypatch, mock_database_manager, bets):
+    monkeypatch.delenv("REDIS_HOST", raising=False)
+
+    async def lookup(query, params, raise_errors=False):
+        return bets.get(params[0])
+
+    mock_database_manager.fetch_one.side_effect = lookup
+    mock_database_manager.execute.return_value = 1
+    service = BetService(
+        SimpleNamespace(user=SimpleNamespace(id=0)), mock_database_manager
+    )
+    service.cache_manager = EnhancedCacheManager()
+    return service
+
+
+class TestBetMessageCache:
+    """Test cases for BetService message lookups."""
+
+    @pytest.mark.asyncio
+    async def test_slips_and_non_slips_are_cached(self, bet_service):
+        """Test that repeated reactions are answered without the database."""
+        for _ in range(3):
+            context = await bet_service._get_bet_context(100, 50)
+            assert context["bet_serial"] == 7
+            assert await bet_service._get_bet_context(200, 50) is None
+        assert bet_service.db_manager.fetch_one.await_count == 2
+
+        # A slip posted in another guild never matches
+        assert await bet_service._get_bet_context(100, 51) is None
+
+    @pytest.mark.asyncio
+    async def test_confirming_a_slip_replaces_the_negative_entry(
+        self, bet_service, bets
+    ):
+        """Test that a message cached as "not a bet" is picked up once posted."""
+        assert await bet_service._get_bet_context(300, 50) is None
+
+        bets[300] = {
+            "bet_serial": 8,
+            "user_id": 1,
+            "guild_id": 50,
+        }
+        assert await bet_service.confirm_bet(8, 300, 9)
+
+        context = await bet_service._get_bet_context(300, 50)
+        assert context["bet_serial"] == 8
+
+    @pytest.mark.asyncio
+    async def test_failed_lookups_are_not_cached(self, bet_service):
+        """Test that a database error does not mark a slip as "not a bet"."""
+        fetch_one = bet_service.db_manager.fetch_one
+        lookup = fetch_one.side_effect
+        fetch_one.side_effect = ConnectionError("database down")
+        assert await bet_service._get_bet_context(100, 50) is None
+
+        fetch_one.side_effect = lookup
+        context = await bet_service._get_bet_context(100, 50)
+        assert context["bet_serial"] == 7
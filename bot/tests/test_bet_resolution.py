@@ -0,0 +1,143 @@
+"""
+Tests for single-statement bet resolution.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from bot.services.bet_service import BetService
+from bot.utils.enhanced_cache_manager import EnhancedCacheManager
+from bot.utils.stats_rollups import StatsRollups
+
+
+class FakeVoiceService:
+    def __init__(self):
+        self.guilds = []
+
+    async def update_on_bet_resolve(self, guild_id):
+        self.guilds.append(guild_id)
+
+
+@pytest.fixture
+def make_service(monkeypatch, mock_database_manager):
+    """Build a BetService whose fetch_one answers with ``row``."""
+    monkeypatch.delenv("REDIS_HOST", raising=False)
+
+    def make(row):
+        mock_database_manager.fetch_one.return_value = row
+        voice_service = FakeVoiceService()
+        bot = SimpleNamespace(user=SimpleNamespace(id=0), voice_service=voice_service)
+        service = BetService(bot, mock_database_manager)
+        service.cache_manager = EnhancedCacheManager()
+        service.stats_rollups = StatsRollups(mock_database_manager)
+        service.stats_rollups.cache_manager = service.cache_manager
+        return service, voice_service
+
+    return make
+
+
+def statements(service):
+    """(query, params) of every fetch the service sent, in order."""
+    return [
+        call.args
+        for call in service.db_manager.mock_calls
+        if call[0] in ("fetch_one", "fetch_all")
+    ]
+
+
+class TestBetResolution:
+    """Test cases for BetService.resolve_bet."""
+
+    @pytest.mark.asyncio
+    async def test_resolution_is_one_statement(self, make_service):
+        """Test that bet, unit record and capper are written together."""
+        row = {
+            "bet_serial": 7,
+            "guild_id": 1,
+            "user_id": 2,
+            "status": "won",
+            "result_value": 0.91,
+            "bet_won": 4,
+            "bet_loss": 1,
+            "bet_push": 0,
+        }
+        service, _ = make_service(row)
+
+        assert await service.resolve_bet(7, "won") == row
+        assert len(statements(service)) == 1
+        query, params = statements(service)[0]
+        assert "UPDATE bets" in query
+        assert "INSERT INTO unit_records" in query
+        assert "ON CONFLICT (bet_serial)" in query
+        assert "UPDATE cappers" in query
+        assert "INSERT INTO guild_stat_rollups" in query
+        assert params[:2] == (7, "won")
+
+    @pytest.mark.asyncio
+    async def test_side_effects_are_queued(self, make_service):
+        """Test that the voice update runs after, not inside, the resolution."""
+        service, voice_service = make_service(None)
+
+        service._queue_resolution_side_effects(1)
+        assert voice_service.guilds == []
+        assert len(service._side_effect_tasks) == 2
+        await asyncio.gather(*service._side_effect_tasks)
+        assert voice_service.guilds == [1]
+        assert not service._side_effect_tasks
+
+    @pytest.mark.asyncio
+    async def test_side_effect_failures_are_logged(self, make_service, caplog):
+        """Test that a failing side effect is logged rather than left unretrieved."""
+        service, voice_service = make_service(None)
+
+        async def fail(guild_id):
+            raise RuntimeError("channel gone")
+
+        voice_service.update_on_bet_resolve = fail
+        service._queue_resolution_side_effects(1)
+        await asyncio.gather(*service._side_effect_tasks)
+
+        assert "voice channel update failed: channel gone" in caplog.text
+
+    @pytest.mark.asyncio
+    async def test_delete_takes_the_bet_out_of_rollups(self, make_service):
+        """Test that deleting a bet adjusts its rollups in the same statement."""
+        service, _ = make_service({"message_id": 9, "guild_id": 1})
+
+        await service.delete_bet(7)
+        await asyncio.gather(*service._side_effect_tasks)
+
+        assert len(statements(service)) == 1
+        query, params = statements(service)[0]
+        assert "DELETE FROM bets" in query
+        assert "UPDATE guild_stat_rollups" in query
+        assert params == (7,)
+
+    @pytest.mark.asyncio
+    async def test_updating_a_resolved_bet_rebuilds_rollups(self, make_service):
+        """Test that only edits that change a resolved bet's totals rebuild."""
+        row = {
+            "guild_id": 1,
+            "status": "won",
+            "previous_guild_id": 1,
+            "previous_status": "won",
+        }
+        service, _ = make_service(row)
+
+        assert await service.update_bet(7, channel_id=3)
+        assert len(statements(service)) == 1
+
+        assert await service.update_bet(7, units=2, odds=-110)
+        query, params = statements(service)[1]
+        assert "SET units = $1, odds = $2" in query
+        assert "WHERE bet_serial = $3" in query
+        assert params == (2, -110, 7)
+        rebuild_query, rebuild_params = statements(service)[2]
+        assert "INSERT INTO guild_stat_rollups" in rebuild_query
+        assert rebuild_params == (1,)
+
+        row["status"] = row["previous_status"] = "pending"
+        assert await service.update_bet(7, units=3)
+        assert len(statements(service)) == 4
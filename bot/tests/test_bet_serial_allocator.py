@@ -0,0 +1,70 @@
+"""
+Tests for sequence-backed bet serial allocation.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from bot.services.bet_service import BetService
+from bot.utils.bet_serial_allocator import BetSerialAllocator
+
+
+class FakeSequenceDB:
+    """Hands out block_size values from a counter per nextval query."""
+
+    def __init__(self):
+        self.next_value = 100
+        self.queries = []
+
+    async def fetch_all(self, query, params):
+        self.queries.append(query)
+        await asyncio.sleep(0)
+        (count,) = params
+        rows = [{"bet_serial": self.next_value + i} for i in range(count)]
+        self.next_value += count
+        return rows
+
+    async def execute(self, query, params):
+        self.queries.append(query)
+        return 1
+
+
+class TestBetSerialAllocator:
+    """Test cases for BetSerialAllocator."""
+
+    @pytest.mark.asyncio
+    async def test_serials_come_from_prefetched_blocks(self):
+        """Test that one query serves a whole block of serials."""
+        db = FakeSequenceDB()
+        allocator = BetSerialAllocator(db, block_size=5)
+
+        serials = await asyncio.gather(*(allocator.allocate() for _ in range(12)))
+
+        assert sorted(serials) == list(range(100, 112))
+        assert len(db.queries) == 3
+        assert "nextval(pg_get_serial_sequence('bets', 'bet_serial'))" in db.queries[0]
+        assert len(allocator) == 3
+
+    @pytest.mark.asyncio
+    async def test_unreachable_sequence(self):
+        """Test that allocation fails softly when no serials are returned."""
+
+        class EmptyDB(FakeSequenceDB):
+            async def fetch_all(self, query, params):
+                return []
+
+        assert await BetSerialAllocator(EmptyDB()).allocate() is None
+
+    @pytest.mark.asyncio
+    async def test_reservations_write_no_rows(self):
+        """Test that reserving and cancelling a preview serial skips the bets table."""
+        db = FakeSequenceDB()
+        service = BetService(SimpleNamespace(user=SimpleNamespace(id=0)), db)
+
+        first = await service.reserve_bet(guild_id=1, user_id=2)
+        second = await service.reserve_bet(guild_id=3, user_id=4)
+        assert first != second
+        assert await service.cancel_reserved_bet(first, 1, 2)
+        assert all("INSERT" not in q and "DELETE" not in q for q in db.queries)
@@ -0,0 +1,242 @@
+"""
+Tests for pipelined cache batches.
+"""
+
+import json
+
+import pytest
+
+import utils.enhanced_cache_manager as enhanced_cache_manager
+from utils.enhanced_cache_manager import EnhancedCacheManager
+
+
+class FakePipeline:
+    """Records pipelined commands and answers them from a dict."""
+
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.commands.append((name, *args))
+
+        return queue
+
+    async def execute(self):
+        self.client.round_trips += 1
+        self.client.commands.extend(self.commands)
+        store = self.client.store
+        replies = []
+        for name, *args in self.commands:
+            if name == "get":
+                replies.append(store.get(args[0]))
+            elif name == "mget":
+                replies.append([store.get(key) for key in args[0]])
+            elif name == "pttl":
+                replies.append(60000 if args[0] in store else -2)
+            elif name == "setex":
+                store[args[0]] = args[2]
+                replies.append(True)
+            elif name in ("delete", "unlink"):
+                replies.append(sum(store.pop(key, None) is not None for key in args))
+            elif name == "zadd":
+                self.client.zsets.setdefault(args[0], {}).update(args[1])
+                replies.append(len(args[1]))
+            elif name == "zremrangebyscore":
+                members = self.client.zsets.get(args[0], {})
+                expired = [m for m, score in members.items() if score <= args[2]]
+                for member in expired:
+                    del members[member]
+                replies.append(len(expired))
+            elif name == "expire":
+                replies.append(args[0] in store or args[0] in self.client.zsets)
+            else:
+                replies.append(1)
+        return replies
+
+
+class FakeRedis:
+    def __init__(self):
+        self.store = {}
+        self.zsets = {}
+        self.commands = []
+        self.round_trips = 0
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def zscan_iter(self, name, count=None):
+        for member, score in list(self.zsets.get(name, {}).items()):
+            yield member, score
+
+    async def unlink(self, *keys):
+        return sum(
+            self.store.pop(key, None) is not None
+            or self.zsets.pop(key, None) is not None
+            for key in keys
+        )
+
+
+def connected_manager(redis_client):
+    manager = EnhancedCacheManager()
+    manager._redis_client = redis_client
+    manager._enabled = True
+    manager._is_connected = True
+    return manager
+
+
+@pytest.fixture
+def cache_manager(monkeypatch):
+    monkeypatch.delenv("REDIS_HOST", raising=False)
+    return connected_manager(FakeRedis())
+
+
+class TestCacheBatch:
+    """Test cases for CacheBatch."""
+
+    @pytest.mark.asyncio
+    async def test_batch_uses_one_round_trip_per_pipeline(
+        self, cache_manager, monkeypatch
+    ):
+        """Test that many sets go out in a few pipelines with shared tag sets."""
+        monkeypatch.setattr(enhanced_cache_manager, "BATCH_PIPELINE_SIZE", 100)
+        batch = cache_manager.batch()
+        for user_id in range(250):
+            batch.set("user_data", f"user:{user_id}", {"id": user_id}, ttl=1800)
+
+        results = await batch.execute()
+
+        redis_client = cache_manager._redis_client
+        assert results == [True] * 250
+        assert redis_client.round_trips == 3
+        assert len(redis_client.store) == 250
+        zadds = [c for c in redis_client.commands if c[0] == "zadd"]
+        # One ZADD per tag ("user:user") per pipeline
+        assert len(zadds) == 3
+        publishes = [c for c in redis_client.commands if c[0] == "publish"]
+        assert len(publishes) == 3
+
+    @pytest.mark.asyncio
+    async def test_batch_results_follow_queue_order(self, cache_manager):
+        """Test mixed operations, per-key TTLs and reads after writes."""
+        await cache_manager.set("team_data", "team:1", {"id": 1}, ttl=60)
+        redis_client = cache_manager._redis_client
+
+        results = await (
+            cache_manager.batch()
+            .get("team_data", "team:1")
+            .set("team_data", "team:1", {"id": 1, "name": "new"}, ttl=30)
+            .get("team_data", "team:1")
+            .get("team_data", "team:2")
+            .expire("team_data", "team:1", 10)
+            .delete("team_data", "team:1")
+            .execute()
+        )
+
+        assert results == [
+            {"id": 1},
+            True,
+            {"id": 1, "name": "new"},
+            None,
+            True,
+            True,
+        ]
+        assert ("setex", "team:team:1", 30) in [
+            c[:3] for c in redis_client.commands if c[0] == "setex"
+        ]
+        assert await cache_manager.get("team_data", "team:1") is None
+
+    @pytest.mark.asyncio
+    async def test_batch_falls_back_to_local_cache(self, cache_manager):
+        """Test that a batch still works against L1 without Redis."""
+        cache_manager._is_connected = False
+
+        assert await cache_manager.mset("guild_data", {"guild:1": 1, "guild:2": 2})
+        results = await (
+            cache_manager.batch()
+            .get("guild_data", "guild:1")
+            .delete("guild_data", "guild:2")
+            .get("guild_data", "guild:2")
+            .execute()
+        )
+
+        assert results == [1, True, None]
+        assert cache_manager._redis_client.round_trips == 0
+
+    @pytest.mark.asyncio
+    async def test_entries_loaded_from_redis_keep_their_tags(self, cache_manager):
+        """Test that a peer's tag invalidation drops L1 copies read from Redis."""
+        await cache_manager.set("guild_stats", "5:guild:all", {"wins": 3}, tags=["gs:5"])
+        await cache_manager.batch().set(
+            "guild_stats", "5:user:1", {"wins": 1}, tags=["gs:5"]
+        ).execute()
+        await cache_manager.set("guild_stats", "6:guild:all", {"wins": 9})
+        peer = connected_manager(cache_manager._redis_client)
+
+        assert await peer.get("guild_stats", "5:guild:all") == {"wins": 3}
+        assert await peer.batch().get("guild_stats", "5:user:1").execute() == [
+            {"wins": 1}
+        ]
+        assert await peer.mget("guild_stats", ["6:guild:all"]) == [{"wins": 9}]
+        assert len(peer._local_cache) == 3
+
+        peer._apply_invalidation(json.dumps({"origin": "other", "tags": ["gs:5"]}))
+
+        assert peer._local_cache.keys() == ["guild_stats:6:guild:all"]
+
+    @pytest.mark.asyncio
+    async def test_tag_indexes_drop_expired_members(self, cache_manager, monkeypatch):
+        """Test that tag indexes are trimmed on write and skip expired keys."""
+        clock = [1000.0]
+        monkeypatch.setattr(enhanced_cache_manager.time, "time", lambda: clock[0])
+        redis_client = cache_manager._redis_client
+
+        await cache_manager.set("team_data", "nfl:old", 1, ttl=10)
+        # Expired in Redis but still indexed, as if the write came late
+        await cache_manager.set("team_data", "nfl:stale", 2, ttl=20)
+        clock[0] += 15
+        await cache_manager.set("team_data", "nfl:new", 3, ttl=60)
+
+        assert set(redis_client.zsets["tagset:team:nfl"]) == {
+            "team:nfl:stale",
+            "team:nfl:new",
+        }
+        assert "tagset:team" not in redis_client.zsets
+
+        clock[0] += 10
+        redis_client.store.pop("team:nfl:stale")
+        unlinked = []
+        real_unlink = cache_manager._unlink
+
+        async def record_unlink(batch):
+            unlinked.extend(batch)
+            return await real_unlink(batch)
+
+        monkeypatch.setattr(cache_manager, "_unlink", record_unlink)
+        cache_manager._local_cache.clear()
+        assert await cache_manager.invalidate_tags("team:nfl") == 1
+        assert unlinked == ["team:nfl:new"]
+        assert "tagset:team:nfl" not in redis_client.zsets
+
+    @pytest.mark.asyncio
+    async def test_invalidation_drops_queued_query_results(self, cache_manager):
+        """Test that an invalidated query result is neither served nor written."""
+        from services.database_query_service import DatabaseQueryService
+
+        service = DatabaseQueryService(cache_manager)
+        await service._set_cached_result("query:bets:1", [{"bet_serial": 1}])
+        await service._set_cached_result("query:users:1", [{"user_id": 1}])
+
+        await service._invalidate_cache_patterns(["bets"])
+        assert await service._get_cached_result("query:users:1") is not None
+        assert await service._get_cached_result("query:bets:1") is None
+
+        await service._flush_task
+        assert not any("bets" in key for key in cache_manager._redis_client.store)
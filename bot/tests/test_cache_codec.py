@@ -0,0 +1,93 @@
+"""
+Tests for the cache value codec.
+"""
+
+import json
+import pickle
+from collections import namedtuple
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+
+from utils import cache_codec
+from utils.cache_codec import (
+    CODEC_JSON,
+    CODEC_PICKLE,
+    COMPRESSION_NONE,
+    COMPRESSION_ZLIB,
+    CacheCodec,
+)
+
+
+@dataclass
+class Headers:
+    etag: str
+
+
+Line = namedtuple("Line", "odds units")
+
+
+class TestCacheCodec:
+    """Test cases for CacheCodec."""
+
+    def test_types_round_trip(self):
+        """Test that datetimes, decimals and sets keep their types."""
+        codec = CacheCodec(compression=COMPRESSION_NONE)
+        value = {
+            "start_time": datetime(2025, 9, 7, 17, 0, tzinfo=timezone.utc),
+            "date": date(2025, 9, 7),
+            "odds": Decimal("-110.5"),
+            "window": timedelta(minutes=5),
+            "ids": {1, 2},
+            "games": [{"id": 1, "score": None}],
+        }
+
+        encoded = codec.encode(value)
+        assert encoded[0] == CODEC_JSON << 3
+        assert codec.decode(encoded) == value
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_tuples_and_non_str_keys_round_trip(self, monkeypatch, use_orjson):
+        """Test that tuples and int or tuple keys are not turned into lists and str."""
+        if not use_orjson:
+            monkeypatch.setattr(cache_codec, "orjson", None)
+        codec = CacheCodec(compression=COMPRESSION_NONE)
+        value = {
+            "line": (1, "-110"),
+            "by_id": {1: "home", 2: ("away", date(2025, 9, 7))},
+            "pairs": {(1, 2): [3, (4,)]},
+            "seen": {(1, 2)},
+            "plain": [{"id": 1}],
+        }
+
+        encoded = codec.encode(value)
+        assert encoded[0] == CODEC_JSON << 3
+        assert codec.decode(encoded) == value
+
+        encoded = codec.encode([Line(-110, 1)])
+        assert encoded[0] >> 3 == CODEC_PICKLE
+        assert codec.decode(encoded) == [Line(-110, 1)]
+
+    def test_large_payloads_are_compressed(self):
+        """Test that payloads over the threshold are compressed."""
+        codec = CacheCodec(compression=COMPRESSION_ZLIB, compress_threshold=256)
+        games = [{"home_team_name": "Boston Red Sox", "status": "NS"}] * 200
+
+        encoded = codec.encode(games)
+        assert encoded[0] & 0x07 == COMPRESSION_ZLIB
+        assert len(encoded) < len(json.dumps(games))
+        assert codec.decode(encoded) == games
+        assert codec.encode([1])[0] & 0x07 == COMPRESSION_NONE
+
+    def test_unsupported_objects_and_legacy_values(self):
+        """Test the pickle fallback and values stored before the header."""
+        codec = CacheCodec()
+
+        encoded = codec.encode({"headers": Headers("abc")})
+        assert encoded[0] >> 3 == CODEC_PICKLE
+        assert codec.decode(encoded) == {"headers": Headers("abc")}
+
+        assert codec.decode(json.dumps({"a": 1}).encode()) == {"a": 1}
+        assert codec.decode(pickle.dumps([1, 2])) == [1, 2]
@@ -0,0 +1,94 @@
+"""
+Tests for the local L1 cache and tag-based cache invalidation.
+"""
+
+import json
+
+import pytest
+
+from utils.enhanced_cache_manager import (
+    EnhancedCacheManager,
+    derived_tags,
+    pattern_tag,
+)
+from utils.local_cache import LocalLRUCache
+
+
+@pytest.fixture
+def cache_manager(monkeypatch):
+    monkeypatch.delenv("REDIS_HOST", raising=False)
+    return EnhancedCacheManager()
+
+
+class TestCacheInvalidation:
+    """Test cases for tag-based cache invalidation."""
+
+    def test_trailing_wildcards_map_to_tags(self):
+        """Test that key ancestors become tags and matching globs use them."""
+        assert derived_tags("svc:audit_logs:5:all") == [
+            "svc:audit_logs",
+            "svc:audit_logs:5",
+        ]
+        assert pattern_tag("svc:audit_logs:5:*") == "svc:audit_logs:5"
+        # Whole prefixes are not tags, so clearing one is a SCAN
+        assert pattern_tag("svc:*") is None
+        assert pattern_tag("svc:audit_*") is None
+        assert pattern_tag("svc:audit_logs:5:all:*") is None
+
+    @pytest.mark.asyncio
+    async def test_service_patterns_and_tags_clear_entries(self, cache_manager):
+        """Test that glob patterns and explicit tags drop the right entries."""
+        await cache_manager.enhanced_cache_set("audit_logs:5:all", [1])
+        await cache_manager.enhanced_cache_set("audit_logs:6:all", [2])
+        await cache_manager.enhanced_cache_set("tenant_data:5", {"id": 5}, tags=["tenant:5"])
+        await cache_manager.enhanced_cache_set("tenant_list:all", [5, 6])
+
+        assert await cache_manager.clear_cache_by_pattern("audit_logs:5:*") == 1
+        assert await cache_manager.enhanced_cache_get("audit_logs:5:all") is None
+        assert await cache_manager.enhanced_cache_get("audit_logs:6:all") == [2]
+
+        assert await cache_manager.invalidate_tags("tenant:5") == 1
+        assert await cache_manager.enhanced_cache_get("tenant_data:5") is None
+
+        # Not expressible as a tag, so it falls back to a pattern scan
+        assert await cache_manager.clear_cache_by_pattern("tenant_l*") == 1
+        assert await cache_manager.enhanced_cache_get("tenant_list:all") is None
+        assert cache_manager._performance_stats["scan_invalidations"] == 1
+
+
+class TestLocalLRUCache:
+    """Test cases for the L1 cache."""
+
+    def test_entries_and_bytes_are_bounded(self):
+        """Test that the least recently used entries are evicted first."""
+        cache = LocalLRUCache(max_entries=2, max_bytes=400)
+        cache.set("a", 1, ttl=60, size=10, tags=["t"])
+        cache.set("b", 2, ttl=60, size=10)
+        assert cache.get("a") == 1
+        cache.set("c", 3, ttl=60, size=10)
+
+        assert cache.get("b") is None
+        assert cache.keys() == ["a", "c"]
+        assert not cache.set("huge", 4, ttl=60, size=200)
+        assert cache.pop_tag("t") == 1
+        assert cache.get_stats()["tags"] == 0
+
+    @pytest.mark.asyncio
+    async def test_peer_invalidations_drop_l1_entries(self, cache_manager):
+        """Test that invalidation messages from other processes are applied."""
+        await cache_manager.set("guild_data", "1:settings", {"prefix": "!"})
+        await cache_manager.set("team_data", "nfl:bos", {"name": "Patriots"})
+        assert await cache_manager.get("guild_data", "1:settings") == {"prefix": "!"}
+
+        cache_manager._apply_invalidation(
+            json.dumps({"origin": "peer", "keys": ["guild_data:1:settings"]})
+        )
+        cache_manager._apply_invalidation(
+            json.dumps({"origin": "peer", "tags": ["team:nfl"]})
+        )
+
+        assert await cache_manager.get("guild_data", "1:settings") is None
+        assert await cache_manager.get("team_data", "nfl:bos") is None
+        tiers = cache_manager.get_tier_stats()
+        assert tiers["guild_data"]["l1_hits"] == 1
+        assert tiers["guild_data"]["misses"] == 1
@@ -0,0 +1,138 @@
+"""
+Tests for the incrementally maintained capper win/loss/push counters.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import bot.services.bet_service as bet_service_module
+from bot.services.bet_service import BetService
+from bot.utils.enhanced_cache_manager import EnhancedCacheManager
+from bot.utils.stats_rollups import StatsRollups
+
+
+def make_service(monkeypatch, db, member=None):
+    monkeypatch.delenv("REDIS_HOST", raising=False)
+    guild = SimpleNamespace(get_member=lambda user_id: member)
+    bot = SimpleNamespace(user=SimpleNamespace(id=0), get_guild=lambda guild_id: guild)
+    service = BetService(bot, db)
+    service.cache_manager = EnhancedCacheManager()
+    service.stats_rollups = StatsRollups(db)
+    service.stats_rollups.cache_manager = service.cache_manager
+    return service
+
+
+def removal(user_id):
+    return SimpleNamespace(user_id=user_id, guild_id=1)
+
+
+def queries(db):
+    """Every statement sent to the database, in order."""
+    return [call.args[0] for call in db.mock_calls if call.args]
+
+
+class TestCapperCounters:
+    """Test cases for the capper counter upkeep in BetService."""
+
+    @pytest.mark.asyncio
+    async def test_reconcile_only_rewrites_drifted_cappers(
+        self, monkeypatch, mock_database_manager
+    ):
+        """Test that reconciliation recounts in one statement and reports repairs."""
+        mock_database_manager.execute.return_value = 2
+        service = make_service(monkeypatch, mock_database_manager)
+
+        assert await service.reconcile_capper_counters() == 2
+        query = mock_database_manager.execute.await_args.args[0]
+        assert "UPDATE cappers" in query
+        assert "IS DISTINCT FROM" in query
+
+        mock_database_manager.execute.return_value = 0
+        assert await service.reconcile_capper_counters() == 0
+
+    @pytest.mark.asyncio
+    async def test_reconcile_runs_in_the_background(
+        self, monkeypatch, mock_database_manager
+    ):
+        """Test that start() schedules reconciliation and stop() cancels it."""
+        monkeypatch.setattr(bet_service_module, "CAPPER_RECONCILE_INTERVAL", 0.01)
+        service = make_service(monkeypatch, mock_database_manager)
+
+        await service.start()
+        await asyncio.sleep(0.05)
+        task = service.reconcile_task
+        await service.stop()
+        await asyncio.sleep(0)
+
+        assert task.done()
+        sent = queries(mock_database_manager)
+        assert any("UPDATE cappers" in query for query in sent)
+        assert any("INSERT INTO guild_stat_rollups" in query for query in sent)
+
+    @pytest.mark.asyncio
+    async def test_owner_removing_the_reaction_reverts_the_counter(
+        self, monkeypatch, mock_database_manager
+    ):
+        """Test that the bet owner can undo a resolution in one statement."""
+        reverted = {"bet_serial": 7, "guild_id": 1, "user_id": 2}
+        mock_database_manager.fetch_one.return_value = reverted
+        service = make_service(monkeypatch, mock_database_manager)
+        context = {"bet_serial": 7, "user_id": 2, "guild_id": 1, "status": "won"}
+
+        await service._unresolve_bet(removal(user_id=2), context)
+        await asyncio.gather(*service._side_effect_tasks)
+
+        mock_database_manager.fetch_one.assert_awaited_once()
+        query, params = mock_database_manager.fetch_one.await_args.args
+        assert "UPDATE cappers" in query
+        assert "GREATEST(c.bet_won - CASE" in query
+        assert params[:2] == (7, "won")
+
+    @pytest.mark.asyncio
+    async def test_other_members_cannot_revert(
+        self, monkeypatch, mock_database_manager
+    ):
+        """Test that only the owner or a moderator can undo a resolution."""
+        member = SimpleNamespace(
+            guild_permissions=SimpleNamespace(manage_messages=False)
+        )
+        service = make_service(monkeypatch, mock_database_manager, member=member)
+        context = {"bet_serial": 7, "user_id": 2, "guild_id": 1, "status": "lost"}
+
+        await service._unresolve_bet(removal(user_id=3), context)
+        mock_database_manager.fetch_one.assert_not_awaited()
+
+        member.guild_permissions.manage_messages = True
+        await service._unresolve_bet(removal(user_id=3), context)
+        mock_database_manager.fetch_one.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_deletes_and_edits_move_the_counter(
+        self, monkeypatch, mock_database_manager
+    ):
+        """Test that deleting or re-grading a bet moves its capper's counter."""
+        mock_database_manager.fetch_one.return_value = {
+            "message_id": 9,
+            "guild_id": 1,
+            "user_id": 2,
+            "status": "lost",
+            "previous_guild_id": 1,
+            "previous_user_id": 2,
+            "previous_status": "won",
+        }
+        service = make_service(monkeypatch, mock_database_manager)
+
+        await service.delete_bet(7)
+        await asyncio.gather(*service._side_effect_tasks)
+        query = mock_database_manager.fetch_one.await_args.args[0]
+        assert "DELETE FROM bets" in query
+        assert "GREATEST(c.bet_won - (d.status = 'won')::int, 0)" in query
+
+        assert await service.update_bet(7, status="lost")
+        query, params = mock_database_manager.fetch_one.await_args.args
+        assert "SET status = $1" in query
+        assert "UPDATE cappers" in query
+        assert "previous_status AS status, -1 AS delta" in query
+        assert params == ("lost", 7)
@@ -0,0 +1,86 @@
+"""
+Tests for the scheduled comprehensive fetch pass.
+"""
+
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+import utils.comprehensive_fetcher as fetcher_module
+from utils.comprehensive_fetcher import ComprehensiveFetcher
+from utils.fetch_scheduler import ProviderFetchScheduler
+
+
+@pytest.fixture
+def fetcher(monkeypatch):
+    monkeypatch.setattr(fetcher_module, "API_KEY", "test-key")
+    monkeypatch.setattr(
+        ProviderFetchScheduler,
+        "from_api_providers",
+        classmethod(lambda cls: cls({}, default_rate_limit=6000)),
+    )
+    fetcher = ComprehensiveFetcher(None, mode="incremental")
+    fetcher.games_writer.load_fingerprints = AsyncMock(return_value=0)
+    fetcher.games_writer.flush = AsyncMock(return_value=0)
+    fetcher.expire_stale_games = AsyncMock(return_value=0)
+    fetcher.discovered_leagues = {
+        "football": [{"id": 39, "name": "EPL"}, {"id": 140, "name": "La Liga"}]
+    }
+    return fetcher
+
+
+class TestComprehensiveFetcher:
+    """Test cases for ComprehensiveFetcher."""
+
+    @pytest.mark.asyncio
+    async def test_failed_leagues_are_counted(self, fetcher):
+        """Test that a league whose fetch raised is reported as failed."""
+
+        async def fetch_games(sport, league, date):
+            if league["name"] == "La Liga":
+                raise RuntimeError("provider down")
+            return []
+
+        fetcher.multi_provider_api = SimpleNamespace(
+            fetch_games=fetch_games,
+            rate_limiter=SimpleNamespace(get_stats=lambda: {}),
+        )
+
+        results = await fetcher.fetch_all_leagues_data("2026-10-16", next_days=1)
+
+        assert results["total_leagues"] == 2
+        assert results["failed_fetches"] == 1
+        assert results["successful_fetches"] == 1
+        assert fetcher.failed_leagues == {"La Liga"}
+        assert results["provider_throughput"]["api-sports"]["errors"] == 1
+        errors = [status["error"] for status in results["http_status_codes"]]
+        assert sorted(errors) == ["No games found", "provider down"]
+
+    @pytest.mark.asyncio
+    async def test_live_games_outlast_the_fetch_window(self, fetcher):
+        """Test that games still being played are not expired at midnight."""
+        conn = SimpleNamespace(execute=AsyncMock(return_value="DELETE 3"))
+
+        @asynccontextmanager
+        async def acquire():
+            yield conn
+
+        fetcher.db_pool = SimpleNamespace(acquire=acquire)
+        del fetcher.expire_stale_games
+
+        assert await fetcher.expire_stale_games("2026-10-16") == 3
+        query, window_start, finished, _, live, live_cutoff = (
+            conn.execute.await_args.args
+        )
+        assert window_start == "2026-10-16 00:00:00"
+        assert "FT" in finished
+        assert "2h" in live and "ft" not in live
+        assert "<> ALL($4::text[])" in query
+        assert "OR start_time < $5" in query
+        now = datetime.now(fetcher_module.EST).replace(tzinfo=None)
+        cutoff = datetime.strptime(live_cutoff, "%Y-%m-%d %H:%M:%S")
+        stuck_for = timedelta(hours=fetcher_module.LIVE_GAME_MAX_HOURS)
+        assert abs(now - stuck_for - cutoff) < timedelta(minutes=1)
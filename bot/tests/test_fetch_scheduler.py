@@ -0,0 +1,76 @@
+"""
+Tests for the provider-aware fetch scheduler.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from utils.fetch_scheduler import ProviderFetchScheduler
+
+
+class TestProviderFetchScheduler:
+    """Test cases for ProviderFetchScheduler."""
+
+    @pytest.mark.asyncio
+    async def test_results_keep_submission_order(self):
+        """Test that results come back in the order jobs were queued."""
+        scheduler = ProviderFetchScheduler({"fast": 6000})
+
+        async def job(value, delay):
+            await asyncio.sleep(delay)
+            return value
+
+        jobs = [
+            ("fast", lambda: job(1, 0.03)),
+            ("fast", lambda: job(2, 0.01)),
+            ("fast", lambda: job(3, 0.0)),
+        ]
+        assert await scheduler.run(jobs) == [1, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_providers_run_concurrently(self):
+        """Test that slow jobs on different providers overlap."""
+        scheduler = ProviderFetchScheduler({"a": 6000, "b": 6000})
+
+        async def job():
+            await asyncio.sleep(0.1)
+
+        started = time.monotonic()
+        await scheduler.run([("a", job), ("b", job), ("a", job), ("b", job)])
+        assert time.monotonic() - started < 0.3
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_spaces_request_starts(self):
+        """Test that request starts are paced by the provider's rate limit."""
+        # 600 calls per minute -> one start every 0.1s
+        scheduler = ProviderFetchScheduler({"slow": 600})
+        starts = []
+
+        async def job():
+            starts.append(time.monotonic())
+
+        await scheduler.run([("slow", job)] * 3)
+        gaps = [b - a for a, b in zip(starts, starts[1:])]
+        assert all(gap >= 0.09 for gap in gaps)
+
+    @pytest.mark.asyncio
+    async def test_errors_are_returned_and_counted(self):
+        """Test that a failing job does not abort the pass."""
+        scheduler = ProviderFetchScheduler({"p": 6000})
+
+        async def ok():
+            return "ok"
+
+        async def boom():
+            raise RuntimeError("boom")
+
+        results = await scheduler.run([("p", ok), ("p", boom)])
+        assert results[0] == "ok"
+        assert isinstance(results[1], RuntimeError)
+
+        report = scheduler.get_report()
+        assert report["providers"]["p"]["requests"] == 2
+        assert report["providers"]["p"]["errors"] == 1
+        assert report["duration_seconds"] >= 0
@@ -0,0 +1,111 @@
+"""
+Tests for the guild settings read-through cache.
+"""
+
+import asyncio
+
+import pytest
+
+from bot.services.admin_service import AdminService
+from bot.utils.enhanced_cache_manager import EnhancedCacheManager
+from bot.utils.guild_settings_cache import GuildSettingsCache
+
+
+@pytest.fixture
+def rows():
+    """guild_settings rows by guild_id."""
+    return {
+        1: {
+            "guild_id": 1,
+            "subscription_level": "platinum",
+            "is_paid": 1,
+            "member_role": "55",
+            "embed_channel_1": 10,
+            "embed_channel_3": 30,
+        },
+        2: {"guild_id": 2, "subscription_level": "free", "is_paid": 0},
+    }
+
+
+@pytest.fixture
+def db(mock_database_manager, rows):
+    async def fetch_settings(query, params, raise_errors=False):
+        return [rows[guild_id] for guild_id in params[0] if guild_id in rows]
+
+    mock_database_manager.fetch_all.side_effect = fetch_settings
+    mock_database_manager.execute.return_value = 1
+    return mock_database_manager
+
+
+@pytest.fixture
+def cache(db, monkeypatch):
+    monkeypatch.delenv("REDIS_HOST", raising=False)
+    cache = GuildSettingsCache(db)
+    cache.cache_manager = EnhancedCacheManager()
+    return cache
+
+
+class TestGuildSettingsCache:
+    """Test cases for GuildSettingsCache."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_query(self, cache, db):
+        """Test that lookups started together are loaded in one query."""
+        first, second, missing = await asyncio.gather(
+            cache.get(1), cache.get(2), cache.get(3)
+        )
+
+        db.fetch_all.assert_awaited_once()
+        assert sorted(db.fetch_all.await_args.args[1][0]) == [1, 2, 3]
+        assert first.is_platinum and first.is_paid
+        assert first.member_role == 55
+        assert first.embed_channel_ids == [10, 30]
+        assert second.subscription_level == "free"
+        assert missing is None
+
+        # Hits, including the guild without settings, stay in memory
+        await cache.get_many([1, 2, 3])
+        assert db.fetch_all.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_invalidate_reloads_the_guild(self, cache, db, rows):
+        """Test that an invalidated guild is read from the database again."""
+        await cache.get(2)
+        rows[2]["subscription_level"] = "premium"
+        await cache.invalidate(2)
+
+        settings = await cache.get(2)
+        assert settings.subscription_level == "premium"
+        assert db.fetch_all.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_loads_are_not_cached(self, cache, db):
+        """Test that a database error is not remembered as "no settings"."""
+        fetch_settings = db.fetch_all.side_effect
+        db.fetch_all.side_effect = ConnectionError("database down")
+        assert await cache.get(1) is None
+
+        db.fetch_all.side_effect = fetch_settings
+        settings = await cache.get(1)
+        assert settings.is_platinum
+        assert db.fetch_all.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_update_guild_settings_invalidates(self, cache, db, rows):
+        """Test that AdminService writes are visible to the next read."""
+        admin_service = AdminService(None, db)
+        admin_service.guild_settings = cache
+        assert await admin_service.check_guild_subscription(1)
+
+        assert await admin_service.update_guild_settings(
+            1, {"member_role": 66, "embed_channel_2": 20}
+        )
+        query, *args = db.execute.await_args.args
+        assert "member_role = $1, embed_channel_2 = $2" in query
+        assert "WHERE guild_id = $3" in query
+        assert args == [66, 20, 1]
+
+        rows[1].update(member_role=66, embed_channel_2=20)
+        settings = await cache.get(1)
+        assert settings.member_role == 66
+        assert settings.embed_channel_ids == [10, 20, 30]
@@ -0,0 +1,71 @@
+"""
+Tests for the shared HTTP client.
+"""
+
+from contextlib import asynccontextmanager
+
+import pytest
+from aiohttp import web
+
+from utils.http_client import HTTPClientConfig, SharedHTTPClient
+
+
+@asynccontextmanager
+async def local_server():
+    """Serve a games endpoint on a free local port."""
+
+    async def games(request):
+        return web.json_response({"response": []})
+
+    app = web.Application()
+    app.router.add_get("/games", games)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    try:
+        yield f"http://127.0.0.1:{runner.addresses[0][1]}"
+    finally:
+        await runner.cleanup()
+
+
+@pytest.fixture
+def client():
+    return SharedHTTPClient(HTTPClientConfig(connections_per_host=2))
+
+
+class TestSharedHTTPClient:
+    """Test cases for SharedHTTPClient."""
+
+    @pytest.mark.asyncio
+    async def test_session_is_shared_until_closed(self, client):
+        """Test that callers borrow one session and a closed one is replaced."""
+        session = await client.get_session()
+        assert await client.get_session() is session
+        assert session.connector.limit_per_host == 2
+
+        await client.close()
+        assert session.closed
+        assert await client.get_session() is not session
+        assert client.metrics["sessions_created"] == 2
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_sequential_requests_reuse_one_connection(self, client):
+        """Test that keep-alive connections are reused and counted."""
+        async with local_server() as server:
+            session = await client.get_session()
+            for _ in range(3):
+                async with session.get(f"{server}/games") as response:
+                    assert (await response.json()) == {"response": []}
+            await client.close()
+
+        metrics = client.get_metrics()
+        assert metrics["requests"] == 3
+        assert metrics["connections_created"] == 1
+        assert metrics["connections_reused"] == 2
+        assert metrics["connection_reuse_rate"] == pytest.approx(2 / 3)
+
+    def test_metrics_without_connections(self):
+        """Test that the reuse rate is defined before any request."""
+        assert SharedHTTPClient().get_metrics()["connection_reuse_rate"] == 0.0
@@ -0,0 +1,52 @@
+"""
+Tests for the decoded image LRU cache.
+"""
+
+import time
+
+from PIL import Image
+
+from utils.image_cache import ImageLRUCache
+
+
+class TestImageLRUCache:
+    """Test cases for ImageLRUCache."""
+
+    def test_hits_return_independent_copies(self):
+        """Test that cached images cannot be mutated through a hit."""
+        cache = ImageLRUCache(max_bytes=1024 * 1024)
+        cache.put("logo", Image.new("RGBA", (10, 10), (255, 0, 0, 255)))
+
+        first = cache.get("logo")
+        first.putpixel((0, 0), (0, 0, 0, 0))
+        assert cache.get("logo").getpixel((0, 0)) == (255, 0, 0, 255)
+        assert cache.get("missing") is None
+
+        stats = cache.get_stats()
+        assert stats["hits"] == 2
+        assert stats["misses"] == 1
+        assert stats["bytes"] == 10 * 10 * 4
+
+    def test_byte_budget_evicts_least_recently_used(self):
+        """Test that the byte budget evicts the coldest entries first."""
+        # Each 10x10 RGBA image is 400 bytes; the budget fits two
+        cache = ImageLRUCache(max_bytes=800)
+        for key in ("a", "b"):
+            cache.put(key, Image.new("RGBA", (10, 10)))
+        cache.get("a")
+        cache.put("c", Image.new("RGBA", (10, 10)))
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+        assert cache.get_stats()["evictions"] == 1
+        assert cache.current_bytes <= 800
+
+    def test_negative_entries_expire(self):
+        """Test that remembered misses expire after their TTL."""
+        cache = ImageLRUCache(negative_ttl=0.05)
+        cache.record_miss(("team", "nobody", "NFL"))
+
+        assert cache.is_known_miss(("team", "nobody", "NFL"))
+        time.sleep(0.06)
+        assert not cache.is_known_miss(("team", "nobody", "NFL"))
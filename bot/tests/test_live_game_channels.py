@@ -0,0 +1,141 @@
+"""
+Tests for change-driven live game channel updates.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+import services.live_game_channel_service as live_module
+from services.live_game_channel_service import LiveGameChannelService
+
+
+class FakeChannel:
+    def __init__(self, channel_id, name):
+        self.id = channel_id
+        self.name = name
+        self.renames = []
+        self.deleted = False
+
+    async def edit(self, name, reason=None):
+        self.name = name
+        self.renames.append(name)
+
+    async def delete(self, reason=None):
+        self.deleted = True
+
+
+class FakeGuild:
+    def __init__(self, guild_id):
+        self.id = guild_id
+        self.default_role = object()
+        self.channels = {}
+
+    async def create_text_channel(self, name, overwrites=None, reason=None):
+        channel = FakeChannel(100 + len(self.channels), name)
+        self.channels[channel.id] = channel
+        return channel
+
+    def get_channel(self, channel_id):
+        return self.channels.get(channel_id)
+
+
+def make_game(score="1:0", status="2H", **fields):
+    game = {
+        "api_game_id": "g1",
+        "home_team_name": "Boston",
+        "away_team_name": "Toronto",
+        "start_time": "2026-10-16T23:00:00Z",
+        "status": status,
+        "score": score,
+        "end_time": None,
+        "game_id": 1,
+    }
+    game.update(fields)
+    return game
+
+
+@pytest.fixture
+def guild():
+    return FakeGuild(5)
+
+
+@pytest.fixture
+def games():
+    """api_games rows, replaced by tests as the games progress."""
+    return [make_game()]
+
+
+@pytest.fixture
+def service(guild, games, monkeypatch, mock_database_manager):
+    monkeypatch.setattr(live_module, "LIVE_CHANNEL_GUILD_RENAME_INTERVAL", 0)
+
+    async def fetch_all(query, *args):
+        if "FROM bets" in query:
+            return [{"guild_id": 5, "api_game_id": "g1"}]
+        return [game for game in games if game["api_game_id"] in args[0][0]]
+
+    mock_database_manager.fetch_all.side_effect = fetch_all
+    bot = SimpleNamespace(get_guild=lambda guild_id: guild)
+    return LiveGameChannelService(bot, mock_database_manager)
+
+
+class TestLiveGameChannelService:
+    """Test cases for LiveGameChannelService."""
+
+    @pytest.mark.asyncio
+    async def test_unchanged_games_cost_no_api_calls(self, service, guild):
+        """Test that a channel is created once and left alone while nothing changes."""
+        await service.update_all_live_game_channels()
+        assert len(guild.channels) == 1
+        channel = next(iter(guild.channels.values()))
+        assert channel.name == "BOS-Vs-TOR-1:0"
+
+        for _ in range(3):
+            await service.update_all_live_game_channels()
+
+        assert len(guild.channels) == 1
+        assert channel.renames == []
+        # Bets were loaded once; the games are read every cycle in one query
+        assert service.db.fetch_all.await_count == 5
+
+    @pytest.mark.asyncio
+    async def test_renames_are_rate_limited_per_channel(self, service, guild, games):
+        """Test that score changes within the channel interval keep the newest."""
+        await service.update_all_live_game_channels()
+        channel = next(iter(guild.channels.values()))
+
+        games[:] = [make_game(score="2:0")]
+        await service.update_all_live_game_channels()
+        assert channel.renames == ["BOS-Vs-TOR-2:0"]
+
+        games[:] = [make_game(score="3:0")]
+        await service.update_all_live_game_channels()
+        games[:] = [make_game(score="3:1")]
+        await service.update_all_live_game_channels()
+        assert channel.renames == ["BOS-Vs-TOR-2:0"]
+        assert service._pending_renames[5]["g1"]["score"] == "3:1"
+
+        interval = live_module.LIVE_CHANNEL_RENAME_INTERVAL
+        service._last_channel_rename[channel.id] -= interval
+        await service.update_all_live_game_channels()
+        assert channel.renames == ["BOS-Vs-TOR-2:0", "BOS-Vs-TOR-3:1"]
+
+    @pytest.mark.asyncio
+    async def test_finished_games_are_deleted_after_the_grace_period(
+        self, service, guild, games
+    ):
+        """Test that a finished game's channel is retired and forgotten."""
+        await service.update_all_live_game_channels()
+        channel = next(iter(guild.channels.values()))
+
+        ended = datetime.now(timezone.utc) - timedelta(hours=2)
+        games[:] = [make_game(status="Finished", end_time=ended)]
+        await service.update_all_live_game_channels()
+        await asyncio.gather(*service.cleanup_tasks)
+
+        assert channel.deleted
+        assert service.guild_game_channels[5] == {}
+        assert not service._deleting_channels
@@ -0,0 +1,92 @@
+"""
+Tests for the multi-provider token-bucket rate limiter.
+"""
+
+import time
+
+import pytest
+
+from utils.multi_provider_api import (
+    MultiProviderRateLimiter,
+    TokenBucket,
+    parse_retry_after,
+)
+
+
+class TestTokenBucket:
+    """Test cases for TokenBucket."""
+
+    def test_burst_is_free_then_paced(self):
+        """Test that the burst is served immediately and the rest is spaced."""
+        bucket = TokenBucket(rate_per_minute=60, burst=2)
+        now = bucket.updated
+
+        assert bucket.reserve(now) == 0
+        assert bucket.reserve(now) == 0
+        assert bucket.reserve(now) == pytest.approx(1.0)
+        assert bucket.reserve(now) == pytest.approx(2.0)
+
+    def test_refills_over_time(self):
+        """Test that tokens come back at the configured rate."""
+        bucket = TokenBucket(rate_per_minute=60, burst=1)
+        now = bucket.updated
+
+        bucket.reserve(now)
+        assert bucket.reserve(now + 1.0) == pytest.approx(0.0)
+
+    def test_block_for_delays_next_reservation(self):
+        """Test that a Retry-After style block pushes reservations out."""
+        bucket = TokenBucket(rate_per_minute=600, burst=5)
+        now = bucket.updated
+
+        bucket.block_for(10, now)
+        assert bucket.reserve(now) == pytest.approx(10.0)
+
+
+class TestMultiProviderRateLimiter:
+    """Test cases for MultiProviderRateLimiter."""
+
+    def test_parse_retry_after_seconds(self):
+        """Test parsing a delta-seconds Retry-After header."""
+        assert parse_retry_after("5") == 5.0
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("not a date") is None
+
+    @pytest.mark.asyncio
+    async def test_acquire_does_not_serialize_burst(self):
+        """Test that callers within the burst are not delayed."""
+        limiter = MultiProviderRateLimiter()
+        started = time.monotonic()
+        await limiter.acquire("api-sports")
+        await limiter.acquire("api-sports")
+        assert time.monotonic() - started < 0.1
+        assert limiter.get_stats()["api-sports"]["acquired"] == 2
+
+    def test_429_blocks_provider(self):
+        """Test that an HTTP 429 pauses the provider for Retry-After seconds."""
+        limiter = MultiProviderRateLimiter()
+        limiter.update_from_response("api-sports", 429, {"Retry-After": "30"})
+
+        bucket = limiter.limiters["api-sports"]["bucket"]
+        assert bucket.blocked_until - time.monotonic() == pytest.approx(30, abs=1)
+        assert limiter.get_stats()["api-sports"]["server_throttles"] == 1
+
+    def test_exhausted_remaining_header_blocks(self):
+        """Test that X-RateLimit-Remaining of zero pauses until the reset."""
+        limiter = MultiProviderRateLimiter()
+        limiter.update_from_response(
+            "api-sports", 200, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "12"}
+        )
+
+        bucket = limiter.limiters["api-sports"]["bucket"]
+        assert bucket.blocked_until - time.monotonic() == pytest.approx(12, abs=1)
+
+    def test_endpoint_sub_limit(self):
+        """Test that an endpoint sub-limit is enforced on top of the provider."""
+        limiter = MultiProviderRateLimiter()
+        limiter.limiters["api-sports"]["endpoint_limits"]["/fixtures"] = 6
+        bucket = limiter._get_endpoint_bucket(
+            limiter.limiters["api-sports"], "/fixtures?date=2025-01-01"
+        )
+        assert bucket is not None
+        assert bucket.rate == pytest.approx(0.1)
@@ -0,0 +1,115 @@
+"""
+Tests for the in-memory player search index.
+"""
+
+import pytest
+
+from services.player_search_service import PlayerSearchService
+from utils.player_search_index import (
+    LeaguePlayerIndex,
+    get_player_search_index,
+    normalize_name,
+)
+
+PLAYERS = [
+    ("LeBron James", "Lakers"),
+    ("Anthony Davis", "Lakers"),
+    ("Stephen Curry", "Warriors"),
+    ("Nikola Jokic", "Nuggets"),
+    ("Jamal Murray", "Nuggets"),
+]
+
+
+def make_player(player_name, team_name, league="NBA"):
+    return {
+        "player_name": player_name,
+        "team_name": team_name,
+        "league": league,
+        "sport": "basketball",
+        "last_used": None,
+        "usage_count": 1,
+    }
+
+
+@pytest.fixture
+def player_db(mock_database_manager):
+    """Serves PLAYERS, filtered by the league the query asks for."""
+    players = [make_player(*p) for p in PLAYERS]
+
+    async def fetch_players(query, params):
+        return [p for p in players if not params or p["league"] == params[0]]
+
+    mock_database_manager.fetch_all.side_effect = fetch_players
+    mock_database_manager.execute.return_value = 1
+    return mock_database_manager
+
+
+@pytest.fixture(autouse=True)
+def clear_index():
+    get_player_search_index().clear()
+    yield
+    get_player_search_index().clear()
+
+
+class TestLeaguePlayerIndex:
+    """Test cases for LeaguePlayerIndex."""
+
+    def test_normalize_name(self):
+        """Test that accents and punctuation are dropped."""
+        assert normalize_name("Martin Ødegaard") == "martin ødegaard"
+        assert normalize_name("Leroy Sané") == "leroy sane"
+        assert normalize_name("D'Angelo  Russell") == "d angelo russell"
+
+    def test_shortlist_ranks_shared_trigrams(self):
+        """Test that the shortlist only holds players resembling the query."""
+        index = LeaguePlayerIndex("NBA")
+        index.add_many(make_player(*p) for p in PLAYERS)
+
+        shortlist = index.shortlist("jokic")
+        assert index.entries[shortlist[0]]["player_name"] == "Nikola Jokic"
+        assert "Stephen Curry" not in {
+            index.entries[i]["player_name"] for i in shortlist
+        }
+
+    def test_shortlist_team_filter(self):
+        """Test that a team limits the shortlist to its players."""
+        index = LeaguePlayerIndex("NBA")
+        index.add_many(make_player(*p) for p in PLAYERS)
+
+        names = {index.entries[i]["player_name"] for i in index.shortlist("ja", "Nuggets")}
+        assert names <= {"Nikola Jokic", "Jamal Murray"}
+        assert "Jamal Murray" in names
+
+    def test_add_updates_known_players_in_place(self):
+        """Test that re-adding a player does not duplicate it."""
+        index = LeaguePlayerIndex("NBA")
+        index.add(make_player("LeBron James", "Lakers"))
+        index.add({**make_player("LeBron James", "Lakers"), "usage_count": 9})
+
+        assert len(index) == 1
+        assert index.entries[0]["usage_count"] == 9
+
+
+class TestPlayerSearchService:
+    """Test cases for searching through the index."""
+
+    @pytest.mark.asyncio
+    async def test_index_is_built_once_per_league(self, player_db):
+        """Test that searches reuse the index instead of reloading players."""
+        results = await PlayerSearchService(player_db).search_players("lebron", "NBA")
+        assert results[0].player_name == "LeBron James"
+
+        await PlayerSearchService(player_db).search_players("curry", "NBA")
+        assert player_db.fetch_all.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_added_players_are_searchable(self, player_db):
+        """Test that add_player_to_cache updates the index immediately."""
+        service = PlayerSearchService(player_db)
+        assert not await service.search_players("wembanyama", "NBA", min_confidence=90)
+
+        assert await service.add_player_to_cache(
+            "Victor Wembanyama", "Spurs", "NBA", "basketball"
+        )
+        results = await service.search_players("wembanyama", "NBA", min_confidence=90)
+        assert [r.player_name for r in results] == ["Victor Wembanyama"]
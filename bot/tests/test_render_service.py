@@ -0,0 +1,128 @@
+"""
+Tests for the off-loop render service.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from utils.asset_loader import asset_loader
+from utils.errors import RenderQueueFullError
+from utils.render_service import RenderService, RenderServiceConfig
+from utils.slip_cache import RenderedSlipCache, slip_cache_key
+
+
+class TestRenderService:
+    """Test cases for RenderService."""
+
+    @pytest.mark.asyncio
+    async def test_render_runs_off_the_event_loop(self):
+        """Test that renders run on a worker thread and record timings."""
+        service = RenderService(RenderServiceConfig(max_workers=2, max_queue=2))
+        loop_thread = threading.get_ident()
+
+        def render(value, suffix=""):
+            time.sleep(0.01)
+            return threading.get_ident(), f"{value}{suffix}"
+
+        try:
+            thread_id, result = await service.render(
+                render, "slip", suffix=".png", name="game_line"
+            )
+        finally:
+            service.shutdown()
+
+        assert result == "slip.png"
+        assert thread_id != loop_thread
+        stats = service.get_stats()
+        assert stats["renders"]["game_line"]["renders"] == 1
+        assert stats["renders"]["game_line"]["avg_seconds"] > 0
+        assert stats["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_full_queue_rejects_renders(self):
+        """Test that renders beyond the queue bound are rejected."""
+        service = RenderService(
+            RenderServiceConfig(max_workers=1, max_queue=0, queue_timeout=0.05)
+        )
+        release = threading.Event()
+
+        try:
+            first = asyncio.ensure_future(service.render(release.wait, name="slow"))
+            await asyncio.sleep(0.01)
+            with pytest.raises(RenderQueueFullError):
+                await service.render(lambda: None, name="fast")
+            release.set()
+            assert await first is True
+        finally:
+            release.set()
+            service.shutdown()
+
+        assert service.get_stats()["rejected"] == 1
+
+    @pytest.mark.asyncio
+    async def test_cache_key_skips_identical_renders(self):
+        """Test that a repeated cache key reuses the rendered bytes."""
+        service = RenderService(
+            RenderServiceConfig(max_workers=1, max_queue=1),
+            cache=RenderedSlipCache(max_bytes=1024),
+        )
+        calls = []
+
+        def render(line):
+            calls.append(line)
+            return f"png:{line}".encode()
+
+        key = slip_cache_key("game_line", 1, line="-3.5", units=1.0)
+        try:
+            first = await service.render(render, "-3.5", name="game_line", cache_key=key)
+            second = await service.render(render, "-3.5", name="game_line", cache_key=key)
+        finally:
+            service.shutdown()
+
+        assert first == second == b"png:-3.5"
+        assert calls == ["-3.5"]
+        assert service.get_stats()["renders"]["game_line"]["cache_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_cached_previews_can_be_reused(self, tmp_path):
+        """Test that a later step gets a preview's bytes back, even from disk."""
+        key = slip_cache_key("game_line", None, line="+7", units=2.0)
+        service = RenderService(
+            RenderServiceConfig(max_workers=1, max_queue=1),
+            cache=RenderedSlipCache(max_bytes=1024, disk_dir=str(tmp_path)),
+        )
+        restarted = RenderService(
+            RenderServiceConfig(max_workers=1, max_queue=1),
+            cache=RenderedSlipCache(max_bytes=1024, disk_dir=str(tmp_path)),
+        )
+        try:
+            await service.render(lambda: b"png:+7", name="game_line", cache_key=key)
+            assert await service.get_cached(key) == b"png:+7"
+            assert await restarted.get_cached(key) == b"png:+7"
+            assert await restarted.get_cached("0" * 64) is None
+        finally:
+            service.shutdown()
+            restarted.shutdown()
+
+    def test_guild_branding_changes_the_cache_key(self, tmp_path, monkeypatch):
+        """Test that replacing a guild's logo makes its old slips unreachable."""
+        monkeypatch.setattr(asset_loader, "static_dir", str(tmp_path))
+        guild_dir = tmp_path / "guilds" / "5"
+        guild_dir.mkdir(parents=True)
+
+        def key(guild_id):
+            return slip_cache_key("game_line", guild_id, line="-3.5", units=1.0)
+
+        plain = key(5)
+        other_guild = key(6)
+        (guild_dir / "default_image.webp").write_bytes(b"old logo")
+        branded = key(5)
+        (guild_dir / "default_image.webp").write_bytes(b"new logo!")
+        rebranded = key(5)
+
+        assert len({plain, branded, rebranded}) == 3
+        assert key(5) == rebranded
+        assert key(6) == other_guild
@@ -0,0 +1,116 @@
+"""
+Tests for the cached stat rollup reads.
+"""
+
+from datetime import date, datetime
+
+import pytest
+
+from utils.enhanced_cache_manager import EnhancedCacheManager
+from utils.stats_rollups import STATS_ROLLUPS_PREFIX, StatsRollups, period_start
+
+
+@pytest.fixture
+def rollups(monkeypatch, mock_database_manager):
+    monkeypatch.delenv("REDIS_HOST", raising=False)
+    mock_database_manager.fetch_all.return_value = [
+        {
+            "user_id": 1,
+            "display_name": "Sharp",
+            "bets": 10,
+            "units_wagered": 10,
+            "net_units": 4.5,
+            "wins": 6,
+            "losses": 3,
+            "pushes": 1,
+            "reactions": 2,
+        }
+    ]
+    rollups = StatsRollups(mock_database_manager)
+    rollups.cache_manager = EnhancedCacheManager()
+    return rollups
+
+
+class TestStatsRollups:
+    """Test cases for StatsRollups."""
+
+    def test_period_start(self):
+        """Test that each period starts on its first day."""
+        now = datetime(2026, 10, 16, 15, 30)
+        assert period_start("day", now) == date(2026, 10, 16)
+        assert period_start("month", now) == date(2026, 10, 1)
+        assert period_start("year", now) == date(2026, 1, 1)
+        assert period_start("all", now) == date(1970, 1, 1)
+
+    def test_cache_prefix_is_registered(self, rollups):
+        """Test that reads can be stored in Redis under their own prefix."""
+        cache_key = rollups.cache_manager._get_cache_key(
+            STATS_ROLLUPS_PREFIX, "5:leaderboard:net_units"
+        )
+        assert cache_key == "gstats:5:leaderboard:net_units"
+
+    @pytest.mark.asyncio
+    async def test_leaderboard_is_a_cached_top_n_read(self, rollups):
+        """Test that a leaderboard reads top rows once and is then cached."""
+        first = await rollups.get_leaderboard(5, "win_rate", "month", limit=3)
+        second = await rollups.get_leaderboard(5, "win_rate", "month", limit=3)
+
+        assert first == second
+        assert first["as_of"]
+        assert first["rows"][0]["username"] == "Sharp"
+        assert first["rows"][0]["win_rate"] == pytest.approx(200 / 3)
+        fetch_all = rollups.db_manager.fetch_all
+        fetch_all.assert_awaited_once()
+        query, params = fetch_all.await_args.args
+        assert "GROUP BY" not in query
+        assert "LIMIT $4" in query
+        assert params[1:] == ("month", period_start("month"), 3)
+
+    @pytest.mark.asyncio
+    async def test_invalidate_drops_cached_reads(self, rollups):
+        """Test that invalidating a guild makes the next read query again."""
+        await rollups.get_leaderboard(5)
+        await rollups.invalidate(5)
+        await rollups.get_leaderboard(5)
+
+        assert rollups.db_manager.fetch_all.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_unknown_metric_is_rejected(self, rollups):
+        """Test that only known metrics reach the ORDER BY clause."""
+        with pytest.raises(ValueError):
+            await rollups.get_leaderboard(5, "bets; DROP TABLE bets")
+
+    @pytest.mark.asyncio
+    async def test_rebuild_invalidates_repaired_guilds(self, rollups):
+        """Test that a rebuild drops cached reads of the guilds it repaired."""
+        fetch_all = rollups.db_manager.fetch_all
+        await rollups.get_leaderboard(5)
+        leaderboard_rows = fetch_all.return_value
+        fetch_all.return_value = [{"guild_id": 5}, {"guild_id": 5}]
+
+        assert await rollups.rebuild(5) == 2
+        query, params = fetch_all.await_args.args
+        assert "INSERT INTO guild_stat_rollups" in query
+        assert params == (5,)
+
+        fetch_all.return_value = leaderboard_rows
+        await rollups.get_leaderboard(5)
+        assert fetch_all.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_date_parameters_are_cast_from_text(self, rollups):
+        """Test that period starts still match a DATE column once stringified."""
+        db = rollups.db_manager
+        db.fetch_one.return_value = {"total_bets": 10, "net_units": 4.5}
+        await rollups.get_guild_stats(5, "month")
+        db.fetch_all.return_value = []
+        await rollups.get_user_stats(5, 1)
+
+        calls = db.fetch_one.await_args_list + db.fetch_all.await_args_list
+        assert len(calls) == 3
+        for call in calls:
+            query, params = call.args
+            for position, value in enumerate(params, start=1):
+                if isinstance(value, date):
+                    assert f"${position}::text::date" in query
@@ -0,0 +1,32 @@
+"""
+Tests for the unit total voice channel updater.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+import utils.voice_channel_updater as voice_channel_updater
+from utils.voice_channel_updater import VoiceChannelUpdater
+
+
+class TestVoiceChannelUpdater:
+    """Test cases for VoiceChannelUpdater."""
+
+    @pytest.mark.asyncio
+    async def test_resolutions_are_debounced_into_one_query(
+        self, monkeypatch, mock_database_manager
+    ):
+        """Test that a burst of resolutions runs one grouped totals query."""
+        monkeypatch.setattr(voice_channel_updater, "VOICE_UPDATE_DEBOUNCE", 0)
+        updater = VoiceChannelUpdater(SimpleNamespace(), mock_database_manager)
+
+        for guild_id in (1, 2, 1, 3):
+            await updater.update_on_bet_resolve(guild_id)
+        await updater._flush_task
+
+        mock_database_manager.fetch_all.assert_awaited_once()
+        query, params = mock_database_manager.fetch_all.await_args.args
+        assert "GROUP BY gs.guild_id" in query
+        assert "ANY($3)" in query
+        assert sorted(params[2]) == [1, 2, 3]
@@ -0,0 +1,231 @@
+"""
+Asset Path Index for DBSBM.
+In-memory index of the static logos tree so logo lookups are dictionary hits
+instead of chains of os.path.exists/os.listdir calls. The index is persisted
+to a JSON manifest for fast cold starts and refreshed incrementally by
+comparing directory mtimes.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+DEFAULT_REFRESH_INTERVAL = float(os.getenv("ASSET_INDEX_REFRESH_INTERVAL", "60"))
+
+
+def _dir_key(parts: Iterable[str]) -> str:
+    """Normalized (case-insensitive) key for a directory relative to the root."""
+    return "/".join(str(part).strip().lower() for part in parts if part)
+
+
+class AssetPathIndex:
+    """Case-insensitive index of every directory and file under a root.
+
+    Each directory is stored under its lower-cased relative path together
+    with its real path, its mtime and a map of lower-cased file names to the
+    real names on disk. ``refresh()`` stats the indexed directories and only
+    re-lists the ones whose mtime changed (a new file or subdirectory bumps
+    the mtime of its parent), so keeping the index current costs one stat per
+    directory rather than a rescan of the tree.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        manifest_path: Optional[str] = None,
+        refresh_interval: float = DEFAULT_REFRESH_INTERVAL,
+    ):
+        self.root = os.path.abspath(root)
+        # Kept next to (not inside) the root so writing it does not change
+        # the mtime of an indexed directory
+        self.manifest_path = manifest_path or os.getenv(
+            "ASSET_INDEX_MANIFEST",
+            os.path.join(
+                os.path.dirname(self.root), f".{os.path.basename(self.root)}_index.json"
+            ),
+        )
+        self.refresh_interval = refresh_interval
+        self._dirs: Dict[str, Dict] = {}
+        self._loaded = False
+        self._last_refresh = 0.0
+        self._lock = threading.RLock()
+        self.stats = {"builds": 0, "refreshes": 0, "rescanned_dirs": 0}
+
+    def _scan_dir(self, key: str, path: str) -> None:
+        """(Re)list one directory and recurse into subdirectories not yet indexed."""
+        try:
+            mtime = os.stat(path).st_mtime
+            entries = list(os.scandir(path))
+        except OSError:
+            self._drop_dir(key)
+            return
+        files = {}
+        subdirs = {}
+        for entry in entries:
+            if entry.is_dir():
+                subdirs[entry.name.lower()] = entry.path
+            else:
+                files[entry.name.lower()] = entry.name
+
+        previous = self._dirs.get(key)
+        self._dirs[key] = {
+            "path": path,
+            "mtime": mtime,
+            "files": files,
+            "dirs": sorted(subdirs),
+        }
+        self.stats["rescanned_dirs"] += 1
+
+        prefix = f"{key}/" if key else ""
+        if previous:
+            # Forget subdirectories that were removed
+            for name in set(previous.get("dirs", ())) - set(subdirs):
+                self._drop_dir(f"{prefix}{name}")
+        for name, sub_path in subdirs.items():
+            if f"{prefix}{name}" not in self._dirs:
+                self._scan_dir(f"{prefix}{name}", sub_path)
+
+    def _drop_dir(self, key: str) -> None:
+        for known in [k for k in self._dirs if k == key or k.startswith(f"{key}/")]:
+            del self._dirs[known]
+
+    def build(self) -> None:
+        """Index the whole tree from scratch."""
+        with self._lock:
+            self._dirs = {}
+            if os.path.isdir(self.root):
+                self._scan_dir("", self.root)
+            self._loaded = True
+            self._last_refresh = time.monotonic()
+            self.stats["builds"] += 1
+            logger.info(f"Indexed {len(self._dirs)} asset directories under {self.root}")
+            self.save_manifest()
+
+    def load_manifest(self) -> bool:
+        """Load a persisted index. Returns False if there is no usable manifest."""
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if (
+            manifest.get("version") != MANIFEST_VERSION
+            or manifest.get("root") != self.root
+        ):
+            return False
+        with self._lock:
+            self._dirs = manifest.get("dirs", {})
+            self._loaded = True
+        logger.info(
+            f"Loaded asset index manifest with {len(self._dirs)} directories"
+        )
+        return True
+
+    def save_manifest(self) -> None:
+        """Persist the index so the next start can skip the full scan."""
+        manifest = {"version": MANIFEST_VERSION, "root": self.root, "dirs": self._dirs}
+        tmp_path = f"{self.manifest_path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(manifest, f)
+            os.replace(tmp_path, self.manifest_path)
+        except OSError as e:
+            logger.debug(f"Could not write asset index manifest: {e}")
+
+    def refresh(self, force: bool = False) -> int:
+        """Re-list directories whose mtime changed. Returns how many were rescanned."""
+        now = time.monotonic()
+        if not force and self._loaded and now - self._last_refresh < self.refresh_interval:
+            return 0
+        with self._lock:
+            if not self._loaded:
+                self.ensure_loaded()
+                return 0
+            if not force and now - self._last_refresh < self.refresh_interval:
+                return 0
+            self._last_refresh = now
+            self.stats["refreshes"] += 1
+
+            before = self.stats["rescanned_dirs"]
+            for key in sorted(self._dirs, key=len):
+                entry = self._dirs.get(key)
+                if entry is None:
+                    continue  # dropped along with a removed parent
+                try:
+                    mtime = os.stat(entry["path"]).st_mtime
+                except OSError:
+                    self._drop_dir(key)
+                    continue
+                if mtime != entry["mtime"]:
+                    self._scan_dir(key, entry["path"])
+            if not self._dirs and os.path.isdir(self.root):
+                self._scan_dir("", self.root)
+            rescanned = self.stats["rescanned_dirs"] - before
+            if rescanned:
+                logger.info(f"Asset index refreshed {rescanned} changed directories")
+                self.save_manifest()
+            return rescanned
+
+    def ensure_loaded(self) -> None:
+        """Load the manifest (validating it by mtime) or build the index."""
+        with self._lock:
+            if self._loaded:
+                return
+            if self.load_manifest():
+                self.refresh(force=True)
+            else:
+                self.build()
+
+    def _get_dir(self, parts: Sequence[str]) -> Optional[Dict]:
+        if not self._loaded:
+            self.ensure_loaded()
+        else:
+            self.refresh()
+        return self._dirs.get(_dir_key(parts))
+
+    def find_dir(self, *parts: str) -> Optional[str]:
+        """Real path of the directory at ``parts`` (matched case-insensitively)."""
+        entry = self._get_dir(parts)
+        return entry["path"] if entry else None
+
+    def find_file(self, dir_parts: Sequence[str], filename: str) -> Optional[str]:
+        """Real path of ``filename`` inside the directory at ``dir_parts``."""
+        entry = self._get_dir(dir_parts)
+        if not entry:
+            return None
+        real_name = entry["files"].get(filename.lower())
+        return os.path.join(entry["path"], real_name) if real_name else None
+
+    def list_files(
+        self, dir_parts: Sequence[str], extensions: Sequence[str] = (".webp",)
+    ) -> List[str]:
+        """Real file names in the directory at ``dir_parts`` with the given extensions."""
+        entry = self._get_dir(dir_parts)
+        if not entry:
+            return []
+        extensions = tuple(ext.lower() for ext in extensions)
+        return sorted(
+            name for lower, name in entry["files"].items() if lower.endswith(extensions)
+        )
+
+    def get_stats(self) -> Dict[str, int]:
+        return {**self.stats, "directories": len(self._dirs)}
+
+
+# Global indexes, one per indexed root
+_global_indexes: Dict[str, AssetPathIndex] = {}
+
+
+def get_asset_index(root: str) -> AssetPathIndex:
+    """Get the shared index for a root directory."""
+    root = os.path.abspath(root)
+    index = _global_indexes.get(root)
+    if index is None:
+        index = _global_indexes[root] = AssetPathIndex(root)
+    return index
@@ -4,10 +4,13 @@ import difflib
 import logging
 import os
 import os
-from typing import Optional, Tuple
+from typing import Any, Dict, Optional, Sequence, Tuple
 
 from PIL import Image, ImageFont
 
+from utils.asset_index import get_asset_index
+from utils.image_cache import ImageLRUCache
+
 logger = logging.getLogger(__name__)
 
 
@@ -79,6 +82,15 @@ class AssetLoader:
         # Cache for loaded assets
         self._font_cache = {}
         self._default_logo = None
+        # Decoded (and optionally pre-resized) images keyed by path and size,
+        # plus resolved logo paths keyed by lookup so repeat renders skip the
+        # name matching and filesystem probing entirely
+        self.image_cache = ImageLRUCache()
+        self._team_logo_paths: Dict[Tuple[str, str], str] = {}
+        self._player_image_paths: Dict[Tuple[str, str, str], Tuple[str, str]] = {}
+        # In-memory index of the logos tree; built (or loaded from its
+        # manifest) on first lookup so lookups never probe the filesystem
+        self.index = get_asset_index(self.logos_dir)
 
         # Log resolved paths for debugging
         logger.info(f"AssetLoader initialized. static_dir={self.static_dir}, logos_dir={self.logos_dir}, fonts_dir={self.fonts_dir}")
@@ -145,38 +157,120 @@ class AssetLoader:
             return None
 
     def load_image(
-        self, image_path: str, convert_to_rgba: bool = True
+        self,
+        image_path: str,
+        convert_to_rgba: bool = True,
+        size: Optional[Tuple[int, int]] = None,
+        warn_missing: bool = True,
     ) -> Optional[Image.Image]:
         """
         Load an image with proper error handling.
 
+        Decoded images are cached per (path, mode, size); callers get a copy.
+
         Args:
             image_path: Path to the image file
             convert_to_rgba: Whether to convert to RGBA mode
+            size: Optional (width, height) to resize to
+            warn_missing: Whether to log a warning if the file does not exist
 
         Returns:
             PIL Image object or None if loading fails
         """
-        try:
-            if not os.path.exists(image_path):
+        return self._load_cached_image(image_path, convert_to_rgba, size, warn_missing)
+
+    def _load_cached_image(
+        self,
+        image_path: str,
+        convert_to_rgba: bool = True,
+        size: Optional[Tuple[int, int]] = None,
+        warn_missing: bool = True,
+    ) -> Optional[Image.Image]:
+        """Load an image through the decoded-image cache."""
+        key = ("image", image_path, convert_to_rgba, size)
+        cached = self.image_cache.get(key)
+        if cached is not None:
+            return cached
+
+        missing = self.image_cache.is_known_miss(("path", image_path))
+        if not missing and not os.path.exists(image_path):
+            self.image_cache.record_miss(("path", image_path))
+            missing = True
+        if missing:
+            if warn_missing:
                 logger.warning(f"Image file not found: {image_path}")
-                return None
-
-            image = Image.open(image_path)
-            if convert_to_rgba and image.mode != "RGBA":
-                image = image.convert("RGBA")
-            return image
+            return None
 
+        try:
+            with Image.open(image_path) as source:
+                image = source
+                if convert_to_rgba and image.mode != "RGBA":
+                    image = image.convert("RGBA")
+                if size:
+                    image = image.resize(size, Image.Resampling.LANCZOS)
+                # Force the decode so the cached copy no longer needs the file
+                image.load()
+                if image is source:
+                    image = source.copy()
         except Exception as e:
             logger.error(f"Error loading image {image_path}: {e}")
             return None
 
+        self.image_cache.put(key, image)
+        return image.copy()
+
+    def clear_cache(self) -> None:
+        """Forget cached images and resolved paths, e.g. after logos change."""
+        self.image_cache.clear()
+        self._team_logo_paths.clear()
+        self._player_image_paths.clear()
+        self.index.refresh(force=True)
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Image cache hit/miss counters and memory usage."""
+        return {
+            **self.image_cache.get_stats(),
+            "resolved_team_logos": len(self._team_logo_paths),
+            "resolved_player_images": len(self._player_image_paths),
+        }
+
     def load_team_logo(
-        self, team_name: str, league: str, guild_id: str = None
+        self,
+        team_name: str,
+        league: str,
+        guild_id: str = None,
+        size: Optional[Tuple[int, int]] = None,
     ) -> Optional[Image.Image]:
         """
         Load team logo with fallback chain.
+
+        The resolved path is remembered per (team, league) and the decoded,
+        optionally resized RGBA image is served from the image cache. Teams
+        without a logo are negatively cached and go straight to the fallback.
         """
+        if league.upper() == "MANUAL":
+            logger.info(f"Manual entry detected - using fallback logo")
+            return self._load_fallback_logo(guild_id, size)
+
+        key = (team_name.strip().lower(), league.strip().upper())
+        logo_path = self._team_logo_paths.get(key)
+        if logo_path is None and not self.image_cache.is_known_miss(("team",) + key):
+            logo_path = self._resolve_team_logo_path(team_name, league)
+            if logo_path:
+                self._team_logo_paths[key] = logo_path
+            else:
+                self.image_cache.record_miss(("team",) + key)
+
+        if logo_path:
+            logo = self._load_cached_image(logo_path, size=size)
+            if logo is not None:
+                return logo
+            # The file disappeared or is unreadable; resolve again next time
+            self._team_logo_paths.pop(key, None)
+        return self._load_fallback_logo(guild_id, size)
+
+    def _resolve_team_logo_path(self, team_name: str, league: str) -> Optional[str]:
+        """Find the logo file for a team, or None if only the fallback applies."""
         # Import here to avoid circular imports
         from config.asset_paths import get_sport_category_for_path
 
@@ -218,31 +312,27 @@ class AssetLoader:
         filename_team = self._team_name_to_filename(normalized_team)
 
         # Get sport category
-        # Special handling for MANUAL entry
-        if league.upper() == "MANUAL":
-            logger.info(f"Manual entry detected - using fallback logo")
-            return self._load_fallback_logo(guild_id)
-
         # Special handling for UFC/MMA fighters
         if league.upper() in ["UFC", "MMA"]:
             logger.info(f"UFC/MMA detected - looking for fighter logo")
             # UFC fighters are stored in FIGHTING/UFC directory
-            ufc_logo_dir = os.path.join(self.logos_dir, "teams", "FIGHTING", "UFC")
-            ufc_logo_path = os.path.join(ufc_logo_dir, f"{filename_team}.webp")
+            ufc_logo_path = self.index.find_file(
+                ("teams", "FIGHTING", "UFC"), f"{filename_team}.webp"
+            )
 
-            if os.path.exists(ufc_logo_path):
+            if ufc_logo_path:
                 logger.info(f"Found UFC fighter logo: {ufc_logo_path}")
-                return self.load_image(ufc_logo_path)
+                return ufc_logo_path
             else:
                 logger.warning(
-                    f"No UFC fighter logo found for '{team_name}' at {ufc_logo_path}"
+                    f"No UFC fighter logo found for '{team_name}' ({filename_team}.webp)"
                 )
-                return self._load_fallback_logo(guild_id)
+                return None
 
         sport = get_sport_category_for_path(league.upper())
         if not sport:
             logger.warning(f"No sport category found for league: {league}")
-            return self._load_fallback_logo(guild_id)
+            return None
 
         logger.info(
             f"[DEBUG] Looking for team '{team_name}' in league '{league}' -> sport '{sport}'"
@@ -288,59 +378,56 @@ class AssetLoader:
         elif league.lower() == "uefa europa league" or league == "EuropaLeague":
             league_variants.extend(["UEFA_Europa_League", "UEFA EUROPA LEAGUE"])
 
+        # Directory lookups are case-insensitive, so the case variants above
+        # collapse into a single index hit
         logo_dir = None
         for variant in league_variants:
-            candidate_dir = os.path.join(self.logos_dir, "teams", sport, variant)
-            logger.info(f"[DEBUG] Trying directory: {candidate_dir}")
-            if os.path.exists(candidate_dir):
-                logo_dir = candidate_dir
-                logger.info(f"[DEBUG] Found logo directory: {logo_dir}")
+            if self.index.find_dir("teams", sport, variant):
+                logo_dir = ("teams", sport, variant)
                 break
         if not logo_dir:
             logger.warning(
                 f"No logo directory found for league: {league} (tried {league_variants})"
             )
-            return self._load_fallback_logo(guild_id)
+            return None
 
-        logger.info(f"[DEBUG] Using logo directory: {logo_dir}")
-        logger.info(f"[DEBUG] Looking for filename: {filename_team}.webp")
+        logger.debug(f"Looking for {filename_team}.webp in {'/'.join(logo_dir)}")
 
         # Try exact match (full name)
-        logo_path = os.path.join(logo_dir, f"{filename_team}.webp")
-        if os.path.exists(logo_path):
+        logo_path = self.index.find_file(logo_dir, f"{filename_team}.webp")
+        if logo_path:
             logger.info(f"Found exact logo match: {logo_path}")
-            return self.load_image(logo_path)
+            return logo_path
 
         # Try mascot-only (last word)
         mascot = filename_team.split("_")[-1]
-        mascot_path = os.path.join(logo_dir, f"{mascot}.webp")
-        if os.path.exists(mascot_path):
+        mascot_path = self.index.find_file(logo_dir, f"{mascot}.webp")
+        if mascot_path:
             logger.info(f"Found mascot-only logo match: {mascot_path}")
-            return self.load_image(mascot_path)
+            return mascot_path
 
         # Try city-only (first word)
         city = filename_team.split("_")[0]
-        city_path = os.path.join(logo_dir, f"{city}.webp")
-        if os.path.exists(city_path):
+        city_path = self.index.find_file(logo_dir, f"{city}.webp")
+        if city_path:
             logger.info(f"Found city-only logo match: {city_path}")
-            return self.load_image(city_path)
+            return city_path
 
         # Try fuzzy matching
-        candidates = [f for f in os.listdir(logo_dir) if f.endswith(".webp")]
+        candidates = self.index.list_files(logo_dir, (".webp",))
         candidate_names = [os.path.splitext(f)[0] for f in candidates]
-        import difflib
 
         matches = difflib.get_close_matches(
             filename_team, candidate_names, n=1, cutoff=0.7
         )
         if matches:
-            match_path = os.path.join(logo_dir, f"{matches[0]}.webp")
+            match_path = self.index.find_file(logo_dir, f"{matches[0]}.webp")
             logger.info(f"Found fuzzy logo match: {match_path}")
-            return self.load_image(match_path)
+            return match_path
 
         # Fallback to default logo
         logger.warning(f"No logo found for team '{team_name}' in league '{league}'")
-        return self._load_fallback_logo(guild_id)
+        return None
 
     def load_player_image(
         self, player_name: str, team_name: str, league: str, guild_id: str = None
@@ -357,14 +444,40 @@ class AssetLoader:
         Returns:
             Tuple of (PIL Image object, display name) or (None, original_name) if not found
         """
+        key = (
+            player_name.strip().lower(),
+            team_name.strip().lower(),
+            league.strip().upper(),
+        )
+        resolved = self._player_image_paths.get(key)
+        if resolved is None and not self.image_cache.is_known_miss(("player",) + key):
+            resolved = self._resolve_player_image_path(player_name, team_name, league)
+            if resolved:
+                self._player_image_paths[key] = resolved
+            else:
+                self.image_cache.record_miss(("player",) + key)
+
+        if resolved:
+            player_path, display_name = resolved
+            image = self._load_cached_image(player_path)
+            if image is not None:
+                return image, display_name
+            self._player_image_paths.pop(key, None)
+
+        fallback = self._load_fallback_logo(guild_id)
+        return fallback, player_name
+
+    def _resolve_player_image_path(
+        self, player_name: str, team_name: str, league: str
+    ) -> Optional[Tuple[str, str]]:
+        """Find a player image file, returning (path, display name) or None."""
         from config.asset_paths import get_sport_category_for_path
         from data.game_utils import normalize_team_name_any_league
 
         sport = get_sport_category_for_path(league.upper())
         if not sport:
             logger.warning(f"No sport category found for league: {league}")
-            fallback = self._load_fallback_logo(guild_id)
-            return fallback, player_name
+            return None
 
         # Normalize names
         normalized_team = (
@@ -381,34 +494,30 @@ class AssetLoader:
         )
 
         # Try exact match
-        player_dir = os.path.join(
-            self.logos_dir, "players", sport.lower(), normalized_team
-        )
-        player_path = os.path.join(player_dir, f"{normalized_player}.webp")
+        player_dir = ("players", sport.lower(), normalized_team)
+        player_path = self.index.find_file(player_dir, f"{normalized_player}.webp")
 
-        if os.path.exists(player_path):
+        if player_path:
             logger.info(f"Found exact player image: {player_path}")
-            return self.load_image(player_path), player_name
+            return player_path, player_name
 
         # Try fuzzy matching
-        if os.path.exists(player_dir):
-            candidates = [f for f in os.listdir(player_dir) if f.endswith(".webp")]
+        candidates = self.index.list_files(player_dir, (".webp",))
+        if candidates:
             candidate_names = [os.path.splitext(f)[0] for f in candidates]
             matches = difflib.get_close_matches(
                 normalized_player, candidate_names, n=1, cutoff=0.75
             )
             if matches:
-                match_path = os.path.join(player_dir, f"{matches[0]}.webp")
+                match_path = self.index.find_file(player_dir, f"{matches[0]}.webp")
                 display_name = matches[0].replace("_", " ").title()
                 logger.info(f"Found fuzzy player image match: {match_path}")
-                return self.load_image(match_path), display_name
+                return match_path, display_name
 
-        # Fallback
         logger.warning(
             f"No player image found for '{player_name}' in team '{team_name}'"
         )
-        fallback = self._load_fallback_logo(guild_id)
-        return fallback, player_name
+        return None
 
     def load_league_logo(
         self, league_code: str, sport: str = None
@@ -447,69 +556,37 @@ class AssetLoader:
             league_name.replace(" ", "_").replace("/", "_").replace("\\", "_")
         )
 
-        # Try to find the logo file
-        logo_paths = [
+        # Try to find the logo file as (directory, filename) candidates
+        sport_dir = ("leagues", sport.upper())
+        logo_candidates = [
             # Try the new naming convention first (full league name)
-            os.path.join(
-                self.logos_dir,
-                "leagues",
-                sport.upper(),
-                league_code.upper(),
-                f"{normalized_name}.webp",
-            ),
+            (sport_dir + (league_code.upper(),), f"{normalized_name}.webp"),
             # Try using league name as directory (for cases like MMA -> UFC)
-            os.path.join(
-                self.logos_dir,
-                "leagues",
-                sport.upper(),
-                league_name.upper(),
-                f"{normalized_name}.webp",
-            ),
+            (sport_dir + (league_name.upper(),), f"{normalized_name}.webp"),
             # Fallback to old naming convention (league code)
-            os.path.join(
-                self.logos_dir,
-                "leagues",
-                sport.upper(),
-                league_code.upper(),
-                f"{league_code.lower()}.webp",
-            ),
+            (sport_dir + (league_code.upper(),), f"{league_code.lower()}.webp"),
             # Try using league name as directory with lowercase filename
-            os.path.join(
-                self.logos_dir,
-                "leagues",
-                sport.upper(),
-                league_name.upper(),
-                f"{league_code.lower()}.webp",
-            ),
+            (sport_dir + (league_name.upper(),), f"{league_code.lower()}.webp"),
             # Try without sport subdirectory
-            os.path.join(
-                self.logos_dir,
-                "leagues",
-                league_code.upper(),
-                f"{normalized_name}.webp",
-            ),
-            os.path.join(
-                self.logos_dir,
-                "leagues",
-                league_code.upper(),
-                f"{league_code.lower()}.webp",
-            ),
+            (("leagues", league_code.upper()), f"{normalized_name}.webp"),
+            (("leagues", league_code.upper()), f"{league_code.lower()}.webp"),
         ]
 
-        for logo_path in logo_paths:
-            if os.path.exists(logo_path):
+        for dir_parts, filename in logo_candidates:
+            logo_path = self.index.find_file(dir_parts, filename)
+            if logo_path:
                 logger.info(f"Found league logo: {logo_path}")
                 return self.load_image(logo_path)
 
         # Try fuzzy matching in the league directory (try both league code and league name)
         league_dirs = [
-            os.path.join(self.logos_dir, "leagues", sport.upper(), league_code.upper()),
-            os.path.join(self.logos_dir, "leagues", sport.upper(), league_name.upper()),
+            sport_dir + (league_code.upper(),),
+            sport_dir + (league_name.upper(),),
         ]
 
         for league_dir in league_dirs:
-            if os.path.exists(league_dir):
-                candidates = [f for f in os.listdir(league_dir) if f.endswith(".webp")]
+            candidates = self.index.list_files(league_dir, (".webp",))
+            if candidates:
                 candidate_names = [os.path.splitext(f)[0] for f in candidates]
 
                 # Try matching against normalized league name
@@ -520,13 +597,40 @@ class AssetLoader:
                     cutoff=0.75,
                 )
                 if matches:
-                    match_path = os.path.join(league_dir, f"{matches[0]}.webp")
+                    match_path = self.index.find_file(league_dir, f"{matches[0]}.webp")
                     logger.info(f"Found fuzzy league logo match: {match_path}")
                     return self.load_image(match_path)
 
         logger.warning(f"No league logo found for '{league_code}' ({league_name})")
         return None
 
+    def find_league_logo_path(
+        self, league: str, sport_category: str, name_variants: Sequence[str] = ()
+    ) -> Optional[str]:
+        """Resolve the header logo file for a league from the asset index."""
+        league_upper = league.upper()
+        league_lower = league.lower()
+        sport_dir = ("leagues", sport_category)
+        league_dir = sport_dir + (league_upper,)
+
+        # Subfolder logo first, then a logo directly in the sport folder
+        logo_path = self.index.find_file(league_dir, f"{league_lower}.webp")
+        if logo_path:
+            return logo_path
+        for name in (*name_variants, league_lower):
+            logo_path = self.index.find_file(sport_dir, f"{name}.webp")
+            if logo_path:
+                return logo_path
+
+        # Any logo in the league folder, then a sport-level logo naming the league
+        league_files = self.index.list_files(league_dir, (".webp",))
+        if league_files:
+            return self.index.find_file(league_dir, league_files[0])
+        for fname in self.index.list_files(sport_dir, (".webp",)):
+            if league_upper in fname.upper():
+                return self.index.find_file(sport_dir, fname)
+        return None
+
     def _normalize_team_name(self, team_name: str, league: str) -> Optional[str]:
         """Normalize team name using league dictionaries."""
         try:
@@ -589,7 +693,9 @@ class AssetLoader:
         filename_team = filename_team.strip("_")
         return filename_team
 
-    def _load_fallback_logo(self, guild_id: str = None) -> Optional[Image.Image]:
+    def _load_fallback_logo(
+        self, guild_id: str = None, size: Optional[Tuple[int, int]] = None
+    ) -> Optional[Image.Image]:
         """Load fallback logo with guild-specific priority."""
         fallback_paths = []
 
@@ -608,9 +714,10 @@ class AssetLoader:
         )
 
         for path in fallback_paths:
-            if os.path.exists(path):
-                logger.info(f"Using fallback logo: {path}")
-                return self.load_image(path)
+            logo = self._load_cached_image(path, size=size, warn_missing=False)
+            if logo is not None:
+                logger.debug(f"Using fallback logo: {path}")
+                return logo
 
         logger.error("No fallback logo found")
         return None
@@ -625,23 +732,18 @@ def find_team_logo_path(team_name, league, sport_category, static_root):
     normalized_team = (
         team_name.replace(" ", "_").replace("-", "_").replace("'", "").lower()
     )
-    league_dir = os.path.join(static_root, "logos", "teams", sport_category, league)
-    logger.warning(f"[DEBUG] Searching for team logo in: {league_dir}")
-    logger.warning(f"[DEBUG] Normalized team name: {normalized_team}")
-    if not os.path.isdir(league_dir):
-        logger.warning(f"[DEBUG] Directory does not exist: {league_dir}")
+    index = get_asset_index(os.path.join(static_root, "logos"))
+    league_dir = ("teams", sport_category, league)
+    logger.debug(f"Searching for team logo '{normalized_team}' in {'/'.join(league_dir)}")
+    files = index.list_files(league_dir, (".webp", ".jpg", ".jpeg"))
+    if not files:
+        logger.debug(f"No logo files indexed for {'/'.join(league_dir)}")
         return None
-    files = [
-        f
-        for f in os.listdir(league_dir)
-        if f.lower().endswith((".webp", ".jpg", ".jpeg"))
-    ]
-    logger.warning(f"[DEBUG] Files in directory: {files}")
     # Try exact match first
     for ext in [".webp", ".jpg", ".jpeg"]:
-        candidate = os.path.join(league_dir, f"{normalized_team}{ext}")
-        if os.path.isfile(candidate):
-            logger.warning(f"[DEBUG] Found exact logo: {candidate}")
+        candidate = index.find_file(league_dir, f"{normalized_team}{ext}")
+        if candidate:
+            logger.debug(f"Found exact logo: {candidate}")
             return candidate
     from rapidfuzz import process
 
@@ -649,7 +751,7 @@ def find_team_logo_path(team_name, league, sport_category, static_root):
         normalized_team, files, limit=1, scorer=process.fuzz.partial_ratio
     )
     if matches and matches[0][1] > 80:
-        logger.warning(f"[DEBUG] Found fuzzy logo match: {matches[0][0]}")
-        return os.path.join(league_dir, matches[0][0])
-    logger.warning(f"[DEBUG] No logo found for team '{team_name}' in league '{league}'")
+        logger.debug(f"Found fuzzy logo match: {matches[0][0]}")
+        return index.find_file(league_dir, matches[0][0])
+    logger.debug(f"No logo found for team '{team_name}' in league '{league}'")
     return None
@@ -0,0 +1,292 @@
+"""
+Cache Codec for DBSBM.
+Binary encoding for cached values: a one-byte header identifies the codec and
+the compression used, values keep their types (datetime, date, Decimal, ...)
+across a round trip, and large payloads are compressed.
+"""
+
+import json
+import logging
+import os
+import pickle
+import zlib
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import Any, Callable, Dict, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+logger = logging.getLogger(__name__)
+
+# Header byte: (codec << 3) | compression. Values stay below 0x20, so they
+# never collide with legacy headerless JSON (printable first byte) or pickle
+# (0x80).
+CODEC_JSON = 1
+CODEC_PICKLE = 2
+
+COMPRESSION_NONE = 0
+COMPRESSION_ZLIB = 1
+COMPRESSION_ZSTD = 2
+COMPRESSION_LZ4 = 3
+
+# Payloads smaller than this are stored uncompressed
+COMPRESS_THRESHOLD = int(os.getenv("CACHE_COMPRESS_THRESHOLD", "1024"))
+
+# Marker key for values JSON cannot represent natively
+TYPE_KEY = "__t"
+
+_compressors: Dict[int, Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]] = {
+    COMPRESSION_ZLIB: (lambda data: zlib.compress(data, 6), zlib.decompress),
+}
+if zstandard is not None:
+    _zstd_compressor = zstandard.ZstdCompressor(level=3)
+    _zstd_decompressor = zstandard.ZstdDecompressor()
+    _compressors[COMPRESSION_ZSTD] = (
+        _zstd_compressor.compress,
+        _zstd_decompressor.decompress,
+    )
+if lz4_frame is not None:
+    _compressors[COMPRESSION_LZ4] = (lz4_frame.compress, lz4_frame.decompress)
+
+_COMPRESSION_NAMES = {
+    "none": COMPRESSION_NONE,
+    "zlib": COMPRESSION_ZLIB,
+    "zstd": COMPRESSION_ZSTD,
+    "lz4": COMPRESSION_LZ4,
+}
+
+
+def _default_compression() -> int:
+    configured = os.getenv("CACHE_COMPRESSION", "").strip().lower()
+    if configured:
+        compression = _COMPRESSION_NAMES.get(configured)
+        if compression is None or (
+            compression != COMPRESSION_NONE and compression not in _compressors
+        ):
+            logger.warning(
+                f"Cache compression '{configured}' is not available, using zlib"
+            )
+            return COMPRESSION_ZLIB
+        return compression
+    for compression in (COMPRESSION_ZSTD, COMPRESSION_LZ4, COMPRESSION_ZLIB):
+        if compression in _compressors:
+            return compression
+    return COMPRESSION_NONE
+
+
+def _encode_typed(obj: Any) -> Any:
+    """JSON ``default`` hook: tag the types JSON would otherwise lose."""
+    # datetime is a subclass of date, so it must be checked first
+    if isinstance(obj, datetime):
+        return {TYPE_KEY: "datetime", "v": obj.isoformat()}
+    if isinstance(obj, date):
+        return {TYPE_KEY: "date", "v": obj.isoformat()}
+    if isinstance(obj, time):
+        return {TYPE_KEY: "time", "v": obj.isoformat()}
+    if isinstance(obj, timedelta):
+        return {TYPE_KEY: "timedelta", "v": obj.total_seconds()}
+    if isinstance(obj, Decimal):
+        return {TYPE_KEY: "decimal", "v": str(obj)}
+    if isinstance(obj, (set, frozenset)):
+        return {TYPE_KEY: "set", "v": list(obj)}
+    if isinstance(obj, bytes):
+        return {TYPE_KEY: "bytes", "v": obj.hex()}
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def _tag_containers(value: Any) -> Any:
+    """Tag the containers JSON would silently change: tuples (which become
+    lists), sets holding them and dicts with non-str keys. Values that need no
+    tagging are returned as they are, without copying."""
+    cls = type(value)
+    if cls is dict:
+        if all(type(key) is str for key in value):
+            tagged = {key: _tag_containers(item) for key, item in value.items()}
+            return value if _unchanged(tagged.values(), value.values()) else tagged
+        return {
+            TYPE_KEY: "dict",
+            "v": [
+                [_tag_containers(key), _tag_containers(item)]
+                for key, item in value.items()
+            ],
+        }
+    if cls is list:
+        tagged = [_tag_containers(item) for item in value]
+        return value if _unchanged(tagged, value) else tagged
+    if cls is tuple:
+        return {TYPE_KEY: "tuple", "v": [_tag_containers(item) for item in value]}
+    if cls is set or cls is frozenset:
+        return {TYPE_KEY: "set", "v": [_tag_containers(item) for item in value]}
+    if isinstance(value, tuple):
+        # Named tuples and other subclasses would come back as plain tuples
+        raise TypeError(f"Type is not JSON serializable: {cls.__name__}")
+    return value
+
+
+def _unchanged(tagged, original) -> bool:
+    return all(new is old for new, old in zip(tagged, original))
+
+
+_TYPE_DECODERS: Dict[str, Callable[[Any], Any]] = {
+    "datetime": datetime.fromisoformat,
+    "date": date.fromisoformat,
+    "time": time.fromisoformat,
+    "timedelta": lambda v: timedelta(seconds=v),
+    "decimal": Decimal,
+    "set": set,
+    "bytes": bytes.fromhex,
+    "tuple": tuple,
+    "dict": dict,
+}
+
+
+def _decode_typed(obj: Dict) -> Any:
+    """Reverse of ``_encode_typed`` for a single decoded dict."""
+    if len(obj) == 2 and TYPE_KEY in obj and "v" in obj:
+        decoder = _TYPE_DECODERS.get(obj[TYPE_KEY])
+        if decoder is not None:
+            return decoder(obj["v"])
+    return obj
+
+
+def _restore_types(value: Any) -> Any:
+    if isinstance(value, dict):
+        return _decode_typed({k: _restore_types(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return [_restore_types(v) for v in value]
+    return value
+
+
+class JSONCodec:
+    """Typed JSON, using orjson when it is installed."""
+
+    codec_id = CODEC_JSON
+    _type_marker = f'"{TYPE_KEY}"'.encode()
+
+    def encode(self, value: Any) -> bytes:
+        value = _tag_containers(value)
+        if orjson is not None:
+            return orjson.dumps(
+                value,
+                default=_encode_typed,
+                option=orjson.OPT_PASSTHROUGH_DATETIME
+                | orjson.OPT_PASSTHROUGH_DATACLASS,
+            )
+        return json.dumps(
+            value, default=_encode_typed, separators=(",", ":")
+        ).encode("utf-8")
+
+    def decode(self, data: bytes) -> Any:
+        if orjson is not None:
+            value = orjson.loads(data)
+            # Only walk the result when a typed value was actually stored
+            return _restore_types(value) if self._type_marker in data else value
+        return json.loads(data, object_hook=_decode_typed)
+
+
+class PickleCodec:
+    """Fallback for objects typed JSON cannot represent."""
+
+    codec_id = CODEC_PICKLE
+
+    def encode(self, value: Any) -> bytes:
+        return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def decode(self, data: bytes) -> Any:
+        return pickle.loads(data)
+
+
+class CacheCodec:
+    """Encodes values as ``header byte + (compressed) payload``.
+
+    Values are encoded with the first codec in ``codecs`` that accepts them
+    (typed JSON, then pickle). Payloads of at least ``compress_threshold``
+    bytes are compressed with ``compression`` if that makes them smaller.
+    Headerless values written before this format existed still decode.
+    """
+
+    def __init__(
+        self,
+        compression: Optional[int] = None,
+        compress_threshold: int = COMPRESS_THRESHOLD,
+        codecs: Tuple = (JSONCodec(), PickleCodec()),
+    ):
+        self.compression = (
+            _default_compression() if compression is None else compression
+        )
+        self.compress_threshold = compress_threshold
+        self.codecs = codecs
+        self._codecs_by_id = {codec.codec_id: codec for codec in codecs}
+
+    def encode(self, value: Any) -> bytes:
+        payload = None
+        codec = None
+        for codec in self.codecs:
+            try:
+                payload = codec.encode(value)
+                break
+            except (TypeError, ValueError, OverflowError):
+                continue
+        if payload is None:
+            raise TypeError(f"No cache codec can encode {type(value).__name__}")
+
+        compression = COMPRESSION_NONE
+        if (
+            self.compression != COMPRESSION_NONE
+            and len(payload) >= self.compress_threshold
+        ):
+            compressed = _compressors[self.compression][0](payload)
+            if len(compressed) < len(payload):
+                payload = compressed
+                compression = self.compression
+        return bytes([(codec.codec_id << 3) | compression]) + payload
+
+    def decode(self, data: bytes) -> Any:
+        if not data:
+            return None
+        header = data[0]
+        if header >= 0x20:
+            return self._decode_legacy(data)
+
+        codec = self._codecs_by_id.get(header >> 3)
+        compression = header & 0x07
+        if codec is None:
+            raise ValueError(f"Unknown cache codec in header byte {header:#04x}")
+        payload = data[1:]
+        if compression != COMPRESSION_NONE:
+            if compression not in _compressors:
+                raise ValueError(f"Cache compression {compression} is not installed")
+            payload = _compressors[compression][1](payload)
+        return codec.decode(payload)
+
+    @staticmethod
+    def _decode_legacy(data: bytes) -> Any:
+        """Values stored as bare JSON or pickle before the header existed."""
+        if data[0] == 0x80:
+            return pickle.loads(data)
+        return json.loads(data.decode("utf-8"))
+
+
+# Global codec instance
+_global_codec: Optional[CacheCodec] = None
+
+
+def get_cache_codec() -> CacheCodec:
+    """Get the global cache codec instance."""
+    global _global_codec
+    if _global_codec is None:
+        _global_codec = CacheCodec()
+    return _global_codec
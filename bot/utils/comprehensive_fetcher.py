@@ -15,6 +15,8 @@ bot_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if bot_dir not in sys.path:
     sys.path.insert(0, bot_dir)
 
+from data.api_games_writer import ApiGamesBulkWriter
+from utils.http_client import close_http_client, get_http_client
 from utils.league_discovery import SPORT_ENDPOINTS, LeagueDiscovery
 from utils.fetcher_logger import (
     get_fetcher_logger,
@@ -34,6 +36,7 @@ import logging
 import os
 import psutil
 from datetime import datetime, timedelta, timezone
+from functools import partial
 from typing import Dict, List, Optional, Set
 from zoneinfo import ZoneInfo
 
@@ -55,28 +58,54 @@ logger = fetcher_logger  # Use the custom logger for all logging
 EST = ZoneInfo("America/New_York")
 UTC = ZoneInfo("UTC")
 
+# "incremental" upserts only changed games and expires stale rows in place;
+# "reload" keeps the old truncate-and-reload behaviour
+FETCH_MODE = os.getenv("FETCH_MODE", "incremental").lower()
+
+# Statuses after which a game's payload no longer changes
+FINISHED_STATUSES = (
+    'Match Finished', 'FT', 'AET', 'PEN', 'Match Cancelled', 'Match Postponed', 'Match Suspended', 'Match Interrupted',
+    'Fight Finished', 'Cancelled', 'Postponed', 'Suspended', 'Interrupted', 'Completed'
+)
+
+# How long finished games stay visible (e.g. for bet resolution) before expiry
+FINISHED_GAME_GRACE_HOURS = int(os.getenv("FINISHED_GAME_GRACE_HOURS", "6"))
+# How long after kickoff a game still marked live is kept past the fetch window;
+# beyond it the row is assumed stuck and expired like any other
+LIVE_GAME_MAX_HOURS = int(os.getenv("LIVE_GAME_MAX_HOURS", "12"))
+
 
 class ComprehensiveFetcher:
-    def __init__(self, db_pool: asyncpg.Pool):
+    def __init__(self, db_pool: asyncpg.Pool, mode: str = FETCH_MODE):
         self.db_pool = db_pool
+        self.incremental = mode != "reload"
         self.api_key = API_KEY
         if not self.api_key:
             raise ValueError("API_KEY not found in environment variables")
         # Never log API keys
 
-        self.session = None
+        self.multi_provider_api = None
         self.discovered_leagues = {}
         self.failed_leagues = set()
         self.successful_fetches = 0
         self.total_fetches = 0
+        # Mapped games are buffered here and upserted in batches; in
+        # incremental mode only games whose content changed are written
+        self.games_writer = ApiGamesBulkWriter(db_pool, fingerprint=self.incremental)
 
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        from utils.multi_provider_api import MultiProviderAPI
+
+        # One MultiProviderAPI for the whole pass: its requests borrow the
+        # process-wide HTTP session and share the global provider rate limiter
+        self.multi_provider_api = await MultiProviderAPI().__aenter__()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            await self.session.close()
+        await self.games_writer.flush()
+        if self.multi_provider_api:
+            await self.multi_provider_api.__aexit__(exc_type, exc_val, exc_tb)
+            self.multi_provider_api = None
 
     async def discover_all_leagues(self) -> Dict[str, List[Dict]]:
         """Dynamically build league list from LEAGUE_CONFIG, grouping by sport, so only mapped leagues are queried."""
@@ -107,26 +136,48 @@ class ComprehensiveFetcher:
     ) -> dict:
         """Fetch data for ALL discovered leagues and collect HTTP status codes and errors."""
         if not date:
-            date = datetime.now().strftime("%Y-%m-%d")
+            # start_time is stored in EST, so the fetch window starts at EST midnight
+            date = datetime.now(EST).strftime("%Y-%m-%d")
 
         log_fetcher_operation(
-            "Starting comprehensive fetch", {"date": date, "next_days": next_days}
+            "Starting comprehensive fetch",
+            {
+                "date": date,
+                "next_days": next_days,
+                "mode": "incremental" if self.incremental else "reload",
+            },
         )
 
-        # Clear existing data
-        await self.clear_api_games_table()
+        if self.incremental:
+            # Keep serving the existing rows; only changed games get written
+            known = await self.games_writer.load_fingerprints()
+            logger.info(f"Loaded {known} stored game fingerprints")
+        else:
+            # Clear existing data
+            await self.clear_api_games_table()
 
         results = {
             "total_leagues": 0,
             "successful_fetches": 0,
             "failed_fetches": 0,
             "total_games": 0,
+            "games_written": 0,
             "http_status_codes": [],
         }
+        written_before = self.games_writer.stats["rows_written"]
+
+        from utils.fetch_scheduler import ProviderFetchScheduler
+        from utils.multi_provider_api import SPORT_PROVIDER_MAP
 
-        # Fetch for each sport and league
+        scheduler = ProviderFetchScheduler.from_api_providers()
+        jobs = []
+        job_meta = []
+
+        # Queue one job per sport, league and day; the scheduler fans them out
+        # concurrently while keeping each provider within its rate limit
         for sport, leagues in self.discovered_leagues.items():
             logger.info(f"Processing {len(leagues)} leagues for {sport}")
+            provider = SPORT_PROVIDER_MAP.get(sport, "api-sports")
 
             for league in leagues:
                 # Only process league dicts (should always be dicts now)
@@ -136,93 +187,155 @@ class ComprehensiveFetcher:
 
                 results["total_leagues"] += 1
 
-                try:
-                    # Fetch for multiple days
-                    for day_offset in range(next_days):
-                        fetch_date = (
-                            datetime.strptime(date, "%Y-%m-%d")
-                            + timedelta(days=day_offset)
-                        ).strftime("%Y-%m-%d")
-
-                        games_fetched, status_code, error_msg = await self._fetch_league_games(
-                            sport, league, fetch_date, collect_status=True
+                for day_offset in range(next_days):
+                    fetch_date = (
+                        datetime.strptime(date, "%Y-%m-%d")
+                        + timedelta(days=day_offset)
+                    ).strftime("%Y-%m-%d")
+                    jobs.append(
+                        (
+                            provider,
+                            partial(
+                                self._fetch_league_games,
+                                sport,
+                                league,
+                                fetch_date,
+                                collect_status=True,
+                                raise_errors=True,
+                            ),
                         )
-                        results["http_status_codes"].append({
-                            "sport": sport,
-                            "league": league.get("name"),
-                            "date": fetch_date,
-                            "status_code": status_code,
-                            "error": error_msg
-                        })
+                    )
+                    job_meta.append((sport, league, fetch_date))
+
+        outcomes = await scheduler.run(jobs)
 
-                        if games_fetched > 0:
-                            results["total_games"] += games_fetched
-                            logger.info(
-                                f"Fetched {games_fetched} games for {league['name']} on {fetch_date}"
-                            )
+        # Write whatever is still buffered from the last partial batch
+        await self.games_writer.flush()
+        log_database_operation(
+            "Bulk upsert api_games",
+            self.games_writer.stats["failed_batches"] == 0,
+            self.games_writer.stats["rows_written"],
+        )
+        results["db_write_stats"] = dict(self.games_writer.stats)
+        results["games_written"] = self.games_writer.stats["rows_written"] - written_before
+
+        if self.incremental:
+            results["expired_games"] = await self.expire_stale_games(date)
+
+        failed_league_keys = set()
+        for (sport, league, fetch_date), outcome in zip(job_meta, outcomes):
+            league_key = (sport, str(league.get("id")))
+            if isinstance(outcome, Exception):
+                failed_league_keys.add(league_key)
+                self.failed_leagues.add(league.get("name", str(league)))
+                log_fetcher_error(
+                    f"Failed to fetch data for {league.get('name', str(league))}: {outcome}",
+                    "league_fetch",
+                )
+                results["http_status_codes"].append({
+                    "sport": sport,
+                    "league": league.get("name"),
+                    "date": fetch_date,
+                    "status_code": None,
+                    "error": str(outcome)
+                })
+                continue
 
-                        # Rate limiting between requests - reduced for hourly operation
-                        await asyncio.sleep(0.5)
+            games_queued, status_code, error_msg = outcome
+            results["http_status_codes"].append({
+                "sport": sport,
+                "league": league.get("name"),
+                "date": fetch_date,
+                "status_code": status_code,
+                "error": error_msg
+            })
+
+            if games_queued > 0:
+                results["total_games"] += games_queued
+                logger.info(
+                    f"Queued {games_queued} games for {league['name']} on {fetch_date}"
+                )
 
-                    results["successful_fetches"] += 1
+        results["failed_fetches"] = len(failed_league_keys)
+        results["successful_fetches"] = results["total_leagues"] - len(failed_league_keys)
+        self.total_fetches += len(jobs)
+        self.successful_fetches += len(jobs) - sum(
+            1 for outcome in outcomes if isinstance(outcome, Exception)
+        )
 
-                except Exception as e:
-                    results["failed_fetches"] += 1
-                    self.failed_leagues.add(league.get("name", str(league)))
-                    log_fetcher_error(
-                        f"Failed to fetch data for {league.get('name', str(league))}: {e}",
-                        "league_fetch",
-                    )
-                    continue
+        schedule_report = scheduler.get_report()
+        results["duration_seconds"] = schedule_report["duration_seconds"]
+        results["provider_throughput"] = schedule_report["providers"]
+        log_fetcher_operation("Scheduled fetch pass finished", schedule_report)
+        log_fetcher_operation("HTTP connection pool", get_http_client().get_metrics())
+        if self.multi_provider_api is not None:
+            results["rate_limiter"] = self.multi_provider_api.rate_limiter.get_stats()
 
         logger.info(f"Comprehensive fetch completed: {results}")
         return results
 
-    async def _fetch_league_games(self, sport: str, league: dict, date: str, collect_status: bool = False):
-        """Fetch games for a specific league on a specific date using MultiProviderAPI."""
+    async def _fetch_league_games(
+        self,
+        sport: str,
+        league: dict,
+        date: str,
+        collect_status: bool = False,
+        raise_errors: bool = False,
+    ):
+        """Fetch games for a specific league on a specific date using MultiProviderAPI.
+
+        Returns the number of games queued for the bulk writer; they are only
+        written when its batch fills or the fetch pass flushes it. Failures are
+        logged and count as no games, unless ``raise_errors`` is set so the
+        fetch scheduler records them as failed jobs.
+        """
         from utils.multi_provider_api import MultiProviderAPI
         import time
         start_time = time.time()
         status_code = None
         error_msg = None
-        games_saved = 0
+        games_queued = 0
         try:
             # league is always a dict now
-            async with MultiProviderAPI() as mpa:
-                games = await mpa.fetch_games(sport, league, date)
-                logger.info(f"Fetched games list: type={type(games)}, len={len(games) if hasattr(games, '__len__') else 'N/A'}, sample={games[:1] if isinstance(games, list) and games else str(games)[:200]}")
-                if not games:
-                    logger.warning(f"No games found for {league.get('name', league.get('id'))} on {date}")
-                    error_msg = "No games found"
-                for game in games:
-                    try:
-                        # Log the raw game dict for debugging
-                        logger.info(f"Raw game dict: {game}")
-                        mapped_game = self._map_game_data(game, sport, league)
-                        # Log the mapped game result for debugging
-                        logger.info(f"Mapped game result: {mapped_game}")
-                        if not mapped_game:
-                            logger.warning("Game could not be mapped: [DATA REDACTED]")
-                        else:
-                            logger.info("Mapped game: [DATA REDACTED]")
-                            save_result = await self._save_game_to_db(mapped_game)
-                            logger.info(f"Save to DB result: {save_result}")
-                            if save_result:
-                                games_saved += 1
-                    except Exception as e:
-                        log_fetcher_error(
-                            f"Error processing game for {league.get('name', league.get('id'))}: {e}",
-                            "game_processing",
-                        )
-                        continue
-            log_league_fetch(sport, league.get("name", league.get("id")), True, games_saved)
+            if self.multi_provider_api is not None:
+                games = await self.multi_provider_api.fetch_games(sport, league, date)
+            else:
+                # Called outside the fetcher's context manager
+                async with MultiProviderAPI() as mpa:
+                    games = await mpa.fetch_games(sport, league, date)
+            logger.info(f"Fetched games list: type={type(games)}, len={len(games) if hasattr(games, '__len__') else 'N/A'}, sample={games[:1] if isinstance(games, list) and games else str(games)[:200]}")
+            if not games:
+                logger.warning(f"No games found for {league.get('name', league.get('id'))} on {date}")
+                error_msg = "No games found"
+            rows = []
+            for game in games:
+                try:
+                    mapped_game = self._map_game_data(game, sport, league)
+                    if not mapped_game:
+                        logger.warning("Game could not be mapped: [DATA REDACTED]")
+                    else:
+                        rows.append(self._to_db_row(mapped_game))
+                except Exception as e:
+                    log_fetcher_error(
+                        f"Error processing game for {league.get('name', league.get('id'))}: {e}",
+                        "game_processing",
+                    )
+                    continue
+            # Queue for the bulk writer; rows are upserted in batches, so the
+            # count is of games queued, not yet written (see db_write_stats)
+            await self.games_writer.add_many(rows)
+            games_queued = len(rows)
+            log_league_fetch(sport, league.get("name", league.get("id")), True, games_queued)
             log_api_request(f"multi_provider:{sport}:{league.get('id')}", True, time.time() - start_time)
-            return (games_saved, status_code, error_msg) if collect_status else games_saved
+            return (games_queued, status_code, error_msg) if collect_status else games_queued
         except Exception as e:
             league_name = league.get("name") if isinstance(league, dict) else str(league)
             league_id = league.get("id") if isinstance(league, dict) else str(league)
             log_league_fetch(sport, league_name, False, 0, str(e))
             log_api_request(f"multi_provider:{sport}:{league_id}", False, time.time() - start_time, str(e))
+            if raise_errors:
+                # Reported by the caller along with the other failed jobs
+                raise
             log_fetcher_error(
                 f"Unexpected error fetching {league_name}: {e}", "league_fetch"
             )
@@ -570,76 +683,20 @@ class ComprehensiveFetcher:
             )
             return None
 
-    async def _save_game_to_db(self, game_data: Dict) -> bool:
-        """Save game data to the database."""
-        try:
-            # Log the full mapped game data for debugging (redact keys if needed)
-            logger.info(f"_save_game_to_db: mapped game data: {game_data}")
-            async with self.db_pool.acquire() as conn:
-                # Check if game already exists
-                row = await conn.fetchrow(
-                    "SELECT api_game_id FROM api_games WHERE api_game_id = $1",
-                    game_data["api_game_id"],
-                )
-
-                if row:
-                    logger.info(f"Game already exists in DB: {game_data['api_game_id']}")
-                    # Update existing game
-                    result = await conn.execute(
-                        """
-                        UPDATE api_games SET
-                            sport = $1, league_id = $2, league_name = $3,
-                            home_team_name = $4, away_team_name = $5,
-                            start_time = $6, status = $7, score = $8, venue = $9,
-                            updated_at = NOW()
-                        WHERE api_game_id = $10
-                        """,
-                        game_data["sport"],
-                        game_data["league_id"],
-                        game_data["league_name"],
-                        game_data["home_team_name"],
-                        game_data["away_team_name"],
-                        game_data["start_time"],
-                        game_data["status"],
-                        str(game_data["score"]) if game_data["score"] else None,
-                        game_data["venue"],
-                        game_data["api_game_id"],
-                    )
-                    logger.info(f"UPDATE result: {result}")
-                    log_database_operation("UPDATE game", True, 1)
-                else:
-                    logger.info(f"Inserting new game into DB: {game_data['api_game_id']}")
-                    # Insert new game
-                    result = await conn.execute(
-                        """
-                        INSERT INTO api_games (
-                            api_game_id, sport, league_id, league_name,
-                            home_team_name, away_team_name, start_time,
-                            status, score, venue, created_at, updated_at
-                        ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, NOW(), NOW())
-                        """,
-                        game_data["api_game_id"],
-                        game_data["sport"],
-                        game_data["league_id"],
-                        game_data["league_name"],
-                        game_data["home_team_name"],
-                        game_data["away_team_name"],
-                        game_data["start_time"],
-                        game_data["status"],
-                        str(game_data["score"]) if game_data["score"] else None,
-                        game_data["venue"],
-                    )
-                    logger.info(f"INSERT result: {result}")
-                    log_database_operation("INSERT game", True, 1)
-
-                return True
+    def _to_db_row(self, game_data: Dict) -> Dict:
+        """Convert a mapped game into an api_games row for the bulk writer."""
+        row = dict(game_data)
+        row["score"] = str(game_data["score"]) if game_data.get("score") else None
+        return row
 
-        except Exception as e:
-            logger.error(f"Exception in _save_game_to_db: {e}")
-            logger.error(f"Game data that caused error: {game_data}")
-            log_database_operation("Save game", False, 0, str(e))
-            log_fetcher_error(f"Error saving game to database: {e}", "database_save")
-            return False
+    async def _save_game_to_db(self, game_data: Dict) -> bool:
+        """Save a single game to the database through the bulk writer."""
+        written = await self.games_writer.write([self._to_db_row(game_data)])
+        if written:
+            log_database_operation("UPSERT game", True, written)
+            return True
+        log_database_operation("Save game", False, 0, "bulk upsert failed")
+        return False
 
     async def clear_api_games_table(self):
         """Clear the api_games table."""
@@ -652,6 +709,59 @@ class ComprehensiveFetcher:
                 f"Error clearing api_games table: {e}", "database_cleanup"
             )
 
+    async def expire_stale_games(self, window_start_date: str) -> int:
+        """Delete games that fell out of the fetch window or finished a while ago.
+
+        Used by incremental mode instead of emptying the table: games starting
+        before the fetch window (an EST date, like start_time) are gone unless
+        still live, as are finished games older than FINISHED_GAME_GRACE_HOURS.
+        Games that kicked off before midnight and are still being played stay
+        for live channels and bet resolution, for up to LIVE_GAME_MAX_HOURS.
+        """
+        from services.api_response_cache_service import LIVE_STATUSES
+
+        now = datetime.now(EST)
+        finished_cutoff = (
+            now - timedelta(hours=FINISHED_GAME_GRACE_HOURS)
+        ).strftime("%Y-%m-%d %H:%M:%S")
+        live_cutoff = (now - timedelta(hours=LIVE_GAME_MAX_HOURS)).strftime(
+            "%Y-%m-%d %H:%M:%S"
+        )
+        window_start = f"{window_start_date} 00:00:00"
+        try:
+            async with self.db_pool.acquire() as conn:
+                result = await conn.execute(
+                    """
+                    DELETE FROM api_games
+                    WHERE (
+                        start_time < $1
+                        AND (
+                            COALESCE(LOWER(status), '') <> ALL($4::text[])
+                            OR start_time < $5
+                        )
+                    )
+                    OR (status = ANY($2::text[]) AND start_time < $3)
+                    """,
+                    window_start,
+                    list(FINISHED_STATUSES),
+                    finished_cutoff,
+                    sorted(LIVE_STATUSES),
+                    live_cutoff,
+                )
+            deleted_count = 0
+            if result and result.startswith('DELETE'):
+                try:
+                    deleted_count = int(result.split(' ')[1])
+                except Exception:
+                    deleted_count = 0
+            log_cleanup_operation("Expired stale games", deleted_count)
+            return deleted_count
+        except Exception as e:
+            log_fetcher_error(
+                f"Error expiring stale games: {e}", "database_cleanup"
+            )
+            return 0
+
     async def clear_past_games(self):
         """Clear finished games and past games data, keeping active and upcoming games."""
         try:
@@ -665,12 +775,10 @@ class ComprehensiveFetcher:
                 result = await conn.execute(
                     """
                     DELETE FROM api_games
-                    WHERE status IN (
-                        'Match Finished', 'FT', 'AET', 'PEN', 'Match Cancelled', 'Match Postponed', 'Match Suspended', 'Match Interrupted',
-                        'Fight Finished', 'Cancelled', 'Postponed', 'Suspended', 'Interrupted', 'Completed'
-                    )
-                    OR start_time < $1
+                    WHERE status = ANY($1::text[])
+                    OR start_time < $2
                     """,
+                    list(FINISHED_STATUSES),
                     current_time_str,
                 )
 
@@ -739,9 +847,10 @@ async def run_comprehensive_hourly_fetch(db_pool: asyncpg.Pool):
             log_fetcher_operation("Running comprehensive hourly fetch for ALL leagues")
 
             async with ComprehensiveFetcher(db_pool) as fetcher:
-                # Clear past games before fetching new data
-                await fetcher.clear_past_games()
-                log_cleanup_operation("Cleared past games before fetching new data")
+                if not fetcher.incremental:
+                    # Clear past games before fetching new data
+                    await fetcher.clear_past_games()
+                    log_cleanup_operation("Cleared past games before fetching new data")
 
                 # Discover all leagues first
                 await fetcher.discover_all_leagues()
@@ -768,6 +877,17 @@ async def run_comprehensive_hourly_fetch(db_pool: asyncpg.Pool):
                 logger.info(
                     f"  - Failed leagues: {len(stats.get('failed_leagues', []))}"
                 )
+                logger.info(
+                    f"  - Pass duration: {results.get('duration_seconds', 0)}s"
+                )
+                for provider, throughput in results.get(
+                    "provider_throughput", {}
+                ).items():
+                    logger.info(
+                        f"  - {provider}: {throughput['requests']} requests, "
+                        f"{throughput['requests_per_minute']}/min "
+                        f"(limit {throughput['rate_limit']}/min)"
+                    )
 
         except Exception as e:
             log_fetcher_error(f"Error in comprehensive hourly fetch: {e}")
@@ -810,9 +930,10 @@ async def main():
         log_fetcher_error(f"Fatal error in comprehensive fetcher: {e}")
         raise
     finally:
-        # Properly close the asyncpg pool
+        # Properly close the asyncpg pool and the shared HTTP session
         if db_pool:
             await db_pool.close()
+        await close_http_client()
         log_fetcher_shutdown()
 
 
@@ -7,22 +7,32 @@ This module provides advanced caching capabilities with:
 - Circuit breaker pattern
 - Advanced serialization
 - Cache warming
+- Bounded in-process L1 cache kept coherent through Redis pub/sub
+- Tag-based invalidation (SCAN for glob patterns, never KEYS)
 - Performance monitoring
 """
 
 import asyncio
+import fnmatch
 import json
 import logging
 import os
-import pickle
 import time
+import uuid
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Union, Callable
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Union
 from functools import wraps
 
 import redis.asyncio as redis
 from redis.asyncio import ConnectionPool
 
+try:
+    from utils.cache_codec import get_cache_codec
+    from utils.local_cache import LocalLRUCache
+except ImportError:
+    from bot.utils.cache_codec import get_cache_codec
+    from bot.utils.local_cache import LocalLRUCache
+
 # Import centralized configuration with fallback
 try:
     from config.settings import get_settings
@@ -66,6 +76,12 @@ CACHE_PREFIXES = {
     "odds_data": "odds:",
     "stats_data": "stats:",
     "analytics_data": "analytics:",
+    # Free-form keys used by services (e.g. "tenant_data:{tenant_id}")
+    "service_data": "svc:",
+    # Bet slip message id -> bet context, used by reaction handlers
+    "bet_message": "betmsg:",
+    # Leaderboards and stats read from guild_stat_rollups
+    "guild_stats": "gstats:",
 }
 
 # Default TTL values (in seconds)
@@ -85,8 +101,69 @@ DEFAULT_TTLS = {
     "odds_data": 300,  # 5 minutes
     "stats_data": 3600,  # 1 hour
     "analytics_data": 7200,  # 2 hours
+    "service_data": 600,  # 10 minutes
+    "bet_message": 259200,  # 3 days
+    "guild_stats": 300,  # 5 minutes
 }
 
+# Tag indexes are sorted sets of cache keys scored by their expiry time.
+# Expired members are trimmed on every write to the index, and the index
+# itself expires with its longest-lived member. (Plain sets used to live
+# under "tag:"; those age out on their own.)
+TAG_KEY_PREFIX = "tagset:"
+# Explicit tags of an entry, stored beside it so processes that load the
+# entry from Redis can tag their L1 copy too
+ENTRY_TAGS_KEY_PREFIX = "tags:"
+# Ancestor tags registered per entry ("svc:tenant_data", "svc:tenant_data:5").
+# Whole prefixes ("svc") are not tags; clearing one is a SCAN
+MAX_DERIVED_TAG_DEPTH = int(os.getenv("CACHE_TAG_DEPTH", "3"))
+# Keys deleted per pipeline round trip, per UNLINK command, and hinted per
+# SCAN/ZSCAN step
+INVALIDATION_BATCH_SIZE = int(os.getenv("CACHE_INVALIDATION_BATCH_SIZE", "500"))
+UNLINK_CHUNK_SIZE = 100
+# Operations sent per pipeline round trip by CacheBatch
+BATCH_PIPELINE_SIZE = int(os.getenv("CACHE_BATCH_SIZE", "1000"))
+SCAN_COUNT = int(os.getenv("CACHE_SCAN_COUNT", "1000"))
+
+_GLOB_CHARS = set("*?[")
+
+# Pub/sub channel that tells every process which L1 entries to drop
+INVALIDATION_CHANNEL = os.getenv("CACHE_INVALIDATION_CHANNEL", "cache:invalidate")
+# Longest an L1 copy of a Redis entry is used; invalidation messages
+# normally drop it much sooner, this bounds staleness if one is missed
+L1_TTL = float(os.getenv("CACHE_L1_TTL", "300"))
+
+_MISSING = object()
+
+
+def derived_tags(cache_key: str) -> List[str]:
+    """Ancestor tags of a cache key below its prefix, split on ':'.
+
+    ``svc:audit_logs:5:all`` is tagged ``svc:audit_logs`` and
+    ``svc:audit_logs:5``, so clearing ``svc:audit_logs:5:*`` is a tag lookup.
+    The bare prefix is left out: every key of the prefix would land in it.
+    """
+    parts = cache_key.split(":")
+    depth = min(len(parts) - 1, MAX_DERIVED_TAG_DEPTH)
+    return [":".join(parts[: i + 1]) for i in range(1, depth) if parts[i]]
+
+
+def pattern_tag(pattern: str) -> Optional[str]:
+    """Tag equivalent to a glob pattern, or None if it needs a SCAN.
+
+    Only ``<prefix>:<literal>:*`` patterns within the derived tag depth
+    qualify.
+    """
+    if not pattern.endswith(":*"):
+        return None
+    tag = pattern[:-2]
+    if (
+        _GLOB_CHARS & set(tag)
+        or not 1 <= tag.count(":") < MAX_DERIVED_TAG_DEPTH
+    ):
+        return None
+    return tag
+
 
 class CircuitBreaker:
     """Circuit breaker pattern for cache operations."""
@@ -124,6 +201,61 @@ class CircuitBreaker:
             self.state = "OPEN"
 
 
+class CacheBatch:
+    """Cache operations queued up and sent to Redis in pipelined round trips.
+
+    Created by ``EnhancedCacheManager.batch()``. Queue ``get``, ``set`` (each
+    with its own TTL and tags), ``expire`` and ``delete`` calls, then
+    ``await execute()`` for their results in queue order. Each pipeline
+    carries up to ``BATCH_PIPELINE_SIZE`` operations, indexes its keys with
+    one ZADD per tag (the ``tagset:`` sorted sets, scored by expiry) and
+    publishes a single L1 invalidation message.
+    """
+
+    def __init__(self, manager: "EnhancedCacheManager"):
+        self._manager = manager
+        self._ops: List[tuple] = []
+
+    def __len__(self) -> int:
+        return len(self._ops)
+
+    def get(self, prefix: str, key: str) -> "CacheBatch":
+        self._ops.append(("get", prefix, key, None, None, None))
+        return self
+
+    def set(
+        self,
+        prefix: str,
+        key: str,
+        value: Any,
+        ttl: Optional[int] = None,
+        tags: Optional[Iterable[str]] = None,
+    ) -> "CacheBatch":
+        if ttl is None:
+            ttl = DEFAULT_TTLS.get(prefix, 300)
+        self._ops.append(("set", prefix, key, value, ttl, tags))
+        return self
+
+    def expire(self, prefix: str, key: str, ttl: int) -> "CacheBatch":
+        self._ops.append(("expire", prefix, key, None, ttl, None))
+        return self
+
+    def delete(self, prefix: str, key: str) -> "CacheBatch":
+        self._ops.append(("delete", prefix, key, None, None, None))
+        return self
+
+    async def execute(self) -> List[Any]:
+        """Run the queued operations and clear the queue.
+
+        Returns the value (or None) for each ``get`` and a bool for each
+        ``set``, ``expire`` and ``delete``.
+        """
+        ops, self._ops = self._ops, []
+        if not ops:
+            return []
+        return await self._manager._execute_batch(ops)
+
+
 class EnhancedCacheManager:
     """Enhanced Redis cache manager with advanced features."""
 
@@ -136,16 +268,26 @@ class EnhancedCacheManager:
         self._connection_retries = 3
         self._retry_delay = 2
         self._circuit_breaker = CircuitBreaker()
-        # Local cache fallback (in-memory cache when Redis is unavailable)
-        self._local_cache = {}
-        self._local_cache_ttl = {}
+        self._codec = get_cache_codec()
+        # L1: bounded in-process cache in front of Redis, and the only tier
+        # when Redis is unavailable
+        self._local_cache = LocalLRUCache()
         self._use_local_fallback = True
+        self._l1_ttl = L1_TTL
+        # Identifies this process's own invalidation messages
+        self._instance_id = uuid.uuid4().hex
+        self._invalidation_task: Optional[asyncio.Task] = None
+        # Per-prefix L1/L2 hit counters
+        self._tier_stats: Dict[str, Dict[str, int]] = {}
 
         self._performance_stats = {
             "hits": 0,
             "misses": 0,
             "errors": 0,
             "total_operations": 0,
+            "tag_invalidations": 0,
+            "scan_invalidations": 0,
+            "keys_invalidated": 0,
         }
 
         # Get Redis configuration
@@ -234,6 +376,7 @@ class EnhancedCacheManager:
                     await asyncio.wait_for(self._redis_client.ping(), timeout=5.0)
                     self._is_connected = True
                     self._circuit_breaker.on_success()
+                    self._start_invalidation_listener()
                     logger.info(
                         f"Successfully connected to Redis Cloud: {self._redis_host}:{self._redis_port}"
                     )
@@ -263,6 +406,9 @@ class EnhancedCacheManager:
 
     async def disconnect(self):
         """Disconnect from Redis."""
+        if self._invalidation_task:
+            self._invalidation_task.cancel()
+            self._invalidation_task = None
         if self._redis_client and self._is_connected:
             await self._redis_client.close()
             if self._connection_pool:
@@ -270,6 +416,62 @@ class EnhancedCacheManager:
             self._is_connected = False
             logger.info("Disconnected from Redis cache")
 
+    def _start_invalidation_listener(self) -> None:
+        if self._invalidation_task is None or self._invalidation_task.done():
+            self._invalidation_task = asyncio.create_task(
+                self._listen_for_invalidations()
+            )
+
+    def _invalidation_message(self, **fields: Any) -> str:
+        return json.dumps({"origin": self._instance_id, **fields})
+
+    async def _publish_invalidation(self, **fields: Any) -> None:
+        """Tell other processes to drop matching L1 entries."""
+        if not self._enabled or not self._is_connected:
+            return
+        try:
+            await self._redis_client.publish(
+                INVALIDATION_CHANNEL, self._invalidation_message(**fields)
+            )
+        except Exception as e:
+            logger.warning(f"Could not publish cache invalidation: {e}")
+
+    def _apply_invalidation(self, data: Any) -> None:
+        try:
+            message = json.loads(data)
+        except (TypeError, ValueError):
+            return
+        if message.get("origin") == self._instance_id:
+            return
+        for local_key in message.get("keys", ()):
+            self._local_cache.pop(local_key)
+        for tag in message.get("tags", ()):
+            self._local_cache.pop_tag(tag)
+        if message.get("pattern"):
+            self._drop_local_pattern(message["pattern"])
+
+    async def _listen_for_invalidations(self) -> None:
+        """Drop L1 entries that other processes changed or invalidated."""
+        while self._is_connected:
+            pubsub = self._redis_client.pubsub()
+            try:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                # Messages sent while we were not subscribed are lost
+                self._local_cache.clear()
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self._apply_invalidation(message.get("data"))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Cache invalidation listener failed, resubscribing: {e}")
+                await asyncio.sleep(self._retry_delay)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
     def _get_cache_key(self, prefix: str, key: str) -> str:
         """Generate a cache key with prefix."""
         if prefix not in CACHE_PREFIXES:
@@ -279,196 +481,401 @@ class EnhancedCacheManager:
     def _serialize_value(self, value: Any) -> bytes:
         """Serialize a value for storage in Redis with compression."""
         try:
-            # Try JSON first for simple types
-            return json.dumps(value, default=str).encode("utf-8")
-        except (TypeError, ValueError):
-            try:
-                # Fall back to pickle for complex objects
-                return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
-            except Exception as e:
-                logger.error(f"Failed to serialize value: {e}")
-                return pickle.dumps(None)
+            return self._codec.encode(value)
+        except Exception as e:
+            logger.error(f"Failed to serialize value: {e}")
+            return self._codec.encode(None)
 
     def _deserialize_value(self, value: bytes) -> Any:
         """Deserialize a value from Redis storage."""
-        if not value:
+        try:
+            return self._codec.decode(value)
+        except Exception as e:
+            logger.error(f"Failed to deserialize cached value: {e}")
             return None
 
-        try:
-            # Try JSON first
-            return json.loads(value.decode("utf-8"))
-        except (json.JSONDecodeError, UnicodeDecodeError):
+    def _record_tier(self, prefix: str, event: str) -> None:
+        stats = self._tier_stats.setdefault(
+            prefix, {"l1_hits": 0, "l2_hits": 0, "misses": 0}
+        )
+        stats[event] += 1
+        if event == "misses":
+            self._performance_stats["misses"] += 1
+        else:
+            self._performance_stats["hits"] += 1
+
+    def _store_local(
+        self,
+        local_key: str,
+        value: Any,
+        size: int,
+        ttl: float,
+        tags: Iterable[str] = (),
+    ) -> None:
+        if not self._use_local_fallback:
+            return
+        if self._enabled and self._is_connected:
+            # Redis holds the authoritative copy; cap how long L1 trusts it
+            ttl = min(ttl, self._l1_ttl)
+        self._local_cache.set(local_key, value, ttl, size, tags)
+
+    def _all_tags(self, prefix: str, key: str, tags: Optional[Iterable[str]]) -> Set[str]:
+        all_tags = set(tags or ())
+        all_tags.update(derived_tags(f"{CACHE_PREFIXES.get(prefix, f'{prefix}:')}{key}"))
+        return all_tags
+
+    @staticmethod
+    def _queue_tag_index(pipe, tag_members: Dict[str, Dict[str, float]]) -> None:
+        """Index cache keys under their tags, scored by expiry.
+
+        ``tag_members`` maps each tag to ``{cache_key: expires_at}``.
+        """
+        now = time.time()
+        for tag, members in tag_members.items():
+            tag_key = f"{TAG_KEY_PREFIX}{tag}"
+            pipe.zadd(tag_key, members)
+            pipe.zremrangebyscore(tag_key, "-inf", now)
+            ttl = max(1, int(max(members.values()) - now) + 1)
+            # NX gives a new index a TTL, GT only ever extends it
+            pipe.expire(tag_key, ttl, nx=True)
+            pipe.expire(tag_key, ttl, gt=True)
+
+    @staticmethod
+    def _queue_entry_tags(pipe, cache_key: str, tags: Optional[Iterable[str]], ttl: int) -> None:
+        """Store an entry's explicit tags beside it, or drop stale ones."""
+        entry_tags_key = f"{ENTRY_TAGS_KEY_PREFIX}{cache_key}"
+        if tags:
+            pipe.setex(entry_tags_key, ttl, json.dumps(sorted(tags)))
+        else:
+            pipe.delete(entry_tags_key)
+
+    @staticmethod
+    def _loaded_tags(cache_key: str, raw_tags: Optional[bytes]) -> Set[str]:
+        """Tags of an entry read from Redis: derived plus stored explicit ones."""
+        tags = set(derived_tags(cache_key))
+        if raw_tags:
             try:
-                # Fall back to pickle
-                return pickle.loads(value)
-            except Exception as e:
-                logger.error(f"Failed to deserialize cached value: {e}")
-                return None
+                tags.update(json.loads(raw_tags))
+            except (TypeError, ValueError):
+                pass
+        return tags
 
     async def get(self, prefix: str, key: str) -> Optional[Any]:
-        """Get a value from cache with performance tracking and local fallback."""
+        """Get a value from L1, then Redis, with performance tracking."""
         self._performance_stats["total_operations"] += 1
+        local_key = f"{prefix}:{key}"
+
+        value = self._local_cache.get(local_key, _MISSING)
+        if value is not _MISSING:
+            logger.debug(f"L1 cache HIT: {local_key}")
+            self._record_tier(prefix, "l1_hits")
+            return value
 
-        # Try Redis first
         if self._enabled and self._is_connected:
             try:
                 cache_key = self._get_cache_key(prefix, key)
-                value = await self._redis_client.get(cache_key)
+                async with self._redis_client.pipeline(transaction=False) as pipe:
+                    pipe.get(cache_key)
+                    pipe.pttl(cache_key)
+                    pipe.get(f"{ENTRY_TAGS_KEY_PREFIX}{cache_key}")
+                    raw, pttl, raw_tags = await pipe.execute()
 
-                if value is not None:
+                if raw is not None:
                     logger.debug(f"Cache HIT: {cache_key}")
-                    self._performance_stats["hits"] += 1
-                    return self._deserialize_value(value)
-                else:
-                    logger.debug(f"Cache MISS: {cache_key}")
-                    self._performance_stats["misses"] += 1
-                    return None
-            except Exception as e:
-                logger.warning(f"Redis cache error, falling back to local cache: {e}")
-                self._performance_stats["errors"] += 1
-
-        # Fallback to local cache
-        if self._use_local_fallback:
-            try:
-                local_key = f"{prefix}:{key}"
-                if local_key in self._local_cache:
-                    # Check TTL
-                    if local_key in self._local_cache_ttl:
-                        if time.time() < self._local_cache_ttl[local_key]:
-                            logger.debug(f"Local cache HIT: {local_key}")
-                            self._performance_stats["hits"] += 1
-                            return self._local_cache[local_key]
-                        else:
-                            # Expired, remove from cache
-                            del self._local_cache[local_key]
-                            del self._local_cache_ttl[local_key]
-
-                logger.debug(f"Local cache MISS: {local_key}")
-                self._performance_stats["misses"] += 1
-                return None
+                    self._record_tier(prefix, "l2_hits")
+                    value = self._deserialize_value(raw)
+                    remaining = pttl / 1000 if pttl and pttl > 0 else self._l1_ttl
+                    self._store_local(
+                        local_key,
+                        value,
+                        len(raw),
+                        remaining,
+                        self._loaded_tags(cache_key, raw_tags),
+                    )
+                    return value
+                logger.debug(f"Cache MISS: {cache_key}")
             except Exception as e:
-                logger.error(f"Error accessing local cache: {e}")
+                logger.warning(f"Redis cache error, serving from local cache only: {e}")
                 self._performance_stats["errors"] += 1
 
+        self._record_tier(prefix, "misses")
         return None
 
     async def set(
-        self, prefix: str, key: str, value: Any, ttl: Optional[int] = None
+        self,
+        prefix: str,
+        key: str,
+        value: Any,
+        ttl: Optional[int] = None,
+        tags: Optional[Iterable[str]] = None,
     ) -> bool:
-        """Set a value in cache with optional TTL and local fallback."""
+        """Set a value in Redis and L1 with optional TTL.
+
+        The entry is registered in the tag sets derived from its key plus any
+        extra ``tags`` (e.g. ``tenant:5``, ``guild:123``, ``user:42``) so it can
+        later be dropped with ``invalidate_tags``. Other processes drop their
+        L1 copy when they receive the invalidation message.
+        """
         self._performance_stats["total_operations"] += 1
 
         if ttl is None:
             ttl = DEFAULT_TTLS.get(prefix, 300)
+        all_tags = self._all_tags(prefix, key, tags)
+        local_key = f"{prefix}:{key}"
+        serialized_value = self._serialize_value(value)
 
         # Try Redis first
         if self._enabled and self._is_connected:
             try:
                 cache_key = self._get_cache_key(prefix, key)
-                serialized_value = self._serialize_value(value)
-                await self._redis_client.setex(cache_key, ttl, serialized_value)
+                async with self._redis_client.pipeline(transaction=False) as pipe:
+                    pipe.setex(cache_key, ttl, serialized_value)
+                    self._queue_entry_tags(pipe, cache_key, tags, ttl)
+                    expires_at = time.time() + ttl
+                    self._queue_tag_index(
+                        pipe, {tag: {cache_key: expires_at} for tag in all_tags}
+                    )
+                    pipe.publish(
+                        INVALIDATION_CHANNEL, self._invalidation_message(keys=[local_key])
+                    )
+                    await pipe.execute()
                 logger.debug(f"Cache SET: {cache_key} (TTL: {ttl}s)")
-
-                # Also set in local cache for fallback
-                if self._use_local_fallback:
-                    local_key = f"{prefix}:{key}"
-                    self._local_cache[local_key] = value
-                    self._local_cache_ttl[local_key] = time.time() + ttl
-
+                self._store_local(
+                    local_key, value, len(serialized_value), ttl, all_tags
+                )
                 return True
             except Exception as e:
                 logger.warning(f"Redis cache error, using local cache only: {e}")
                 self._performance_stats["errors"] += 1
 
-        # Fallback to local cache only
+        # Local cache only
         if self._use_local_fallback:
-            try:
-                local_key = f"{prefix}:{key}"
-                self._local_cache[local_key] = value
-                self._local_cache_ttl[local_key] = time.time() + ttl
-                logger.debug(f"Local cache SET: {local_key} (TTL: {ttl}s)")
-                return True
-            except Exception as e:
-                logger.error(f"Error setting local cache: {e}")
-                self._performance_stats["errors"] += 1
+            self._store_local(local_key, value, len(serialized_value), ttl, all_tags)
+            logger.debug(f"Local cache SET: {local_key} (TTL: {ttl}s)")
+            return True
 
         return False
 
     async def mget(self, prefix: str, keys: List[str]) -> List[Optional[Any]]:
-        """Get multiple values from cache efficiently."""
+        """Get multiple values, fetching only L1 misses from Redis."""
         self._performance_stats["total_operations"] += 1
 
-        if not self._enabled or not self._is_connected:
-            return [None] * len(keys)
+        results: List[Optional[Any]] = [None] * len(keys)
+        missing = []
+        for i, key in enumerate(keys):
+            value = self._local_cache.get(f"{prefix}:{key}", _MISSING)
+            if value is _MISSING:
+                missing.append(i)
+            else:
+                self._record_tier(prefix, "l1_hits")
+                results[i] = value
 
-        try:
-            cache_keys = [self._get_cache_key(prefix, key) for key in keys]
-            values = await self._redis_client.mget(cache_keys)
-
-            results = []
-            for i, value in enumerate(values):
-                if value is not None:
-                    logger.debug(f"Cache HIT: {cache_keys[i]}")
-                    self._performance_stats["hits"] += 1
-                    results.append(self._deserialize_value(value))
-                else:
-                    logger.debug(f"Cache MISS: {cache_keys[i]}")
-                    self._performance_stats["misses"] += 1
-                    results.append(None)
+        if missing and self._enabled and self._is_connected:
+            try:
+                cache_keys = [self._get_cache_key(prefix, keys[i]) for i in missing]
+                async with self._redis_client.pipeline(transaction=False) as pipe:
+                    pipe.mget(cache_keys)
+                    pipe.mget(
+                        [f"{ENTRY_TAGS_KEY_PREFIX}{cache_key}" for cache_key in cache_keys]
+                    )
+                    values, entry_tags = await pipe.execute()
+                still_missing = []
+                for i, cache_key, raw, raw_tags in zip(
+                    missing, cache_keys, values, entry_tags
+                ):
+                    if raw is None:
+                        still_missing.append(i)
+                        continue
+                    self._record_tier(prefix, "l2_hits")
+                    results[i] = self._deserialize_value(raw)
+                    # MGET returns no TTLs, so L1 keeps these for its own TTL
+                    self._store_local(
+                        f"{prefix}:{keys[i]}",
+                        results[i],
+                        len(raw),
+                        self._l1_ttl,
+                        self._loaded_tags(cache_key, raw_tags),
+                    )
+                missing = still_missing
+            except Exception as e:
+                logger.error(f"Error getting multiple values from cache: {e}")
+                self._performance_stats["errors"] += 1
 
-            return results
-        except Exception as e:
-            logger.error(f"Error getting multiple values from cache: {e}")
-            self._performance_stats["errors"] += 1
-            return [None] * len(keys)
+        for _ in missing:
+            self._record_tier(prefix, "misses")
+        return results
 
     async def mset(
         self, prefix: str, data: Dict[str, Any], ttl: Optional[int] = None
     ) -> bool:
         """Set multiple values in cache efficiently."""
-        self._performance_stats["total_operations"] += 1
-
-        if not self._enabled or not self._is_connected:
-            return False
+        batch = self.batch()
+        for key, value in data.items():
+            batch.set(prefix, key, value, ttl=ttl)
+        return all(await batch.execute())
+
+    def batch(self) -> CacheBatch:
+        """Start a pipelined batch of cache operations (see ``CacheBatch``)."""
+        return CacheBatch(self)
+
+    async def _execute_batch(self, ops: List[tuple]) -> List[Any]:
+        self._performance_stats["total_operations"] += len(ops)
+        results: List[Any] = [None] * len(ops)
+        # index -> (serialized value, tags) for every set
+        prepared: Dict[int, tuple] = {}
+        pending: List[int] = []
+        # Keys written earlier in the batch; later gets must not use L1
+        touched: Set[str] = set()
+        use_redis = self._enabled and self._is_connected
+
+        for i, (op, prefix, key, value, ttl, tags) in enumerate(ops):
+            local_key = f"{prefix}:{key}"
+            if op == "set":
+                prepared[i] = (
+                    self._serialize_value(value),
+                    self._all_tags(prefix, key, tags),
+                )
+            if op != "get":
+                touched.add(local_key)
+            elif use_redis and local_key not in touched:
+                cached = self._local_cache.get(local_key, _MISSING)
+                if cached is not _MISSING:
+                    self._record_tier(prefix, "l1_hits")
+                    results[i] = cached
+                    continue
+            pending.append(i)
 
-        try:
-            if ttl is None:
-                ttl = DEFAULT_TTLS.get(prefix, 300)
+        if not use_redis:
+            self._apply_batch_locally(ops, pending, prepared, results)
+            return results
 
-            # Prepare data for mset
-            mset_data = {}
-            for key, value in data.items():
+        for start in range(0, len(pending), BATCH_PIPELINE_SIZE):
+            chunk = pending[start : start + BATCH_PIPELINE_SIZE]
+            try:
+                await self._execute_batch_chunk(ops, chunk, prepared, results)
+            except Exception as e:
+                logger.warning(f"Redis batch error, using local cache only: {e}")
+                self._performance_stats["errors"] += 1
+                self._apply_batch_locally(ops, chunk, prepared, results)
+        return results
+
+    async def _execute_batch_chunk(
+        self,
+        ops: List[tuple],
+        chunk: List[int],
+        prepared: Dict[int, tuple],
+        results: List[Any],
+    ) -> None:
+        """Send one pipeline's worth of batch operations to Redis."""
+        changed: List[str] = []
+        tag_members: Dict[str, Dict[str, float]] = {}
+        now = time.time()
+
+        async with self._redis_client.pipeline(transaction=False) as pipe:
+            for i in chunk:
+                op, prefix, key, _, ttl, explicit_tags = ops[i]
                 cache_key = self._get_cache_key(prefix, key)
-                mset_data[cache_key] = self._serialize_value(value)
-
-            # Use pipeline for atomic operation
-            async with self._redis_client.pipeline() as pipe:
-                await pipe.mset(mset_data)
-                for cache_key in mset_data.keys():
-                    await pipe.expire(cache_key, ttl)
-                await pipe.execute()
-
-            logger.debug(f"Cache MSET: {len(data)} keys (TTL: {ttl}s)")
-            return True
-        except Exception as e:
-            logger.error(f"Error setting multiple values in cache: {e}")
-            self._performance_stats["errors"] += 1
-            return False
+                if op == "get":
+                    pipe.get(cache_key)
+                    pipe.pttl(cache_key)
+                    pipe.get(f"{ENTRY_TAGS_KEY_PREFIX}{cache_key}")
+                    continue
+                changed.append(f"{prefix}:{key}")
+                if op == "set":
+                    pipe.setex(cache_key, ttl, prepared[i][0])
+                    self._queue_entry_tags(pipe, cache_key, explicit_tags, ttl)
+                    for tag in prepared[i][1]:
+                        tag_members.setdefault(tag, {})[cache_key] = now + ttl
+                elif op == "expire":
+                    pipe.expire(cache_key, ttl)
+                else:
+                    pipe.delete(cache_key, f"{ENTRY_TAGS_KEY_PREFIX}{cache_key}")
+            self._queue_tag_index(pipe, tag_members)
+            if changed:
+                pipe.publish(
+                    INVALIDATION_CHANNEL, self._invalidation_message(keys=changed)
+                )
+            replies = iter(await pipe.execute())
+
+        for i in chunk:
+            op, prefix, key, value, ttl, _ = ops[i]
+            local_key = f"{prefix}:{key}"
+            reply = next(replies)
+            if op == "get":
+                pttl, raw_tags = next(replies), next(replies)
+                if reply is None:
+                    self._record_tier(prefix, "misses")
+                    continue
+                self._record_tier(prefix, "l2_hits")
+                results[i] = self._deserialize_value(reply)
+                remaining = pttl / 1000 if pttl and pttl > 0 else self._l1_ttl
+                self._store_local(
+                    local_key,
+                    results[i],
+                    len(reply),
+                    remaining,
+                    self._loaded_tags(self._get_cache_key(prefix, key), raw_tags),
+                )
+            elif op == "set":
+                next(replies)  # entry tags
+                serialized, tags = prepared[i]
+                self._store_local(local_key, value, len(serialized), ttl, tags)
+                results[i] = True
+            else:
+                # L1 picks up the new TTL (or the deletion) on its next read
+                dropped = self._local_cache.pop(local_key)
+                results[i] = bool(reply) or (op == "delete" and dropped)
+        logger.debug(f"Cache BATCH: {len(chunk)} operations")
+
+    def _apply_batch_locally(
+        self,
+        ops: List[tuple],
+        indices: List[int],
+        prepared: Dict[int, tuple],
+        results: List[Any],
+    ) -> None:
+        """Run batch operations against L1 alone, in queue order."""
+        for i in indices:
+            op, prefix, key, value, ttl, _ = ops[i]
+            local_key = f"{prefix}:{key}"
+            if op == "get":
+                cached = self._local_cache.get(local_key, _MISSING)
+                if cached is _MISSING:
+                    self._record_tier(prefix, "misses")
+                else:
+                    self._record_tier(prefix, "l1_hits")
+                    results[i] = cached
+            elif op == "set":
+                if self._use_local_fallback:
+                    serialized, tags = prepared[i]
+                    self._store_local(local_key, value, len(serialized), ttl, tags)
+                results[i] = self._use_local_fallback
+            elif op == "delete":
+                results[i] = self._local_cache.pop(local_key)
+            else:
+                results[i] = False
 
     async def delete(self, prefix: str, key: str) -> bool:
         """Delete a value from cache."""
+        local_key = f"{prefix}:{key}"
+        deleted = self._local_cache.pop(local_key)
         if not self._enabled or not self._is_connected:
-            return False
+            return deleted
 
         try:
             cache_key = self._get_cache_key(prefix, key)
-            result = await self._redis_client.delete(cache_key)
+            async with self._redis_client.pipeline(transaction=False) as pipe:
+                pipe.delete(cache_key, f"{ENTRY_TAGS_KEY_PREFIX}{cache_key}")
+                pipe.publish(
+                    INVALIDATION_CHANNEL, self._invalidation_message(keys=[local_key])
+                )
+                result, _ = await pipe.execute()
             if result:
                 logger.debug(f"Cache DELETE: {cache_key}")
-            return bool(result)
+            return bool(result) or deleted
         except Exception as e:
             logger.error(f"Error deleting from cache: {e}")
-            return False
+            return deleted
 
     async def exists(self, prefix: str, key: str) -> bool:
         """Check if a key exists in cache."""
@@ -494,35 +901,155 @@ class EnhancedCacheManager:
             logger.error(f"Error setting cache expiration: {e}")
             return False
 
-    async def clear_prefix(self, prefix: str, pattern: str = None) -> int:
-        """Clear all keys with a specific prefix."""
-        if not self._enabled or not self._is_connected:
-            return 0
-
-        try:
-            if pattern:
-                # Use the provided pattern directly
-                search_pattern = f"{CACHE_PREFIXES.get(prefix, prefix)}*{pattern}*"
-            else:
-                # Use the default prefix pattern
-                search_pattern = f"{CACHE_PREFIXES[prefix]}*"
+    def _drop_local_pattern(self, pattern: str) -> int:
+        return sum(
+            self._local_cache.pop(local_key)
+            for local_key in self._local_cache.keys()
+            if fnmatch.fnmatchcase(self._local_cache_key(local_key), pattern)
+        )
 
-            keys = await self._redis_client.keys(search_pattern)
-            if keys:
-                deleted = await self._redis_client.delete(*keys)
-                logger.info(
-                    f"Cleared {deleted} cache keys with prefix: {prefix}, pattern: {pattern}"
+    def _local_cache_key(self, local_key: str) -> str:
+        """Redis-style key (``svc:...``) of a local key (``service_data:...``)."""
+        prefix, _, key = local_key.partition(":")
+        return f"{CACHE_PREFIXES.get(prefix, f'{prefix}:')}{key}"
+
+    async def _unlink_batches(self, keys) -> int:
+        """UNLINK keys from an async iterator in pipelined batches."""
+        deleted = 0
+        batch = []
+        async for key in keys:
+            batch.append(key)
+            if len(batch) >= INVALIDATION_BATCH_SIZE:
+                deleted += await self._unlink(batch)
+                batch = []
+        if batch:
+            deleted += await self._unlink(batch)
+        return deleted
+
+    async def _unlink(self, batch: List) -> int:
+        # UNLINK frees memory in a background thread, unlike DEL
+        async with self._redis_client.pipeline(transaction=False) as pipe:
+            for i in range(0, len(batch), UNLINK_CHUNK_SIZE):
+                pipe.unlink(*batch[i : i + UNLINK_CHUNK_SIZE])
+            results = await pipe.execute()
+        return sum(results)
+
+    async def _live_tag_members(self, tag_key: str):
+        now = time.time()
+        async for member, expires_at in self._redis_client.zscan_iter(
+            tag_key, count=SCAN_COUNT
+        ):
+            if expires_at > now:
+                yield member
+
+    async def invalidate_tags(self, *tags: str) -> int:
+        """Delete every entry registered under any of ``tags``.
+
+        Members are read with ZSCAN and deleted in pipelined UNLINK batches,
+        so the cost is proportional to the tag's size, not the keyspace.
+        Members that already expired are skipped.
+        """
+        deleted = 0
+        for tag in tags:
+            self._performance_stats["tag_invalidations"] += 1
+            deleted += self._local_cache.pop_tag(tag)
+            if not self._enabled or not self._is_connected:
+                continue
+            tag_key = f"{TAG_KEY_PREFIX}{tag}"
+            try:
+                deleted += await self._unlink_batches(
+                    self._live_tag_members(tag_key)
                 )
-                return deleted
-            return 0
-        except Exception as e:
-            logger.error(f"Error clearing cache prefix: {e}")
-            return 0
+                await self._redis_client.unlink(tag_key)
+            except Exception as e:
+                logger.error(f"Error invalidating cache tag {tag}: {e}")
+        await self._publish_invalidation(tags=list(tags))
+        self._performance_stats["keys_invalidated"] += deleted
+        if deleted:
+            logger.info(f"Invalidated {deleted} cache keys for tags: {', '.join(tags)}")
+        return deleted
+
+    async def clear_pattern(self, pattern: str) -> int:
+        """Clear keys matching a glob pattern over full cache keys.
+
+        ``<tag>:*`` patterns become a tag invalidation; anything else falls
+        back to an incremental SCAN, which never blocks Redis the way KEYS does.
+        """
+        tag = pattern_tag(pattern)
+        if tag is not None:
+            return await self.invalidate_tags(tag)
+
+        self._performance_stats["scan_invalidations"] += 1
+        deleted = self._drop_local_pattern(pattern)
+        if self._enabled and self._is_connected:
+            try:
+                deleted += await self._unlink_batches(
+                    self._redis_client.scan_iter(match=pattern, count=SCAN_COUNT)
+                )
+            except Exception as e:
+                logger.error(f"Error clearing cache pattern {pattern}: {e}")
+            await self._publish_invalidation(pattern=pattern)
+        self._performance_stats["keys_invalidated"] += deleted
+        if deleted:
+            logger.info(f"Cleared {deleted} cache keys matching pattern: {pattern}")
+        return deleted
+
+    async def clear_prefix(self, prefix: str, pattern: str = None) -> int:
+        """Clear all keys with a specific prefix (optionally containing ``pattern``)."""
+        key_prefix = CACHE_PREFIXES.get(prefix, f"{prefix}:")
+        if pattern:
+            return await self.clear_pattern(f"{key_prefix}*{pattern}*")
+        return await self.clear_pattern(f"{key_prefix}*")
+
+    # Key/value helpers used by services that cache under free-form keys
+
+    async def enhanced_cache_get(self, key: str) -> Optional[Any]:
+        """Get a service cache entry."""
+        return await self.get("service_data", key)
+
+    async def enhanced_cache_set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[int] = None,
+        tags: Optional[Iterable[str]] = None,
+    ) -> bool:
+        """Set a service cache entry."""
+        return await self.set("service_data", key, value, ttl, tags=tags)
+
+    async def clear_cache_by_pattern(self, pattern: str) -> int:
+        """Clear service cache entries matching a key or glob pattern."""
+        cache_pattern = self._get_cache_key("service_data", pattern)
+        if not _GLOB_CHARS & set(pattern):
+            return int(await self.delete("service_data", pattern))
+        return await self.clear_pattern(cache_pattern)
+
+    async def get_cache_stats(self) -> Dict[str, Any]:
+        """Alias of ``get_stats`` used by services."""
+        return await self.get_stats()
+
+    def get_tier_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-prefix L1 and L2 (Redis) hit rates."""
+        tiers = {}
+        for prefix, counters in self._tier_stats.items():
+            lookups = sum(counters.values())
+            l2_lookups = counters["l2_hits"] + counters["misses"]
+            tiers[prefix] = {
+                **counters,
+                "l1_hit_rate": counters["l1_hits"] / lookups if lookups else 0.0,
+                "l2_hit_rate": counters["l2_hits"] / l2_lookups if l2_lookups else 0.0,
+            }
+        return tiers
 
     async def get_stats(self) -> Dict[str, Any]:
         """Get comprehensive Redis Cloud statistics."""
         if not self._enabled or not self._is_connected:
-            return {"enabled": False, "connected": False}
+            return {
+                "enabled": False,
+                "connected": False,
+                "local_cache": self._local_cache.get_stats(),
+                "tiers": self.get_tier_stats(),
+            }
 
         try:
             info = await self._redis_client.info()
@@ -550,6 +1077,11 @@ class EnhancedCacheManager:
                     "total_operations": self._performance_stats["total_operations"],
                     "hit_rate": hit_rate,
                 },
+                "invalidation": {
+                    "tag_invalidations": self._performance_stats["tag_invalidations"],
+                    "scan_invalidations": self._performance_stats["scan_invalidations"],
+                    "keys_invalidated": self._performance_stats["keys_invalidated"],
+                },
                 "redis_cloud_info": {
                     "version": info.get("redis_version", "unknown"),
                     "used_memory": info.get("used_memory_human", "N/A"),
@@ -559,10 +1091,8 @@ class EnhancedCacheManager:
                     "keyspace_misses": info.get("keyspace_misses", 0),
                     "uptime_in_seconds": info.get("uptime_in_seconds", 0),
                 },
-                "local_cache": {
-                    "size": len(self._local_cache),
-                    "ttl_entries": len(self._local_cache_ttl),
-                },
+                "local_cache": self._local_cache.get_stats(),
+                "tiers": self.get_tier_stats(),
             }
 
             # Calculate Redis Cloud hit rate
@@ -123,3 +123,7 @@ class DataProcessingError(AnalyticsServiceError):
 
 class VisualizationError(AnalyticsServiceError):
     """Exception raised for errors during data visualization."""
+
+
+class RenderQueueFullError(ServiceError):
+    """Raised when the image render queue is full and a render is rejected."""
@@ -0,0 +1,163 @@
+"""
+Provider-aware Fetch Scheduler
+Runs league/day fetch jobs concurrently while keeping every API provider
+within the calls-per-minute budget declared in API_PROVIDERS.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on simultaneous in-flight requests per provider. The pacing
+# below is what enforces the rate limit; this only caps open sockets.
+DEFAULT_MAX_CONCURRENCY = 8
+
+
+@dataclass
+class ProviderFetchStats:
+    """Throughput statistics for a single provider during one pass."""
+
+    provider: str
+    rate_limit: int
+    requests: int = 0
+    errors: int = 0
+    busy_seconds: float = 0.0
+    wait_seconds: float = 0.0
+
+    def to_dict(self, pass_seconds: float) -> Dict[str, Any]:
+        minutes = pass_seconds / 60 if pass_seconds > 0 else 0
+        return {
+            "rate_limit": self.rate_limit,
+            "requests": self.requests,
+            "errors": self.errors,
+            "requests_per_minute": (
+                round(self.requests / minutes, 2) if minutes else float(self.requests)
+            ),
+            "avg_request_seconds": (
+                round(self.busy_seconds / self.requests, 3) if self.requests else 0.0
+            ),
+            "total_wait_seconds": round(self.wait_seconds, 3),
+        }
+
+
+@dataclass
+class _ProviderSlot:
+    """Pacing state for a single provider."""
+
+    interval: float
+    semaphore: asyncio.Semaphore
+    next_start: float = 0.0
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+class ProviderFetchScheduler:
+    """Fan fetch jobs out concurrently, bounded per provider.
+
+    Each provider gets a semaphore capping in-flight requests and a start-time
+    pacer spacing request starts ``60 / rate_limit`` seconds apart. The pacer
+    only reserves a slot under its lock and sleeps outside it, so callers for
+    the same provider never queue behind one another's sleep.
+    """
+
+    def __init__(
+        self,
+        rate_limits: Dict[str, int],
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        default_rate_limit: int = 30,
+    ):
+        self.rate_limits = dict(rate_limits)
+        self.max_concurrency = max(1, max_concurrency)
+        self.default_rate_limit = default_rate_limit
+        self._slots: Dict[str, _ProviderSlot] = {}
+        self.stats: Dict[str, ProviderFetchStats] = {}
+        self.pass_started: Optional[float] = None
+        self.pass_seconds: float = 0.0
+
+    @classmethod
+    def from_api_providers(
+        cls, max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+    ) -> "ProviderFetchScheduler":
+        """Build a scheduler from the rate limits declared in API_PROVIDERS."""
+        from utils.multi_provider_api import API_PROVIDERS
+
+        rate_limits = {
+            provider: config.get("rate_limit", 30)
+            for provider, config in API_PROVIDERS.items()
+        }
+        return cls(rate_limits, max_concurrency=max_concurrency)
+
+    def _get_slot(self, provider: str) -> _ProviderSlot:
+        slot = self._slots.get(provider)
+        if slot is None:
+            rate_limit = self.rate_limits.get(provider, self.default_rate_limit)
+            rate_limit = max(1, int(rate_limit))
+            slot = _ProviderSlot(
+                interval=60.0 / rate_limit,
+                semaphore=asyncio.Semaphore(min(rate_limit, self.max_concurrency)),
+            )
+            self._slots[provider] = slot
+            self.stats[provider] = ProviderFetchStats(
+                provider=provider, rate_limit=rate_limit
+            )
+        return slot
+
+    async def _wait_for_slot(self, provider: str) -> float:
+        """Reserve the next start time for a provider and sleep until it."""
+        slot = self._get_slot(provider)
+        async with slot.lock:
+            now = time.monotonic()
+            start_at = max(now, slot.next_start)
+            slot.next_start = start_at + slot.interval
+        delay = start_at - now
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    async def submit(
+        self, provider: str, job: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Run one job under the provider's concurrency and rate budget."""
+        slot = self._get_slot(provider)
+        stats = self.stats[provider]
+        async with slot.semaphore:
+            stats.wait_seconds += await self._wait_for_slot(provider)
+            started = time.monotonic()
+            try:
+                return await job()
+            except Exception:
+                stats.errors += 1
+                raise
+            finally:
+                stats.requests += 1
+                stats.busy_seconds += time.monotonic() - started
+
+    async def run(
+        self, jobs: List[Tuple[str, Callable[[], Awaitable[Any]]]]
+    ) -> List[Any]:
+        """Run all (provider, job) pairs concurrently.
+
+        Results are returned in submission order; a job that raised has its
+        exception in place of a result.
+        """
+        self.pass_started = time.monotonic()
+        try:
+            return await asyncio.gather(
+                *(self.submit(provider, job) for provider, job in jobs),
+                return_exceptions=True,
+            )
+        finally:
+            self.pass_seconds = time.monotonic() - self.pass_started
+
+    def get_report(self) -> Dict[str, Any]:
+        """Pass duration and per-provider throughput for the last run."""
+        return {
+            "duration_seconds": round(self.pass_seconds, 2),
+            "providers": {
+                provider: stats.to_dict(self.pass_seconds)
+                for provider, stats in self.stats.items()
+            },
+        }
@@ -6,6 +6,7 @@ logger = logging.getLogger(__name__)
 # Add module-level PIL and asset_loader imports to avoid repeated/missing imports
 from PIL import Image, ImageDraw, ImageFont
 from utils.asset_loader import asset_loader
+from utils.slip_cache import slip_cache_key
 
 
 def generate_player_prop_bet_image(
@@ -186,6 +187,14 @@ class GameLineImageGenerator:
         self.guild_id = guild_id
         self.db_conn = None  # Use db_manager directly for async queries
 
+    def bet_slip_cache_key(self, **kwargs):
+        """Content key for generate_bet_slip_image called with these arguments."""
+        timestamp = kwargs.get("timestamp")
+        if timestamp is not None:
+            # The footer only shows the minute, so renders within it are identical
+            kwargs["timestamp"] = timestamp.strftime("%Y-%m-%d %H:%M UTC")
+        return slip_cache_key("game_line", self.guild_id, **kwargs)
+
     def _setup_image_parameters(self):
         """Setup image parameters and fonts."""
         from config.image_settings import (
@@ -257,12 +266,6 @@ class GameLineImageGenerator:
 
         # Special handling for UEFA Champions League to match team folder structure
         if league_upper == "UEFA CHAMPIONS LEAGUE" or league == "ChampionsLeague":
-            league_dir_variants = [
-                "uefa champions league",
-                league_upper,
-                league_cap,
-                league_lower,
-            ]
             logo_file_variants = [
                 "uefa champions league.webp",
                 league_upper + ".webp",
@@ -270,12 +273,6 @@ class GameLineImageGenerator:
                 league_lower + ".webp",
             ]
         elif league_upper == "UEFA EUROPA LEAGUE" or league == "EuropaLeague":
-            league_dir_variants = [
-                "uefa_europa_league",
-                league_upper,
-                league_cap,
-                league_lower,
-            ]
             logo_file_variants = [
                 "uefa_europa_league.webp",
                 league_upper + ".webp",
@@ -283,211 +280,15 @@ class GameLineImageGenerator:
                 league_lower + ".webp",
             ]
         else:
-            league_dir_variants = [league_upper, league_cap, league_lower]
             logo_file_variants = [
                 league_upper + ".webp",
                 league_cap + ".webp",
                 league_lower + ".webp",
             ]
 
-        # Try to find the logo file using asset_loader's logos_dir
-        logos_root = asset_loader.get_logo_dir()
-        if not logos_root:
-            return None
-
-        # First try direct paths
-        for logo_file in logo_file_variants:
-            logo_path = os.path.join(logos_root, "leagues", sport_category, logo_file)
-            if os.path.exists(logo_path):
-                return logo_path
-
-        # Try subfolder and lowercase filename first, then fallback to direct file
-        logo_path_subfolder = os.path.join(
-            "StaticFiles", "DBSBM", "static", "logos", "leagues",
-            sport_category, league_upper, f"{league_lower}.webp"
-        )
-        logo_path_direct = os.path.join(
-            "StaticFiles", "DBSBM", "static", "logos", "leagues",
-            sport_category, f"{league_lower}.webp"
-        )
-        logo_path_upper_direct = os.path.join(
-            "StaticFiles", "DBSBM", "static", "logos", "leagues",
-            sport_category, f"{league_upper}.webp"
-        )
-        logo_path = None
-        if os.path.exists(logo_path_subfolder):
-            logo_path = logo_path_subfolder
-        elif os.path.exists(logo_path_direct):
-            logo_path = logo_path_direct
-        elif os.path.exists(logo_path_upper_direct):
-            logo_path = logo_path_upper_direct
-        else:
-            # Fallback: search for any .webp file in the league folder (case-insensitive)
-            league_dir = os.path.join("StaticFiles", "DBSBM", "static", "logos", "leagues", sport_category, league_upper)
-            if os.path.isdir(league_dir):
-                for fname in os.listdir(league_dir):
-                    if fname.lower().endswith(".webp"):
-                        logo_path = os.path.join(league_dir, fname)
-                        break
-            # Fallback: search for any .webp file in the sport_category folder
-            if not logo_path:
-                sport_dir = os.path.join("StaticFiles", "DBSBM", "static", "logos", "leagues", sport_category)
-                if os.path.isdir(sport_dir):
-                    for fname in os.listdir(sport_dir):
-                        if fname.lower().endswith(".webp") and league_upper in fname.upper():
-                            logo_path = os.path.join(sport_dir, fname)
-                            break
-        logger.debug(f"League logo path: {logo_path}")
-        logger.debug(f"Logo exists: {os.path.exists(logo_path) if logo_path else False}")
-        header_text = f"{league_upper} GAMELINE BET"
-        logo_w, logo_h = 60, 50  # Wider logo
-        font_bold = params["fonts"]["bold"]
-        font_team = params["fonts"]["bold_team"]
-        font_vs = params["fonts"]["vs"]
-        font_line = params["fonts"]["line"]
-        font_odds = params["fonts"]["odds"]
-        font_footer = params["fonts"]["footer"]
-        image_width = params["image_width"]
-        image_height = params["image_height"]
-        padding = params["padding"]
-        logo_size = params["logo_size"]
-        text_w, text_h = font_bold.getbbox(header_text)[2:]
-        total_w = logo_w + 12 + text_w
-        start_x = (image_width - total_w) // 2
-        y = padding
-        # Paste league logo only if found
-        if os.path.exists(logo_path):
-            try:
-                logo_img = Image.open(logo_path).convert("RGBA")
-                logger.debug(f"Loaded logo image size: {logo_img.size}, mode: {logo_img.mode}")
-                # Pad logo to (60, 50) if needed
-                if logo_img.size != (logo_w, logo_h):
-                    padded_logo = Image.new("RGBA", (logo_w, logo_h), (0,0,0,0))
-                    lw, lh = logo_img.size
-                    px = (logo_w - lw) // 2
-                    py = (logo_h - lh) // 2
-                    logo_img = logo_img.resize((logo_w, logo_h), Image.Resampling.LANCZOS)
-                    padded_logo.paste(logo_img, (px, py), logo_img)
-                    logo_img = padded_logo
-                image.paste(logo_img, (start_x, y), logo_img)
-                logger.debug(f"Logo pasted at: {(start_x, y)}")
-                text_x = start_x + logo_w + 12
-            except Exception as e:
-                logger.error(f"Failed to load/paste league logo at {logo_path}: {e}")
-                text_x = start_x
-        else:
-            logger.warning(f"League logo not found at path: {logo_path}")
-            text_x = start_x
-        text_y = y + (logo_h - text_h) // 2
-        draw.text((text_x, text_y), header_text, font=font_bold, fill="white")
-
-        # === Body: Team Logos, VS, Team Names ===
-        base_logo_size = logo_size
-        lw = int(base_logo_size[0]*1.2)
-        lh = int(base_logo_size[1]*1.2)
-        quarter_w = image_width//4
-        left_x = quarter_w - lw//2
-        right_x = 3*quarter_w - lw//2
-        logo_y = y + logo_h + 30
-        # Left team logo
-        home_logo = self._load_team_logo(home_team, league)
-        if home_logo:
-            hl = home_logo.convert("RGBA").resize((lw,lh), Image.Resampling.LANCZOS)
-            image.paste(hl, (left_x, logo_y), hl)
-        # Right team logo
-        away_logo = self._load_team_logo(away_team, league)
-        if away_logo:
-            al = away_logo.convert("RGBA").resize((lw,lh), Image.Resampling.LANCZOS)
-            image.paste(al, (right_x, logo_y), al)
-        # VS text
-        vs = "VS"
-        vw, vh = font_vs.getbbox(vs)[2:]
-        vxx = (image_width - vw)//2
-        vyy = logo_y + (lh - vh)//2
-        draw.text((vxx, vyy), vs, font=font_vs, fill=(255,215,0))
-
-        # Team names under logos (closer to logos)
-        name_y = logo_y + lh - 10  # Move up by 18px compared to previous
-        # Ensure selected_team is always defined
-        selected_team = selected_team if selected_team is not None else ''
-        for name, x_pos in [(home_team, left_x), (away_team, right_x)]:
-            if not name: continue
-            w = font_team.getbbox(name)[2]
-            nx = x_pos + (lw - w)//2
-            color = (0,230,0) if name.lower()==(selected_team or '').lower() else "white"
-            draw.text((nx, name_y), name, font=font_team, fill=color)
-
-        # === Line (no label), Separator, Odds (move up) ===
-        line_y = name_y + 22  # Move up by 10px compared to previous
-        line_text = f"{line if line is not None else ''}"
-        lw_txt = font_line.getbbox(line_text)[2]
-        lx = (image_width - lw_txt)//2
-        draw.text((lx, line_y), line_text, font=font_line, fill="white")
-
-        sep_y = line_y + font_line.getbbox(line_text)[3] + 12  # Move up by 8px
-        draw.line([(padding, sep_y), (image_width-padding, sep_y)], fill="#aaaaaa", width=1)
-
-        odds_y = sep_y + 12  # Move up by 8px
-        odds_text = f"{odds if odds is not None else ''}"
-        ow = font_odds.getbbox(odds_text)[2]
-        ox = (image_width - ow)//2
-        draw.text((ox, odds_y), odds_text, font=font_odds, fill="white")
-
-        # === Payout row below odds ===
-        # Calculate payout text and icons
-        from bot.utils.bet_utils import calculate_profit_from_odds, determine_risk_win_display_auto, format_units_display
-        odds_val = float(odds) if odds is not None else 0.0
-        profit = calculate_profit_from_odds(odds_val, units)
-        display_as_risk = determine_risk_win_display_auto(odds_val, units, profit)
-        unit_label = "Unit" if units == 1 else "Units"
-        payout_text = format_units_display(units, display_as_risk, unit_label)
-        # lock icon path
-        lock_icon_path = os.path.join("StaticFiles", "DBSBM", "static", "lock_icon.webp")
-        payout_y = odds_y + font_odds.getbbox(odds_text)[3] + 12
-        # load lock icon
-        try:
-            lock_img = Image.open(lock_icon_path).resize((24,24)).convert("RGBA") if os.path.exists(lock_icon_path) else None
-        except Exception:
-            lock_img = None
-        pt_w = font_odds.getbbox(payout_text)[2]
-        pt_x = (image_width - pt_w)//2
-        # left icon
-        if lock_img:
-            image.paste(lock_img, (pt_x-28, payout_y), lock_img)
-        draw.text((pt_x, payout_y), payout_text, font=font_odds, fill=(255,215,0))
-        # right icon
-        if lock_img:
-            image.paste(lock_img, (pt_x+pt_w+8, payout_y), lock_img)
-
-        # === Footer (move down) ===
-        footer_font = font_footer
-        sample_text = "Hg"
-        bbox_sample = draw.textbbox((0, 0), sample_text, font=footer_font)
-        footer_h = bbox_sample[3] - bbox_sample[1]
-        f_y = image_height - footer_h - 5  # Move down by 10px compared to previous
-        # Use bet_id argument for Bet# display
-        # Use the full bet_id string for Bet#
-        if bet_id:
-            bid = f"Bet #{bet_id}"
-        else:
-            bid = "Bet #1"
-        draw.text((padding, f_y), bid, font=footer_font, fill=(200, 200, 200))
-        if timestamp:
-            ts = timestamp.strftime("%Y-%m-%d %H:%M UTC")
-            bbox_ts = draw.textbbox((0, 0), ts, font=footer_font)
-            ts_w = bbox_ts[2] - bbox_ts[0]
-            draw.text((image_width - padding - ts_w, f_y), ts, font=footer_font, fill=(200, 200, 200))
-
-        # Save or return
-        if output_path:
-            image.save(output_path, "PNG")
-            return output_path
-        else:
-            import io
-            buf=io.BytesIO()
-            image.save(buf, format="PNG")
-            buf.seek(0)
-            return buf.getvalue()
+        # Variants collapse case-insensitively in the asset index
+        name_variants = [os.path.splitext(f)[0] for f in logo_file_variants]
+        return asset_loader.find_league_logo_path(league, sport_category, name_variants)
 
     def get_next_bet_id(self, db_conn):
         """Get the next Bet# from bets table."""
@@ -551,53 +352,17 @@ class GameLineImageGenerator:
         league_lower = (league or "").lower()
         # Force NFL to use FOOTBALL as sport_category
         sport_category = "FOOTBALL" if league_upper == "NFL" else LEAGUE_CONFIG.get(league_upper, {}).get("sport", "FOOTBALL").upper()
-        logos_root = asset_loader.get_logo_dir()
-        logger.debug(f"League logo root directory: {logos_root}")
-        logo_path_subfolder = os.path.join(
-            logos_root, "leagues", sport_category, league_upper, f"{league_lower}.webp"
-        )
-        logo_path_direct = os.path.join(
-            logos_root, "leagues", sport_category, f"{league_lower}.webp"
-        )
-        logo_path_upper_direct = os.path.join(
-            logos_root, "leagues", sport_category, f"{league_upper}.webp"
-        )
-        logo_path = None
-        if logo_path_subfolder and os.path.exists(logo_path_subfolder):
-            logo_path = logo_path_subfolder
-        elif logo_path_direct and os.path.exists(logo_path_direct):
-            logo_path = logo_path_direct
-        elif logo_path_upper_direct and os.path.exists(logo_path_upper_direct):
-            logo_path = logo_path_upper_direct
-        else:
-            league_dir = os.path.join(logos_root, "leagues", sport_category, league_upper)
-            logger.debug(f"League logo fallback directory: {league_dir}")
-            if os.path.isdir(league_dir):
-                webp_files = [fname for fname in os.listdir(league_dir) if fname.lower().endswith(".webp")]
-                if webp_files:
-                    logo_path_candidate = os.path.join(league_dir, webp_files[0])
-                    if logo_path_candidate and os.path.exists(logo_path_candidate):
-                        logo_path = logo_path_candidate
-            if not logo_path:
-                sport_dir = os.path.join(logos_root, "leagues", sport_category)
-                logger.debug(f"League logo sport fallback directory: {sport_dir}")
-                if os.path.isdir(sport_dir):
-                    webp_files = [fname for fname in os.listdir(sport_dir) if fname.lower().endswith(".webp") and league_upper in fname.upper()]
-                    if webp_files:
-                        logo_path_candidate = os.path.join(sport_dir, webp_files[0])
-                        if logo_path_candidate and os.path.exists(logo_path_candidate):
-                            logo_path = logo_path_candidate
+        logo_path = asset_loader.find_league_logo_path(league_upper, sport_category)
         logger.debug(f"League logo path: {logo_path}")
-        logger.debug(f"Logo exists: {os.path.exists(logo_path) if logo_path else False}")
         header_text = f"{league_upper} GAMELINE BET"
         logo_w, logo_h = 60, 50
         text_w, text_h = font_bold.getbbox(header_text)[2:]
         total_w = logo_w + 12 + text_w
         start_x = (image_width - total_w) // 2
         y = padding
-        if logo_path and os.path.exists(logo_path):
+        if logo_path:
             try:
-                logo_img = Image.open(logo_path).convert("RGBA")
+                logo_img = asset_loader.load_image(logo_path)
                 logger.debug(f"Loaded logo image size: {logo_img.size}, mode: {logo_img.mode}")
                 # Maintain aspect ratio and center in (logo_w, logo_h)
                 orig_w, orig_h = logo_img.size
@@ -630,15 +395,13 @@ class GameLineImageGenerator:
         right_x = 3*quarter_w - lw//2
         logo_y = y + logo_h + 30
         # Left team logo
-        home_logo = self._load_team_logo(home_team, league)
+        home_logo = self._load_team_logo(home_team, league, size=(lw,lh))
         if home_logo:
-            hl = home_logo.convert("RGBA").resize((lw,lh), Image.Resampling.LANCZOS)
-            image.paste(hl, (left_x, logo_y), hl)
+            image.paste(home_logo, (left_x, logo_y), home_logo)
         # Right team logo
-        away_logo = self._load_team_logo(away_team, league)
+        away_logo = self._load_team_logo(away_team, league, size=(lw,lh))
         if away_logo:
-            al = away_logo.convert("RGBA").resize((lw,lh), Image.Resampling.LANCZOS)
-            image.paste(al, (right_x, logo_y), al)
+            image.paste(away_logo, (right_x, logo_y), away_logo)
         # VS text
         vs = "VS"
         vw, vh = font_vs.getbbox(vs)[2:]
@@ -686,7 +449,7 @@ class GameLineImageGenerator:
         payout_y = odds_y + font_odds.getbbox(odds_text)[3] + 12
         # load lock icon
         try:
-            lock_img = Image.open(lock_icon_path).resize((24,24)).convert("RGBA") if os.path.exists(lock_icon_path) else None
+            lock_img = asset_loader.load_image(lock_icon_path, size=(24,24), warn_missing=False)
         except Exception:
             lock_img = None
         pt_w = font_odds.getbbox(payout_text)[2]
@@ -853,13 +616,12 @@ class GameLineImageGenerator:
 
         return y_base + text_y_offset + 50  # Return y position for next section
 
-    def _load_team_logo(self, team_name: str, league: str):
-        from PIL import Image
-
-        # Use asset_loader for all logo resolution/fallbacks
+    def _load_team_logo(self, team_name: str, league: str, size=None):
+        # Use asset_loader for all logo resolution/fallbacks; logos come back
+        # decoded as RGBA (and resized when size is given) from its cache
         # Special handling for manual entry
         if league.upper() == "MANUAL":
-            return asset_loader._load_fallback_logo(getattr(self, "guild_id", None))
+            return asset_loader._load_fallback_logo(getattr(self, "guild_id", None), size)
 
         # Special handling for individual sports - use specific logos
         elif league.lower() in ["darts", "tennis", "golf", "f1"] or any(
@@ -878,14 +640,13 @@ class GameLineImageGenerator:
             sport_all_path = os.path.join(asset_loader.get_logo_dir(), f"{sport}_all.webp")
             default_sport_path = os.path.join(asset_loader.get_logo_dir(), f"default_{sport}.webp")
 
-            if os.path.exists(sport_all_path):
-                return Image.open(sport_all_path)
-            elif os.path.exists(default_sport_path):
-                return Image.open(default_sport_path)
-            else:
-                return asset_loader.load_team_logo(team_name, league, getattr(self, "guild_id", None))
+            for path in (sport_all_path, default_sport_path):
+                logo = asset_loader.load_image(path, size=size, warn_missing=False)
+                if logo is not None:
+                    return logo
+            return asset_loader.load_team_logo(team_name, league, getattr(self, "guild_id", None), size)
         else:
-            return asset_loader.load_team_logo(team_name, league, getattr(self, "guild_id", None))
+            return asset_loader.load_team_logo(team_name, league, getattr(self, "guild_id", None), size)
 
     def _load_player_image(self, player_name: str, team_name: str, league: str):
         from utils.asset_loader import asset_loader
@@ -0,0 +1,201 @@
+"""
+Guild Settings Cache for DBSBM.
+Read-through cache of guild_settings rows. Rows live in the enhanced cache
+manager's in-process L1 (backed by Redis), concurrent misses are loaded in one
+query, and writers invalidate a guild so every process drops its copy through
+the cache manager's pub/sub channel.
+"""
+
+import asyncio
+import logging
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional
+
+try:
+    from utils.enhanced_cache_manager import get_enhanced_cache_manager
+except ImportError:
+    from bot.utils.enhanced_cache_manager import get_enhanced_cache_manager
+
+logger = logging.getLogger(__name__)
+
+# Shared with CacheWarmingService, which preloads active guilds under it
+GUILD_SETTINGS_PREFIX = "guild_data"
+# Seconds a guild's settings are cached; writers invalidate them sooner
+GUILD_SETTINGS_TTL = int(os.getenv("GUILD_SETTINGS_CACHE_TTL", "3600"))
+# Seconds a guild without a settings row is remembered as such
+GUILD_SETTINGS_NEGATIVE_TTL = int(os.getenv("GUILD_SETTINGS_NEGATIVE_TTL", "60"))
+
+EMBED_CHANNEL_COLUMNS = tuple(f"embed_channel_{i}" for i in range(1, 6))
+
+
+def _cache_key(guild_id: int) -> str:
+    return f"guild:{int(guild_id)}"
+
+
+def _optional_int(value: Any) -> Optional[int]:
+    return int(value) if value else None
+
+
+@dataclass(frozen=True)
+class GuildSettings:
+    """Typed view of a guild_settings row."""
+
+    row: Dict[str, Any]
+
+    @property
+    def guild_id(self) -> int:
+        return int(self.row["guild_id"])
+
+    @property
+    def subscription_level(self) -> Optional[str]:
+        return self.row.get("subscription_level")
+
+    @property
+    def is_paid(self) -> bool:
+        return bool(self.row.get("is_paid"))
+
+    @property
+    def is_platinum(self) -> bool:
+        return self.subscription_level == "platinum"
+
+    @property
+    def member_role(self) -> Optional[int]:
+        return _optional_int(self.row.get("member_role"))
+
+    @property
+    def embed_channel_ids(self) -> List[int]:
+        """Configured embed channels, in slot order."""
+        return [
+            int(self.row[column])
+            for column in EMBED_CHANNEL_COLUMNS
+            if self.row.get(column)
+        ]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Any other column of the row."""
+        value = self.row.get(key)
+        return default if value is None else value
+
+
+class GuildSettingsCache:
+    """Serves guild settings from memory, loading missing guilds in batches."""
+
+    def __init__(self, db_manager):
+        self.db_manager = db_manager
+        self.cache_manager = get_enhanced_cache_manager()
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._load_task: Optional[asyncio.Task] = None
+        # Bumped by invalidate() so in-flight loads do not cache stale rows
+        self._versions: Dict[int, int] = {}
+        self._stats = {"hits": 0, "loads": 0, "queries": 0, "invalidations": 0}
+
+    async def start(self):
+        """Connect the cache manager so invalidations reach other processes."""
+        await self.cache_manager.connect()
+
+    async def get(self, guild_id: int) -> Optional[GuildSettings]:
+        """Settings of a guild, or None if it has no settings row."""
+        return (await self.get_many([guild_id]))[int(guild_id)]
+
+    async def get_many(
+        self, guild_ids: Iterable[int]
+    ) -> Dict[int, Optional[GuildSettings]]:
+        """Settings of several guilds; all misses are loaded together."""
+        guild_ids = list(dict.fromkeys(int(guild_id) for guild_id in guild_ids))
+        rows = await self.cache_manager.mget(
+            GUILD_SETTINGS_PREFIX, [_cache_key(guild_id) for guild_id in guild_ids]
+        )
+
+        results: Dict[int, Optional[GuildSettings]] = {}
+        waiting = {}
+        for guild_id, row in zip(guild_ids, rows):
+            if row is None:
+                waiting[guild_id] = self._queue_load(guild_id)
+                continue
+            self._stats["hits"] += 1
+            results[guild_id] = GuildSettings(row) if row else None
+
+        for guild_id, future in waiting.items():
+            row = await future
+            results[guild_id] = GuildSettings(row) if row else None
+        return results
+
+    async def invalidate(self, guild_id: int) -> None:
+        """Drop a guild's settings here and in every other process.
+
+        Call after any write to its guild_settings row.
+        """
+        guild_id = int(guild_id)
+        self._versions[guild_id] = self._versions.get(guild_id, 0) + 1
+        self._stats["invalidations"] += 1
+        await self.cache_manager.delete(GUILD_SETTINGS_PREFIX, _cache_key(guild_id))
+
+    def _queue_load(self, guild_id: int) -> asyncio.Future:
+        future = self._pending.get(guild_id)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._pending[guild_id] = future
+            if self._load_task is None or self._load_task.done():
+                self._load_task = asyncio.create_task(self._load_pending())
+        return future
+
+    async def _load_pending(self) -> None:
+        """Load queued guilds until the queue stays empty."""
+        # Let the other lookups started in this iteration join the query
+        await asyncio.sleep(0)
+        while self._pending:
+            pending, self._pending = self._pending, {}
+            versions = {guild_id: self._versions.get(guild_id, 0) for guild_id in pending}
+            try:
+                loaded = await self._fetch_rows(list(pending))
+            except Exception as e:
+                # Answered as "no settings" for now but not cached, so the
+                # next lookup queries again
+                logger.error(f"Error loading guild settings: {e}")
+                for future in pending.values():
+                    if not future.done():
+                        future.set_result({})
+                continue
+
+            batch = self.cache_manager.batch()
+            for guild_id, future in pending.items():
+                row = loaded.get(guild_id, {})
+                if versions[guild_id] == self._versions.get(guild_id, 0):
+                    batch.set(
+                        GUILD_SETTINGS_PREFIX,
+                        _cache_key(guild_id),
+                        row,
+                        ttl=GUILD_SETTINGS_TTL if row else GUILD_SETTINGS_NEGATIVE_TTL,
+                    )
+                if not future.done():
+                    future.set_result(row)
+            try:
+                await batch.execute()
+            except Exception as e:
+                logger.warning(f"Error caching guild settings: {e}")
+
+    async def _fetch_rows(self, guild_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        self._stats["queries"] += 1
+        self._stats["loads"] += len(guild_ids)
+        rows = await self.db_manager.fetch_all(
+            "SELECT * FROM guild_settings WHERE guild_id = ANY($1)",
+            (guild_ids,),
+            raise_errors=True,
+        )
+        return {int(row["guild_id"]): dict(row) for row in rows}
+
+    def get_stats(self) -> Dict[str, int]:
+        return dict(self._stats)
+
+
+# Global guild settings cache instance
+_global_guild_settings_cache: Optional[GuildSettingsCache] = None
+
+
+def get_guild_settings_cache(db_manager) -> GuildSettingsCache:
+    """Get the global guild settings cache, created on first use."""
+    global _global_guild_settings_cache
+    if _global_guild_settings_cache is None:
+        _global_guild_settings_cache = GuildSettingsCache(db_manager)
+    return _global_guild_settings_cache
@@ -0,0 +1,156 @@
+"""
+Shared HTTP client for DBSBM.
+Provides one long-lived aiohttp session per process with a tuned TCP
+connector, so outbound API calls reuse keep-alive connections, TLS sessions
+and cached DNS lookups instead of opening a fresh session per request.
+"""
+
+import asyncio
+import logging
+import os
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class HTTPClientConfig:
+    """Connector and timeout settings for the shared session."""
+
+    total_connections: int = int(os.getenv("HTTP_POOL_LIMIT", "100"))
+    connections_per_host: int = int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", "10"))
+    dns_cache_ttl: int = int(os.getenv("HTTP_DNS_CACHE_TTL", "300"))
+    keepalive_timeout: float = float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", "60"))
+    total_timeout: float = float(os.getenv("HTTP_TIMEOUT", "30"))
+    connect_timeout: float = float(os.getenv("HTTP_CONNECT_TIMEOUT", "10"))
+
+
+class SharedHTTPClient:
+    """Process-wide aiohttp session with connection-reuse metrics.
+
+    Callers borrow the session via ``get_session()`` and must not close it;
+    the session is closed once at shutdown through ``close()``.
+    """
+
+    def __init__(self, config: Optional[HTTPClientConfig] = None):
+        self.config = config or HTTPClientConfig()
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = asyncio.Lock()
+        self.metrics = {
+            "requests": 0,
+            "request_errors": 0,
+            "connections_created": 0,
+            "connections_reused": 0,
+            "dns_cache_hits": 0,
+            "dns_cache_misses": 0,
+            "sessions_created": 0,
+        }
+
+    def _build_trace_config(self) -> aiohttp.TraceConfig:
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_request_start(session, context, params):
+            self.metrics["requests"] += 1
+
+        async def on_request_exception(session, context, params):
+            self.metrics["request_errors"] += 1
+
+        async def on_connection_create_end(session, context, params):
+            self.metrics["connections_created"] += 1
+
+        async def on_connection_reuseconn(session, context, params):
+            self.metrics["connections_reused"] += 1
+
+        async def on_dns_cache_hit(session, context, params):
+            self.metrics["dns_cache_hits"] += 1
+
+        async def on_dns_cache_miss(session, context, params):
+            self.metrics["dns_cache_misses"] += 1
+
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_request_exception.append(on_request_exception)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        trace_config.on_dns_cache_hit.append(on_dns_cache_hit)
+        trace_config.on_dns_cache_miss.append(on_dns_cache_miss)
+        return trace_config
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(
+            limit=self.config.total_connections,
+            limit_per_host=self.config.connections_per_host,
+            ttl_dns_cache=self.config.dns_cache_ttl,
+            use_dns_cache=True,
+            keepalive_timeout=self.config.keepalive_timeout,
+        )
+        timeout = aiohttp.ClientTimeout(
+            total=self.config.total_timeout, connect=self.config.connect_timeout
+        )
+        self.metrics["sessions_created"] += 1
+        logger.info(
+            f"Creating shared HTTP session (limit={self.config.total_connections}, "
+            f"per_host={self.config.connections_per_host})"
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=timeout,
+            trace_configs=[self._build_trace_config()],
+        )
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """Return the shared session, creating it on first use."""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # A session is bound to the loop it was created on (scripts may
+            # call asyncio.run more than once), so start over on a new loop
+            self._loop = loop
+            self._lock = asyncio.Lock()
+            self._session = None
+        if self._session is not None and not self._session.closed:
+            return self._session
+        async with self._lock:
+            if self._session is None or self._session.closed:
+                self._session = self._create_session()
+            return self._session
+
+    async def close(self) -> None:
+        """Close the shared session and its connection pool."""
+        async with self._lock:
+            if self._session is not None and not self._session.closed:
+                await self._session.close()
+                logger.info("Shared HTTP session closed")
+            self._session = None
+
+    def get_metrics(self) -> Dict[str, float]:
+        """Connection-reuse metrics for the shared session."""
+        connections = (
+            self.metrics["connections_created"] + self.metrics["connections_reused"]
+        )
+        return {
+            **self.metrics,
+            "connection_reuse_rate": (
+                self.metrics["connections_reused"] / connections if connections else 0.0
+            ),
+        }
+
+
+# Global HTTP client instance
+_global_http_client: Optional[SharedHTTPClient] = None
+
+
+def get_http_client() -> SharedHTTPClient:
+    """Get the global shared HTTP client instance."""
+    global _global_http_client
+    if _global_http_client is None:
+        _global_http_client = SharedHTTPClient()
+    return _global_http_client
+
+
+async def close_http_client() -> None:
+    """Close the global shared HTTP client, if it was created."""
+    if _global_http_client is not None:
+        await _global_http_client.close()
@@ -0,0 +1,123 @@
+"""
+Decoded Image Cache for DBSBM.
+Memory-bounded LRU of decoded Pillow images plus a negative cache for asset
+lookups that found nothing, shared by the image generators.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = int(os.getenv("IMAGE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+DEFAULT_NEGATIVE_TTL = float(os.getenv("IMAGE_CACHE_NEGATIVE_TTL", "300"))
+DEFAULT_NEGATIVE_MAX_ENTRIES = 4096
+
+
+def image_nbytes(image: Image.Image) -> int:
+    """Approximate in-memory size of a decoded image."""
+    return image.width * image.height * len(image.getbands())
+
+
+class ImageLRUCache:
+    """Byte-budgeted LRU of decoded images.
+
+    Entries are evicted least-recently-used first once the summed size of
+    the cached images exceeds ``max_bytes``. Cached images are shared, so
+    ``get`` hands out a copy that callers may mutate freely. Renders run on
+    worker threads, hence the lock around every access.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        negative_ttl: float = DEFAULT_NEGATIVE_TTL,
+        negative_max_entries: int = DEFAULT_NEGATIVE_MAX_ENTRIES,
+    ):
+        self.max_bytes = max(0, max_bytes)
+        self.negative_ttl = negative_ttl
+        self.negative_max_entries = max(1, negative_max_entries)
+        self._images: "OrderedDict[Hashable, Tuple[Image.Image, int]]" = OrderedDict()
+        self._misses: "OrderedDict[Hashable, float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "negative_hits": 0,
+            "evictions": 0,
+        }
+
+    def get(self, key: Hashable) -> Optional[Image.Image]:
+        """Return a copy of the cached image, or None on a miss."""
+        with self._lock:
+            entry = self._images.get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+            self._images.move_to_end(key)
+            self.stats["hits"] += 1
+            image = entry[0]
+        return image.copy()
+
+    def put(self, key: Hashable, image: Image.Image) -> None:
+        """Cache an image, evicting the least recently used ones over budget."""
+        size = image_nbytes(image)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._images.pop(key, None)
+            if previous is not None:
+                self.current_bytes -= previous[1]
+            self._images[key] = (image, size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes and self._images:
+                _, (_, evicted_size) = self._images.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.stats["evictions"] += 1
+
+    def is_known_miss(self, key: Hashable) -> bool:
+        """Whether ``key`` recently failed to resolve."""
+        with self._lock:
+            expires_at = self._misses.get(key)
+            if expires_at is None:
+                return False
+            if expires_at < time.monotonic():
+                del self._misses[key]
+                return False
+            self.stats["negative_hits"] += 1
+            return True
+
+    def record_miss(self, key: Hashable) -> None:
+        """Remember that ``key`` did not resolve, for ``negative_ttl`` seconds."""
+        with self._lock:
+            self._misses[key] = time.monotonic() + self.negative_ttl
+            self._misses.move_to_end(key)
+            while len(self._misses) > self.negative_max_entries:
+                self._misses.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every cached image and remembered miss."""
+        with self._lock:
+            self._images.clear()
+            self._misses.clear()
+            self.current_bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and memory usage."""
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "entries": len(self._images),
+                "negative_entries": len(self._misses),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hit_rate": self.stats["hits"] / lookups if lookups else 0.0,
+            }
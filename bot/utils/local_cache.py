@@ -0,0 +1,128 @@
+"""
+Local Cache for DBSBM.
+Bounded in-process LRU cache with per-entry TTLs, used as the L1 tier in
+front of Redis so hot keys are served without a network round trip.
+"""
+
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+DEFAULT_MAX_ENTRIES = int(os.getenv("CACHE_L1_MAX_ENTRIES", "10000"))
+DEFAULT_MAX_BYTES = int(os.getenv("CACHE_L1_MAX_BYTES", str(64 * 1024 * 1024)))
+
+
+class LocalLRUCache:
+    """LRU cache bounded by entry count and by (approximate) bytes.
+
+    Every entry carries its own expiry and is dropped when read after it.
+    Entries can be tagged and dropped per tag; the tag index only ever holds
+    keys that are still cached. Values are stored as-is, so callers must not
+    mutate what ``get`` returns.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max(0, max_bytes)
+        # key -> (value, expires_at, size, tags)
+        self._entries: "OrderedDict[str, Tuple[Any, float, int, Tuple[str, ...]]]" = (
+            OrderedDict()
+        )
+        self._tags: Dict[str, Set[str]] = {}
+        self.current_bytes = 0
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the live value for ``key`` or ``default``."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats["misses"] += 1
+            return default
+        value, expires_at = entry[0], entry[1]
+        if expires_at <= time.time():
+            self._remove(key)
+            self.stats["expirations"] += 1
+            self.stats["misses"] += 1
+            return default
+        self._entries.move_to_end(key)
+        self.stats["hits"] += 1
+        return value
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: float,
+        size: int = 0,
+        tags: Iterable[str] = (),
+    ) -> bool:
+        """Store ``value`` for ``ttl`` seconds. Returns False if it cannot fit."""
+        self._remove(key)
+        # A single entry may use at most a quarter of the budget so one large
+        # payload cannot flush every hot key
+        if ttl <= 0 or size > self.max_bytes // 4:
+            return False
+        tags = tuple(tags)
+        self._entries[key] = (value, time.time() + ttl, size, tags)
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+        self.current_bytes += size
+        self._evict()
+        return True
+
+    def pop(self, key: str) -> bool:
+        """Drop ``key``. Returns True if it was cached."""
+        return self._remove(key)
+
+    def pop_tag(self, tag: str) -> int:
+        """Drop every entry tagged ``tag``. Returns how many were cached."""
+        return sum(self._remove(key) for key in list(self._tags.get(tag, ())))
+
+    def keys(self) -> List[str]:
+        return list(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._tags.clear()
+        self.current_bytes = 0
+
+    def _remove(self, key: str) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self.current_bytes -= entry[2]
+        for tag in entry[3]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+        return True
+
+    def _evict(self) -> None:
+        while self._entries and (
+            len(self._entries) > self.max_entries or self.current_bytes > self.max_bytes
+        ):
+            key = next(iter(self._entries))
+            self._remove(key)
+            self.stats["evictions"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "entries": len(self._entries),
+            "tags": len(self._tags),
+            "bytes": self.current_bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hit_rate": self.stats["hits"] / lookups if lookups else 0.0,
+        }
@@ -17,6 +17,7 @@ from config.leagues import LEAGUE_CONFIG
 
 # Example, if used directly in modal
 from utils.errors import BetServiceError
+from utils.render_service import get_render_service
 
 # Import the correct version of the image generator
 
@@ -777,7 +778,9 @@ class ParlayBetDetailsModal(Modal):
             legs = self.view_ref.bet_details.get("legs", [])
 
             # Generate the parlay image
-            image_bytes = generator.generate_image(
+            image_bytes = await get_render_service().render(
+                generator.generate_image,
+                name="parlay",
                 legs=legs,
                 output_path=None,
                 total_odds=total_odds,
@@ -13,13 +13,16 @@ from services.api_response_cache_service import (
     cache_api_response,
     cache_api_response_with_invalidation,
 )
+from data.api_games_writer import ApiGamesBulkWriter
 from data.db_manager import DatabaseManager
 from config.api_settings import API_KEY
+from utils.http_client import get_http_client
 import asyncio
 import json
 import logging
 import os
 import sys
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional, Union
 
@@ -234,42 +237,253 @@ ENDPOINT_CONFIGS = {
     },
 }
 
+# Attempts per request when the provider answers HTTP 429
+MAX_RATE_LIMIT_ATTEMPTS = 3
+
+# Column set written to api_games by MultiProviderAPI
+MULTI_PROVIDER_COLUMNS = (
+    "api_game_id",
+    "sport",
+    "league_id",
+    "league_name",
+    "home_team_id",
+    "away_team_id",
+    "home_team_name",
+    "away_team_name",
+    "start_time",
+    "end_time",
+    "status",
+    "score",
+    "venue",
+    "referee",
+    "season",
+    "raw_json",
+    "fetched_at",
+)
+
+
+def _parse_header_number(value: Optional[str]) -> Optional[float]:
+    """Parse a numeric rate-limit header value, ignoring garbage."""
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """Parse a Retry-After header (delta seconds or HTTP date) into seconds."""
+    if not value:
+        return None
+    seconds = _parse_header_number(value)
+    if seconds is not None:
+        return max(0.0, seconds)
+    try:
+        from email.utils import parsedate_to_datetime
+
+        retry_at = parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+    now = datetime.now(timezone.utc).timestamp() if now is None else now
+    return max(0.0, retry_at - now)
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at ``rate_per_minute``.
+
+    ``reserve`` is O(1) and never awaits: it takes a token (letting the
+    balance go negative) and returns how long the caller must wait for it.
+    Because nothing sleeps while holding state, concurrent callers are
+    spread out instead of queueing behind one another.
+    """
+
+    def __init__(self, rate_per_minute: float, burst: int = 1):
+        self.rate = max(rate_per_minute, 0.001) / 60.0
+        self.capacity = float(max(1, burst))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def _refill(self, now: float) -> None:
+        if now > self.updated:
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+
+    def reserve(self, now: Optional[float] = None) -> float:
+        """Take one token and return the seconds to wait before using it."""
+        now = time.monotonic() if now is None else now
+        self._refill(now)
+        self.tokens -= 1
+        ready_at = max(self.updated, now)
+        if self.tokens < 0:
+            ready_at += -self.tokens / self.rate
+        return max(0.0, ready_at - now)
+
+    def block_for(self, seconds: float, now: Optional[float] = None) -> None:
+        """Stop handing out tokens for ``seconds`` (e.g. after Retry-After)."""
+        now = time.monotonic() if now is None else now
+        until = now + max(0.0, seconds)
+        if until > self.blocked_until:
+            self.blocked_until = until
+        # Restart refilling from the end of the block with at most one token,
+        # so the provider does not see a burst the moment it reopens
+        self._refill(now)
+        self.tokens = min(self.tokens, 1.0)
+        self.updated = max(self.updated, self.blocked_until)
+
+    def limit_remaining(self, remaining: float) -> None:
+        """Clamp the local balance to what the server says is left."""
+        self._refill(time.monotonic())
+        self.tokens = min(self.tokens, remaining)
+
 
 class MultiProviderRateLimiter:
+    """Per-provider token buckets with optional per-endpoint sub-limits.
+
+    Provider limits come from ``rate_limit`` (calls per minute) and ``burst``
+    in API_PROVIDERS; ``endpoint_limits`` maps an endpoint path to its own
+    calls-per-minute budget. Responses feed back through
+    ``update_from_response`` so Retry-After and X-RateLimit-* headers pause
+    or slow the bucket.
+    """
+
+    # Pause applied on HTTP 429 when the server gives no Retry-After
+    DEFAULT_RETRY_AFTER = 60.0
+
     def __init__(self):
         self.limiters = {}
         for provider, config in API_PROVIDERS.items():
+            limit = config.get("rate_limit", 30)
             self.limiters[provider] = {
-                "calls": [],
-                "limit": config.get("rate_limit", 30),
-                "lock": asyncio.Lock(),
+                "limit": limit,
+                "bucket": TokenBucket(limit, config.get("burst", max(1, limit // 6))),
+                "endpoint_limits": dict(config.get("endpoint_limits", {})),
+                "endpoint_buckets": {},
+                "stats": {
+                    "acquired": 0,
+                    "throttled": 0,
+                    "wait_seconds": 0.0,
+                    "server_throttles": 0,
+                },
             }
 
-    async def acquire(self, provider: str):
+    def _get_endpoint_bucket(self, limiter: Dict, endpoint: Optional[str]):
+        if not endpoint:
+            return None
+        path = endpoint.split("?", 1)[0]
+        limit = limiter["endpoint_limits"].get(path)
+        if not limit:
+            return None
+        bucket = limiter["endpoint_buckets"].get(path)
+        if bucket is None:
+            bucket = TokenBucket(limit, max(1, int(limit) // 6))
+            limiter["endpoint_buckets"][path] = bucket
+        return bucket
+
+    async def acquire(self, provider: str, endpoint: Optional[str] = None):
+        if provider not in self.limiters:
+            return
+
+        limiter = self.limiters[provider]
+        buckets = [limiter["bucket"]]
+        endpoint_bucket = self._get_endpoint_bucket(limiter, endpoint)
+        if endpoint_bucket is not None:
+            buckets.append(endpoint_bucket)
+
+        now = time.monotonic()
+        wait = max(bucket.reserve(now) for bucket in buckets)
+        stats = limiter["stats"]
+        stats["acquired"] += 1
+        if wait > 0:
+            stats["throttled"] += 1
+            stats["wait_seconds"] += wait
+            await asyncio.sleep(wait)
+
+        # A Retry-After may have arrived while we slept
+        blocked_until = max(bucket.blocked_until for bucket in buckets)
+        remaining_block = blocked_until - time.monotonic()
+        if remaining_block > 0:
+            stats["wait_seconds"] += remaining_block
+            await asyncio.sleep(remaining_block)
+
+    def update_from_response(
+        self,
+        provider: str,
+        status: int,
+        headers,
+        endpoint: Optional[str] = None,
+    ) -> None:
+        """Feed a response's status and rate-limit headers back into the limiter."""
         if provider not in self.limiters:
             return
 
         limiter = self.limiters[provider]
-        async with limiter["lock"]:
-            now = datetime.now().timestamp()
-            # Remove calls older than 1 minute
-            limiter["calls"] = [call for call in limiter["calls"] if now - call < 60]
+        buckets = [limiter["bucket"]]
+        endpoint_bucket = self._get_endpoint_bucket(limiter, endpoint)
+        if endpoint_bucket is not None:
+            buckets.append(endpoint_bucket)
+
+        retry_after = parse_retry_after(headers.get("Retry-After"))
+        remaining = _parse_header_number(
+            headers.get("X-RateLimit-Remaining")
+            or headers.get("X-RateLimit-Requests-Remaining")
+        )
+        reset = _parse_header_number(
+            headers.get("X-RateLimit-Reset")
+            or headers.get("X-RateLimit-Requests-Reset")
+        )
+        if reset is not None and reset > 1_000_000_000:
+            # Epoch timestamp rather than seconds-until-reset
+            reset = max(0.0, reset - datetime.now(timezone.utc).timestamp())
+
+        pause = None
+        if status == 429:
+            limiter["stats"]["server_throttles"] += 1
+            pause = retry_after if retry_after is not None else reset
+            if pause is None:
+                pause = self.DEFAULT_RETRY_AFTER
+        elif retry_after is not None:
+            pause = retry_after
+        elif remaining is not None and remaining <= 0:
+            pause = reset if reset is not None else self.DEFAULT_RETRY_AFTER
+
+        for bucket in buckets:
+            if pause is not None:
+                bucket.block_for(pause)
+            elif remaining is not None:
+                bucket.limit_remaining(remaining)
+
+        if pause is not None:
+            logger.warning(f"Pausing {provider} requests for {pause:.1f}s")
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-provider acquire and throttling counters."""
+        return {
+            provider: {"limit": limiter["limit"], **limiter["stats"]}
+            for provider, limiter in self.limiters.items()
+        }
 
-            if len(limiter["calls"]) >= limiter["limit"]:
-                # Wait until we can make another call
-                sleep_time = 60 - (now - limiter["calls"][0])
-                if sleep_time > 0:
-                    await asyncio.sleep(sleep_time)
-                limiter["calls"] = limiter["calls"][1:]
 
-            limiter["calls"].append(now)
+# Global rate limiter instance, shared by every MultiProviderAPI so call
+# history survives across instances
+_global_rate_limiter: Optional[MultiProviderRateLimiter] = None
+
+
+def get_multi_provider_rate_limiter() -> MultiProviderRateLimiter:
+    """Get the global multi-provider rate limiter instance."""
+    global _global_rate_limiter
+    if _global_rate_limiter is None:
+        _global_rate_limiter = MultiProviderRateLimiter()
+    return _global_rate_limiter
 
 
 class MultiProviderAPI:
     def __init__(self, db_pool=None):
         self.db_pool = db_pool
-        self.session = None
-        self.rate_limiter = MultiProviderRateLimiter()
+        self.rate_limiter = get_multi_provider_rate_limiter()
         self.discovered_leagues = {}
 
         # Verify API keys are available
@@ -283,12 +497,10 @@ class MultiProviderAPI:
             )
 
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            await self.session.close()
+        pass
 
     def get_provider_for_sport(self, sport: str) -> str:
         """Get the API provider for a given sport."""
@@ -315,9 +527,6 @@ class MultiProviderAPI:
         )
         provider_config = API_PROVIDERS[provider]
 
-        # Rate limiting
-        await self.rate_limiter.acquire(provider)
-
         # Build URL
         base_url = provider_config["base_urls"].get(sport)
         if not base_url:
@@ -341,31 +550,46 @@ class MultiProviderAPI:
                 params = {}
             params["key"] = provider_config["api_key"]
 
-        try:
-            async with self.session.get(
-                url, headers=headers, params=params
-            ) as response:
-                if response.status == 429:  # Rate limit exceeded
-                    logger.warning(f"Rate limit exceeded for {sport}, waiting...")
-                    await asyncio.sleep(60)
-                    return await self.make_request(
-                        sport, endpoint, params, provider_override
-                    )
+        # Borrow the process-wide session on every call rather than holding
+        # one per instance: stale-while-revalidate refreshes run after the
+        # caller's ``async with`` block has exited
+        session = await get_http_client().get_session()
+
+        for attempt in range(1, MAX_RATE_LIMIT_ATTEMPTS + 1):
+            # Rate limiting; also waits out any Retry-After from a previous 429
+            await self.rate_limiter.acquire(provider, endpoint)
 
-                response.raise_for_status()
-                result = await response.json()
-                # If result is not a dict, try to convert
-                if not isinstance(result, dict):
-                    try:
-                        import json as _json
-                        result = _json.loads(result)
-                    except Exception:
-                        pass
-                return result
-
-        except aiohttp.ClientError as e:
-            logger.error(f"API request failed for {sport}: {e}")
-            raise
+            try:
+                async with session.get(
+                    url, headers=headers, params=params
+                ) as response:
+                    self.rate_limiter.update_from_response(
+                        provider, response.status, response.headers, endpoint
+                    )
+                    if (
+                        response.status == 429
+                        and attempt < MAX_RATE_LIMIT_ATTEMPTS
+                    ):  # Rate limit exceeded
+                        logger.warning(
+                            f"Rate limit exceeded for {sport}, retrying "
+                            f"(attempt {attempt}/{MAX_RATE_LIMIT_ATTEMPTS})"
+                        )
+                        continue
+
+                    response.raise_for_status()
+                    result = await response.json()
+                    # If result is not a dict, try to convert
+                    if not isinstance(result, dict):
+                        try:
+                            import json as _json
+                            result = _json.loads(result)
+                        except Exception:
+                            pass
+                    return result
+
+            except aiohttp.ClientError as e:
+                logger.error(f"API request failed for {sport}: {e}")
+                raise
 
     # 1 hour for league data
     @cache_api_response(ttl=3600, provider="multi-provider")
@@ -1300,16 +1524,11 @@ class MultiProviderAPI:
                                 logger.info(
                                     f"Saving {len(games)} games to database for {league['name']}"
                                 )
-                                for game in games:
-                                    success = await self._save_game_to_db(game)
-                                    if success:
-                                        logger.debug(
-                                            f"Successfully saved game {game.get('api_game_id')} to database"
-                                        )
-                                    else:
-                                        logger.error(
-                                            f"Failed to save game {game.get('api_game_id')} to database"
-                                        )
+                                saved = await self._save_games_to_db(games)
+                                if saved < len(games):
+                                    logger.error(
+                                        f"Saved {saved} of {len(games)} games for {league['name']}"
+                                    )
                             else:
                                 logger.warning(
                                     "No database pool available, skipping database save"
@@ -1328,108 +1547,48 @@ class MultiProviderAPI:
         logger.info(f"Multi-provider fetch completed: {results}")
         return results
 
+    def _to_db_row(self, game_data: Dict, fetched_at: datetime) -> Dict:
+        """Convert a mapped game into an api_games row for the bulk writer."""
+        return {
+            "api_game_id": game_data.get("api_game_id"),
+            "sport": game_data.get("sport"),
+            "league_id": game_data.get("league_id"),
+            "league_name": game_data.get("league_name"),
+            "home_team_id": game_data.get("home_team_id"),
+            "away_team_id": game_data.get("away_team_id"),
+            "home_team_name": game_data.get("home_team_name"),
+            "away_team_name": game_data.get("away_team_name"),
+            "start_time": parse_datetime(game_data.get("start_time")),
+            "end_time": parse_datetime(game_data.get("end_time")),
+            "status": game_data.get("status"),
+            "score": (
+                json.dumps(game_data.get("score")) if game_data.get("score") else None
+            ),
+            "venue": game_data.get("venue"),
+            "referee": game_data.get("referee"),
+            "season": game_data.get("season"),
+            "raw_json": json.dumps(game_data),
+            "fetched_at": fetched_at,
+        }
+
+    async def _save_games_to_db(self, games: List[Dict]) -> int:
+        """Upsert a batch of games in one round trip. Returns rows written."""
+        if not self.db_pool:
+            logger.warning("No database pool available")
+            return 0
+
+        fetched_at = datetime.now()
+        writer = ApiGamesBulkWriter(
+            self.db_pool,
+            columns=MULTI_PROVIDER_COLUMNS,
+            insert_timestamp_columns=(),
+            update_timestamp_columns=(),
+        )
+        return await writer.write(self._to_db_row(game, fetched_at) for game in games)
+
     async def _save_game_to_db(self, game_data: Dict) -> bool:
         """Save game data to the database."""
         logger.debug(
             f"Attempting to save game to database: {game_data.get('api_game_id')}"
         )
-
-        if not self.db_pool:
-            logger.warning("No database pool available")
-            return False
-
-        try:
-            async with self.db_pool.acquire() as conn:
-                # Check if game already exists
-                row = await conn.fetchrow(
-                    "SELECT api_game_id FROM api_games WHERE api_game_id = $1",
-                    game_data["api_game_id"],
-                )
-
-                # Prepare raw_json data and fetched_at timestamp
-                raw_json = json.dumps(game_data)
-                fetched_at = datetime.now()
-
-                # Parse datetime strings
-                start_time = parse_datetime(game_data.get("start_time"))
-                end_time = parse_datetime(game_data.get("end_time"))
-
-                logger.debug(f"Original start_time: {game_data.get('start_time')}")
-                logger.debug(f"Parsed start_time: {start_time}")
-                logger.debug(f"Original end_time: {game_data.get('end_time')}")
-                logger.debug(f"Parsed end_time: {end_time}")
-
-                if row:
-                    # Update existing game
-                    await conn.execute(
-                        """
-                        UPDATE api_games SET
-                            sport = $1, league_id = $2, league_name = $3,
-                            home_team_id = $4, away_team_id = $5,
-                            home_team_name = $6, away_team_name = $7,
-                            start_time = $8, end_time = $9, status = $10,
-                            score = $11, venue = $12, referee = $13, season = $14,
-                            raw_json = $15, fetched_at = $16
-                        WHERE api_game_id = $17
-                        """,
-                        game_data.get("sport"),
-                        game_data.get("league_id"),
-                        game_data.get("league_name"),
-                        game_data.get("home_team_id"),
-                        game_data.get("away_team_id"),
-                        game_data.get("home_team_name"),
-                        game_data.get("away_team_name"),
-                        start_time,
-                        end_time,
-                        game_data.get("status"),
-                        (
-                            json.dumps(game_data.get("score"))
-                            if game_data.get("score")
-                            else None
-                        ),
-                        game_data.get("venue"),
-                        game_data.get("referee"),
-                        game_data.get("season"),
-                        raw_json,
-                        fetched_at,
-                        game_data["api_game_id"],
-                    )
-                else:
-                    # Insert new game
-                    await conn.execute(
-                        """
-                        INSERT INTO api_games (
-                            api_game_id, sport, league_id, league_name, home_team_id,
-                            away_team_id, home_team_name, away_team_name, start_time,
-                            end_time, status, score, venue, referee, season,
-                            raw_json, fetched_at
-                        ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15, $16, $17)
-                        """,
-                        game_data["api_game_id"],
-                        game_data.get("sport"),
-                        game_data.get("league_id"),
-                        game_data.get("league_name"),
-                        game_data.get("home_team_id"),
-                        game_data.get("away_team_id"),
-                        game_data.get("home_team_name"),
-                        game_data.get("away_team_name"),
-                        start_time,
-                        end_time,
-                        game_data.get("status"),
-                        (
-                            json.dumps(game_data.get("score"))
-                            if game_data.get("score")
-                            else None
-                        ),
-                        game_data.get("venue"),
-                        game_data.get("referee"),
-                        game_data.get("season"),
-                        raw_json,
-                        fetched_at,
-                    )
-
-                return True
-
-        except Exception as e:
-            logger.error(f"Error saving game to database: {e}")
-            return False
+        return await self._save_games_to_db([game_data]) > 0
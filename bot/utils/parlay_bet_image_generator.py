@@ -5,6 +5,7 @@ import os
 from PIL import ImageDraw, ImageFont
 
 from utils.asset_loader import asset_loader
+from utils.slip_cache import slip_cache_key
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +30,12 @@ class ParlayBetImageGenerator:
         self.font_huge = asset_loader.load_font("Roboto-Bold.ttf", 48)
         self.font_vs_small = asset_loader.load_font("Roboto-Regular.ttf", 21)  # 3/4 of 28
 
+    def parlay_preview_cache_key(self, legs, total_odds=None, units=None):
+        """Content key for generate_parlay_preview called with these arguments."""
+        return slip_cache_key(
+            "parlay_preview", self.guild_id, legs=legs, total_odds=total_odds, units=units
+        )
+
     def generate_parlay_preview(self, legs, total_odds=None, units=None):
         """
         Generates a preview image for a parlay bet (before finalization).
@@ -0,0 +1,218 @@
+"""
+Player Search Index for DBSBM.
+In-memory per-league index of searchable players: normalized names, trigram
+postings that shortlist candidates for a query, and batched fuzzy scoring of
+just that shortlist.
+"""
+
+import asyncio
+import os
+import re
+import unicodedata
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from rapidfuzz import fuzz, process
+
+# Candidates scored per query, taken by trigram overlap
+SHORTLIST_SIZE = int(os.getenv("PLAYER_SEARCH_SHORTLIST", "300"))
+# Seconds between pulls of players added or used since the last pull
+INDEX_SYNC_INTERVAL = float(os.getenv("PLAYER_INDEX_SYNC_INTERVAL", "300"))
+# Seconds after which a league index is rebuilt from scratch, which also
+# drops players deleted from the database
+INDEX_REBUILD_INTERVAL = float(os.getenv("PLAYER_INDEX_REBUILD_INTERVAL", "21600"))
+
+_NON_WORD = re.compile(r"[^\w\s]")
+
+
+def normalize_name(text: str) -> str:
+    """Lowercase, accent-free, punctuation-free form of a name."""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(_NON_WORD.sub(" ", stripped.lower()).split())
+
+
+def trigrams(text: str) -> Set[str]:
+    """Trigrams of each word, padded so short words and prefixes match."""
+    grams = set()
+    for word in text.split():
+        padded = f"  {word} "
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class LeaguePlayerIndex:
+    """Searchable players of one league (or of all leagues, for ``None``).
+
+    Players are only ever added or updated in place, so positions in the
+    entry lists stay valid for the postings. ``add`` is cheap enough to call
+    for every player a user adds.
+    """
+
+    def __init__(self, league: Optional[str]):
+        self.league = league
+        self.entries: List[Dict[str, Any]] = []
+        # Lowercase forms scored by fuzzy matching, parallel to ``entries``
+        self.player_names: List[str] = []
+        self.team_names: List[str] = []
+        self.full_names: List[str] = []
+        self._positions: Dict[Tuple[str, str], int] = {}
+        self._postings: Dict[str, List[int]] = {}
+        self._by_team: Dict[str, Set[int]] = {}
+        self.built_at = 0.0
+        self.synced_at = 0.0
+        # Newest last_used seen; rows used or added after it are synced
+        self.high_water: Optional[datetime] = None
+        self.rebuild_task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def add(self, player: Dict[str, Any]) -> None:
+        """Add a player, or refresh the stored row of a known one."""
+        player_name = player.get("player_name") or ""
+        team_name = player.get("team_name") or ""
+        if not player_name:
+            return
+
+        key = (player_name, team_name)
+        position = self._positions.get(key)
+        if position is not None:
+            self.entries[position] = dict(player)
+            return
+
+        position = len(self.entries)
+        self._positions[key] = position
+        self.entries.append(dict(player))
+        self.player_names.append(player_name.lower())
+        self.team_names.append(team_name.lower())
+        self.full_names.append(f"{player_name} {team_name}".lower())
+        self._by_team.setdefault(team_name, set()).add(position)
+        for gram in trigrams(normalize_name(f"{player_name} {team_name}")):
+            self._postings.setdefault(gram, []).append(position)
+
+    def add_many(self, players: Iterable[Dict[str, Any]]) -> None:
+        """Add rows loaded from the database and advance ``high_water``."""
+        for player in players:
+            self.add(player)
+            last_used = player.get("last_used")
+            if isinstance(last_used, datetime) and (
+                self.high_water is None or last_used > self.high_water
+            ):
+                self.high_water = last_used
+
+    def record_usage(self, player_name: str, team_name: str, used_at: datetime) -> None:
+        position = self._positions.get((player_name, team_name))
+        if position is not None:
+            entry = self.entries[position]
+            entry["usage_count"] = (entry.get("usage_count") or 0) + 1
+            entry["last_used"] = used_at
+
+    def shortlist(
+        self, query: str, team_name: Optional[str] = None, size: int = SHORTLIST_SIZE
+    ) -> List[int]:
+        """Positions sharing the most trigrams with ``query``."""
+        allowed = self._by_team.get(team_name, set()) if team_name else None
+        counts: Counter = Counter()
+        for gram in trigrams(normalize_name(query)):
+            for position in self._postings.get(gram, ()):
+                if allowed is None or position in allowed:
+                    counts[position] += 1
+        if not counts and allowed:
+            # Nothing in common with the query; the team is still a match
+            return sorted(allowed)[:size]
+        return [position for position, _ in counts.most_common(size)]
+
+    def score(
+        self, query: str, positions: List[int], min_confidence: float
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """Best partial_ratio of ``query`` against name, team and both."""
+        return score_players(
+            query,
+            [self.entries[i] for i in positions],
+            [self.player_names[i] for i in positions],
+            [self.team_names[i] for i in positions],
+            [self.full_names[i] for i in positions],
+            min_confidence,
+        )
+
+
+def score_players(
+    query: str,
+    players: List[Dict[str, Any]],
+    player_names: List[str],
+    team_names: List[str],
+    full_names: List[str],
+    min_confidence: float,
+    boost: float = 0.0,
+) -> List[Tuple[Dict[str, Any], float]]:
+    """Score candidates in three batched rapidfuzz calls.
+
+    ``boost`` is added to every score before ``min_confidence`` is applied.
+    """
+    best = [0.0] * len(players)
+    for choices in (player_names, team_names, full_names):
+        for _, score, index in process.extract(
+            query, choices, scorer=fuzz.partial_ratio, limit=None
+        ):
+            if score > best[index]:
+                best[index] = score
+    return [
+        (player, confidence + boost)
+        for player, confidence in zip(players, best)
+        if confidence + boost >= min_confidence
+    ]
+
+
+class PlayerSearchIndex:
+    """Per-league indexes shared by every PlayerSearchService instance."""
+
+    def __init__(self):
+        self._leagues: Dict[Optional[str], LeaguePlayerIndex] = {}
+        self._locks: Dict[Optional[str], asyncio.Lock] = {}
+
+    def get(self, league: Optional[str]) -> Optional[LeaguePlayerIndex]:
+        return self._leagues.get(league)
+
+    def put(self, index: LeaguePlayerIndex) -> None:
+        self._leagues[index.league] = index
+
+    def lock(self, league: Optional[str]) -> asyncio.Lock:
+        return self._locks.setdefault(league, asyncio.Lock())
+
+    def add_player(self, player: Dict[str, Any]) -> None:
+        """Add a player to its league's index and to the all-leagues index."""
+        for league in {player.get("league"), None}:
+            index = self._leagues.get(league)
+            if index is not None:
+                index.add(player)
+
+    def record_usage(
+        self, player_name: str, team_name: str, league: str, used_at: datetime
+    ) -> None:
+        for key in {league, None}:
+            index = self._leagues.get(key)
+            if index is not None:
+                index.record_usage(player_name, team_name, used_at)
+
+    def clear(self) -> None:
+        self._leagues.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            str(league): {"players": len(index), "trigrams": len(index._postings)}
+            for league, index in self._leagues.items()
+        }
+
+
+# Global player search index instance
+_global_player_search_index: Optional[PlayerSearchIndex] = None
+
+
+def get_player_search_index() -> PlayerSearchIndex:
+    """Get the global player search index instance."""
+    global _global_player_search_index
+    if _global_player_search_index is None:
+        _global_player_search_index = PlayerSearchIndex()
+    return _global_player_search_index
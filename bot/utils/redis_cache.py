@@ -127,12 +127,19 @@ class RedisCacheManager:
             return 0
 
         try:
-            keys = await self._redis.keys(pattern)
-            if keys:
-                result = await self._redis.delete(*keys)
+            # SCAN walks the keyspace incrementally; KEYS would block Redis
+            result = 0
+            batch = []
+            async for key in self._redis.scan_iter(match=pattern, count=1000):
+                batch.append(key)
+                if len(batch) >= 500:
+                    result += await self._redis.unlink(*batch)
+                    batch = []
+            if batch:
+                result += await self._redis.unlink(*batch)
+            if result:
                 logger.info(f"Deleted {result} keys matching pattern: {pattern}")
-                return result
-            return 0
+            return result
         except Exception as e:
             logger.error(f"Error clearing pattern {pattern}: {e}")
             return 0
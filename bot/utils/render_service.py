@@ -0,0 +1,259 @@
+"""
+Render Service for DBSBM.
+Runs synchronous Pillow bet slip rendering on a bounded worker pool so image
+generation never blocks the Discord gateway event loop.
+"""
+
+import asyncio
+import functools
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+from utils.errors import RenderQueueFullError
+from utils.slip_cache import RenderedSlipCache, get_slip_cache
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RenderServiceConfig:
+    """Worker pool and queue settings for the render service."""
+
+    # Pillow releases the GIL for most encode/resize/draw work, so threads
+    # give real parallelism without pickling images across processes
+    max_workers: int = int(
+        os.getenv("RENDER_WORKERS", str(min(4, os.cpu_count() or 1)))
+    )
+    # Renders allowed to wait for a worker on top of the ones running
+    max_queue: int = int(os.getenv("RENDER_MAX_QUEUE", "32"))
+    # How long a caller waits for a queue slot before the render is rejected
+    queue_timeout: float = float(os.getenv("RENDER_QUEUE_TIMEOUT", "5"))
+    # Upper bound for a single render, measured from when it was queued
+    render_timeout: float = float(os.getenv("RENDER_TIMEOUT", "20"))
+
+
+@dataclass
+class RenderStats:
+    """Timing statistics for one kind of render."""
+
+    renders: int = 0
+    cache_hits: int = 0
+    errors: int = 0
+    timeouts: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    queue_wait_seconds: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "renders": self.renders,
+            "cache_hits": self.cache_hits,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "avg_seconds": (
+                round(self.total_seconds / self.renders, 4) if self.renders else 0.0
+            ),
+            "max_seconds": round(self.max_seconds, 4),
+            "avg_queue_wait_seconds": (
+                round(self.queue_wait_seconds / self.renders, 4)
+                if self.renders
+                else 0.0
+            ),
+        }
+
+
+class RenderService:
+    """Async front end for a pool of image render workers.
+
+    ``render()`` admits at most ``max_workers + max_queue`` renders at once.
+    Callers beyond that wait up to ``queue_timeout`` for a slot and are then
+    rejected with ``RenderQueueFullError``, so a burst of bet placements
+    degrades into fast failures instead of an unbounded backlog.
+
+    Renders given a ``cache_key`` are served from the rendered slip cache
+    when the same content was drawn before.
+    """
+
+    def __init__(
+        self,
+        config: Optional[RenderServiceConfig] = None,
+        cache: Optional[RenderedSlipCache] = None,
+    ):
+        self.config = config or RenderServiceConfig()
+        self.cache = cache if cache is not None else get_slip_cache()
+        self.config.max_workers = max(1, self.config.max_workers)
+        self.config.max_queue = max(0, self.config.max_queue)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.rejected = 0
+        self.stats: Dict[str, RenderStats] = {}
+
+    @property
+    def capacity(self) -> int:
+        return self.config.max_workers + self.config.max_queue
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.config.max_workers,
+                thread_name_prefix="render",
+            )
+            logger.info(
+                f"Render pool started (workers={self.config.max_workers}, "
+                f"queue={self.config.max_queue})"
+            )
+        return self._executor
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._slots is None or loop is not self._loop:
+            self._loop = loop
+            self._slots = asyncio.Semaphore(self.capacity)
+        return self._slots
+
+    async def render(
+        self,
+        func: Callable[..., Any],
+        *args: Any,
+        name: Optional[str] = None,
+        timeout: Optional[float] = None,
+        cache_key: Optional[str] = None,
+        **kwargs: Any,
+    ) -> Any:
+        """Run ``func(*args, **kwargs)`` on a render worker and return its result.
+
+        ``name`` groups the timing metrics (defaults to the function name).
+        With ``cache_key`` (see ``slip_cache_key``) previously rendered bytes
+        are returned without drawing, and new bytes are cached.
+        Raises ``RenderQueueFullError`` when no queue slot frees up in time and
+        ``asyncio.TimeoutError`` when the render exceeds ``timeout``.
+        """
+        name = name or getattr(func, "__name__", "render")
+        stats = self.stats.setdefault(name, RenderStats())
+        if cache_key:
+            cached = self.cache.get_memory(cache_key)
+            if cached is not None:
+                stats.cache_hits += 1
+                return cached
+        slots = self._get_slots()
+        queued_at = time.monotonic()
+
+        try:
+            await asyncio.wait_for(slots.acquire(), timeout=self.config.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            logger.warning(
+                f"Render queue full ({self.capacity} renders in flight), "
+                f"rejected {name}"
+            )
+            raise RenderQueueFullError(
+                "Image rendering is busy right now, please try again in a moment."
+            )
+
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        timing: Dict[str, float] = {}
+
+        def _run() -> Any:
+            if cache_key:
+                # Disk tier lookups stay off the event loop too
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    timing["cache_hit"] = 1
+                    return cached
+            started = time.monotonic()
+            timing["queue_wait"] = started - queued_at
+            try:
+                result = func(*args, **kwargs)
+            finally:
+                timing["render"] = time.monotonic() - started
+            if cache_key and result:
+                self.cache.put(cache_key, result)
+            return result
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._get_executor(), _run)
+        # The worker thread cannot be interrupted, so the slot is released
+        # when the render really finishes rather than when the caller gives up
+        future.add_done_callback(functools.partial(self._release, slots))
+
+        try:
+            return await asyncio.wait_for(
+                asyncio.shield(future),
+                timeout=timeout if timeout is not None else self.config.render_timeout,
+            )
+        except asyncio.TimeoutError:
+            stats.timeouts += 1
+            logger.warning(f"Render {name} timed out")
+            raise
+        except Exception:
+            stats.errors += 1
+            raise
+        finally:
+            if "cache_hit" in timing:
+                stats.cache_hits += 1
+            if "render" in timing:
+                stats.renders += 1
+                stats.total_seconds += timing["render"]
+                stats.max_seconds = max(stats.max_seconds, timing["render"])
+                stats.queue_wait_seconds += timing["queue_wait"]
+
+    async def get_cached(self, cache_key: str) -> Optional[bytes]:
+        """Bytes previously rendered under ``cache_key``, or None.
+
+        Lets a later step reuse a preview without drawing it again; disk tier
+        lookups run on a render worker.
+        """
+        cached = self.cache.get_memory(cache_key)
+        if cached is not None:
+            return cached
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), self.cache.get, cache_key)
+
+    def _release(self, slots: asyncio.Semaphore, _future: asyncio.Future) -> None:
+        self.in_flight -= 1
+        slots.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth and per-render timing metrics."""
+        return {
+            "workers": self.config.max_workers,
+            "capacity": self.capacity,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "rejected": self.rejected,
+            "renders": {name: stats.to_dict() for name, stats in self.stats.items()},
+            "slip_cache": self.cache.get_stats(),
+        }
+
+    def shutdown(self) -> None:
+        """Stop the worker pool; queued renders are cancelled."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            logger.info("Render pool stopped")
+
+
+# Global render service instance
+_global_render_service: Optional[RenderService] = None
+
+
+def get_render_service() -> RenderService:
+    """Get the global render service instance."""
+    global _global_render_service
+    if _global_render_service is None:
+        _global_render_service = RenderService()
+    return _global_render_service
+
+
+def shutdown_render_service() -> None:
+    """Stop the global render service, if it was started."""
+    if _global_render_service is not None:
+        _global_render_service.shutdown()
@@ -0,0 +1,220 @@
+"""
+Rendered Slip Cache for DBSBM.
+Content-addressed cache of encoded bet slip images, so identical previews
+and the final post reuse bytes that were already rendered.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = int(os.getenv("SLIP_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+DEFAULT_DISK_MAX_FILES = int(os.getenv("SLIP_CACHE_DISK_MAX_FILES", "2000"))
+
+
+def guild_asset_version(guild_id: Any) -> List[Tuple[str, int, int]]:
+    """Name, size and mtime of each branding file in a guild's static folder.
+
+    Part of every slip key, so replacing a guild's logo or background makes
+    its old slips unreachable, including those on disk from before a restart.
+    """
+    from utils.asset_loader import asset_loader
+
+    guild_dir = os.path.join(asset_loader.get_static_dir(), "guilds", str(guild_id))
+    files = []
+    try:
+        with os.scandir(guild_dir) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    stat = entry.stat()
+                    files.append((entry.name, stat.st_size, stat.st_mtime_ns))
+    except OSError:
+        return []
+    return sorted(files)
+
+
+def slip_cache_key(kind: str, guild_id: Any = None, **fields: Any) -> str:
+    """Hash of everything that affects a slip's pixels.
+
+    ``fields`` must already be in the form the image shows them (for example
+    a timestamp formatted the way the footer prints it).
+    """
+    payload = {"kind": kind, "guild_id": str(guild_id) if guild_id else None}
+    if guild_id:
+        payload["guild_assets"] = guild_asset_version(guild_id)
+    payload.update(fields)
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class RenderedSlipCache:
+    """Two-tier cache of encoded slip images keyed by content hash.
+
+    The memory tier is an LRU bounded by ``max_bytes``. When ``disk_dir`` is
+    set, entries are also written there and memory misses fall back to disk,
+    so a restart or an eviction does not force a redraw. Disk reads and
+    writes happen on render workers, never on the event loop.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        disk_dir: Optional[str] = os.getenv("SLIP_CACHE_DIR") or None,
+        disk_max_files: int = DEFAULT_DISK_MAX_FILES,
+    ):
+        self.max_bytes = max(0, max_bytes)
+        self.disk_dir = disk_dir
+        self.disk_max_files = max(1, disk_max_files)
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_writes_since_prune = 0
+        self.current_bytes = 0
+        self.stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "evictions": 0,
+        }
+
+    def get_memory(self, key: str) -> Optional[bytes]:
+        """Look up the memory tier only (cheap enough for the event loop)."""
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.stats["memory_hits"] += 1
+            return data
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Look up memory, then disk. Returns None on a miss."""
+        data = self.get_memory(key)
+        if data is not None:
+            return data
+        data = self._read_disk(key)
+        with self._lock:
+            if data is None:
+                self.stats["misses"] += 1
+                return None
+            self.stats["disk_hits"] += 1
+        self._store_memory(key, data)
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        """Store encoded image bytes in both tiers."""
+        if not isinstance(data, (bytes, bytearray)):
+            return
+        data = bytes(data)
+        self._store_memory(key, data)
+        with self._lock:
+            self.stats["stores"] += 1
+        self._write_disk(key, data)
+
+    def _store_memory(self, key: str, data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.current_bytes -= len(previous)
+            self._entries[key] = data
+            self.current_bytes += len(data)
+            while self.current_bytes > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self.current_bytes -= len(evicted)
+                self.stats["evictions"] += 1
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, key[:2], f"{key}.img")
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        if not self.disk_dir:
+            return None
+        try:
+            with open(self._disk_path(key), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _write_disk(self, key: str, data: bytes) -> None:
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        tmp_path = f"{path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.debug(f"Could not write slip cache entry {key}: {e}")
+            return
+        with self._lock:
+            self._disk_writes_since_prune += 1
+            should_prune = self._disk_writes_since_prune >= max(
+                1, self.disk_max_files // 10
+            )
+            if should_prune:
+                self._disk_writes_since_prune = 0
+        if should_prune:
+            self._prune_disk()
+
+    def _prune_disk(self) -> None:
+        """Delete the oldest disk entries beyond ``disk_max_files``."""
+        entries = []
+        for root, _, files in os.walk(self.disk_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    entries.append((os.path.getmtime(path), path))
+                except OSError:
+                    continue
+        excess = len(entries) - self.disk_max_files
+        if excess <= 0:
+            return
+        for _, path in sorted(entries)[:excess]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        """Drop every entry, e.g. after logos or branding changed."""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+        if self.disk_dir:
+            shutil.rmtree(self.disk_dir, ignore_errors=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and memory usage."""
+        with self._lock:
+            hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+            lookups = hits + self.stats["misses"]
+            return {
+                **self.stats,
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "disk_enabled": bool(self.disk_dir),
+                "hit_rate": hits / lookups if lookups else 0.0,
+            }
+
+
+# Global slip cache instance
+_global_slip_cache: Optional[RenderedSlipCache] = None
+
+
+def get_slip_cache() -> RenderedSlipCache:
+    """Get the global rendered slip cache instance."""
+    global _global_slip_cache
+    if _global_slip_cache is None:
+        _global_slip_cache = RenderedSlipCache()
+    return _global_slip_cache
@@ -0,0 +1,320 @@
+"""
+Stats Rollups for DBSBM.
+Reads leaderboards and stats from guild_stat_rollups, which bet resolution and
+the reaction handlers keep current per guild, user and period. Results are
+cached with the time they were read so callers can show how fresh they are.
+Rollups can be rebuilt from bets and reactions to repair any drift.
+"""
+
+import logging
+import os
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Optional
+
+try:
+    from utils.enhanced_cache_manager import get_enhanced_cache_manager
+except ImportError:
+    from bot.utils.enhanced_cache_manager import get_enhanced_cache_manager
+
+logger = logging.getLogger(__name__)
+
+STATS_ROLLUPS_PREFIX = "guild_stats"
+# Seconds a leaderboard or stats read is cached; resolutions invalidate sooner
+STATS_ROLLUPS_TTL = int(os.getenv("STATS_ROLLUPS_CACHE_TTL", "300"))
+# Months of history in a capper's monthly_stats
+STATS_MONTHLY_HISTORY = int(os.getenv("STATS_MONTHLY_HISTORY", "12"))
+
+ROLLUP_PERIODS = ("day", "month", "year", "all")
+ALL_TIME_START = date(1970, 1, 1)
+
+# Leaderboard metric -> ORDER BY expression over guild_stat_rollups
+LEADERBOARD_METRICS = {
+    "net_units": "net_units",
+    "win_rate": "wins::float / NULLIF(wins + losses, 0)",
+    "total_bets": "bets",
+    "roi": "net_units / NULLIF(units_wagered, 0)",
+    "reactions": "reactions",
+}
+
+# Period starts are cast from text in the queries below: DatabaseManager
+# sends dates as ISO strings, which asyncpg rejects for a DATE parameter
+LEADERBOARD_QUERY = """
+    SELECT r.user_id, c.display_name, r.bets, r.units_wagered, r.net_units,
+           r.wins, r.losses, r.pushes, r.reactions
+    FROM guild_stat_rollups r
+    LEFT JOIN cappers c ON c.guild_id = r.guild_id AND c.user_id = r.user_id
+    WHERE r.guild_id = $1 AND r.period_type = $2 AND r.period_start = $3::text::date
+    AND r.{column} > 0
+    ORDER BY {order} DESC NULLS LAST
+    LIMIT $4
+"""
+
+GUILD_TOTALS_QUERY = """
+    SELECT COUNT(*) FILTER (WHERE bets > 0) AS total_cappers,
+           COALESCE(SUM(bets), 0) AS total_bets,
+           COALESCE(SUM(units_wagered), 0) AS total_units,
+           COALESCE(SUM(net_units), 0) AS net_units,
+           COALESCE(SUM(wins), 0) AS wins,
+           COALESCE(SUM(losses), 0) AS losses,
+           COALESCE(SUM(pushes), 0) AS pushes,
+           COALESCE(SUM(reactions), 0) AS reactions
+    FROM guild_stat_rollups
+    WHERE guild_id = $1 AND period_type = $2 AND period_start = $3::text::date
+"""
+
+USER_ROLLUPS_QUERY = """
+    SELECT period_type, period_start, bets, units_wagered, net_units,
+           wins, losses, pushes, reactions
+    FROM guild_stat_rollups
+    WHERE guild_id = $1 AND user_id = $2
+    AND (period_type = 'all' OR (period_type = 'month' AND period_start >= $3::text::date))
+"""
+
+# Recomputes the rollups of one guild ($1), or of every guild if $1 is NULL,
+# from bets and bet_reactions like the migration 026 backfill. Only rows that
+# differ are written; returns the guild of each row repaired or removed.
+REBUILD_ROLLUPS_QUERY = """
+    WITH expected AS (
+        SELECT guild_id, user_id, period_type, period_start,
+               SUM(bets)::int AS bets,
+               SUM(units_wagered) AS units_wagered,
+               SUM(net_units) AS net_units,
+               SUM(wins)::int AS wins,
+               SUM(losses)::int AS losses,
+               SUM(pushes)::int AS pushes,
+               SUM(reactions)::int AS reactions
+        FROM (
+            SELECT b.guild_id, b.user_id, p.period_type, p.period_start,
+                   1 AS bets, COALESCE(b.units, 0) AS units_wagered,
+                   COALESCE(b.result_value, 0) AS net_units,
+                   (b.status = 'won')::int AS wins, (b.status = 'lost')::int AS losses,
+                   (b.status = 'push')::int AS pushes, 0 AS reactions
+            FROM bets b
+            CROSS JOIN LATERAL rollup_periods(
+                COALESCE(b.game_start, b.created_at, b.updated_at)
+            ) p
+            WHERE b.status IN ('won', 'lost', 'push')
+            AND ($1::bigint IS NULL OR b.guild_id = $1)
+            UNION ALL
+            SELECT b.guild_id, br.user_id, p.period_type, p.period_start,
+                   0, 0, 0, 0, 0, 0, 1
+            FROM bet_reactions br
+            JOIN bets b ON b.bet_serial = br.bet_serial
+            CROSS JOIN LATERAL rollup_periods(br.created_at) p
+            WHERE $1::bigint IS NULL OR b.guild_id = $1
+        ) counted
+        GROUP BY guild_id, user_id, period_type, period_start
+    ),
+    removed AS (
+        DELETE FROM guild_stat_rollups g
+        WHERE ($1::bigint IS NULL OR g.guild_id = $1)
+        AND NOT EXISTS (
+            SELECT 1 FROM expected e
+            WHERE e.guild_id = g.guild_id AND e.user_id = g.user_id
+            AND e.period_type = g.period_type AND e.period_start = g.period_start
+        )
+        RETURNING g.guild_id
+    ),
+    repaired AS (
+        INSERT INTO guild_stat_rollups AS g (
+            guild_id, user_id, period_type, period_start,
+            bets, units_wagered, net_units, wins, losses, pushes, reactions, updated_at
+        )
+        SELECT e.*, NOW() FROM expected e
+        ON CONFLICT (guild_id, period_type, period_start, user_id) DO UPDATE SET
+            bets = EXCLUDED.bets,
+            units_wagered = EXCLUDED.units_wagered,
+            net_units = EXCLUDED.net_units,
+            wins = EXCLUDED.wins,
+            losses = EXCLUDED.losses,
+            pushes = EXCLUDED.pushes,
+            reactions = EXCLUDED.reactions,
+            updated_at = EXCLUDED.updated_at
+        WHERE (g.bets, g.units_wagered, g.net_units, g.wins, g.losses, g.pushes, g.reactions)
+            IS DISTINCT FROM (EXCLUDED.bets, EXCLUDED.units_wagered, EXCLUDED.net_units,
+                              EXCLUDED.wins, EXCLUDED.losses, EXCLUDED.pushes,
+                              EXCLUDED.reactions)
+        RETURNING g.guild_id
+    )
+    SELECT guild_id FROM removed
+    UNION ALL
+    SELECT guild_id FROM repaired
+"""
+
+
+def period_start(period: str, now: Optional[datetime] = None) -> date:
+    """First day of the current ``period``."""
+    if period not in ROLLUP_PERIODS:
+        raise ValueError(f"Unknown rollup period: {period}")
+    today = (now or datetime.now(timezone.utc)).date()
+    if period == "day":
+        return today
+    if period == "month":
+        return today.replace(day=1)
+    if period == "year":
+        return today.replace(month=1, day=1)
+    return ALL_TIME_START
+
+
+def _record_stats(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Totals of one rollup row, with the win rate and ROI derived from them."""
+    wins, losses = int(row["wins"]), int(row["losses"])
+    units_wagered = float(row["units_wagered"])
+    net_units = float(row["net_units"])
+    return {
+        "total_bets": int(row["bets"]),
+        "wins": wins,
+        "losses": losses,
+        "pushes": int(row["pushes"]),
+        "reactions": int(row["reactions"]),
+        "total_units": units_wagered,
+        "net_units": net_units,
+        "win_rate": wins / (wins + losses) * 100 if wins + losses else 0.0,
+        "roi": net_units / units_wagered * 100 if units_wagered else 0.0,
+    }
+
+
+class StatsRollups:
+    """Cached reads of a guild's rollups; each costs at most one small query."""
+
+    def __init__(self, db_manager):
+        self.db_manager = db_manager
+        self.cache_manager = get_enhanced_cache_manager()
+
+    async def get_leaderboard(
+        self,
+        guild_id: int,
+        metric: str = "net_units",
+        period: str = "all",
+        limit: int = 10,
+    ) -> Dict[str, Any]:
+        """Top ``limit`` users of a guild for the current ``period``.
+
+        Returns ``{"rows": [...], "as_of": iso timestamp}``.
+        """
+        order = LEADERBOARD_METRICS.get(metric)
+        if order is None:
+            raise ValueError(f"Unknown leaderboard metric: {metric}")
+        # Ranking by reactions covers everyone who reacted, the rest only cappers
+        column = "reactions" if metric == "reactions" else "bets"
+        start = period_start(period)
+
+        async def load():
+            rows = await self.db_manager.fetch_all(
+                LEADERBOARD_QUERY.format(column=column, order=order),
+                (guild_id, period, start, limit),
+            )
+            return [
+                {
+                    "user_id": row["user_id"],
+                    "username": row["display_name"] or f"User {row['user_id']}",
+                    **_record_stats(row),
+                }
+                for row in rows
+            ]
+
+        return await self._cached(
+            guild_id, f"{guild_id}:leaderboard:{metric}:{period}:{start}:{limit}", load
+        )
+
+    async def get_guild_stats(self, guild_id: int, period: str = "all") -> Dict[str, Any]:
+        """Totals of a guild for the current ``period`` plus its top cappers."""
+        start = period_start(period)
+
+        async def load():
+            totals = await self.db_manager.fetch_one(
+                GUILD_TOTALS_QUERY, (guild_id, period, start)
+            )
+            if not totals:
+                return None
+            stats = {
+                key: float(value) if key in ("total_units", "net_units") else int(value)
+                for key, value in totals.items()
+            }
+            leaderboard = await self.get_leaderboard(guild_id, "net_units", period, 8)
+            stats["leaderboard"] = leaderboard["rows"]
+            return stats
+
+        return await self._cached(guild_id, f"{guild_id}:guild:{period}:{start}", load)
+
+    async def get_user_stats(self, guild_id: int, user_id: int) -> Dict[str, Any]:
+        """All-time totals of a user with their recent monthly profit."""
+        month = period_start("month")
+        months_back = month.year * 12 + month.month - STATS_MONTHLY_HISTORY
+        since = date(months_back // 12, months_back % 12 + 1, 1)
+
+        async def load():
+            rows = await self.db_manager.fetch_all(
+                USER_ROLLUPS_QUERY, (guild_id, user_id, since)
+            )
+            overall = next((row for row in rows if row["period_type"] == "all"), None)
+            if overall is None:
+                return None
+            stats = _record_stats(overall)
+            stats["total_profit"] = stats["net_units"]
+            stats["monthly_stats"] = {
+                row["period_start"].strftime("%Y-%m"): {
+                    "bets": int(row["bets"]),
+                    "profit": float(row["net_units"]),
+                }
+                for row in sorted(rows, key=lambda row: row["period_start"])
+                if row["period_type"] == "month"
+            }
+            return stats
+
+        return await self._cached(guild_id, f"{guild_id}:user:{user_id}:{month}", load)
+
+    async def rebuild(self, guild_id: Optional[int] = None) -> int:
+        """Recompute the rollups of a guild, or of every guild, from its bets.
+
+        Repairs drift from writes that bypass the incremental updates and
+        returns the number of rollup rows that had to be corrected.
+        """
+        rows = await self.db_manager.fetch_all(
+            REBUILD_ROLLUPS_QUERY, (None if guild_id is None else int(guild_id),)
+        )
+        for repaired_guild in {row["guild_id"] for row in rows}:
+            await self.invalidate(repaired_guild)
+        return len(rows)
+
+    async def invalidate(self, guild_id: int) -> None:
+        """Drop every cached read of a guild, here and in other processes."""
+        await self.cache_manager.invalidate_tags(_guild_tag(guild_id))
+
+    async def _cached(self, guild_id: int, key: str, load) -> Dict[str, Any]:
+        cached = await self.cache_manager.get(STATS_ROLLUPS_PREFIX, key)
+        if cached is not None:
+            return cached
+        as_of = datetime.now(timezone.utc).isoformat()
+        result = await load()
+        if isinstance(result, list):
+            result = {"rows": result, "as_of": as_of}
+        elif result is not None:
+            result["as_of"] = as_of
+        else:
+            # Nothing rolled up yet; not cached so the first bet shows at once
+            return {}
+        await self.cache_manager.set(
+            STATS_ROLLUPS_PREFIX,
+            key,
+            result,
+            ttl=STATS_ROLLUPS_TTL,
+            tags=[_guild_tag(guild_id)],
+        )
+        return result
+
+
+def _guild_tag(guild_id: int) -> str:
+    return f"{STATS_ROLLUPS_PREFIX}:{int(guild_id)}"
+
+
+# Global stats rollups instance
+_global_stats_rollups: Optional[StatsRollups] = None
+
+
+def get_stats_rollups(db_manager) -> StatsRollups:
+    """Get the global stats rollups reader, created on first use."""
+    global _global_stats_rollups
+    if _global_stats_rollups is None:
+        _global_stats_rollups = StatsRollups(db_manager)
+    return _global_stats_rollups
@@ -1,313 +1,173 @@
 import asyncio
 import logging
+import os
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Iterable, List, Optional, Set
 
-import aiosqlite
 from discord import Client, VoiceChannel
 
 logger = logging.getLogger(__name__)
 
+# Seconds between full refreshes of every guild's unit channels
+VOICE_UPDATE_INTERVAL = float(os.getenv("VOICE_UPDATE_INTERVAL", "300"))
+# Resolutions within this many seconds are folded into one update per guild
+VOICE_UPDATE_DEBOUNCE = float(os.getenv("VOICE_UPDATE_DEBOUNCE", "10"))
+
+# Monthly and yearly unit totals of paid guilds in one pass over unit_records
+UNIT_TOTALS_QUERY = """
+    SELECT gs.guild_id, gs.voice_channel_id, gs.yearly_channel_id,
+           COALESCE(SUM(ur.monthly_result_value) FILTER (WHERE ur.month = $2), 0)
+               AS monthly_total,
+           COALESCE(SUM(ur.total_result_value), 0) AS yearly_total
+    FROM guild_settings gs
+    LEFT JOIN unit_records ur ON ur.guild_id = gs.guild_id AND ur.year = $1
+    WHERE gs.is_paid::boolean
+    {filters}
+    GROUP BY gs.guild_id, gs.voice_channel_id, gs.yearly_channel_id
+"""
+
 
 class VoiceChannelUpdater:
-    async def reinitialize_pending_bets(self):
-        """Check the bets table for any rows with status 'pending' and reinitialize them for reaction monitoring."""
-        try:
-            async with aiosqlite.connect(self.db_path) as db:
-                async with db.execute(
-                    """
-                    SELECT bet_serial, guild_id, user_id
-                    FROM bets
-                    WHERE status = 'pending'
-                    """
-                ) as cursor:
-                    pending_bets = await cursor.fetchall()
-                for bet in pending_bets:
-                    # Reinitialize reaction monitoring for pending bets
-                    bet_serial, guild_id, user_id = bet
-                    try:
-                        # Get the bet message from the database
-                        async with aiosqlite.connect(self.db_path) as db:
-                            async with db.execute(
-                                """
-                                SELECT message_id, channel_id
-                                FROM bets
-                                WHERE bet_serial = ?
-                                """,
-                                (bet_serial,),
-                            ) as cursor:
-                                bet_info = await cursor.fetchone()
+    """Shows each paid guild's monthly and yearly unit totals as channel names.
 
-                        if bet_info:
-                            message_id, channel_id = bet_info
-                            # Attempt to reinitialize reaction monitoring
-                            # This would typically involve setting up reaction listeners
-                            logger.info(
-                                f"Reinitializing reaction monitoring for bet {bet_serial} "
-                                f"in channel {channel_id}, message {message_id}"
-                            )
-                        else:
-                            logger.warning(
-                                f"Could not find message info for bet {bet_serial}"
-                            )
-                    except Exception as e:
-                        logger.error(f"Error reinitializing bet {bet_serial}: {str(e)}")
-        except Exception as e:
-            logger.error(f"Error reinitializing pending bets: {str(e)}")
+    Totals for every guild come from one grouped query against the main
+    database. Bet resolutions mark their guild dirty and are flushed together
+    after ``VOICE_UPDATE_DEBOUNCE`` seconds, and a channel is only renamed
+    when its text actually changes.
+    """
 
-    def __init__(self, bot: Client, db_path: str):
+    def __init__(self, bot: Client, db_manager):
         self.bot = bot
-        self.db_path = db_path
+        self.db_manager = db_manager
         self.running = False
         self._update_task: Optional[asyncio.Task] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self._dirty_guilds: Set[int] = set()
 
     async def start(self):
         """Start the voice channel update service."""
         self.running = True
-        await self.reinitialize_pending_bets()
         self._update_task = asyncio.create_task(self._update_loop())
         logger.info("Voice channel updater started")
 
     async def stop(self):
         """Stop the voice channel update service."""
         self.running = False
-        if self._update_task:
-            self._update_task.cancel()
+        for task in (self._update_task, self._flush_task):
+            if task:
+                task.cancel()
         logger.info("Voice channel updater stopped")
 
     async def _update_loop(self):
-        """Main update loop that runs every 5 minutes."""
+        """Main update loop that runs every ``VOICE_UPDATE_INTERVAL`` seconds."""
         while self.running:
             try:
                 await self.update_all_channels()
-                await asyncio.sleep(300)  # 5 minutes
+                await asyncio.sleep(VOICE_UPDATE_INTERVAL)
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.error(f"Error in voice channel update loop: {str(e)}")
-                await asyncio.sleep(300)
+                await asyncio.sleep(VOICE_UPDATE_INTERVAL)
 
     async def update_all_channels(self):
-        """Update all voice channels for all guilds."""
+        """Update the unit channels of all guilds."""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                # Get all guilds with voice channels configured
-                async with db.execute(
-                    """
-                    SELECT guild_id, voice_channel_id, yearly_channel_id, is_paid
-                    FROM guild_settings
-                    WHERE voice_channel_id IS NOT NULL OR yearly_channel_id IS NOT NULL
-                    """
-                ) as cursor:
-                    guilds = await cursor.fetchall()
-
-                for guild in guilds:
-                    guild_id, voice_channel_id, yearly_channel_id, is_paid = guild
-
-                    if not is_paid:
-                        continue
-
-                    # Update monthly channel if configured
-                    if voice_channel_id:
-                        monthly_total = await self._get_monthly_total(db, guild_id)
-                        await self._update_channel_name(
-                            voice_channel_id, f"Monthly Units: {monthly_total}"
-                        )
-
-                    # Update yearly channel if configured
-                    if yearly_channel_id:
-                        yearly_total = await self._get_yearly_total(db, guild_id)
-                        await self._update_channel_name(
-                            yearly_channel_id, f"Yearly Units: {yearly_total}"
-                        )
-
+            await self._update_guilds(None)
         except Exception as e:
             logger.error(f"Error updating voice channels: {str(e)}")
 
     async def update_on_bet_resolve(self, guild_id: int):
-        """Update voice channels when a bet is resolved."""
-        try:
-            async with aiosqlite.connect(self.db_path) as db:
-                # Get guild settings
-                async with db.execute(
-                    """
-                    SELECT voice_channel_id, yearly_channel_id, is_paid
-                    FROM guild_settings
-                    WHERE guild_id = ?
-                    """,
-                    (guild_id,),
-                ) as cursor:
-                    guild = await cursor.fetchone()
-
-                if not guild or not guild[2]:  # Not paid
-                    return
-
-                voice_channel_id, yearly_channel_id, _ = guild
-
-                # Update monthly channel if configured
-                if voice_channel_id:
-                    monthly_total = await self._get_monthly_total(db, guild_id)
-                    await self._update_channel_name(
-                        voice_channel_id, f"Monthly Units: {monthly_total}"
-                    )
-
-                # Update yearly channel if configured
-                if yearly_channel_id:
-                    yearly_total = await self._get_yearly_total(db, guild_id)
-                    await self._update_channel_name(
-                        yearly_channel_id, f"Yearly Units: {yearly_total}"
-                    )
-
-        except Exception as e:
-            logger.error(f"Error updating voice channels on bet resolve: {str(e)}")
-
-    async def _get_monthly_total(
-        self, db: aiosqlite.Connection, guild_id: int
-    ) -> float:
-        """Get the total units for the current month."""
-        try:
-            now = datetime.utcnow()
-            # Debug logging for monthly total calculation
-            logger.info(
-                f"Calculating monthly total for guild_id={guild_id}, year={now.year}, month={now.month}"
+        """Schedule a unit channel update for a guild after a bet resolution."""
+        self._dirty_guilds.add(guild_id)
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_dirty_guilds())
+
+    async def _flush_dirty_guilds(self):
+        await asyncio.sleep(VOICE_UPDATE_DEBOUNCE)
+        while self._dirty_guilds:
+            guild_ids, self._dirty_guilds = self._dirty_guilds, set()
+            try:
+                await self._update_guilds(guild_ids)
+            except Exception as e:
+                logger.error(f"Error updating voice channels on bet resolve: {str(e)}")
+
+    async def get_unit_totals(
+        self,
+        guild_ids: Optional[Iterable[int]] = None,
+        year: Optional[int] = None,
+        with_channels: bool = True,
+    ) -> List[Dict]:
+        """Monthly and yearly totals per paid guild.
+
+        Covers ``guild_ids`` (default: all), and only guilds with a unit
+        channel configured unless ``with_channels`` is False.
+        """
+        now = datetime.utcnow()
+        params = [year or now.year, now.month]
+        filters = []
+        if with_channels:
+            filters.append(
+                "AND (gs.voice_channel_id IS NOT NULL OR gs.yearly_channel_id IS NOT NULL)"
             )
-            async with db.execute(
-                """
-                SELECT COALESCE(SUM(monthly_result_value), 0.0) as total
-                FROM unit_records
-                WHERE guild_id = ? AND year = ? AND month = ?
-                """,
-                (guild_id, now.year, now.month),
-            ) as cursor:
-                result = await cursor.fetchone()
-                logger.info(
-                    f"Monthly total query result for guild_id={guild_id}: {result}"
+        if guild_ids is not None:
+            filters.append("AND gs.guild_id = ANY($3)")
+            params.append(list(guild_ids))
+        return await self.db_manager.fetch_all(
+            UNIT_TOTALS_QUERY.format(filters="\n    ".join(filters)), tuple(params)
+        )
+
+    async def _update_guilds(self, guild_ids: Optional[Iterable[int]]):
+        for row in await self.get_unit_totals(guild_ids):
+            if row["voice_channel_id"]:
+                await self._update_channel_name(
+                    row["voice_channel_id"],
+                    f"Monthly Units: {float(row['monthly_total']):.2f}",
                 )
-                return (
-                    result["total"] if result and result["total"] is not None else 0.0
+            if row["yearly_channel_id"]:
+                await self._update_channel_name(
+                    row["yearly_channel_id"],
+                    f"Yearly Units: {float(row['yearly_total']):.2f}",
                 )
-        except Exception as e:
-            logger.error(f"Error getting monthly total: {str(e)}")
-            return 0.0
-
-    async def _get_yearly_total(self, db: aiosqlite.Connection, guild_id: int) -> float:
-        """Get the total units for the current year."""
-        try:
-            now = datetime.utcnow()
-
-            async with db.execute(
-                """
-                SELECT COALESCE(SUM(result_value), 0.0) as total
-                FROM unit_records
-                WHERE guild_id = ? AND year = ?
-                """,
-                (guild_id, now.year),
-            ) as cursor:
-                result = await cursor.fetchone()
-                return (
-                    result["total"] if result and result["total"] is not None else 0.0
-                )
-        except Exception as e:
-            logger.error(f"Error getting yearly total: {str(e)}")
-            return 0.0
 
     async def _update_channel_name(self, channel_id: int, new_name: str):
-        """Update a voice channel's name."""
+        """Rename a voice channel unless it already shows ``new_name``."""
         try:
             channel = self.bot.get_channel(channel_id)
-            if isinstance(channel, VoiceChannel):
+            # Renames are heavily rate limited, so never spend one on a no-op
+            if isinstance(channel, VoiceChannel) and channel.name != new_name:
                 await channel.edit(name=new_name)
         except Exception as e:
             logger.error(f"Error updating channel name: {str(e)}")
 
     async def handle_month_end(self):
-        """Handle end of month tasks."""
-        try:
-            async with aiosqlite.connect(self.db_path) as db:
-                # Get all guilds
-                async with db.execute(
-                    """
-                    SELECT guild_id, voice_channel_id, yearly_channel_id, is_paid
-                    FROM guild_settings
-                    """
-                ) as cursor:
-                    guilds = await cursor.fetchall()
-
-                for guild in guilds:
-                    guild_id, voice_channel_id, yearly_channel_id, is_paid = guild
-
-                    if not is_paid:
-                        continue
-
-                    # Reset monthly units
-                    await db.execute(
-                        """
-                        UPDATE unit_records
-                        SET monthly_result_value = 0
-                        WHERE guild_id = ?
-                        """,
-                        (guild_id,),
-                    )
+        """Handle end of month tasks.
 
-                    # Update voice channel to show reset
-                    if voice_channel_id:
-                        await self._update_channel_name(
-                            voice_channel_id, "Monthly Units: 0"
-                        )
+        Monthly totals only count the current month's records, so the new
+        month starts at zero without resetting anything.
+        """
+        await self.update_all_channels()
 
-                await db.commit()
-        except Exception as e:
-            logger.error(f"Error handling month end: {str(e)}")
-
-    async def handle_year_end(self):
+    async def handle_year_end(self, year: Optional[int] = None):
         """Handle end of year tasks."""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                # Get all guilds
-                async with db.execute(
-                    """
-                    SELECT guild_id, yearly_channel_id, is_paid
-                    FROM guild_settings
+            year = year or datetime.utcnow().year
+            totals = await self.get_unit_totals(year=year, with_channels=False)
+            if totals:
+                # One statement for every guild instead of one per guild
+                await self.db_manager.execute(
                     """
-                ) as cursor:
-                    guilds = await cursor.fetchall()
-
-                for guild in guilds:
-                    guild_id, yearly_channel_id, is_paid = guild
-
-                    if not is_paid:
-                        continue
-
-                    # Get yearly total
-                    yearly_total = await self._get_yearly_total(db, guild_id)
-
-                    # Update subscribers table
-                    await db.execute(
-                        """
-                        UPDATE subscribers
-                        SET year_total = ?,
-                            lifetime_units = lifetime_units + ?
-                        WHERE guild_id = ?
-                        """,
-                        (yearly_total, yearly_total, guild_id),
-                    )
-
-                    # Reset yearly total
-                    await db.execute(
-                        """
-                        UPDATE unit_records
-                        SET total_result_value = 0
-                        WHERE guild_id = ?
-                        """,
-                        (guild_id,),
-                    )
-
-                    # Update voice channel to show reset
-                    if yearly_channel_id:
-                        await self._update_channel_name(
-                            yearly_channel_id, "Yearly Units: 0"
-                        )
-
-                await db.commit()
+                    UPDATE subscribers s
+                    SET year_total = t.yearly_total,
+                        lifetime_units = s.lifetime_units + t.yearly_total
+                    FROM UNNEST($1::bigint[], $2::float8[]) AS t(guild_id, yearly_total)
+                    WHERE s.guild_id = t.guild_id
+                    """,
+                    (
+                        [row["guild_id"] for row in totals],
+                        [float(row["yearly_total"]) for row in totals],
+                    ),
+                )
+            await self.update_all_channels()
         except Exception as e:
             logger.error(f"Error handling year end: {str(e)}")
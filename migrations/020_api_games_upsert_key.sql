@@ -0,0 +1,12 @@
+-- Migration 020: api_games upsert key
+-- Bulk ingestion writes api_games with INSERT ... ON CONFLICT (api_game_id),
+-- which requires a unique index on api_game_id.
+
+-- Keep only the most recently fetched row for any duplicated api_game_id
+DELETE FROM api_games a
+USING api_games b
+WHERE a.api_game_id = b.api_game_id
+  AND a.id < b.id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_api_games_api_game_id
+    ON api_games (api_game_id);
@@ -0,0 +1,6 @@
+-- Migration 021: api_games payload fingerprint
+-- The incremental fetch mode stores a content hash per game and only
+-- rewrites rows whose hash changed, instead of truncating and reloading
+-- api_games every hour.
+
+ALTER TABLE api_games ADD COLUMN IF NOT EXISTS payload_hash VARCHAR(40);
@@ -0,0 +1,9 @@
+-- Migration 022: bets message_id index
+-- Reaction events look up the bet slip by (message_id, guild_id). Only
+-- confirmed bets have a message, so the index skips rows without one.
+
+ALTER TABLE bets ADD COLUMN IF NOT EXISTS message_id BIGINT;
+
+CREATE INDEX IF NOT EXISTS idx_bets_message_guild
+    ON bets (message_id, guild_id)
+    WHERE message_id IS NOT NULL;
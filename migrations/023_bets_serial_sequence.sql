@@ -0,0 +1,28 @@
+-- Migration 023: bets serial sequence
+-- Bet serials are handed out in blocks from the sequence behind
+-- bets.bet_serial and inserted explicitly. Make sure the column has an
+-- owned sequence that starts past the existing serials, and that explicit
+-- values are accepted when the column is an identity column.
+
+DO $$
+BEGIN
+    IF pg_get_serial_sequence('bets', 'bet_serial') IS NULL THEN
+        CREATE SEQUENCE IF NOT EXISTS bets_bet_serial_seq AS BIGINT;
+        ALTER SEQUENCE bets_bet_serial_seq OWNED BY bets.bet_serial;
+        PERFORM setval(
+            'bets_bet_serial_seq',
+            COALESCE((SELECT MAX(bet_serial) FROM bets), 0) + 1,
+            false
+        );
+        ALTER TABLE bets
+            ALTER COLUMN bet_serial SET DEFAULT nextval('bets_bet_serial_seq');
+    ELSIF EXISTS (
+        SELECT 1
+        FROM information_schema.columns
+        WHERE table_name = 'bets'
+          AND column_name = 'bet_serial'
+          AND identity_generation = 'ALWAYS'
+    ) THEN
+        ALTER TABLE bets ALTER COLUMN bet_serial SET GENERATED BY DEFAULT;
+    END IF;
+END $$;
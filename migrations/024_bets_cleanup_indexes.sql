@@ -0,0 +1,16 @@
+-- Migration 024: bets cleanup indexes
+-- The bet janitor deletes unconfirmed bets after a few minutes and pending
+-- bets a day after they expire. Each of its DELETE predicates has a partial
+-- index, so a sweep only touches the rows it removes.
+
+CREATE INDEX IF NOT EXISTS idx_bets_unconfirmed_created
+    ON bets (created_at)
+    WHERE confirmed = 0;
+
+CREATE INDEX IF NOT EXISTS idx_bets_pending_expiration
+    ON bets (expiration_time)
+    WHERE status = 'pending' AND expiration_time IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_bets_pending_created_no_expiration
+    ON bets (created_at)
+    WHERE status = 'pending' AND expiration_time IS NULL;
@@ -0,0 +1,21 @@
+-- Migration 025: one unit record per bet
+-- Bet resolution upserts its unit record with ON CONFLICT (bet_serial), which
+-- needs a unique index on bet_serial. Duplicates left by the old non-atomic
+-- resolution path are removed first, keeping the newest row of each bet
+-- (latest created_at, then highest record_id; ctid is not insertion order).
+
+DELETE FROM unit_records u
+USING (
+    SELECT record_id,
+           ROW_NUMBER() OVER (
+               PARTITION BY bet_serial
+               ORDER BY created_at DESC NULLS LAST, record_id DESC
+           ) AS newest
+    FROM unit_records
+    WHERE bet_serial IS NOT NULL
+) ranked
+WHERE u.record_id = ranked.record_id
+AND ranked.newest > 1;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_unit_records_bet_serial
+    ON unit_records (bet_serial);
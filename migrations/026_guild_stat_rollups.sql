@@ -0,0 +1,68 @@
+-- Migration 026: per-guild stat rollups
+-- Leaderboards and stats used to GROUP BY over every bet and reaction a guild
+-- ever had. guild_stat_rollups keeps one row per guild, user and period
+-- (day, month, year and all time) that bet resolution and the reaction
+-- handlers update in the same statement as their own write, so reads only
+-- touch a guild's top rows.
+
+-- Periods a timestamp is counted in; 'all' has a fixed start
+CREATE OR REPLACE FUNCTION rollup_periods(ts timestamptz)
+RETURNS TABLE (period_type text, period_start date)
+LANGUAGE sql STABLE
+AS $$
+    VALUES ('day', date_trunc('day', ts)::date),
+           ('month', date_trunc('month', ts)::date),
+           ('year', date_trunc('year', ts)::date),
+           ('all', DATE '1970-01-01')
+$$;
+
+CREATE TABLE IF NOT EXISTS guild_stat_rollups (
+    guild_id BIGINT NOT NULL,
+    user_id BIGINT NOT NULL,
+    period_type TEXT NOT NULL,
+    period_start DATE NOT NULL,
+    bets INTEGER NOT NULL DEFAULT 0,
+    units_wagered NUMERIC NOT NULL DEFAULT 0,
+    net_units NUMERIC NOT NULL DEFAULT 0,
+    wins INTEGER NOT NULL DEFAULT 0,
+    losses INTEGER NOT NULL DEFAULT 0,
+    pushes INTEGER NOT NULL DEFAULT 0,
+    reactions INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (guild_id, period_type, period_start, user_id)
+);
+
+-- Top-N by net units is an index scan
+CREATE INDEX IF NOT EXISTS idx_guild_stat_rollups_net_units
+    ON guild_stat_rollups (guild_id, period_type, period_start, net_units DESC);
+
+CREATE INDEX IF NOT EXISTS idx_guild_stat_rollups_user
+    ON guild_stat_rollups (guild_id, user_id, period_type, period_start);
+
+-- Backfill from existing history; rerunning the migration rebuilds it
+TRUNCATE guild_stat_rollups;
+
+INSERT INTO guild_stat_rollups (
+    guild_id, user_id, period_type, period_start,
+    bets, units_wagered, net_units, wins, losses, pushes
+)
+SELECT b.guild_id, b.user_id, p.period_type, p.period_start,
+       COUNT(*),
+       SUM(COALESCE(b.units, 0)),
+       SUM(COALESCE(b.result_value, 0)),
+       COUNT(*) FILTER (WHERE b.status = 'won'),
+       COUNT(*) FILTER (WHERE b.status = 'lost'),
+       COUNT(*) FILTER (WHERE b.status = 'push')
+FROM bets b
+CROSS JOIN LATERAL rollup_periods(COALESCE(b.game_start, b.created_at, b.updated_at)) p
+WHERE b.status IN ('won', 'lost', 'push')
+GROUP BY b.guild_id, b.user_id, p.period_type, p.period_start;
+
+INSERT INTO guild_stat_rollups (guild_id, user_id, period_type, period_start, reactions)
+SELECT b.guild_id, br.user_id, p.period_type, p.period_start, COUNT(*)
+FROM bet_reactions br
+JOIN bets b ON b.bet_serial = br.bet_serial
+CROSS JOIN LATERAL rollup_periods(br.created_at) p
+GROUP BY b.guild_id, br.user_id, p.period_type, p.period_start
+ON CONFLICT (guild_id, period_type, period_start, user_id) DO UPDATE
+SET reactions = EXCLUDED.reactions;